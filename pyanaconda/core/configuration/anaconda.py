@@ -102,6 +102,29 @@ class AnacondaSection(Section):
         """
         return self._get_option("optional_modules").split()
 
+    @property
+    def lazy_modules(self):
+        """List of optional Anaconda DBus modules that are started on the first use.
+
+        These modules are not started during the startup of the installer.
+
+        Supported patterns:
+
+            MODULE.PREFIX.*
+            MODULE.NAME
+
+        :return: a list of patterns
+        """
+        return self._get_option("lazy_modules").split()
+
+    @property
+    def profile_installation(self):
+        """Record a timeline of the installation.
+
+        The timeline is saved as a Chrome trace file with the installation logs.
+        """
+        return self._get_option("profile_installation", bool)
+
 
 class AnacondaConfiguration(Configuration):
     """Representation of the Anaconda configuration."""
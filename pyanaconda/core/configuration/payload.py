@@ -142,3 +142,25 @@ class PayloadSection(Section):
     def default_rpm_gpg_keys(self):
         """List of GPG keys to import into RPM database at end of installation."""
         return self._get_option("default_rpm_gpg_keys", str).split()
+
+    @property
+    def stream_live_tarball(self):
+        """Extract a remote live tarball while it is being downloaded.
+
+        If enabled, the tarball is not stored in the system root before
+        the installation. The checksum of the tarball is calculated during
+        the extraction and checked after the tarball is extracted to the
+        system root. If the checksum doesn't match, the extracted content
+        is removed from the system root. A failure of tar stops the
+        installation.
+        """
+        return self._get_option("stream_live_tarball", bool)
+
+    @property
+    def parallel_image_copy(self):
+        """Copy a live image with a pool of workers instead of rsync.
+
+        The files are copied at once with reflinks or copy_file_range
+        if the file systems allow it.
+        """
+        return self._get_option("parallel_image_copy", bool)
@@ -70,6 +70,16 @@ class TargetSection(Section):
         """
         return self._get_option("can_configure_network", bool)
 
+    @property
+    def parallel_configuration(self):
+        """Should we configure the installed system in parallel?
+
+        Independent modules will configure the installed system at once.
+
+        :return: True or False
+        """
+        return self._get_option("parallel_configuration", bool)
+
     @property
     def can_copy_input_kickstart(self):
         """Should we copy input kickstart to the new system?"""
@@ -84,3 +94,11 @@ class TargetSection(Section):
     def can_save_installation_logs(self):
         """Should we save logs from the installation to the new system?"""
         return self._get_option("can_save_installation_logs", bool)
+
+    @property
+    def compress_installation_logs(self):
+        """Should we compress the saved logs from the installation?
+
+        The logs are compressed with zstd if it is supported.
+        """
+        return self._get_option("compress_installation_logs", bool)
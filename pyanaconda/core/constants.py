@@ -116,7 +116,7 @@ THREAD_WAIT_FOR_CONNECTING_NM = "AnaWaitForConnectingNMThread"
 THREAD_PAYLOAD = "AnaPayloadThread"
 THREAD_PAYLOAD_RESTART = "AnaPayloadRestartThread"
 THREAD_EXCEPTION_HANDLING_TEST = "AnaExceptionHandlingTest"
-THREAD_LIVE_PROGRESS = "AnaLiveProgressThread"
+THREAD_LIVE_TAR_OUTPUT = "AnaLiveTarOutputThread"
 THREAD_SOFTWARE_WATCHER = "AnaSoftwareWatcher"
 THREAD_CHECK_SOFTWARE = "AnaCheckSoftwareThread"
 THREAD_SOURCE_WATCHER = "AnaSourceWatcher"
@@ -244,6 +244,9 @@ PASSWORD_POLICY_ROOT = "root"
 PASSWORD_POLICY_USER = "user"
 PASSWORD_POLICY_LUKS = "luks"
 
+# the number of milliseconds without changes before the password is checked
+PASSWORD_CHECK_DELAY = 200
+
 # the number of seconds we consider a noticeable freeze of the UI
 NOTICEABLE_FREEZE = 0.1
 
@@ -299,6 +302,16 @@ NTP_SERVER_QUERY = 2
 # Timeout for the NTP server check
 NTP_SERVER_TIMEOUT = 5
 
+# Maximal number of NTP servers checked at once
+NTP_SERVER_CHECK_WORKERS = 8
+
+# Time in seconds for which a working NTP server is not checked again
+NTP_SERVER_STATUS_TTL = 300
+
+# Initial and maximal time in seconds before a failed NTP server is checked again
+NTP_SERVER_RETRY_BACKOFF = 15
+NTP_SERVER_RETRY_BACKOFF_MAX = 240
+
 # Storage checker constraints
 STORAGE_MIN_RAM = "min_ram"
 STORAGE_ROOT_DEVICE_TYPES = "root_device_types"
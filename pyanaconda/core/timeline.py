@@ -0,0 +1,206 @@
+#
+# A timeline of the installation.
+#
+# Copyright (C) 2026 Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 31 Milk Street #960789 Boston, MA
+# 02196 USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+import glob
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+from pyanaconda.anaconda_loggers import get_module_logger
+from pyanaconda.core.configuration.anaconda import conf
+
+log = get_module_logger(__name__)
+
+__all__ = ["TIMELINE_DIR", "Timeline", "timeline"]
+
+# A directory with recorded events of all processes.
+TIMELINE_DIR = "/tmp/anaconda-timeline"
+
+
+class Timeline:
+    """A timeline of the installation.
+
+    Every process records its events into a separate file in the timeline
+    directory. The files can be merged into one file in the Chrome trace
+    event format, which can be opened in Perfetto or chrome://tracing.
+    """
+
+    def __init__(self, path=TIMELINE_DIR):
+        """Create a new timeline.
+
+        :param str path: a path to the timeline directory
+        """
+        self._path = path
+        self._lock = threading.Lock()
+        self._pid = None
+        self._threads = set()
+
+    @property
+    def path(self):
+        """A path to the timeline directory."""
+        return self._path
+
+    @property
+    def is_enabled(self):
+        """Should we record the timeline?"""
+        return conf.anaconda.profile_installation
+
+    @contextmanager
+    def span(self, name, category, **args):
+        """Record the duration of the code block.
+
+        The yielded dictionary with arguments of the event can be
+        updated in the block.
+
+        :param str name: a name of the event
+        :param str category: a category of the event
+        :param args: arguments of the event
+        """
+        if not self.is_enabled:
+            yield args
+            return
+
+        start = time.time()
+
+        try:
+            yield args
+        finally:
+            self.record(name, category, start, time.time(), args)
+
+    def record(self, name, category, start, end, args=None):
+        """Record a complete event.
+
+        :param str name: a name of the event
+        :param str category: a category of the event
+        :param float start: a start timestamp in seconds
+        :param float end: an end timestamp in seconds
+        :param dict args: arguments of the event
+        """
+        if not self.is_enabled:
+            return
+
+        thread = threading.current_thread()
+        event = {
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": int(start * 1000000),
+            "dur": int((end - start) * 1000000),
+            "pid": os.getpid(),
+            "tid": thread.native_id,
+            "args": {k: str(v) for k, v in (args or {}).items()},
+        }
+
+        with self._lock:
+            events = self._get_metadata_events(thread)
+            events.append(event)
+            self._write_events(events)
+
+    def _get_metadata_events(self, thread):
+        """Get events that name a new process or thread."""
+        pid = os.getpid()
+        events = []
+
+        if self._pid != pid:
+            # The process is new or it was forked.
+            self._pid = pid
+            self._threads = set()
+            events.append(self._get_metadata_event(
+                "process_name", self._get_process_name(), pid
+            ))
+
+        if thread.native_id not in self._threads:
+            self._threads.add(thread.native_id)
+            events.append(self._get_metadata_event(
+                "thread_name", thread.name, pid, thread.native_id
+            ))
+
+        return events
+
+    @staticmethod
+    def _get_metadata_event(name, value, pid, tid=0):
+        """Get a metadata event."""
+        return {"name": name, "ph": "M", "pid": pid, "tid": tid, "args": {"name": value}}
+
+    @staticmethod
+    def _get_process_name():
+        """Get a name of the current process.
+
+        Anaconda DBus modules are named by their packages.
+        """
+        path = sys.argv[0] if sys.argv and sys.argv[0] else "python3"
+        name = os.path.basename(path)
+
+        if name == "__main__.py":
+            return os.path.basename(os.path.dirname(path))
+
+        return name
+
+    def _write_events(self, events):
+        """Append events to the file of the current process."""
+        try:
+            os.makedirs(self._path, exist_ok=True)
+            file_path = os.path.join(self._path, "{}.json".format(self._pid))
+
+            with open(file_path, "a") as f:
+                for event in events:
+                    f.write(json.dumps(event) + "\n")
+
+        except OSError as e:
+            log.debug("Failed to record the timeline: %s", e)
+
+    def collect(self):
+        """Collect events of all processes.
+
+        :return: a list of events sorted by their timestamps
+        """
+        events = []
+
+        for file_path in glob.glob(os.path.join(self._path, "*.json")):
+            try:
+                with open(file_path) as f:
+                    events.extend(json.loads(line) for line in f if line.strip())
+            except (OSError, ValueError) as e:
+                log.warning("Failed to read the timeline %s: %s", file_path, e)
+
+        events.sort(key=lambda event: event.get("ts", 0))
+        return events
+
+    def write_trace(self, file_path):
+        """Write events of all processes into a trace file.
+
+        :param str file_path: a path to the trace file
+        :return: True if the trace file was written, otherwise False
+        """
+        events = self.collect()
+
+        if not events:
+            return False
+
+        with open(file_path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+        return True
+
+
+# The timeline of the installation.
+timeline = Timeline()
@@ -22,6 +22,7 @@ import functools
 import importlib.machinery
 import importlib.util
 import inspect
+import logging
 import os
 import os.path
 import re
@@ -31,7 +32,10 @@ import sys
 
 # Used for ascii_lowercase, ascii_uppercase constants
 import tempfile
+import threading
 import types
+from collections import deque
+from queue import Empty, SimpleQueue
 
 import requests
 from pykickstart.constants import KS_SCRIPT_ONERROR
@@ -50,6 +54,7 @@ from pyanaconda.core.constants import (
 )
 from pyanaconda.core.live_user import get_live_user
 from pyanaconda.core.path import join_paths, make_directories, open_with_perm
+from pyanaconda.core.timeline import timeline
 from pyanaconda.errors import RemovedModuleError
 from pyanaconda.modules.common.constants.objects import SCRIPTS
 from pyanaconda.modules.common.constants.services import RUNTIME
@@ -57,6 +62,9 @@ from pyanaconda.modules.common.constants.services import RUNTIME
 log = get_module_logger(__name__)
 program_log = get_program_logger()
 
+# The number of the last lines of the output kept by execReadlines.
+PROGRAM_OUTPUT_TAIL = 100
+
 _child_env = {}
 
 
@@ -82,6 +90,68 @@ def augmentEnv():
     return env
 
 
+class ProgramOutputLog:
+    """A non-blocking log of the output of external programs.
+
+    Lines of the output are put into a queue and logged by a thread
+    that holds the program log lock. The output is logged incrementally
+    and threads that run external programs never wait for each other.
+    """
+
+    def __init__(self, logger, lock):
+        """Create a new log.
+
+        :param logger: a logger of the program output
+        :param lock: a lock of the logger
+        """
+        self._logger = logger
+        self._lock = lock
+        self._queue = SimpleQueue()
+
+    def log(self, level, msg, *args):
+        """Log a message if the lock is available, otherwise queue it.
+
+        :param level: a logging level
+        :param msg: a message
+        :param args: arguments of the message
+        """
+        self._queue.put((level, msg, args))
+        self._flush(blocking=False)
+
+    def flush(self):
+        """Log all queued messages."""
+        self._flush(blocking=True)
+
+    def _flush(self, blocking):
+        """Log queued messages if possible.
+
+        A message can be queued after the queue is drained, but before
+        the lock is released. The thread that queued it couldn't get the
+        lock, so the queue is checked again after the lock is released.
+        """
+        while self._lock.acquire(blocking=blocking):
+            try:
+                self._drain()
+            finally:
+                self._lock.release()
+
+            if self._queue.empty():
+                break
+
+    def _drain(self):
+        """Log all queued messages."""
+        while True:
+            try:
+                level, msg, args = self._queue.get_nowait()
+            except Empty:
+                break
+
+            self._logger.log(level, msg, *args)
+
+
+program_output_log = ProgramOutputLog(program_log, program_log_lock)
+
+
 def startProgram(argv, root='/', stdin=None, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
                  env_prune=None, env_add=None, reset_handlers=True, reset_lang=True,
                  do_preexec=True, **kwargs):
@@ -119,11 +189,12 @@ def startProgram(argv, root='/', stdin=None, stdout=subprocess.PIPE, stderr=subp
     # signals ignored by anaconda.
     restore_signals = reset_handlers
 
-    with program_log_lock:
-        if target_root != '/':
-            program_log.info("Running in chroot '%s'... %s", target_root, " ".join(argv))
-        else:
-            program_log.info("Running... %s", " ".join(argv))
+    if target_root != '/':
+        program_output_log.log(
+            logging.INFO, "Running in chroot '%s'... %s", target_root, " ".join(argv)
+        )
+    else:
+        program_output_log.log(logging.INFO, "Running... %s", " ".join(argv))
 
     env = augmentEnv()
     for var in env_prune:
@@ -171,14 +242,87 @@ def startProgram(argv, root='/', stdin=None, stdout=subprocess.PIPE, stderr=subp
     return partsubp(preexec_fn=preexec)
 
 
+class _ProgramOutputReader:
+    """Reader of the output of an external program."""
+
+    def __init__(self, stream, *, binary_output=False, replace_utf_decode_errors=False,
+                 log_output=True, stdout=None, max_lines=None):
+        """Create a new reader.
+
+        :param stream: a binary stream to read
+        :param binary_output: whether to treat the output as binary data
+        :param replace_utf_decode_errors: whether to substitute � for decoding errors
+        :param log_output: whether to log the output
+        :param stdout: optional file object to write the output to
+        :param max_lines: a number of the last lines to keep or None for all lines
+        """
+        self._stream = stream
+        self._binary_output = binary_output
+        self._replace_utf_decode_errors = replace_utf_decode_errors
+        self._log_output = log_output
+        self._stdout = stdout
+        self._lines = deque(maxlen=max_lines)
+        self._error = None
+
+    def read(self):
+        """Read the stream until the end.
+
+        :return: the kept output
+        """
+        for raw_line in iter(self._stream.readline, b""):
+            line = self._decode(raw_line)
+
+            if self._log_output:
+                program_output_log.log(
+                    logging.INFO, "%s", raw_line.decode("utf-8", "replace").strip()
+                )
+
+            # Text output always ends with a new line.
+            if not self._binary_output and not line.endswith("\n"):
+                line += "\n"
+
+            self._lines.append(line)
+
+            if self._stdout:
+                self._stdout.write(line)
+
+        empty = b"" if self._binary_output else ""
+        return empty.join(self._lines)
+
+    def check_errors(self):
+        """Raise the first decoding error if any."""
+        if self._error:
+            raise self._error
+
+    def _decode(self, raw_line):
+        """Decode the line of the output."""
+        if self._binary_output:
+            return raw_line
+
+        if self._replace_utf_decode_errors:
+            return raw_line.decode("utf-8", "replace")
+
+        try:
+            return raw_line.decode("utf-8")
+        except UnicodeDecodeError as e:
+            # Read the rest of the output and raise the error later.
+            self._error = self._error or e
+            return raw_line.decode("utf-8", "replace")
+
+
 def _run_program(argv, root='/', stdin=None, stdout=None, env_prune=None,
                  replace_utf_decode_errors=False,
                  log_output=True, binary_output=False, filter_stderr=False,
-                 do_preexec=True, env_add=None, user=None):
+                 do_preexec=True, env_add=None, user=None, *, max_output_lines=None):
     """ Run an external program, log the output and return it to the caller
 
+        The output is read, logged and written to stdout line by line while
+        the program runs.
+
         NOTE/WARNING: UnicodeDecodeError will be raised if the output of the of the
-                      external command can't be decoded as UTF-8.
+                      external command can't be decoded as UTF-8. The error is raised
+                      after the program has finished, so the output is already written
+                      to stdout with the undecodable data replaced by �.
 
         :param argv: The command to run and argument
         :param root: The directory to chroot to before running command.
@@ -192,6 +336,7 @@ def _run_program(argv, root='/', stdin=None, stdout=None, env_prune=None,
         :param do_preexec: whether to use a preexec_fn for subprocess.Popen
         :param env_add: environment variables added for the execution
         :param user: Specify user UID under which the command will be executed
+        :param max_output_lines: return only the given number of the last lines of the output
         :return: The return code of the command and the output
     """
     try:
@@ -200,53 +345,51 @@ def _run_program(argv, root='/', stdin=None, stdout=None, env_prune=None,
         else:
             stderr = subprocess.STDOUT
 
-        proc = startProgram(argv, root=root, stdin=stdin, stdout=subprocess.PIPE, stderr=stderr,
-                            env_prune=env_prune, env_add=env_add, do_preexec=do_preexec, user=user)
-
-        (output_string, err_string) = proc.communicate()
-        if not binary_output:
-            output_string = output_string.decode(
-                "utf-8",
-                errors="strict" if not replace_utf_decode_errors else "replace"
+        with timeline.span(os.path.basename(argv[0]), "program",
+                           argv=" ".join(argv), root=root) as trace_args:
+            proc = startProgram(argv, root=root, stdin=stdin, stdout=subprocess.PIPE,
+                                stderr=stderr, env_prune=env_prune, env_add=env_add,
+                                do_preexec=do_preexec, user=user)
+
+            # If stderr is filtered, log it separately.
+            stderr_thread = None
+
+            if filter_stderr:
+                stderr_reader = _ProgramOutputReader(
+                    proc.stderr,
+                    binary_output=True,
+                    log_output=log_output,
+                    max_lines=0
+                )
+                stderr_thread = threading.Thread(target=stderr_reader.read, daemon=True)
+                stderr_thread.start()
+
+            stdout_reader = _ProgramOutputReader(
+                proc.stdout,
+                binary_output=binary_output,
+                replace_utf_decode_errors=replace_utf_decode_errors,
+                log_output=log_output,
+                stdout=stdout,
+                max_lines=max_output_lines
             )
-            if output_string and output_string[-1] != "\n":
-                output_string = output_string + "\n"
-
-        if log_output:
-            with program_log_lock:
-                if binary_output:
-                    # try to decode as utf-8 and replace all undecodable data by
-                    # "safe" printable representations when logging binary output
-                    decoded_output_lines = output_string.decode("utf-8", "replace")
-                else:
-                    # output_string should already be a Unicode string
-                    decoded_output_lines = output_string.splitlines(True)
-
-                for line in decoded_output_lines:
-                    program_log.info(line.strip())
-
-        if stdout:
-            stdout.write(output_string)
-
-        # If stderr was filtered, log it separately
-        if filter_stderr and err_string and log_output:
-            # try to decode as utf-8 and replace all undecodable data by
-            # "safe" printable representations when logging binary output
-            decoded_err_string = err_string.decode("utf-8", "replace")
-            err_lines = decoded_err_string.splitlines(True)
-
-            with program_log_lock:
-                for line in err_lines:
-                    program_log.info(line.strip())
+            output_string = stdout_reader.read()
+
+            if stderr_thread:
+                stderr_thread.join()
+
+            proc.wait()
+            trace_args["returncode"] = proc.returncode
+
+        program_output_log.flush()
+        stdout_reader.check_errors()
 
     except OSError as e:
-        with program_log_lock:
-            program_log.error("Error running %s: %s", argv[0], e.strerror)
+        program_output_log.log(logging.ERROR, "Error running %s: %s", argv[0], e.strerror)
+        program_output_log.flush()
         raise
 
-    with program_log_lock:
-        program_log.debug("Return code of %s: %d", argv[0], proc.returncode)
-
+    program_output_log.log(logging.DEBUG, "Return code of %s: %d", argv[0], proc.returncode)
+    program_output_log.flush()
     return (proc.returncode, output_string)
 
 
@@ -274,7 +417,7 @@ def execWithRedirect(command, argv, stdin=None, stdout=None, root='/',
                         env_prune=env_prune, env_add=env_add,
                         log_output=log_output, binary_output=binary_output,
                         replace_utf_decode_errors=replace_utf_decode_errors,
-                        do_preexec=do_preexec)[0]
+                        do_preexec=do_preexec, max_output_lines=0)[0]
 
 
 def execWithCapture(command, argv, stdin=None, root='/',
@@ -371,7 +514,8 @@ def execReadlines(command, argv, stdin=None, root='/', env_prune=None, filter_st
         :param filter_stderr: Whether stderr should be excluded from the returned output
         :param raise_on_nozero: Whether a nonzero exit status of the tool should cause an exception
 
-        Output from the file is not logged to program.log
+        Output from the file is not logged to program.log, only the last lines
+        of the output are logged if the command fails.
         This returns an iterator with the lines from the command until it has finished
     """
 
@@ -384,6 +528,7 @@ def execReadlines(command, argv, stdin=None, root='/', env_prune=None, filter_st
             self._proc = proc
             self._argv = argv
             self._raise_on_nozero = raise_on_nozero
+            self._tail = deque(maxlen=PROGRAM_OUTPUT_TAIL)
 
         def __iter__(self):
             return self
@@ -403,6 +548,7 @@ def execReadlines(command, argv, stdin=None, root='/', env_prune=None, filter_st
             if line == '':
                 # Output finished, wait for the process to end
                 self._proc.communicate()
+                self._log_result()
 
                 # If we don't care about return codes, just finish
                 if not self._raise_on_nozero:
@@ -417,8 +563,20 @@ def execReadlines(command, argv, stdin=None, root='/', env_prune=None, filter_st
                                   (self._argv, self._proc.returncode))
                 raise StopIteration
 
+            self._tail.append(line)
             return line.strip()
 
+        def _log_result(self):
+            """Log the return code and the last lines of a failed command."""
+            if self._proc.returncode:
+                for line in self._tail:
+                    program_output_log.log(logging.INFO, "%s", line.strip())
+
+            program_output_log.log(
+                logging.DEBUG, "Return code of %s: %d", self._argv[0], self._proc.returncode
+            )
+            program_output_log.flush()
+
         @property
         def rc(self):
             return self._proc.returncode
@@ -433,8 +591,8 @@ def execReadlines(command, argv, stdin=None, root='/', env_prune=None, filter_st
     try:
         proc = startProgram(argv, root=root, stdin=stdin, stderr=stderr, env_prune=env_prune)
     except OSError as e:
-        with program_log_lock:
-            program_log.error("Error running %s: %s", argv[0], e.strerror)
+        program_output_log.log(logging.ERROR, "Error running %s: %s", argv[0], e.strerror)
+        program_output_log.flush()
         raise
 
     return ExecLineReader(proc, argv, raise_on_nozero)
@@ -655,7 +813,7 @@ def requests_session():
     return session
 
 
-def collect(module_pattern, path, pred):
+def collect(module_pattern, path, pred, modules=None):
     """Traverse the directory (given by path), import all files as a module
        module_pattern % filename and find all classes within that match
        the given predicate.  This is then returned as a list of classes.
@@ -672,6 +830,9 @@ def collect(module_pattern, path, pred):
 
        :param pred: function which marks classes as good to import
        :type pred: function with one argument returning True or False
+
+       :param modules: names of modules to import or None to import all modules
+       :type modules: set of strings or None
     """
     retval = []
     try:
@@ -693,6 +854,9 @@ def collect(module_pattern, path, pred):
         except ValueError:
             mod_name = module_file
 
+        if modules is not None and mod_name not in modules:
+            continue
+
         module = None
         module_path = None
 
@@ -18,13 +18,20 @@
 # Red Hat, Inc.
 #
 
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
 import pwquality
 
 from pyanaconda.anaconda_loggers import get_module_logger
 from pyanaconda.core import constants, regexes, users
+from pyanaconda.core.async_utils import run_in_loop
 from pyanaconda.core.i18n import _
 from pyanaconda.core.kernel import kernel_arguments
 from pyanaconda.core.signal import Signal
+from pyanaconda.core.timer import Timer
 from pyanaconda.modules.common.constants.objects import USER_INTERFACE
 from pyanaconda.modules.common.constants.services import RUNTIME
 from pyanaconda.modules.common.structures.policy import PasswordPolicy
@@ -74,6 +81,81 @@ class PwqualitySettingsCache:
 pwquality_settings_cache = PwqualitySettingsCache()
 
 
+class PwqualityResultCache:
+    """Cache for results of libpwquality checks.
+
+    The libpwquality check includes a lookup in the cracklib dictionary,
+    so it is too slow to be repeated for every change of the password
+    checker. The results are cached by a hash of the password, the username
+    and the minimum password length, which is the only part of the password
+    policy used by libpwquality. Only the most recent results are kept.
+
+    The cache can be used from multiple threads. libpwquality and cracklib
+    are not thread-safe, so only one check runs at a time. A check that
+    waited for the same password reuses the result.
+    """
+
+    def __init__(self, max_size=256):
+        self._results = OrderedDict()
+        self._max_size = max_size
+        self._lock = threading.Lock()
+        self._check_lock = threading.Lock()
+
+    def check(self, settings, password, username):
+        """Check the password with libpwquality.
+
+        :param settings: libpwquality settings
+        :param str password: a password to check
+        :param str username: a username or None
+        :return: a tuple of the quality and the error message
+        """
+        key = (hashlib.sha256(password.encode()).digest(), username, settings.minlen)
+        result = self._get_result(key)
+
+        if result is not None:
+            return result
+
+        with self._check_lock:
+            # The password might have been checked while we waited.
+            result = self._get_result(key)
+
+            if result is not None:
+                return result
+
+            error_message = ""
+            pw_quality = 0
+
+            try:
+                # lets run the password through libpwquality
+                pw_quality = settings.check(password, None, username)
+            # pylint: disable=c-extension-no-member
+            except pwquality.PWQError as e:
+                # Leave valid alone here: the password is weak but can still
+                # be accepted.
+                # PWQError values are built as a tuple of (int, str)
+                error_message = e.args[1]
+
+            with self._lock:
+                self._results[key] = (pw_quality, error_message)
+
+                if len(self._results) > self._max_size:
+                    self._results.popitem(last=False)
+
+        return pw_quality, error_message
+
+    def _get_result(self, key):
+        """Get the cached result for the given key or None."""
+        with self._lock:
+            if key not in self._results:
+                return None
+
+            self._results.move_to_end(key)
+            return self._results[key]
+
+
+pwquality_result_cache = PwqualityResultCache()
+
+
 class PasswordCheckRequest:
     """A wrapper for a password check request.
 
@@ -338,6 +420,16 @@ class InputCheck:
             self.result.success = True
         self._skip = value
 
+    def prepare(self, check_request):
+        """Prepare the check in a background thread.
+
+        Subclasses can do here the slow part of the check, so the check
+        can run in the main thread without blocking it. The result of
+        the check must not be changed.
+
+        :param check_request: arbitrary input data to be processed
+        """
+
     def run(self, check_request):
         """Run the check.
 
@@ -378,17 +470,7 @@ class PasswordValidityCheck(InputCheck):
         """
 
         length_ok = False
-        error_message = ""
-        pw_quality = 0
-        try:
-            # lets run the password through libpwquality
-            pw_quality = check_request.pwquality_settings.check(check_request.password, None, check_request.username)
-        # pylint: disable=c-extension-no-member
-        except pwquality.PWQError as e:
-            # Leave valid alone here: the password is weak but can still
-            # be accepted.
-            # PWQError values are built as a tuple of (int, str)
-            error_message = e.args[1]
+        pw_quality, error_message = self._check_quality(check_request)
 
         if check_request.policy.allow_empty and not check_request.password:
             # if we are OK with empty passwords, then empty passwords are also fine length wise
@@ -437,6 +519,20 @@ class PasswordValidityCheck(InputCheck):
         self.result.length_ok = length_ok  # pylint: disable=attribute-defined-outside-init
 
 
+    def prepare(self, check_request):
+        """Run the password through libpwquality and cache the result."""
+        self._check_quality(check_request)
+
+    @staticmethod
+    def _check_quality(check_request):
+        """Get the quality of the password and the error message."""
+        return pwquality_result_cache.check(
+            check_request.pwquality_settings,
+            check_request.password,
+            check_request.username
+        )
+
+
 class PasswordFIPSCheck(InputCheck):
     """Check if the password is valid under FIPS, if applicable."""
 
@@ -601,6 +697,23 @@ class InputField:
                 self._initial_change_signal_fired = True
 
 
+# The executor for background checks.
+_check_executor = None
+
+
+def _get_check_executor():
+    """Get the executor for background checks."""
+    global _check_executor  # pylint: disable=global-statement
+
+    if _check_executor is None:
+        _check_executor = ThreadPoolExecutor(
+            max_workers=1,
+            thread_name_prefix="AnaPasswordCheck"
+        )
+
+    return _check_executor
+
+
 class PasswordChecker:
     """Run multiple password and input checks in a given order and report the results.
 
@@ -610,10 +723,15 @@ class PasswordChecker:
 
     It's also possible to mark individual checks to be skipped by setting their skip property to True.
     Such check will be skipped during the checking run.
+
+    If a delay is specified, changes of the password fields don't run the checks right away.
+    The checks are scheduled and prepared in a background thread once there are no changes
+    for the given number of milliseconds. Outdated checks are cancelled and only results of
+    the latest checks are reported. The delayed checks require the GLib event loop.
     """
 
     def __init__(self, initial_password_content, initial_password_confirmation_content,
-                 policy_name):
+                 policy_name, delay=None):
         self._password = InputField(initial_password_content)
         self._password_confirmation = InputField(initial_password_confirmation_content)
         self._checks = []
@@ -624,9 +742,20 @@ class PasswordChecker:
         self._username = None
         self._fullname = ""
         self._secret_type = constants.SecretType.PASSWORD
+        self._delay = delay
+        self._timer = Timer()
+        self._generation = 0
+        self._pending = False
+        self._scheduled = False
+        self._future = None
+
         # connect to the password field signals
-        self.password.changed.connect(self.run_checks)
-        self.password_confirmation.changed.connect(self.run_checks)
+        if delay is None:
+            self.password.changed.connect(self.run_checks)
+            self.password_confirmation.changed.connect(self.run_checks)
+        else:
+            self.password.changed.connect(self.schedule_checks)
+            self.password_confirmation.changed.connect(self.schedule_checks)
 
         # signals
         self.checks_done = Signal()
@@ -720,8 +849,8 @@ class PasswordChecker:
         """Add check instance to list of checks."""
         self._checks.append(check_instance)
 
-    def run_checks(self):
-        # first we need to prepare a check request instance
+    def _create_request(self):
+        """Create a check request for the current input."""
         check_request = PasswordCheckRequest()
         check_request.password = self.password.content
         check_request.password_confirmation = self.password_confirmation.content
@@ -729,7 +858,92 @@ class PasswordChecker:
         check_request.username = self.username
         check_request.fullname = self.fullname
         check_request.secret_type = self.secret_type
+        return check_request
+
+    def _cancel_checks(self):
+        """Cancel the scheduled checks."""
+        self._generation += 1
+        self._pending = False
+
+        if self._scheduled:
+            self._scheduled = False
+            self._timer.cancel()
+
+        if self._future:
+            self._future.cancel()
+            self._future = None
+
+    def schedule_checks(self):
+        """Schedule the checks.
+
+        The checks run after the delay, or right away if there is no delay.
+        """
+        if self._delay is None:
+            self.run_checks()
+            return
+
+        self._cancel_checks()
+        self._pending = True
+        self._scheduled = True
+        self._timer.timeout_msec(self._delay, self._start_checks, self._generation)
+
+    def finish_checks(self):
+        """Run the scheduled checks right away.
+
+        Call this method before the results of the checks are used
+        to make sure that they are not outdated.
+        """
+        if self._pending:
+            self.run_checks()
+
+    def _start_checks(self, generation):
+        """Prepare the scheduled checks in the background."""
+        if generation != self._generation:
+            return False
+
+        self._scheduled = False
+
+        # Create the request in the main thread.
+        check_request = self._create_request()
+        checks = [c for c in self.checks if not c.skip]
+
+        self._future = _get_check_executor().submit(self._prepare_checks, checks, check_request)
+        self._future.add_done_callback(
+            lambda future: run_in_loop(self._finish_checks, generation, check_request, future)
+        )
+        return False
+
+    @staticmethod
+    def _prepare_checks(checks, check_request):
+        """Prepare the checks in a background thread."""
+        for check in checks:
+            check.prepare(check_request)
+
+    def _finish_checks(self, generation, check_request, future):
+        """Report results of the scheduled checks in the main thread."""
+        if generation != self._generation or future.cancelled():
+            log.debug("Dropping results of outdated password checks.")
+            return False
+
+        self._future = None
+        self._pending = False
+
+        if future.exception():
+            log.error("Failed to prepare password checks: %s", future.exception())
+
+        self._run_checks(check_request)
+        return False
+
+    def run_checks(self):
+        """Run the checks right away.
+
+        Scheduled checks are cancelled.
+        """
+        self._cancel_checks()
+        self._run_checks(self._create_request())
 
+    def _run_checks(self, check_request):
+        """Run the checks with the given request."""
         # reset the list of failed checks
         self._failed_checks = []
 
@@ -18,7 +18,10 @@
 # Red Hat, Inc.
 #
 import sys
+import threading
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from queue import SimpleQueue
 
 from dasbus.error import DBusError
 
@@ -26,6 +29,7 @@ from pyanaconda.anaconda_loggers import get_module_logger
 from pyanaconda.core import util
 from pyanaconda.core.constants import IPMI_ABORTED
 from pyanaconda.core.signal import Signal
+from pyanaconda.core.timeline import timeline
 from pyanaconda.errors import ERROR_RAISE, errorHandler
 from pyanaconda.flags import flags
 from pyanaconda.modules.common.errors.runtime import ScriptError
@@ -78,7 +82,8 @@ class BaseTask:
         # run the task
         start_timestamp = time.time()
 
-        self._run()
+        with timeline.span(self.name, type(self).__name__):
+            self._run()
 
         done_timestamp = time.time()
         self._elapsed_time = done_timestamp - start_timestamp
@@ -90,19 +95,49 @@ class BaseTask:
         """Run the task - to be overridden by sub-classes."""
         raise NotImplementedError
 
+    def _handle_error(self, exception):
+        """Handle an error of the task.
+
+        The error is handled by the parent task queue if there is one.
+
+        :param exception: an exception to handle
+        :return: a result of the error handler
+        """
+        if self._parent is not None:
+            return self._parent._handle_error(exception)
+
+        return errorHandler.cb(exception)
+
 
 class TaskQueue(BaseTask):
     """TaskQueue represents a queue of TaskQueues or Tasks.
 
     TaskQueues and Tasks can be mixed in a single TaskQueue.
+
+    By default, the items of the queue run one after another. If the queue
+    has more than one worker, an item can run at the same time as other
+    items once the items it requires are completed. Items that share a
+    resource never run at the same time. Items are always started in the
+    order of the queue and their signals are emitted in the same order as
+    if the queue was serial.
     """
 
-    def __init__(self, name, status_message=None, task_category=None):
+    def __init__(self, name, status_message=None, task_category=None, max_workers=1):
         super().__init__(name)
         self._task_category = task_category
         self._status_message = status_message
+        self._max_workers = max_workers
         # the list backing this TaskQueue instance
         self._queue = []
+        # the requirements and resources of the items
+        self._requirements = {}
+        self._resources = {}
+        # the signals of items that have to wait for previous items
+        self._relay_lock = threading.RLock()
+        self._deferred_signals = {}
+        # the thread that runs the items in parallel and its messages
+        self._run_thread = None
+        self._messages = SimpleQueue()
         # triggered if a TaskQueue contained in this one was started/completed
         self.queue_started = Signal()
         self.queue_completed = Signal()
@@ -202,28 +237,219 @@ class TaskQueue(BaseTask):
 
         return message.strip()
 
+    @property
+    def max_workers(self):
+        """The maximal number of items that run at once."""
+        return self._max_workers
+
     def _run(self):
         """Run the task queue."""
+        if self._max_workers > 1 and len(self._queue) > 1:
+            self._run_in_parallel()
+            return
+
         for item in self._queue:
             # start the item (TaskQueue/Task)
             item.start()
 
+    def _get_requirements(self, item):
+        """Get items required by the given item."""
+        requirements = self._requirements[item]
+
+        if requirements is not None:
+            return requirements
+
+        # By default, the item requires the previous item.
+        index = self._queue.index(item)
+        return self._queue[index - 1:index]
+
+    def _is_ready(self, item, pending, running, finished):
+        """Can the item be started?"""
+        if not all(r in finished for r in self._get_requirements(item)):
+            return False
+
+        resources = self._resources[item]
+
+        if not resources:
+            return True
+
+        # Keep the order of items that share a resource.
+        for other in [*running, *pending[:pending.index(item)]]:
+            if resources & self._resources[other]:
+                return False
+
+        return True
+
+    def _run_in_parallel(self):
+        """Run the items of the task queue at once if possible.
+
+        The items run in worker threads, but their errors are handled
+        in the thread that runs the task queue.
+        """
+        pending = list(self._queue)
+        running = {}
+        finished = set()
+        errors = {}
+        start_time = time.monotonic()
+
+        # Defer signals of all items except the first one.
+        with self._relay_lock:
+            self._deferred_signals = {item: [] for item in self._queue[1:]}
+
+        self._run_thread = threading.current_thread()
+        self._messages = SimpleQueue()
+
+        try:
+            with ThreadPoolExecutor(max_workers=self._max_workers) as executor:
+                while pending or running:
+                    # Don't start new items after a failure.
+                    for item in list(pending) if not errors else []:
+                        if len(running) < self._max_workers and \
+                                self._is_ready(item, pending, running, finished):
+                            pending.remove(item)
+                            running[item] = executor.submit(self._run_item, item)
+
+                    if not running:
+                        if pending and not errors:
+                            raise RuntimeError(
+                                "The task queue {} cannot start: {}".format(
+                                    self.name, ", ".join(item.name for item in pending)
+                                )
+                            )
+                        break
+
+                    item, error_request = self._messages.get()
+
+                    if error_request:
+                        self._process_error_request(*error_request)
+                        continue
+
+                    future = running.pop(item)
+                    finished.add(item)
+
+                    if future.exception() is not None:
+                        errors[self._queue.index(item)] = future.exception()
+
+                    self._relay_deferred_signals(finished)
+        finally:
+            self._run_thread = None
+
+        self._relay_deferred_signals(self._queue)
+        self._log_parallel_run(time.monotonic() - start_time)
+
+        # Raise the error of the first failed item.
+        if errors:
+            raise errors[min(errors)]
+
+    def _run_item(self, item):
+        """Run the item in a worker thread."""
+        try:
+            item.start()
+        finally:
+            self._messages.put((item, None))
+
+    def _handle_error(self, exception):
+        """Handle an error of the task queue or its item.
+
+        Errors of items that run in worker threads are sent to the thread
+        that runs the task queue and the worker waits for the result.
+        """
+        if self._run_thread not in (None, threading.current_thread()):
+            result = Future()
+            self._messages.put((None, (exception, result)))
+            return result.result()
+
+        return super()._handle_error(exception)
+
+    def _process_error_request(self, exception, result):
+        """Handle an error sent from a worker thread."""
+        try:
+            result.set_result(super()._handle_error(exception))
+        except BaseException as e:  # pylint: disable=broad-except
+            result.set_exception(e)
+
+    def _relay_signal(self, item, signal, *args):
+        """Emit a signal of the given item or defer it for later."""
+        with self._relay_lock:
+            deferred_signals = self._deferred_signals.get(item)
+
+            if deferred_signals is not None:
+                deferred_signals.append((signal, args))
+                return
+
+            signal.emit(*args)
+
+    def _relay_deferred_signals(self, finished):
+        """Emit deferred signals of items that follow the finished items."""
+        with self._relay_lock:
+            for item in self._queue:
+                deferred_signals = self._deferred_signals.pop(item, [])
+
+                for signal, args in deferred_signals:
+                    signal.emit(*args)
+
+                if item not in finished:
+                    break
+
+    def _log_parallel_run(self, elapsed_time):
+        """Log the critical path and the achieved speedup."""
+        finish_times = {}
+        paths = {}
+
+        for item in self._queue:
+            requirements = self._get_requirements(item)
+            previous = max(requirements, key=finish_times.get, default=None)
+            duration = item.elapsed_time or 0
+
+            finish_times[item] = finish_times.get(previous, 0) + duration
+            paths[item] = paths.get(previous, []) + [item.name]
+
+        last = max(self._queue, key=finish_times.get)
+        serial_time = sum(item.elapsed_time or 0 for item in self._queue)
+
+        log.info(
+            "Task queue %s finished in %.2f s instead of %.2f s (speedup %.2fx). "
+            "Critical path (%.2f s): %s",
+            self.name, elapsed_time, serial_time, serial_time / max(elapsed_time, 1e-6),
+            finish_times[last], " -> ".join(paths[last])
+        )
+
     # implement the Python list "interface" and make sure parent is always
     # set to a correct value
-    def append(self, item):
-        item.started.connect(self.task_started.emit)
-        item.completed.connect(self.task_completed.emit)
+    def append(self, item, requires=None, resources=()):
+        """Append a task or a task queue.
+
+        :param item: a task or a task queue
+        :param requires: a list of items of this queue that have to be
+                         completed first or None for the previous item
+        :param resources: a list of names of resources used by the item
+        """
+        if requires is not None and not all(r in self._queue for r in requires):
+            raise ValueError("The required items are not in the task queue.")
+
+        item.started.connect(lambda *args: self._relay_signal(item, self.task_started, *args))
+        item.completed.connect(lambda *args: self._relay_signal(item, self.task_completed, *args))
 
         if isinstance(item, TaskQueue):
             # connect own start/completion signal to parents queue start/completion signal
-            item.started.connect(self.queue_started.emit)
-            item.completed.connect(self.queue_completed.emit)
+            item.started.connect(
+                lambda *args: self._relay_signal(item, self.queue_started, *args)
+            )
+            item.completed.connect(
+                lambda *args: self._relay_signal(item, self.queue_completed, *args)
+            )
 
             # propagate start/completion signals from nested queues/tasks
-            item.queue_started.connect(self.queue_started.emit)
-            item.queue_completed.connect(self.queue_completed.emit)
+            item.queue_started.connect(
+                lambda *args: self._relay_signal(item, self.queue_started, *args)
+            )
+            item.queue_completed.connect(
+                lambda *args: self._relay_signal(item, self.queue_completed, *args)
+            )
 
         self._queue.append(item)
+        self._requirements[item] = list(requires) if requires is not None else None
+        self._resources[item] = set(resources)
         item.set_parent(self)
 
     def append_dbus_tasks(self, service_id, dbus_tasks):
@@ -267,7 +493,7 @@ class Task(BaseTask):
             self._task_cb(*self._task_args, **self._task_kwargs)
         except Exception as e:  # pylint: disable=broad-except
             # Handle an error.
-            if errorHandler.cb(e) == ERROR_RAISE:
+            if self._handle_error(e) == ERROR_RAISE:
                 raise
 
 
@@ -303,11 +529,11 @@ class DBusTask(BaseTask):
             # Handle a remote error.
             if isinstance(e, ScriptError):
                 flags.ksprompt = True
-                errorHandler.cb(e)
+                self._handle_error(e)
                 util.ipmi_report(IPMI_ABORTED)
                 sys.exit(0)
             else:
-                if errorHandler.cb(e) == ERROR_RAISE:
+                if self._handle_error(e) == ERROR_RAISE:
                     raise
         finally:
             # Disconnect from the signal.
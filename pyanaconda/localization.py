@@ -300,7 +300,7 @@ def get_english_name(locale):
     """
     raise_on_invalid_locale(locale)
 
-    name = langtable.language_name(languageId=locale, languageIdQuery="en")
+    name = _get_language_name(locale, "en")
     return upcase_first_letter(name)
 
 
@@ -315,7 +315,21 @@ def get_native_name(locale):
     """
     raise_on_invalid_locale(locale)
 
-    return langtable.language_name(languageId=locale)
+    return _get_language_name(locale)
+
+
+@functools.lru_cache(4096)
+def _get_language_name(locale, query_locale=None):
+    """Get the name of the locale in the language of the query locale. Cached.
+
+    The language spokes look up names of all locales every time they are
+    shown, so keep them.
+
+    :param str locale: a locale to return the name for
+    :param str query_locale: a language of the name or None for the native name
+    :return str: the name of the locale or an empty string if unknown
+    """
+    return langtable.language_name(languageId=locale, languageIdQuery=query_locale)
 
 
 def get_available_translations(localedir=None):
@@ -395,10 +409,12 @@ def get_territory_locales(territory):
     return langtable.list_locales(territoryId=territory)
 
 
+@functools.cache
 def _build_layout_infos():
-    """Build localized information for keyboard layouts.
+    """Build localized information for keyboard layouts. Cached.
+
+    The returned dictionary is shared, don't modify it.
 
-    :param rxkb_context: RXKB context (e.g., rxkb.Context())
     :return: Dictionary with layouts and their descriptions
     """
     rxkb_context = rxkb.Context()
@@ -555,8 +571,22 @@ def get_xlated_timezone(tz_spec_part):
 
     raise_on_invalid_locale(locale)
 
-    xlated = langtable.timezone_name(tz_spec_part, languageIdQuery=locale)
-    return xlated
+    return _get_xlated_timezone(tz_spec_part, locale)
+
+
+@functools.lru_cache(8192)
+def _get_xlated_timezone(tz_spec_part, locale):
+    """Get the translated name of a timezone part in the given locale. Cached.
+
+    The names are cached per locale, so a change of the locale doesn't
+    return stale translations.  The cache holds all regions, cities and
+    timezones for a few locales.
+
+    :param str tz_spec_part: a region, city or complete timezone name
+    :param str locale: a locale of the translation
+    :return str: the translated name
+    """
+    return langtable.timezone_name(tz_spec_part, languageIdQuery=locale)
 
 
 def get_firmware_language(text_mode=False):
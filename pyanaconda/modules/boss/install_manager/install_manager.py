@@ -18,6 +18,7 @@
 #
 from pyanaconda.anaconda_loggers import get_module_logger
 from pyanaconda.core.dbus import DBus
+from pyanaconda.modules.boss.module_manager.module_observer import activate_modules
 from pyanaconda.modules.common.structures.requirement import Requirement
 
 log = get_module_logger(__name__)
@@ -46,6 +47,9 @@ class InstallManager:
         """
         requirements = []
 
+        # Start the lazy modules on the first use.
+        activate_modules(self._module_observers)
+
         for observer in self._module_observers:
             if not observer.is_service_available:
                 log.warning("Module %s not available!", observer.service_name)
@@ -105,6 +109,9 @@ class InstallManager:
         if not self._module_observers:
             log.error("Starting installation without available modules.")
 
+        # Start the lazy modules on the first use.
+        activate_modules(self._module_observers)
+
         for observer in self._module_observers:
             # FIXME: This check is here for testing purposes only.
             # Normally, all given modules should be available once
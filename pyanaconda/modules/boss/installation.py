@@ -47,12 +47,14 @@ from pyanaconda.core.path import (
 )
 from pyanaconda.core.service import is_service_installed
 from pyanaconda.core.signal import Signal
-from pyanaconda.core.util import execWithRedirect, restorecon
+from pyanaconda.core.timeline import timeline
+from pyanaconda.core.util import restorecon
 from pyanaconda.installation_tasks import DBusTask, Task, TaskQueue
 from pyanaconda.kexec import setup_kexec
 from pyanaconda.modules.boss.install_manager.installation_category_interface import (
     CategoryReportTaskInterface,
 )
+from pyanaconda.modules.boss.log_collector import LogCollector
 from pyanaconda.modules.common.constants.installation import InstallationErrorDialogType
 from pyanaconda.modules.common.constants.objects import (
     BOOTLOADER,
@@ -81,6 +83,14 @@ from pyanaconda.modules.common.util import is_module_available
 log = get_module_logger(__name__)
 
 TARGET_LOG_DIR = "/var/log/anaconda/"
+TIMELINE_FILE = "timeline.json"
+
+# The maximal number of modules that configure the installed system at once.
+CONFIGURATION_WORKERS = 4
+
+# A resource of tasks that enable or disable systemd services.
+RESOURCE_SERVICES = "services"
+
 
 def _writeKS_via_boss():
     boss_proxy = BOSS.get_proxy()
@@ -126,18 +136,27 @@ class CopyLogsTask(InstallationTask):
 
         log.info("Copying logs from the installation environment.")
         self._create_logs_directory()
-        self._copy_tmp_logs()
-        self._copy_lorax_packages()
-        self._copy_pre_script_logs()
-        self._copy_dnf_debugdata()
-        self._copy_post_script_logs()
-        self._dump_journal()
+
+        collector = LogCollector(
+            join_paths(self._sysroot, TARGET_LOG_DIR),
+            compress=conf.target.compress_installation_logs
+        )
+
+        self._copy_tmp_logs(collector)
+        self._copy_lorax_packages(collector)
+        self._copy_pre_script_logs(collector)
+        self._copy_dnf_debugdata(collector)
+        self._copy_post_script_logs(collector)
+        self._dump_journal(collector)
+        collector.collect()
+
+        self._write_timeline()
 
     def _create_logs_directory(self):
         """Create directory for Anaconda logs on the install target"""
         make_directories(join_paths(self._sysroot, TARGET_LOG_DIR))
 
-    def _copy_tmp_logs(self):
+    def _copy_tmp_logs(self, collector):
         """Copy a number of log files from /tmp"""
         log_files_to_copy = [
             "anaconda.log",
@@ -153,46 +172,38 @@ class CopyLogsTask(InstallationTask):
             "dbus.log",
         ]
         for logfile in log_files_to_copy:
-            self._copy_file_to_sysroot(
-                join_paths("/tmp/", logfile),
-                join_paths(TARGET_LOG_DIR, logfile)
-            )
+            collector.add_file(join_paths("/tmp/", logfile), logfile)
 
-    def _copy_lorax_packages(self):
+    def _copy_lorax_packages(self, collector):
         """Copy list of packages used for creating the installation media"""
-        self._copy_file_to_sysroot(
-            "/root/lorax-packages.log",
-            join_paths(TARGET_LOG_DIR, "lorax-packages.log")
-        )
+        collector.add_file("/root/lorax-packages.log", "lorax-packages.log")
 
-    def _copy_pre_script_logs(self):
+    def _copy_pre_script_logs(self, collector):
         """Copy logs from %pre scripts"""
-        self._copy_tree_to_sysroot(
-            "/tmp/pre-anaconda-logs",
-            TARGET_LOG_DIR
-        )
+        collector.add_tree("/tmp/pre-anaconda-logs", "")
 
-    def _copy_dnf_debugdata(self):
+    def _copy_dnf_debugdata(self, collector):
         """Copy DNF debug data"""
-        self._copy_tree_to_sysroot(
-            "/root/debugdata",
-            join_paths(TARGET_LOG_DIR, "dnf_debugdata/")
-        )
+        collector.add_tree("/root/debugdata", "dnf_debugdata/")
 
-    def _copy_post_script_logs(self):
+    def _copy_post_script_logs(self, collector):
         """Copy logs from %post scripts"""
         for logfile in glob.glob("/tmp/ks-script*.log"):
-            self._copy_file_to_sysroot(
-                logfile,
-                join_paths(TARGET_LOG_DIR, os.path.basename(logfile))
-            )
+            collector.add_file(logfile, os.path.basename(logfile))
 
-    def _dump_journal(self):
+    def _dump_journal(self, collector):
         """Dump journal from the installation environment"""
-        tempfile = "/tmp/journal.log"
-        with open_with_perm(tempfile, "w", perm=0o600) as logfile:
-            execWithRedirect("journalctl", ["-b"], stdout=logfile, log_output=False)
-        self._copy_file_to_sysroot(tempfile, join_paths(TARGET_LOG_DIR, "journal.log"))
+        collector.add_command(["journalctl", "-b"], "journal.log")
+
+    def _write_timeline(self):
+        """Write the timeline of the installation as a Chrome trace file"""
+        if not timeline.is_enabled:
+            return
+
+        trace_path = join_paths(self._sysroot, TARGET_LOG_DIR, TIMELINE_FILE)
+
+        if timeline.write_trace(trace_path):
+            log.info("The timeline of the installation is saved to %s.", trace_path)
 
     def _copy_kickstart(self):
         """Copy input kickstart file"""
@@ -221,22 +232,6 @@ class CopyLogsTask(InstallationTask):
             )
             os.chmod(full_dest_path, 0o0600)
 
-    def _copy_tree_to_sysroot(self, src, dest):
-        """Copy a directory tree, if it exists, and set its access bits.
-
-        :param str src: path to source directory
-        :param str dest: path to destination directory within sysroot
-        """
-        if os.path.exists(src):
-            log.info("Copying directory tree: %s -> %s", src, dest)
-            full_dest_path = join_paths(self._sysroot, dest)
-            shutil.copytree(
-                src,
-                full_dest_path,
-                dirs_exist_ok=True
-            )
-            os.chmod(full_dest_path, 0o0600)
-
 
 class SetContextsTask(InstallationTask):
     """Task to set file contexts on target system.
@@ -419,6 +414,35 @@ class RunInstallationTask(InstallationTask):
         """Handle a progress report of a task."""
         self.report_progress(message)
 
+    def _append_configuration_tasks(self, os_config, name, service_id, dbus_tasks, *,
+                                    requires=(), resources=()):
+        """Append tasks that configure the installed system.
+
+        If the configuration can run in parallel, the tasks of the module
+        are wrapped in a task queue with the given requirements and
+        resources. Otherwise, the tasks are appended directly.
+
+        :param TaskQueue os_config: a queue with the configuration tasks
+        :param str name: a name of the task queue of the module
+        :param service_id: an identifier of the DBus module
+        :param dbus_tasks: a list of DBus paths of the tasks
+        :param requires: a list of task queues of other modules to wait for
+        :param resources: a list of names of resources used by the tasks
+        :return: a task queue of the module or None
+        """
+        if os_config.max_workers == 1:
+            os_config.append_dbus_tasks(service_id, dbus_tasks)
+            return None
+
+        module_config = TaskQueue(name, _("Configuring installed system"), CATEGORY_SYSTEM)
+        module_config.append_dbus_tasks(service_id, dbus_tasks)
+        os_config.append(
+            module_config,
+            requires=[r for r in requires if r],
+            resources=resources
+        )
+        return module_config
+
     def _prepare_configuration(self):
         """Prepare queue with tasks configuring installed system."""
         payloads_proxy = PAYLOADS.get_proxy()
@@ -449,42 +473,60 @@ class RunInstallationTask(InstallationTask):
             configuration_queue.append(certificates_import)
 
         # schedule the execute methods of ksdata that require an installed system to be present
+        # the configuration of different modules can run in parallel if allowed
         os_config = TaskQueue(
             "Installed system configuration",
             _("Configuring installed system"),
-            CATEGORY_SYSTEM
+            CATEGORY_SYSTEM,
+            max_workers=CONFIGURATION_WORKERS if conf.target.parallel_configuration else 1
         )
 
         # add installation tasks for the Security DBus module
         if is_module_available(SECURITY):
             security_proxy = SECURITY.get_proxy()
             security_dbus_tasks = security_proxy.InstallWithTasks()
-            os_config.append_dbus_tasks(SECURITY, security_dbus_tasks)
+            self._append_configuration_tasks(
+                os_config, "Security configuration", SECURITY, security_dbus_tasks
+            )
 
         # add installation tasks for the Timezone DBus module
         # run these tasks before tasks of the Services module
+        timezone_config = None
+
         if is_module_available(TIMEZONE):
             timezone_proxy = TIMEZONE.get_proxy()
             timezone_dbus_tasks = timezone_proxy.InstallWithTasks()
-            os_config.append_dbus_tasks(TIMEZONE, timezone_dbus_tasks)
+            timezone_config = self._append_configuration_tasks(
+                os_config, "Timezone configuration", TIMEZONE, timezone_dbus_tasks,
+                resources=[RESOURCE_SERVICES]
+            )
 
         # add installation tasks for the Services DBus module
         if is_module_available(SERVICES):
             services_proxy = SERVICES.get_proxy()
             services_dbus_tasks = services_proxy.InstallWithTasks()
-            os_config.append_dbus_tasks(SERVICES, services_dbus_tasks)
+            self._append_configuration_tasks(
+                os_config, "Services configuration", SERVICES, services_dbus_tasks,
+                requires=[timezone_config], resources=[RESOURCE_SERVICES]
+            )
 
         # add installation tasks for the Localization DBus module
         if is_module_available(LOCALIZATION):
             localization_proxy = LOCALIZATION.get_proxy()
             localization_dbus_tasks = localization_proxy.InstallWithTasks()
-            os_config.append_dbus_tasks(LOCALIZATION, localization_dbus_tasks)
+            self._append_configuration_tasks(
+                os_config, "Localization configuration", LOCALIZATION, localization_dbus_tasks
+            )
 
         # add the Firewall configuration task
+        # it can enable or disable the firewalld service
         if conf.target.can_configure_network:
             firewall_proxy = NETWORK.get_proxy(FIREWALL)
             firewall_dbus_task = firewall_proxy.InstallWithTask()
-            os_config.append_dbus_tasks(NETWORK, [firewall_dbus_task])
+            self._append_configuration_tasks(
+                os_config, "Firewall configuration", NETWORK, [firewall_dbus_task],
+                resources=[RESOURCE_SERVICES]
+            )
 
         configuration_queue.append(os_config)
 
@@ -16,6 +16,8 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 #
+from concurrent.futures import ThreadPoolExecutor
+
 from pykickstart.errors import KickstartError
 from pykickstart.version import makeVersion
 
@@ -24,6 +26,7 @@ from pyanaconda.modules.boss.kickstart_manager.parser import (
     VALID_SECTIONS_ANACONDA,
     SplitKickstartParser,
 )
+from pyanaconda.modules.boss.module_manager.module_observer import activate_modules
 from pyanaconda.modules.common.constants.services import BOSS
 from pyanaconda.modules.common.structures.kickstart import (
     KickstartMessage,
@@ -40,6 +43,7 @@ class KickstartManager:
 
     def __init__(self):
         self._module_observers = []
+        self._kickstart_ownership = {}
 
     @property
     def module_observers(self):
@@ -77,27 +81,83 @@ class KickstartManager:
         parser = SplitKickstartParser(handler, valid_sections=VALID_SECTIONS_ANACONDA)
         return parser.split(path)
 
-    def _distribute_to_modules(self, elements):
-        """Distribute split kickstart to modules synchronously.
+    def _get_available_observers(self):
+        """Get observers of available modules."""
+        observers = []
 
-        :returns: list of (Line number, Message) errors reported by modules when
-                  distributing kickstart
-        :rtype: list of kickstart reports
-        """
-        reports = []
+        # Start the lazy modules on the first use.
+        activate_modules(self._module_observers)
 
         for observer in self._module_observers:
             if not observer.is_service_available:
                 log.warning("Module %s not available!", observer.service_name)
                 continue
 
-            commands = observer.proxy.KickstartCommands
-            sections = observer.proxy.KickstartSections
-            addons = observer.proxy.KickstartAddons
+            observers.append(observer)
+
+        return observers
+
+    @staticmethod
+    def _call_modules(function, observers, *arguments):
+        """Call the given function for all observers at once.
 
+        The D-Bus calls of the function are synchronous, so every
+        observer is handled in a separate thread. The proxies of the
+        observers are created in the calling thread before any job
+        is submitted.
+
+        :param function: a function that accepts a module proxy and
+                         the items of the given arguments
+        :param observers: a list of module observers
+        :param arguments: lists of additional arguments for the observers
+        :return: a list of results in the order of the observers
+        """
+        proxies = [observer.proxy for observer in observers]
+
+        if len(proxies) < 2:
+            return list(map(function, proxies, *arguments))
+
+        with ThreadPoolExecutor(max_workers=len(proxies)) as executor:
+            return list(executor.map(function, proxies, *arguments))
+
+    def _get_kickstart_ownership(self, observers):
+        """Get kickstart commands, sections and addons handled by modules.
+
+        The values don't change, so they are read only once per module.
+
+        :param observers: a list of module observers
+        :return: a list of tuples with commands, sections and addons
+        """
+        missing = [o for o in observers if o.service_name not in self._kickstart_ownership]
+
+        for observer, ownership in zip(missing, self._call_modules(self._read_ownership, missing)):
             log.info("%s handles commands %s sections %s addons %s.",
-                     observer.service_name, commands, sections, addons)
+                     observer.service_name, *ownership)
+
+            self._kickstart_ownership[observer.service_name] = ownership
+
+        return [self._kickstart_ownership[o.service_name] for o in observers]
+
+    @staticmethod
+    def _read_ownership(proxy):
+        """Read kickstart commands, sections and addons handled by the module."""
+        return proxy.KickstartCommands, proxy.KickstartSections, proxy.KickstartAddons
 
+    def _distribute_to_modules(self, elements):
+        """Distribute split kickstart to modules.
+
+        The kickstart is split in the order of the modules and then
+        sent to all modules at once.
+
+        :returns: list of (Line number, Message) errors reported by modules when
+                  distributing kickstart
+        :rtype: list of kickstart reports
+        """
+        observers = self._get_available_observers()
+        ownership = self._get_kickstart_ownership(observers)
+        requests = []
+
+        for observer, (commands, sections, addons) in zip(observers, ownership):
             module_elements = elements.get_and_process_elements(
                 commands=commands,
                 sections=sections,
@@ -112,14 +172,22 @@ class KickstartManager:
                 log.info("There are no kickstart data for %s.", observer.service_name)
                 continue
 
-            module_report = KickstartReport.from_structure(
-                observer.proxy.ReadKickstart(module_kickstart)
-            )
-
             line_references = elements.get_references_from_elements(
                 module_elements
             )
 
+            requests.append((observer, module_kickstart, line_references))
+
+        reports = []
+        results = self._call_modules(
+            lambda proxy, module_kickstart: proxy.ReadKickstart(module_kickstart),
+            [observer for observer, _module_kickstart, _line_references in requests],
+            [module_kickstart for _observer, module_kickstart, _line_references in requests],
+        )
+
+        for (observer, _module_kickstart, line_references), result in zip(requests, results):
+            module_report = KickstartReport.from_structure(result)
+
             for message in module_report.get_messages():
                 line_number, file_name = line_references[message.line_number]
                 message.line_number = line_number
@@ -145,22 +213,13 @@ class KickstartManager:
         return self._merge_module_kickstarts(kickstarts)
 
     def _generate_from_modules(self):
-        """Generate kickstart from modules.
+        """Generate kickstart from all modules at once.
 
         :return: a map of module names and kickstart strings
         """
-        result = {}
-
-        for observer in self._module_observers:
-            if not observer.is_service_available:
-                log.warning("Module %s not available!", observer.service_name)
-                continue
-
-            module_name = observer.service_name
-            module_kickstart = observer.proxy.GenerateKickstart()
-            result[module_name] = module_kickstart
-
-        return result
+        observers = self._get_available_observers()
+        kickstarts = self._call_modules(lambda proxy: proxy.GenerateKickstart(), observers)
+        return {o.service_name: ks for o, ks in zip(observers, kickstarts)}
 
     def _merge_module_kickstarts(self, module_kickstarts):
         """Merge kickstart from modules
@@ -0,0 +1,254 @@
+#
+# Copyright (C) 2026  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 31 Milk Street #960789 Boston, MA
+# 02196 USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+
+from pyanaconda.anaconda_loggers import get_module_logger
+from pyanaconda.core.path import join_paths, make_directories, open_with_perm
+from pyanaconda.core.util import startProgram
+
+try:
+    from compression import zstd
+except ImportError:
+    # The zstd module is available since Python 3.14.
+    zstd = None
+
+__all__ = ["LogCollector"]
+
+log = get_module_logger(__name__)
+
+# The size of a chunk of data read from a log.
+LOG_CHUNK_SIZE = 1024 * 1024
+
+# The maximal number of logs that are collected at once.
+LOG_COPY_WORKERS = 4
+
+# The maximal size of all collected logs before compression.
+LOG_SIZE_BUDGET = 512 * 1024 * 1024
+
+# The maximal size of the end of a log that is kept in the memory.
+LOG_TAIL_SIZE = 4 * 1024 * 1024
+
+# The marker of a log that doesn't fit into the size budget.
+TRUNCATION_MARKER = "\n[The log is truncated. The installation logs exceeded {} bytes.]\n"
+
+
+class LogCollector:
+    """Collector of installation logs.
+
+    Files and outputs of programs are added to the collector first and
+    then collected at once. The data are streamed to the destination
+    directory, so they are never stored in /tmp. Only the end of a log
+    is kept in the memory.
+
+    The total size of the collected logs is limited by a size budget.
+    A log that doesn't fit into the budget is truncated in the middle
+    and a truncation marker is written in place of the missing data.
+    A part of the budget is reserved for the end of the log, because
+    the last messages are usually the most important ones.
+    """
+
+    def __init__(self, dest_dir, *, compress=False, budget=LOG_SIZE_BUDGET,
+                 tail=LOG_TAIL_SIZE, workers=LOG_COPY_WORKERS):
+        """Create a new collector.
+
+        :param str dest_dir: a path to the destination directory
+        :param bool compress: should the logs be compressed with zstd?
+        :param int budget: the maximal size of the collected logs in bytes
+        :param int tail: the size reserved for the end of a log in bytes
+        :param int workers: the maximal number of logs collected at once
+        """
+        self._dest_dir = dest_dir
+        self._compress = compress and self._is_compression_supported()
+        self._budget = budget
+        self._remaining = budget
+        self._tail = tail
+        self._workers = workers
+        self._lock = threading.Lock()
+        self._files = []
+        self._commands = []
+        self._trees = []
+
+    @staticmethod
+    def _is_compression_supported():
+        """Is the zstd compression supported?"""
+        if zstd is None:
+            log.warning("The zstd compression is not supported. "
+                        "The installation logs will not be compressed.")
+            return False
+
+        return True
+
+    def add_file(self, src, dest):
+        """Add a file, if it exists.
+
+        :param str src: a path to the source file
+        :param str dest: a path to the destination file within the directory
+        """
+        if os.path.isfile(src):
+            self._files.append((src, dest))
+
+    def add_tree(self, src, dest):
+        """Add all files of a directory tree, if it exists.
+
+        :param str src: a path to the source directory
+        :param str dest: a path to the destination directory within the directory
+        """
+        if not os.path.isdir(src):
+            return
+
+        for root, _dirs, files in os.walk(src):
+            for name in sorted(files):
+                path = os.path.join(root, name)
+                self.add_file(path, join_paths(dest, os.path.relpath(path, src)))
+
+        self._trees.append(dest)
+
+    def add_command(self, argv, dest):
+        """Add the output of a command.
+
+        :param argv: the command to run and its arguments
+        :param str dest: a path to the destination file within the directory
+        """
+        self._commands.append((argv, dest))
+
+    def collect(self):
+        """Collect the added logs.
+
+        All files are collected before the outputs of commands are
+        saved, so the budget is spent on the logs of the installer first.
+
+        :return: a number of collected bytes before compression
+        """
+        start = time.monotonic()
+        jobs = [(self._copy_file, *f) for f in self._files]
+        jobs += [(self._save_output, *c) for c in self._commands]
+
+        for dest_dir in sorted({os.path.dirname(dest) for _job, _src, dest in jobs}):
+            make_directories(join_paths(self._dest_dir, dest_dir))
+
+        self._run_jobs(jobs[:len(self._files)])
+        self._run_jobs(jobs[len(self._files):])
+
+        for dest in self._trees:
+            os.chmod(join_paths(self._dest_dir, dest), 0o0600)
+
+        size = self._budget - self._remaining
+        log.info("Collected %d installation logs (%d bytes) in %.2f s.",
+                 len(jobs), size, time.monotonic() - start)
+
+        return size
+
+    def _run_jobs(self, jobs):
+        """Run the given jobs and wait for them to finish."""
+        with ThreadPoolExecutor(max_workers=self._workers) as executor:
+            futures = [executor.submit(job, src, dest) for job, src, dest in jobs]
+
+        for future in futures:
+            future.result()
+
+    def _copy_file(self, src, dest):
+        """Copy a file."""
+        log.info("Copying file: %s -> %s", src, dest)
+
+        with open(src, "rb") as f:
+            self._write_log(f.read, dest)
+
+    def _save_output(self, argv, dest):
+        """Save the output of a command."""
+        log.info("Saving output: %s -> %s", " ".join(argv), dest)
+
+        with startProgram(argv) as process:
+            try:
+                self._write_log(process.stdout.read, dest)
+            except BaseException:
+                process.kill()
+                raise
+
+    def _write_log(self, read, dest):
+        """Write a log to the destination within the size budget.
+
+        The end of the log is buffered in the memory and written once
+        the whole log is read. The rest of the log is written only if
+        it fits into the budget.
+
+        :param read: a function that reads a chunk of the log
+        :param str dest: a path to the destination file within the directory
+        """
+        path = join_paths(self._dest_dir, dest)
+        tail_size = self._take_budget(self._tail)
+        tail = bytearray()
+        truncated = False
+
+        if self._compress:
+            path += ".zst"
+
+        with open_with_perm(path, "wb", 0o600) as f, self._open_output(f) as output:
+            while True:
+                chunk = read(LOG_CHUNK_SIZE)
+
+                if not chunk:
+                    break
+
+                tail += chunk
+
+                if len(tail) <= tail_size:
+                    continue
+
+                head = tail[:len(tail) - tail_size]
+                del tail[:len(head)]
+
+                if truncated:
+                    continue
+
+                size = self._take_budget(len(head))
+                output.write(head[:size])
+
+                if size < len(head):
+                    log.warning("The log %s is truncated.", dest)
+                    output.write(TRUNCATION_MARKER.format(self._budget).encode())
+                    truncated = True
+
+            output.write(tail)
+
+        self._return_budget(tail_size - len(tail))
+
+    def _open_output(self, f):
+        """Open the output of the file."""
+        if self._compress:
+            return zstd.ZstdFile(f, "w")
+
+        return nullcontext(f)
+
+    def _take_budget(self, size):
+        """Take the given number of bytes from the budget.
+
+        :return: a number of bytes that can be written
+        """
+        with self._lock:
+            size = min(size, self._remaining)
+            self._remaining -= size
+            return size
+
+    def _return_budget(self, size):
+        """Return the given number of unused bytes to the budget."""
+        with self._lock:
+            self._remaining += size
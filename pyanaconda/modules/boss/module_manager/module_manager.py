@@ -30,6 +30,7 @@ class ModuleManager:
 
     def __init__(self):
         self._module_observers = []
+        self._locale = None
         self.module_observers_changed = Signal()
 
     @property
@@ -40,6 +41,11 @@ class ModuleManager:
     def set_module_observers(self, observers):
         """Set the module observers."""
         self._module_observers = observers
+
+        for observer in observers:
+            if observer.is_lazy:
+                observer.service_available.connect(self._set_module_locale)
+
         self.module_observers_changed.emit(self._module_observers)
 
     def start_modules_with_task(self):
@@ -49,6 +55,7 @@ class ModuleManager:
             activatable=conf.anaconda.activatable_modules,
             forbidden=conf.anaconda.forbidden_modules,
             optional=conf.anaconda.optional_modules,
+            lazy=conf.anaconda.lazy_modules,
         )
         task.succeeded_signal.connect(
             lambda: self.set_module_observers(task.get_result())
@@ -58,12 +65,15 @@ class ModuleManager:
     def get_service_names(self):
         """Get service names of running modules.
 
+        Lazy modules are included, because they are started
+        on the first use.
+
         :return: a list of service names
         """
         names = []
 
         for observer in self.module_observers:
-            if not observer.is_service_available:
+            if not observer.is_service_available and not observer.is_lazy:
                 continue
 
             names.append(observer.service_name)
@@ -76,12 +86,24 @@ class ModuleManager:
         :param str locale: locale to set
         """
         log.info("Setting locale of all modules to %s.", locale)
+        self._locale = locale
+
         for observer in self.module_observers:
             if not observer.is_service_available:
-                log.warning("%s is not available when setting locale", observer)
+                # The locale of a lazy module is set once it is started.
+                if not observer.is_lazy:
+                    log.warning("%s is not available when setting locale", observer)
                 continue
             observer.proxy.SetLocale(locale)
 
+    def _set_module_locale(self, observer):
+        """Set the locale of a lazy module once it is started."""
+        if not self._locale:
+            return
+
+        log.debug("Setting locale of %s to %s.", observer, self._locale)
+        observer.proxy.SetLocale(self._locale)
+
     def stop_modules(self):
         """Tell all running modules to quit."""
         log.debug("Stop modules.")
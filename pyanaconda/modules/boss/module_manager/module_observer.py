@@ -15,25 +15,73 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 #
 from dasbus.client.observer import DBusObserver, DBusObserverError
+from dasbus.constants import DBUS_FLAG_NONE
+from dasbus.error import DBusError
 from dasbus.namespace import get_dbus_name, get_dbus_path, get_namespace_from_name
 
 from pyanaconda.anaconda_loggers import get_module_logger
+from pyanaconda.core.glib import create_main_loop, create_new_context
 from pyanaconda.modules.common.constants.namespaces import ADDONS_NAMESPACE
 
 log = get_module_logger(__name__)
 
 
+def activate_modules(module_observers):
+    """Start the lazy modules and wait for them.
+
+    The modules are started at once and asynchronously. The replies
+    are processed in a new main context, so the main loop doesn't
+    handle other requests while we wait for the modules.
+
+    :param module_observers: a list of module observers
+    """
+    module_observers = [
+        o for o in module_observers if o.is_lazy and not o.is_service_available
+    ]
+
+    if not module_observers:
+        return
+
+    context = create_new_context()
+    loop = create_main_loop(context)
+    pending = set()
+
+    def _on_activated(observer):
+        pending.discard(observer)
+
+        if not pending:
+            loop.quit()
+
+    context.push_thread_default()
+
+    try:
+        for observer in module_observers:
+            pending.add(observer)
+
+            if not observer.activate(callback=_on_activated):
+                pending.discard(observer)
+
+        if pending:
+            loop.run()
+    finally:
+        context.pop_thread_default()
+
+
 class ModuleObserver(DBusObserver):
     """Observer of an Anaconda module."""
 
-    def __init__(self, message_bus, service_name):
+    def __init__(self, message_bus, service_name, is_lazy=False):
         """Creates a module observer.
 
         :param message_bus: a message bus
         :param service_name: a DBus name of a service
+        :param is_lazy: should the module be started on the first use?
         """
         super().__init__(message_bus, service_name)
         self._proxy = None
+        self._is_lazy = is_lazy
+        self._is_activated = False
+        self._activation_callbacks = None
         self._is_addon = service_name.startswith(get_dbus_name(*ADDONS_NAMESPACE))
         self._namespace = get_namespace_from_name(service_name)
         self._object_path = get_dbus_path(*self._namespace)
@@ -46,10 +94,86 @@ class ModuleObserver(DBusObserver):
         """
         return self._is_addon
 
+    @property
+    def is_lazy(self):
+        """Is the observed module started on the first use?
+
+        The module might be already starting in the background.
+        It is started on the first use only if it isn't available yet.
+
+        :return: True or False
+        """
+        return self._is_lazy
+
+    @property
+    def is_service_available(self):
+        """Is the service available?
+
+        A lazy module is available once it is activated, even if the
+        observer hasn't been notified about the service by DBus yet.
+
+        :return: True or False
+        """
+        return self._is_activated or super().is_service_available
+
+    def activate(self, callback=None):
+        """Start the observed module if it is lazy and not available yet.
+
+        The module is started asynchronously. The callback is called
+        with the observer once the module is started or has failed to
+        start. A failure of the lazy module is not fatal, the module
+        will just stay unavailable.
+
+        :param callback: a function that accepts the observer or None
+        :return: True if the module is starting, otherwise False
+        """
+        if not self._is_lazy or self.is_service_available:
+            return False
+
+        # The module is already starting.
+        if self._activation_callbacks is not None:
+            self._activation_callbacks.append(callback)
+            return True
+
+        log.debug("Starting %s on the first use.", self._service_name)
+        self._activation_callbacks = [callback]
+
+        self._message_bus.proxy.StartServiceByName(
+            self._service_name,
+            DBUS_FLAG_NONE,
+            callback=self._activate_callback
+        )
+        return True
+
+    def _activate_callback(self, call):
+        """Callback for the StartServiceByName method."""
+        callbacks, self._activation_callbacks = self._activation_callbacks, None
+
+        try:
+            call()
+        except DBusError as e:
+            log.warning("Service %s has failed to start: %s", self._service_name, e)
+            self.set_failed()
+        else:
+            self._proxy = None
+            self._is_activated = True
+            self.service_available.emit(self)
+
+        for callback in filter(None, callbacks):
+            callback(self)
+
+    def set_failed(self):
+        """Mark the lazy module as failed to start.
+
+        The module is not started on the first use anymore
+        and it is not reported as a running module.
+        """
+        self._is_lazy = False
+
     @property
     def proxy(self):
         """Returns a proxy of the remote object."""
-        if not self._is_service_available:
+        if not self.is_service_available:
             raise DBusObserverError("Service {} is not available."
                                     .format(self._service_name))
 
@@ -67,6 +191,7 @@ class ModuleObserver(DBusObserver):
     def _disable_service(self):
         """Disable the service"""
         self._proxy = None
+        self._is_activated = False
         super()._disable_service()
 
     def __repr__(self):
@@ -16,12 +16,14 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 #
+import time
 from functools import partial
 from queue import SimpleQueue
 
 from dasbus.constants import DBUS_FLAG_NONE, DBUS_START_REPLY_SUCCESS
 
 from pyanaconda.anaconda_loggers import get_module_logger
+from pyanaconda.core.timeline import timeline
 from pyanaconda.modules.boss.module_manager.module_observer import ModuleObserver
 from pyanaconda.modules.common.errors.module import UnavailableModuleError
 from pyanaconda.modules.common.task import Task
@@ -37,9 +39,14 @@ class StartModulesTask(Task):
     The timeout service_start_timeout from the Anaconda bus
     configuration file is applied by default when the DBus
     method StartServiceByName is called.
+
+    The modules are started at once and every module is processed
+    as soon as it is ready. Optional modules that are activated
+    lazily are not started by the task. They are started on the
+    first use.
     """
 
-    def __init__(self, message_bus, activatable, forbidden, optional):
+    def __init__(self, message_bus, activatable, forbidden, optional, lazy=()):
         """Create a new task.
 
         Anaconda modules are specified by their full DBus name or a prefix
@@ -49,14 +56,18 @@ class StartModulesTask(Task):
         :param activatable: a list of modules that can be activated.
         :param forbidden: a list of modules that are are not allowed to run
         :param optional: a list of modules that are optional
+        :param lazy: a list of optional modules that are started on the first use
         """
         super().__init__()
         self._message_bus = message_bus
         self._activatable = activatable
         self._forbidden = forbidden
         self._optional = optional
+        self._lazy = lazy
         self._module_observers = []
         self._callbacks = SimpleQueue()
+        self._start_times = {}
+        self._latencies = {}
 
     @property
     def name(self):
@@ -70,12 +81,24 @@ class StartModulesTask(Task):
         """
         # Collect the modules.
         self._module_observers = self._find_modules()
+        started = [o for o in self._module_observers if not o.is_lazy]
+
+        # Watch the lazy modules.
+        self._watch_lazy_modules(self._module_observers)
 
         # Asynchronously start the modules.
-        self._start_modules(self._module_observers)
+        self._start_modules(started)
 
         # Process the callbacks of the asynchronous calls.
-        self._process_callbacks(self._module_observers)
+        self._process_callbacks(started)
+
+        # Keep only modules that are available or lazy.
+        self._module_observers = [
+            o for o in self._module_observers if o.is_lazy or o in started
+        ]
+
+        # Log the startup latencies.
+        self._log_latencies()
 
         return self._module_observers
 
@@ -114,20 +137,38 @@ class StartModulesTask(Task):
                 )
                 continue
 
+            # Only optional modules can be started lazily.
+            is_lazy = self._match_module(service_name, self._optional) \
+                and self._match_module(service_name, self._lazy)
+
             log.debug("Found %s.", service_name)
             modules.append(ModuleObserver(
                 self._message_bus,
                 service_name,
+                is_lazy=is_lazy
             ))
 
         return modules
 
+    def _watch_lazy_modules(self, module_observers):
+        """Watch the lazy modules.
+
+        The lazy modules become available once they are started.
+        """
+        for observer in module_observers:
+            if not observer.is_lazy:
+                continue
+
+            log.debug("Skip %s. The module will be started on the first use.", observer)
+            observer.connect_once_available()
+
     def _start_modules(self, module_observers):
         """Start the modules."""
         dbus = self._message_bus.proxy
 
         for observer in module_observers:
             log.debug("Starting %s.", observer)
+            self._start_times[observer] = time.time()
 
             dbus.StartServiceByName(
                 observer.service_name,
@@ -167,8 +208,31 @@ class StartModulesTask(Task):
         """Handler for the service_available signal."""
         log.debug("%s is available.", observer)
         observer.proxy.Ping()
+        self._record_latency(observer)
         return True
 
+    def _record_latency(self, observer):
+        """Record the startup latency of the module."""
+        start = self._start_times.get(observer)
+
+        if start is None:
+            return
+
+        end = time.time()
+        self._latencies[observer] = end - start
+        timeline.record(observer.service_name, "module", start, end)
+        log.debug("%s is ready in %.2f s.", observer, end - start)
+
+    def _log_latencies(self):
+        """Log the startup latencies of the modules."""
+        if not self._latencies:
+            return
+
+        latencies = sorted(self._latencies.items(), key=lambda item: item[1], reverse=True)
+        log.info("Modules are ready in %.2f s: %s", latencies[0][1], ", ".join(
+            "{} ({:.2f} s)".format(observer, latency) for observer, latency in latencies
+        ))
+
     def _process_callbacks(self, module_observers):
         """Process callbacks of the asynchronous calls.
 
@@ -65,7 +65,17 @@ class LiveImageConfigurationData(DBusData):
 
     @property
     def checksum(self) -> Str:
-        """The sha256 checksum of the image file.
+        """The checksum of the image file.
+
+        The checksum can be prefixed with the name of the algorithm,
+        for example sha512:<digest>. Supported algorithms:
+
+            sha256
+            sha512
+            blake2b
+
+        Without the prefix, sha512 is used for digests with 128
+        characters and sha256 for other digests.
 
         :return: a string with the checksum
         """
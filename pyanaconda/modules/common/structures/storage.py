@@ -19,7 +19,13 @@
 from dasbus.structure import DBusData
 from dasbus.typing import *  # pylint: disable=wildcard-import
 
-__all__ = ["DeviceActionData", "DeviceData", "DeviceFormatData", "OSData"]
+__all__ = [
+    "DeviceActionData",
+    "DeviceData",
+    "DeviceFormatData",
+    "DeviceTreeSnapshotData",
+    "OSData",
+]
 
 
 class DeviceData(DBusData):
@@ -319,6 +325,85 @@ class DeviceFormatData(DBusData):
         self._description = text
 
 
+class DeviceTreeSnapshotData(DBusData):
+    """Data of all devices in the device tree."""
+
+    def __init__(self):
+        self._generation = 0
+        self._devices = []
+        self._formats = []
+        self._size_limits = {}
+        self._free_space = {}
+
+    @property
+    def generation(self) -> UInt64:
+        """A generation of the device tree.
+
+        The generation changes with every change
+        of the device tree.
+
+        :return: a number
+        """
+        return self._generation
+
+    @generation.setter
+    def generation(self, value: UInt64):
+        self._generation = value
+
+    @property
+    def devices(self) -> List[DeviceData]:
+        """Data of all devices in the device tree.
+
+        :return: a list of device data
+        """
+        return self._devices
+
+    @devices.setter
+    def devices(self, devices: List[DeviceData]):
+        self._devices = devices
+
+    @property
+    def formats(self) -> List[DeviceFormatData]:
+        """Data of formats of all devices in the device tree.
+
+        The formats are in the same order as the devices.
+
+        :return: a list of format data
+        """
+        return self._formats
+
+    @formats.setter
+    def formats(self, formats: List[DeviceFormatData]):
+        self._formats = formats
+
+    @property
+    def size_limits(self) -> Dict[Str, Tuple[UInt64, UInt64]]:
+        """Size limits of devices.
+
+        The size limits are provided only by device
+        trees that support resizing of devices.
+
+        :return: a dictionary of device IDs and min and max sizes in bytes
+        """
+        return self._size_limits
+
+    @size_limits.setter
+    def size_limits(self, size_limits: Dict[Str, Tuple[UInt64, UInt64]]):
+        self._size_limits = size_limits
+
+    @property
+    def free_space(self) -> Dict[Str, UInt64]:
+        """Free space on disks.
+
+        :return: a dictionary of disk IDs and free spaces in bytes
+        """
+        return self._free_space
+
+    @free_space.setter
+    def free_space(self, free_space: Dict[Str, UInt64]):
+        self._free_space = free_space
+
+
 class DeviceActionData(DBusData):
     """Device action data."""
 
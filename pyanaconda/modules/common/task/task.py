@@ -28,6 +28,7 @@ from dasbus.server.publishable import Publishable
 from pyanaconda.anaconda_loggers import get_module_logger
 from pyanaconda.core.constants import THREAD_DBUS_TASK
 from pyanaconda.core.threads import thread_manager
+from pyanaconda.core.timeline import timeline
 from pyanaconda.modules.common.errors.task import NoResultError
 from pyanaconda.modules.common.task.cancellable import Cancellable
 from pyanaconda.modules.common.task.progress import ProgressReporter
@@ -107,7 +108,9 @@ class Task(AbstractTask):
             return
 
         log.info(self.name)
-        self._set_result(self.run())
+
+        with timeline.span(self.name, "DBusTask", module=type(self).__module__):
+            self._set_result(self.run())
 
     def _task_succeeded_callback(self):
         """Callback for a successful task.
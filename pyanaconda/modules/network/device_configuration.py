@@ -93,6 +93,11 @@ class DeviceConfigurations:
     Configurations correspond to NetworkManager persistent connections by
     their uuid.
 
+    Configurations are indexed by device name and connection uuid so that
+    the lookups don't need to scan all of them on hosts with hundreds of
+    devices and connections.  The indexes must be updated whenever a
+    configuration is added, attached or removed.
+
     signals:
         configurations_changed - Provides list of changes - tuples containing
                                  NetworkDeviceConfiguration objects with old and new
@@ -112,12 +117,20 @@ class DeviceConfigurations:
 
     def __init__(self, nm_client=None):
         self._device_configurations = None
+        self._last_serial = 0
+        self._serials = {}
+        self._by_device = {}
+        self._by_uuid = {}
         self.nm_client = nm_client or NM.Client.new()
         self.configurations_changed = Signal()
 
     def reload(self):
         """Reload the state from the system."""
-        self._device_configurations = []
+        self._device_configurations = {}
+        self._last_serial = 0
+        self._serials = {}
+        self._by_device = {}
+        self._by_uuid = {}
         for device in self.nm_client.get_devices():
             self.add_device(device)
         for connection in self.nm_client.get_connections():
@@ -153,7 +166,7 @@ class DeviceConfigurations:
             new_dev_cfg.connection_uuid = connection_uuid
         if device_type is not None:
             new_dev_cfg.device_type = device_type
-        self._device_configurations.append(new_dev_cfg)
+        self._add_cfg(new_dev_cfg)
         log.debug("added %s", new_dev_cfg)
         self.configurations_changed.emit([(NetworkDeviceConfiguration(), new_dev_cfg)])
 
@@ -163,13 +176,65 @@ class DeviceConfigurations:
             return
         old_dev_cfg = copy.deepcopy(dev_cfg)
         if device_name:
-            dev_cfg.device_name = device_name
+            self._set_device_name(dev_cfg, device_name)
             log.debug("attached device name to %s", dev_cfg)
         if connection_uuid:
-            dev_cfg.connection_uuid = connection_uuid
+            self._set_connection_uuid(dev_cfg, connection_uuid)
             log.debug("attached connection uuid to %s", dev_cfg)
         self.configurations_changed.emit([(old_dev_cfg, dev_cfg)])
 
+    def _add_cfg(self, cfg):
+        """Store and index a new configuration."""
+        self._last_serial += 1
+        serial = self._last_serial
+        self._device_configurations[serial] = cfg
+        self._serials[id(cfg)] = serial
+        self._index(self._by_device, cfg.device_name, serial)
+        self._index(self._by_uuid, cfg.connection_uuid, serial)
+
+    def _remove_cfg(self, cfg):
+        """Remove the configuration and its index entries."""
+        serial = self._serials.pop(id(cfg))
+        self._unindex(self._by_device, cfg.device_name, serial)
+        self._unindex(self._by_uuid, cfg.connection_uuid, serial)
+        del self._device_configurations[serial]
+
+    def _set_device_name(self, cfg, device_name):
+        """Set the device name of the configuration and reindex it."""
+        serial = self._serials[id(cfg)]
+        self._unindex(self._by_device, cfg.device_name, serial)
+        cfg.device_name = device_name
+        self._index(self._by_device, cfg.device_name, serial)
+
+    def _set_connection_uuid(self, cfg, connection_uuid):
+        """Set the connection uuid of the configuration and reindex it."""
+        serial = self._serials[id(cfg)]
+        self._unindex(self._by_uuid, cfg.connection_uuid, serial)
+        cfg.connection_uuid = connection_uuid
+        self._index(self._by_uuid, cfg.connection_uuid, serial)
+
+    @staticmethod
+    def _index(index, key, serial):
+        """Add the serial number of a configuration to the index."""
+        index.setdefault(key, set()).add(serial)
+
+    @staticmethod
+    def _unindex(index, key, serial):
+        """Remove the serial number of a configuration from the index."""
+        serials = index[key]
+        serials.discard(serial)
+
+        if not serials:
+            del index[key]
+
+    def _get_indexed(self, index, key):
+        """Get configurations with the given key from the index.
+
+        The configurations are returned in the order they were added in,
+        the same as if all configurations were scanned.
+        """
+        return [self._device_configurations[s] for s in sorted(index.get(key, ()))]
+
     def _should_add_device(self, device):
         """Should the network device be added ?
 
@@ -453,15 +518,13 @@ class DeviceConfigurations:
         return True
 
     def get_for_device(self, device_name):
-        return [cfg for cfg in self._device_configurations
-                if cfg.device_name == device_name]
+        return self._get_indexed(self._by_device, device_name)
 
     def get_for_uuid(self, connection_uuid):
-        return [cfg for cfg in self._device_configurations
-                if cfg.connection_uuid == connection_uuid]
+        return self._get_indexed(self._by_uuid, connection_uuid)
 
     def get_all(self):
-        return list(self._device_configurations)
+        return list(self._device_configurations.values())
 
     def _device_added_cb(self, client, device, *args):
         # We need to wait for valid state before adding the device
@@ -486,12 +549,12 @@ class DeviceConfigurations:
         for cfg in dev_cfgs:
             if cfg.connection_uuid and cfg.device_type in virtual_device_types:
                 old_cfg = copy.deepcopy(cfg)
-                cfg.device_name = ""
+                self._set_device_name(cfg, "")
                 self.configurations_changed.emit([(old_cfg, cfg)])
                 log.debug("device name %s removed from %s", iface, cfg)
             else:
                 empty_cfg = NetworkDeviceConfiguration()
-                self._device_configurations.remove(cfg)
+                self._remove_cfg(cfg)
                 self.configurations_changed.emit([(cfg, empty_cfg)])
                 log.debug("%s removed", cfg)
 
@@ -519,17 +582,17 @@ class DeviceConfigurations:
         for cfg in dev_cfgs:
             if cfg.device_name:
                 old_cfg = copy.deepcopy(cfg)
-                cfg.connection_uuid = ""
+                self._set_connection_uuid(cfg, "")
                 self.configurations_changed.emit([(old_cfg, cfg)])
                 log.debug("connection uuid %s removed from %s", uuid, cfg)
             else:
                 empty_cfg = NetworkDeviceConfiguration()
-                self._device_configurations.remove(cfg)
+                self._remove_cfg(cfg)
                 self.configurations_changed.emit([(cfg, empty_cfg)])
                 log.debug("%s removed", cfg)
 
     def __str__(self):
-        return str(self._device_configurations)
+        return str(self.get_all())
 
     def __repr__(self):
         return "DeviceConfigurations({})".format(self.nm_client)
@@ -155,27 +155,60 @@ def get_vlan_interface_name_from_connection(nm_client, connection):
     return iface
 
 
+def get_device_hwaddr(device):
+    """Get the hardware address identifying the device.
+
+    The permanent address is preferred for ethernet and wireless devices.
+
+    :param device: NetworkManager device object
+    :type device: NMDevice
+    :return: hardware address or None
+    :rtype: str
+    """
+    if device.get_device_type() in (NM.DeviceType.ETHERNET,
+                                    NM.DeviceType.WIFI):
+        try:
+            address = device.get_permanent_hw_address()
+            if not address:
+                address = device.get_hw_address()
+        except AttributeError as e:
+            log.warning("Device %s: %s", device.get_iface(), e)
+            address = device.get_hw_address()
+    else:
+        address = device.get_hw_address()
+    # per #1703152, at least in *some* case, we wind up with
+    # address as None here, so we need to guard against that
+    return address or None
+
+
 def get_iface_from_hwaddr(nm_client, hwaddr):
     """Find the name of device specified by mac address."""
     for device in nm_client.get_devices():
-        if device.get_device_type() in (NM.DeviceType.ETHERNET,
-                                        NM.DeviceType.WIFI):
-            try:
-                address = device.get_permanent_hw_address()
-                if not address:
-                    address = device.get_hw_address()
-            except AttributeError as e:
-                log.warning("Device %s: %s", device.get_iface(), e)
-                address = device.get_hw_address()
-        else:
-            address = device.get_hw_address()
-        # per #1703152, at least in *some* case, we wind up with
-        # address as None here, so we need to guard against that
+        address = get_device_hwaddr(device)
         if address and address.upper() == hwaddr.upper():
             return device.get_iface()
     return None
 
 
+def get_ifaces_by_hwaddr(nm_client):
+    """Map mac addresses of all devices to their names.
+
+    Use it instead of get_iface_from_hwaddr to look up many addresses.
+
+    :param nm_client: instance of NetworkManager client
+    :type nm_client: NM.Client
+    :return: names of devices by upper case mac addresses
+    :rtype: dict(str, str)
+    """
+    ifaces = {}
+    for device in nm_client.get_devices():
+        address = get_device_hwaddr(device)
+        if address:
+            # Keep the first device, the same as get_iface_from_hwaddr.
+            ifaces.setdefault(address.upper(), device.get_iface())
+    return ifaces
+
+
 def get_team_port_config_from_connection(nm_client, uuid):
     connection = nm_client.get_connection_by_uuid(uuid)
     if not connection:
@@ -1405,6 +1438,9 @@ def get_config_file_connection_of_device(nm_client, device_name, device_hwaddr=N
     """
 
     cons = []
+    # Look up names of devices by mac addresses only if needed.
+    ifaces_by_hwaddr = None
+
     for con in nm_client.get_connections():
 
         filename = con.get_filename() or ""
@@ -1434,7 +1470,9 @@ def get_config_file_connection_of_device(nm_client, device_name, device_hwaddr=N
                     if device_hwaddr.upper() == mac_address.upper():
                         cons.append(con)
                 else:
-                    iface = get_iface_from_hwaddr(nm_client, mac_address)
+                    if ifaces_by_hwaddr is None:
+                        ifaces_by_hwaddr = get_ifaces_by_hwaddr(nm_client)
+                    iface = ifaces_by_hwaddr.get(mac_address.upper())
                     if iface == device_name:
                         cons.append(con)
             elif is_s390():
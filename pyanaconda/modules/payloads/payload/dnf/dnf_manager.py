@@ -18,12 +18,11 @@
 # Red Hat, Inc.
 #
 import multiprocessing
-import os
 import re
 import shutil
-import tempfile
 import threading
 import traceback
+from collections import OrderedDict
 
 import libdnf5
 from blivet.size import Size
@@ -56,12 +55,16 @@ from pyanaconda.modules.common.structures.payload import RepoConfigurationData
 from pyanaconda.modules.common.structures.validation import ValidationReport
 from pyanaconda.modules.payloads.constants import DNF_REPO_DIRS
 from pyanaconda.modules.payloads.payload.dnf.download_progress import DownloadProgress
+from pyanaconda.modules.payloads.payload.dnf.metadata_cache import MetadataCache
+from pyanaconda.modules.payloads.payload.dnf.repomd import (
+    RepomdFetcher,
+    RepomdSource,
+)
 from pyanaconda.modules.payloads.payload.dnf.transaction_progress import (
     TransactionProgress,
     process_transaction_progress,
 )
 from pyanaconda.modules.payloads.payload.dnf.utils import (
-    calculate_hash,
     get_group_package_types,
     get_product_release_version,
     transaction_has_errors,
@@ -72,6 +75,9 @@ log = get_module_logger(__name__)
 DNF_CACHE_DIR = '/tmp/dnf.cache'
 DNF_PLUGINCONF_DIR = '/tmp/dnf.pluginconf'
 
+# The maximal number of remembered resolutions of the software selection.
+DNF_RESOLVED_SELECTIONS = 8
+
 # Bonus to required free space which depends on block size and
 # rpm database size estimation. Every file could be aligned to
 # fragment size so 4KiB * number_of_files should be a worst case
@@ -107,10 +113,17 @@ class DNFManager:
         self._lock = threading.RLock()
 
         self._transaction = None
+        self._selection_specs = []
+        self._pending_specs = []
+        self._applied_excludes = set()
+        self._resolved_selections = OrderedDict()
         self._ignore_missing_packages = False
         self._ignore_broken_packages = False
         self._download_location = None
         self._md_hashes = {}
+        self._fetched_md_hashes = None
+        self._repomd_fetcher = RepomdFetcher()
+        self._metadata_cache = MetadataCache()
         self._enabled_system_repositories = []
         self._repositories_loaded = False
         self._query_environments = None
@@ -201,10 +214,15 @@ class DNFManager:
         self.__goal = None
         self.__goal_skip_unavailable = None
         self._transaction = None
+        self._selection_specs = []
+        self._pending_specs = []
+        self._applied_excludes = set()
+        self._resolved_selections = OrderedDict()
         self._ignore_missing_packages = False
         self._ignore_broken_packages = False
         self._download_location = None
         self._md_hashes = {}
+        self._fetched_md_hashes = None
         self._enabled_system_repositories = []
         self._repositories_loaded = False
         self._query_environments = None
@@ -547,7 +565,10 @@ class DNFManager:
         return total_space
 
     def clear_cache(self):
-        """Clear the DNF cache."""
+        """Clear the DNF cache.
+
+        The persistent cache of repository metadata is kept.
+        """
         self.clear_selection()
         self._enabled_system_repositories = []
         shutil.rmtree(DNF_CACHE_DIR, ignore_errors=True)
@@ -592,9 +613,38 @@ class DNFManager:
     def apply_specs(self, include_list, exclude_list):
         """Mark packages, groups and modules for installation.
 
+        If the same selection has been already resolved, the specs are
+        not applied until the selection has to be resolved again.
+
         :param include_list: a list of specs for inclusion
         :param exclude_list: a list of specs for exclusion
         """
+        specs = (tuple(include_list), tuple(exclude_list))
+        self._selection_specs.append(specs)
+        self._pending_specs.append(specs)
+
+        if self._get_selection_key() in self._resolved_selections:
+            log.debug("The software selection has been already resolved.")
+            return
+
+        self._apply_pending_specs()
+
+    def _apply_pending_specs(self):
+        """Apply specs that haven't been applied yet."""
+        for include_list, exclude_list in self._pending_specs:
+            self._apply_specs(include_list, exclude_list)
+
+        self._pending_specs = []
+
+    def _apply_specs(self, include_list, exclude_list):
+        """Mark packages, groups and modules for installation.
+
+        :param include_list: a list of specs for inclusion
+        :param exclude_list: a list of specs for exclusion
+        """
+        # The excludes stay in the base until it is reset.
+        self._applied_excludes.update(exclude_list)
+
         environment_excludes = []
         group_excludes = []
         package_excludes = []
@@ -632,7 +682,63 @@ class DNFManager:
             self._goal.add_install(spec, settings)
             self._goal_skip_unavailable.add_install(spec, settings)
 
+    def _get_selection_key(self):
+        """Get a key of the current software selection.
+
+        The key identifies the selected specs and the configuration
+        of the DNF base that affects the resolution. The excludes are
+        never removed from the base, so the key identifies also all
+        excludes that will be applied when the selection is resolved.
+        """
+        config = self._base.get_config()
+        excludes = set(self._applied_excludes)
+
+        for _include_list, exclude_list in self._selection_specs:
+            excludes.update(exclude_list)
+
+        return (
+            tuple(self._selection_specs),
+            tuple(sorted(excludes)),
+            config.skip_unavailable,
+            config.skip_broken,
+            config.install_weak_deps,
+            config.multilib_policy,
+        )
+
     def resolve_selection(self):
+        """Resolve the software selection.
+
+        The results are remembered for the last resolved selections.
+        If the selection has been already resolved with the current
+        metadata, the remembered result is used.
+        """
+        key = self._get_selection_key()
+
+        if key in self._resolved_selections:
+            self._resolved_selections.move_to_end(key)
+            self._transaction, report = self._resolved_selections[key]
+            log.debug("Using the resolved software selection: %s", report)
+            return self._copy_report(report)
+
+        self._apply_pending_specs()
+        report = self._resolve_selection()
+
+        self._resolved_selections[key] = (self._transaction, self._copy_report(report))
+
+        while len(self._resolved_selections) > DNF_RESOLVED_SELECTIONS:
+            self._resolved_selections.popitem(last=False)
+
+        return report
+
+    @staticmethod
+    def _copy_report(report):
+        """Create a copy of the validation report."""
+        copy = ValidationReport()
+        copy.error_messages = list(report.error_messages)
+        copy.warning_messages = list(report.warning_messages)
+        return copy
+
+    def _resolve_selection(self):
         """Resolve the software selection."""
         report = ValidationReport()
         messages = []
@@ -701,7 +807,10 @@ class DNFManager:
     def clear_selection(self):
         """Clear the software selection."""
         self.__goal = None
+        self.__goal_skip_unavailable = None
         self._transaction = None
+        self._selection_specs = []
+        self._pending_specs = []
         log.debug("The software selection has been cleared.")
 
     @property
@@ -1113,6 +1222,8 @@ class DNFManager:
 
         Can be called only once per each RepoSack.
         """
+        self._restore_metadata()
+
         repo_sack = self._base.get_repo_sack()
         try:
             repo_sack.load_repos(False)
@@ -1120,11 +1231,57 @@ class DNFManager:
             log.warning(str(e))
             raise MetadataError(str(e)) from None
         self._repositories_loaded = True
+        self._resolved_selections.clear()
         log.info("Loaded repositories.")
 
+        self._store_metadata()
+
+    def _restore_metadata(self):
+        """Restore the cached metadata of enabled repositories.
+
+        The metadata is restored only for repositories with unchanged
+        repomd.xml files, so they don't have to be downloaded again.
+        The fetched hashes are reused by load_repomd_hashes.
+        """
+        self._fetched_md_hashes = None
+
+        if self._metadata_cache.is_empty():
+            return
+
+        repositories = libdnf5.repo.RepoQuery(self._base)
+        repositories.filter_enabled(True)
+        repositories = [repo for repo in repositories if repo.get_config().baseurl]
+
+        if not repositories:
+            return
+
+        md_hashes = self._get_repomd_hashes()
+
+        for repo in repositories:
+            self._metadata_cache.restore(md_hashes[repo.get_id()], repo.get_cachedir())
+
+        self._fetched_md_hashes = md_hashes
+
+    def _store_metadata(self):
+        """Store the metadata of enabled repositories in the cache."""
+        repositories = libdnf5.repo.RepoQuery(self._base)
+        repositories.filter_enabled(True)
+
+        for repo in repositories:
+            self._metadata_cache.store(repo.get_cachedir())
+
     def load_repomd_hashes(self):
-        """Load a hash of the repomd.xml file for each enabled repository."""
-        self._md_hashes = self._get_repomd_hashes()
+        """Load a hash of the repomd.xml file for each enabled repository.
+
+        The hashes fetched while loading the repositories are used if
+        they are available, so the files are not downloaded again.
+        """
+        md_hashes, self._fetched_md_hashes = self._fetched_md_hashes, None
+
+        if md_hashes is None:
+            md_hashes = self._get_repomd_hashes()
+
+        self._md_hashes = md_hashes
 
     def verify_repomd_hashes(self):
         """Verify a hash of the repomd.xml file for each enabled repository.
@@ -1144,32 +1301,54 @@ class DNFManager:
         """
         repositories = libdnf5.repo.RepoQuery(self._base)
         repositories.filter_enabled(True)
-        md_hashes = {}
-
-        for repo in repositories:
-            content = self._get_repomd_content(repo)
-            md_hash = calculate_hash(content) if content else None
-            md_hashes[repo.get_id()] = md_hash
+        sources = [self._get_repomd_source(repo) for repo in repositories]
 
+        md_hashes = self._repomd_fetcher.get_hashes(sources)
         log.debug("Loaded repomd.xml hashes: %s", md_hashes)
         return md_hashes
 
-    def _get_repomd_content(self, repo):
-        """Get a content of a repomd.xml file.
+    def _get_repomd_source(self, repo):
+        """Get a source of a repomd.xml file.
+
+        The proxy and SSL configuration of the repository is described
+        by RepoConfigurationData, so the file is downloaded the same way
+        as other files of repositories.
 
         :param repo: a DNF repo
-        :return: a content of the repomd.xml file
+        :return: an instance of RepomdSource
         """
-        for baseurl in repo.get_config().baseurl:
-            repomd_file = tempfile.NamedTemporaryFile(prefix="repomd-", delete=True, delete_on_close=False)
-            downloader = libdnf5.repo.FileDownloader(self._base)
-            downloader.add(repo, os.path.join(baseurl, "repodata/repomd.xml"), repomd_file.name)
+        config = repo.get_config()
+        base_config = self._base.get_config()
+
+        data = RepoConfigurationData()
+        data.name = repo.get_id()
+        data.ssl_verification_enabled = config.sslverify
+
+        proxy_url = config.proxy or base_config.proxy
+
+        if proxy_url:
             try:
-                downloader.download()
-            except (libdnf5.exception.Error, libdnf5.exception.NonLibdnf5Exception) as e:
-                log.debug("Can't download repomd.xml: %s", str(e))
-                continue
-            with open(repomd_file.name, encoding="utf-8") as f:
-                return f.read()
-
-        return ""
+                data.proxy = ProxyString(
+                    url=proxy_url,
+                    username=config.proxy_username or base_config.proxy_username or None,
+                    password=config.proxy_password or base_config.proxy_password or None,
+                ).url
+            except ProxyStringError as e:
+                log.debug("Failed to parse the proxy '%s': %s", proxy_url, e)
+
+        if config.sslverify and config.sslcacert:
+            data.ssl_configuration.ca_cert_path = config.sslcacert.removeprefix("file://")
+
+        if config.sslclientcert:
+            data.ssl_configuration.client_cert_path = \
+                config.sslclientcert.removeprefix("file://")
+
+        if config.sslclientkey:
+            data.ssl_configuration.client_key_path = \
+                config.sslclientkey.removeprefix("file://")
+
+        return RepomdSource(
+            repo_id=repo.get_id(),
+            baseurls=config.baseurl,
+            data=data,
+        )
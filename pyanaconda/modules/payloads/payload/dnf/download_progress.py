@@ -27,6 +27,12 @@ log = get_module_logger(__name__)
 
 __all__ = ["DownloadProgress"]
 
+# The minimal time between two measurements of the download rate in seconds.
+RATE_INTERVAL = 1
+
+# The weight of the last measurement of the download rate.
+RATE_SMOOTHING = 0.3
+
 
 def paced(fn):
     """Execute `fn` no more often then every 2 seconds."""
@@ -39,8 +45,25 @@ def paced(fn):
     return paced_fn
 
 
+def format_time(seconds):
+    """Format the given number of seconds as [H:]MM:SS."""
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+
+    if hours:
+        return "{}:{:02d}:{:02d}".format(hours, minutes, seconds)
+
+    return "{:02d}:{:02d}".format(minutes, seconds)
+
+
 class DownloadProgress(libdnf5.repo.DownloadCallbacks):
-    """The class for receiving information about an ongoing download."""
+    """The class for receiving information about an ongoing download.
+
+    The downloads are stored in slots indexed by the user data of the
+    callbacks and the downloaded size is updated with the difference
+    of every progress tick, so the accounting doesn't depend on the
+    number of packages in the transaction.
+    """
 
     def __init__(self, callback):
         """Create a new instance.
@@ -49,12 +72,16 @@ class DownloadProgress(libdnf5.repo.DownloadCallbacks):
         """
         super().__init__()
         self.callback = callback
-        self.user_cb_data_container = []  # Hold references to user_cb_data
+        self.user_cb_data_container = []  # Hold descriptions indexed by user_cb_data
         self.last_time = time.time()  # Used to pace _report_progress
         self.total_files = 0
-        self.total_size = Size(0)
-        self.downloads = {}  # Hold number of bytes downloaded for each nevra
+        self.total_size = 0
+        self.downloads = []  # Hold number of bytes downloaded indexed by user_cb_data
         self.downloaded_size = 0
+        self.failed_files = 0
+        self._rate = None
+        self._rate_time = time.monotonic()
+        self._rate_size = 0
 
     def add_new_download(self, user_data, description, total_to_download):
         """Notify the client that a new download has been created.
@@ -65,8 +92,9 @@ class DownloadProgress(libdnf5.repo.DownloadCallbacks):
         :return: associated user data for the new package download
         """
         self.user_cb_data_container.append(description)
+        self.downloads.append(0)
         self.total_files += 1
-        self.total_size += total_to_download
+        self.total_size += int(total_to_download)
         log.debug("Started downloading '%s' - %s bytes", description, total_to_download)
         self._report_progress()
         return len(self.user_cb_data_container) - 1
@@ -78,8 +106,9 @@ class DownloadProgress(libdnf5.repo.DownloadCallbacks):
         :param float total_to_download: a total number of bytes to download
         :param float downloaded: a number of bytes downloaded
         """
-        nevra = self.user_cb_data_container[user_cb_data]
-        self.downloads[nevra] = downloaded
+        downloaded = int(downloaded)
+        self.downloaded_size += downloaded - self.downloads[user_cb_data]
+        self.downloads[user_cb_data] = downloaded
 
         if total_to_download > 0:
             self._report_progress()
@@ -102,25 +131,78 @@ class DownloadProgress(libdnf5.repo.DownloadCallbacks):
             log.debug("Skipping to download '%s': %s", nevra, msg)
             self._report_progress()
         else:
+            self.failed_files += 1
             log.warning("Failed to download '%s': %s", nevra, msg)
+            self._report_progress()
 
         return 0  # Not used, but int is expected to be returned.
 
+    @property
+    def rate(self):
+        """The download rate in bytes per second or None if unknown."""
+        return self._rate
+
+    @property
+    def time_left(self):
+        """The estimated time to finish the download in seconds or None if unknown."""
+        if not self._rate:
+            return None
+
+        return max(self.total_size - self.downloaded_size, 0) / self._rate
+
+    def _update_rate(self):
+        """Update the smoothed download rate."""
+        now = time.monotonic()
+        elapsed = now - self._rate_time
+
+        if elapsed < RATE_INTERVAL:
+            return
+
+        rate = (self.downloaded_size - self._rate_size) / elapsed
+
+        if self._rate is None:
+            self._rate = rate
+        else:
+            self._rate = RATE_SMOOTHING * rate + (1 - RATE_SMOOTHING) * self._rate
+
+        self._rate_time = now
+        self._rate_size = self.downloaded_size
+
     @paced
     def _report_progress(self):
-        # Update the downloaded size.
-        self.downloaded_size = Size(sum(self.downloads.values()))
+        # Update the download rate.
+        self._update_rate()
 
         # Report the progress.
-        msg = _(
-            'Downloading {total_files} RPMs, '
-            '{downloaded_size} / {total_size} '
-            '({total_percent}%) done.'
-        ).format(
-            downloaded_size=self.downloaded_size,
-            total_percent=int(100 * int(self.downloaded_size) / int(self.total_size)),
-            total_files=self.total_files,
-            total_size=self.total_size
-        )
+        values = {
+            "downloaded_size": Size(self.downloaded_size),
+            "total_percent": int(100 * self.downloaded_size / self.total_size)
+            if self.total_size else 0,
+            "total_files": self.total_files,
+            "total_size": Size(self.total_size),
+        }
+
+        if self._rate:
+            msg = _(
+                'Downloading {total_files} RPMs, '
+                '{downloaded_size} / {total_size} '
+                '({total_percent}%) done, '
+                '{rate}/s, {time_left} left.'
+            ).format(
+                rate=Size(int(self._rate)),
+                time_left=format_time(self.time_left),
+                **values
+            )
+        else:
+            msg = _(
+                'Downloading {total_files} RPMs, '
+                '{downloaded_size} / {total_size} '
+                '({total_percent}%) done.'
+            ).format(**values)
+
+        if self.failed_files:
+            msg += " " + _(
+                "Failed to download {failed_files} RPMs."
+            ).format(failed_files=self.failed_files)
 
         self.callback(msg)
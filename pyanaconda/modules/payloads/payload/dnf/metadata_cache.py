@@ -0,0 +1,212 @@
+#
+# Copyright (C) 2026  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 31 Milk Street #960789 Boston, MA
+# 02196 USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+import os
+import shutil
+import threading
+
+from blivet.size import Size
+
+from pyanaconda.anaconda_loggers import get_module_logger
+from pyanaconda.modules.payloads.payload.dnf.utils import calculate_hash
+
+log = get_module_logger(__name__)
+
+__all__ = ["MetadataCache"]
+
+# The directory with the cached metadata. It is not removed with the DNF cache.
+DNF_METADATA_CACHE_DIR = "/tmp/dnf.metadata"
+
+# The maximal size of the cached metadata. The cache directory is usually
+# in RAM in the installation environment, so keep it small.
+METADATA_CACHE_SIZE = Size("64 MiB")
+
+# Content of a repo cache directory that is not cached.
+METADATA_CACHE_EXCLUDES = ["packages"]
+
+# The path to the repomd.xml file in a repo cache directory.
+REPOMD_PATH = "repodata/repomd.xml"
+
+
+class MetadataCache:
+    """The persistent cache of repository metadata.
+
+    The downloaded metadata and the solv files of a repository are
+    stored under the hash of its repomd.xml file, so they can be reused
+    by any repository with the same repomd.xml file, even after the DNF
+    cache has been cleared. The cached metadata is copied back to the
+    cache directory of the repository before the repository is loaded
+    and DNF will find it there.
+
+    The files are copied between the cache and the repo cache
+    directories, so DNF can't modify the cached files.
+
+    The size of the cache is limited. The least recently used entries
+    are removed first.
+    """
+
+    def __init__(self, path=DNF_METADATA_CACHE_DIR, max_size=METADATA_CACHE_SIZE):
+        """Create a new metadata cache.
+
+        :param str path: a path to the cache directory
+        :param Size max_size: a maximal size of the cache
+        """
+        self._path = path
+        self._max_size = max_size
+        self._lock = threading.Lock()
+
+    def _get_entry_path(self, md_hash):
+        """Get a path to the cache entry for the given repomd hash."""
+        return os.path.join(self._path, md_hash.hex())
+
+    @staticmethod
+    def get_repomd_hash(cache_dir):
+        """Get a hash of the repomd.xml file in the repo cache directory.
+
+        :param str cache_dir: a path to the repo cache directory
+        :return: a hash of the repomd.xml file or None
+        """
+        try:
+            with open(os.path.join(cache_dir, REPOMD_PATH), encoding="utf-8") as f:
+                content = f.read()
+        except (OSError, UnicodeDecodeError):
+            return None
+
+        return calculate_hash(content) if content else None
+
+    def is_empty(self):
+        """Is the cache empty?
+
+        :return: True if there are no cached metadata, otherwise False
+        """
+        with self._lock:
+            return not any(self._get_entries())
+
+    def _get_entries(self):
+        """Generate the directory entries of the cached metadata."""
+        if not os.path.isdir(self._path):
+            return
+
+        for entry in os.scandir(self._path):
+            if entry.is_dir(follow_symlinks=False) and not entry.name.endswith(".tmp"):
+                yield entry
+
+    def restore(self, md_hash, cache_dir):
+        """Restore the cached metadata of a repository.
+
+        The existing repo cache directory is never replaced.
+
+        :param bytes md_hash: a hash of the repomd.xml file
+        :param str cache_dir: a path to the repo cache directory
+        :return: True if the metadata was restored, otherwise False
+        """
+        if not md_hash or os.path.exists(cache_dir):
+            return False
+
+        with self._lock:
+            entry_path = self._get_entry_path(md_hash)
+
+            if not os.path.isdir(entry_path):
+                return False
+
+            try:
+                shutil.copytree(
+                    entry_path,
+                    cache_dir,
+                    symlinks=True,
+                )
+                # Mark the entry as recently used.
+                os.utime(entry_path)
+            except OSError as e:
+                log.warning("Failed to restore the cached metadata: %s", e)
+                shutil.rmtree(cache_dir, ignore_errors=True)
+                return False
+
+        log.debug("Restored the cached metadata of %s.", cache_dir)
+        return True
+
+    def store(self, cache_dir):
+        """Store the metadata of a repository.
+
+        :param str cache_dir: a path to the repo cache directory
+        :return: True if the metadata was stored, otherwise False
+        """
+        md_hash = self.get_repomd_hash(cache_dir)
+
+        if not md_hash:
+            return False
+
+        with self._lock:
+            entry_path = self._get_entry_path(md_hash)
+
+            if os.path.isdir(entry_path):
+                os.utime(entry_path)
+                return True
+
+            temporary_path = entry_path + ".tmp"
+
+            try:
+                shutil.rmtree(temporary_path, ignore_errors=True)
+                shutil.copytree(
+                    cache_dir,
+                    temporary_path,
+                    symlinks=True,
+                    ignore=shutil.ignore_patterns(*METADATA_CACHE_EXCLUDES),
+                )
+                os.rename(temporary_path, entry_path)
+            except OSError as e:
+                log.warning("Failed to cache the metadata: %s", e)
+                shutil.rmtree(temporary_path, ignore_errors=True)
+                return False
+
+            self._evict_entries()
+
+        log.debug("Cached the metadata of %s.", cache_dir)
+        return True
+
+    def _evict_entries(self):
+        """Remove the least recently used entries if the cache is too big."""
+        entries = []
+
+        for entry in self._get_entries():
+            entries.append((entry.stat().st_mtime, self._get_size(entry.path), entry.path))
+
+        entries.sort()
+        total_size = sum(size for _mtime, size, _path in entries)
+
+        # Keep at least the newest entry.
+        for _mtime, size, path in entries[:-1]:
+            if total_size <= self._max_size:
+                break
+
+            log.debug("Removing the cached metadata %s.", path)
+            shutil.rmtree(path, ignore_errors=True)
+            total_size -= size
+
+    @staticmethod
+    def _get_size(path):
+        """Get a size of the directory."""
+        size = 0
+
+        for root, _dirs, files in os.walk(path):
+            for name in files:
+                try:
+                    size += os.lstat(os.path.join(root, name)).st_size
+                except OSError:
+                    pass
+
+        return size
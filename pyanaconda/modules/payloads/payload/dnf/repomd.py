@@ -0,0 +1,232 @@
+#
+# Copyright (C) 2026  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 31 Milk Street #960789 Boston, MA
+# 02196 USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from pyanaconda.anaconda_loggers import get_module_logger
+from pyanaconda.core.constants import NETWORK_CONNECTION_TIMEOUT
+from pyanaconda.core.util import requests_session
+from pyanaconda.modules.common.structures.payload import RepoConfigurationData
+from pyanaconda.modules.payloads.base.utils import get_downloader_for_repo_configuration
+from pyanaconda.modules.payloads.payload.dnf.utils import calculate_hash
+
+log = get_module_logger(__name__)
+
+__all__ = ["RepomdFetcher", "RepomdSource"]
+
+# The maximal number of repomd.xml files that are downloaded at once.
+REPOMD_WORKERS = 16
+
+# The maximal time to get the repomd.xml file of one repository in seconds.
+REPOMD_TIMEOUT = NETWORK_CONNECTION_TIMEOUT
+
+
+class RepomdSource:
+    """Where and how to download the repomd.xml file of a repository."""
+
+    def __init__(self, repo_id, baseurls, data=None):
+        """Create a new source.
+
+        :param str repo_id: an id of the repository
+        :param baseurls: a list of base URLs of the repository
+        :param RepoConfigurationData data: a configuration of the proxy and SSL or None
+        """
+        self.repo_id = repo_id
+        self.baseurls = list(baseurls)
+        self.data = data or RepoConfigurationData()
+
+    def get_urls(self):
+        """Get a list of URLs of the repomd.xml file."""
+        return [os.path.join(url, "repodata/repomd.xml") for url in self.baseurls]
+
+
+class RepomdFetcher:
+    """Get hashes of the repomd.xml files of repositories.
+
+    The repomd.xml files of all repositories are downloaded at once
+    and kept in memory. The base URLs of a repository are tried in the
+    configured order and the first successful response wins, so the
+    hash of a repository comes from the same mirror every time.
+
+    The ETag and Last-Modified headers of the responses are cached, so
+    the next requests for the same files are conditional. If a file
+    hasn't changed, the server doesn't send it again and the cached hash
+    is used instead.
+    """
+
+    def __init__(self, workers=REPOMD_WORKERS, timeout=REPOMD_TIMEOUT):
+        """Create a new fetcher.
+
+        :param int workers: a maximal number of files downloaded at once
+        :param int timeout: a maximal time to get one file in seconds
+        """
+        self._workers = workers
+        self._timeout = timeout
+        self._lock = threading.Lock()
+        self._cache = {}
+
+    def clear_cache(self):
+        """Forget the cached responses."""
+        with self._lock:
+            self._cache = {}
+
+    def get_hashes(self, sources):
+        """Get hashes of the repomd.xml files.
+
+        :param sources: a list of repomd sources
+        :return: a dictionary of repo ids and repomd.xml hashes or None
+        """
+        md_hashes = {source.repo_id: None for source in sources}
+        sources = [source for source in sources if source.baseurls]
+
+        if not sources:
+            return md_hashes
+
+        session = requests_session()
+        adapter = HTTPAdapter(pool_maxsize=self._workers)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+
+        executor = ThreadPoolExecutor(max_workers=min(self._workers, len(sources)))
+        futures = {
+            executor.submit(self._fetch_repo_hash, session, source): source
+            for source in sources
+        }
+
+        # All repositories are fetched at once, so they share the deadline.
+        pending = {source.repo_id for source in sources}
+
+        try:
+            for future in as_completed(futures, timeout=self._get_deadline(sources)):
+                repo_id = futures[future].repo_id
+                md_hashes[repo_id] = future.result()
+                pending.discard(repo_id)
+
+        except FutureTimeoutError:
+            log.debug("Timed out fetching repomd.xml of: %s", ", ".join(sorted(pending)))
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+            self._close_session_when_done(session, futures)
+
+        return md_hashes
+
+    @staticmethod
+    def _close_session_when_done(session, futures):
+        """Close the session once all requests are finished.
+
+        The requests that are still in progress are not waited for,
+        so the session is closed by the last of them.
+        """
+        lock = threading.Lock()
+        remaining = set(futures)
+
+        def _on_done(future):
+            with lock:
+                remaining.discard(future)
+
+                if remaining:
+                    return
+
+            log.debug("Closing the session for repomd.xml files.")
+            session.close()
+
+        for future in futures:
+            future.add_done_callback(_on_done)
+
+    def _get_deadline(self, sources):
+        """Get the maximal time to get all files in seconds."""
+        rounds = -(-len(sources) // self._workers)
+        mirrors = max(len(source.baseurls) for source in sources)
+        return self._timeout * rounds * mirrors
+
+    def _fetch_repo_hash(self, session, source):
+        """Get the hash of the repomd.xml file from the first working base URL.
+
+        :return: a hash of the file or None
+        """
+        downloader = get_downloader_for_repo_configuration(session, source.data)
+
+        for url in source.get_urls():
+            md_hash = self._fetch_hash(downloader, url)
+
+            if md_hash:
+                return md_hash
+
+        return None
+
+    @staticmethod
+    def _get_cache_key(downloader, url):
+        """Get a key of the cached response for the given URL.
+
+        The network settings are part of the key, so a response isn't
+        reused if the repository is reached in a different way.
+        """
+        settings = downloader.keywords
+        proxies = tuple(sorted(settings["proxies"].items()))
+        return url, proxies, str(settings["verify"]), str(settings["cert"])
+
+    def _fetch_hash(self, downloader, url):
+        """Download the repomd.xml file and calculate its hash.
+
+        :param downloader: a configured session.get method
+        :param str url: a URL of the repomd.xml file
+        :return: a hash of the file or None
+        """
+        key = self._get_cache_key(downloader, url)
+
+        with self._lock:
+            cached = self._cache.get(key)
+
+        headers = dict(downloader.keywords["headers"])
+
+        if cached and cached["etag"]:
+            headers["If-None-Match"] = cached["etag"]
+
+        if cached and cached["last_modified"]:
+            headers["If-Modified-Since"] = cached["last_modified"]
+
+        try:
+            with downloader(url=url, headers=headers, timeout=self._timeout) as response:
+                if response.status_code == 304 and cached:
+                    log.debug("The repomd.xml file at %s hasn't changed.", url)
+                    return cached["hash"]
+
+                response.raise_for_status()
+                content = response.content.decode("utf-8", "replace")
+                validators = response.headers
+        except (requests.exceptions.RequestException, ValueError) as e:
+            # The file adapter raises ValueError for invalid URLs.
+            log.debug("Can't download repomd.xml from %s: %s", url, e)
+            return None
+
+        md_hash = calculate_hash(content) if content else None
+
+        if md_hash and (validators.get("etag") or validators.get("last-modified")):
+            with self._lock:
+                self._cache[key] = {
+                    "etag": validators.get("etag"),
+                    "last_modified": validators.get("last-modified"),
+                    "hash": md_hash,
+                }
+
+        return md_hash
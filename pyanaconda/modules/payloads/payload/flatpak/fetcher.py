@@ -0,0 +1,222 @@
+#
+# Copyright (C) 2026  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 31 Milk Street #960789 Boston, MA
+# 02196 USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+import hashlib
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from blivet.size import Size
+
+from pyanaconda.anaconda_loggers import get_module_logger
+from pyanaconda.core.i18n import _
+from pyanaconda.modules.common.errors.payload import SourceSetupError
+
+log = get_module_logger(__name__)
+
+__all__ = ["BlobFetcher"]
+
+# The size of a chunk that is read from a response at once.
+FETCH_CHUNK_SIZE = 1024 * 1024
+
+# The number of blobs that are downloaded at once.
+FETCH_WORKERS = 4
+
+
+class BlobFetcher:
+    """Download blobs of an OCI image layout.
+
+    The blobs are identified by their SHA-256 digests, so a blob shared
+    by several images is downloaded only once. The blobs are downloaded
+    at once over a pool of connections and streamed to temporary files.
+    The digests are verified during the download and a blob is moved to
+    the layout only if its digest matches.
+
+    Blobs that are already present in the layout are not downloaded again.
+    """
+
+    def __init__(self, downloader, blob_url, download_location, *, progress=None,
+                 cached_blobs=None, workers=FETCH_WORKERS):
+        """Create a new fetcher.
+
+        The downloader should use a pool of connections big enough for
+        the given number of workers.
+
+        :param downloader: a function that acts like requests.Session.get()
+        :param blob_url: a function that returns an URL of a blob with the given digest
+        :param str download_location: a path to the OCI image layout
+        :param progress: an instance of ProgressReporter or None
+        :param dict cached_blobs: a dictionary of digests and verified content
+        :param int workers: a number of blobs downloaded at once
+        """
+        self._downloader = downloader
+        self._blob_url = blob_url
+        self._blobs_dir = os.path.join(download_location, "blobs", "sha256")
+        self._progress = progress
+        self._cached_blobs = cached_blobs or {}
+        self._workers = workers
+        self._lock = threading.Lock()
+        self._total_size = 0
+        self._fetched_size = 0
+        self._last_pct = -1
+
+    def get_blob_path(self, digest):
+        """Get a path to the blob in the layout.
+
+        :param str digest: a digest of the blob
+        :return: a path to the blob
+        """
+        if not digest.startswith("sha256:"):
+            raise RuntimeError("Only SHA-256 digests are supported")
+
+        return os.path.join(self._blobs_dir, digest.removeprefix("sha256:"))
+
+    def fetch(self, blobs):
+        """Download the blobs.
+
+        :param dict blobs: a dictionary of digests and sizes of the blobs
+        :raise SourceSetupError: if a digest doesn't match
+        :raise RequestException: if a download fails
+        """
+        os.makedirs(self._blobs_dir, exist_ok=True)
+
+        self._total_size = sum(blobs.values())
+        self._fetched_size = 0
+        self._last_pct = -1
+
+        log.debug("Fetching %d blobs, %s.", len(blobs), Size(self._total_size))
+        self._report_progress()
+
+        with ThreadPoolExecutor(max_workers=self._workers) as executor:
+            futures = [executor.submit(self._fetch_blob, d, s) for d, s in blobs.items()]
+
+            try:
+                for future in futures:
+                    future.result()
+            except BaseException:
+                # Don't start other downloads.
+                executor.shutdown(cancel_futures=True)
+                raise
+
+        log.debug("Fetched %d blobs.", len(blobs))
+
+    def _fetch_blob(self, digest, size):
+        """Download one blob unless it is in the layout already."""
+        path = self.get_blob_path(digest)
+
+        if self._is_present(path, digest):
+            log.debug("Skipping the blob %s: already present", digest)
+            self._update_progress(size)
+            return
+
+        temporary_path = path + ".part"
+
+        try:
+            if digest in self._cached_blobs:
+                self._write_cached_blob(temporary_path, digest, size)
+            else:
+                self._download_blob(temporary_path, digest)
+
+            os.replace(temporary_path, path)
+        except BaseException:
+            self._discard(temporary_path)
+            raise
+
+    def _is_present(self, path, digest):
+        """Is the blob with the given digest present in the layout?"""
+        if not os.path.exists(path):
+            return False
+
+        checksum = hashlib.sha256()
+
+        with open(path, "rb") as f:
+            while chunk := f.read(FETCH_CHUNK_SIZE):
+                checksum.update(chunk)
+
+        if self._get_digest(checksum) != digest:
+            log.debug("The present blob %s is broken.", digest)
+            return False
+
+        return True
+
+    def _write_cached_blob(self, path, digest, size):
+        """Write the cached content of the blob."""
+        with open(path, "wb") as f:
+            f.write(self._cached_blobs[digest])
+
+        self._update_progress(size)
+
+    def _download_blob(self, path, digest):
+        """Stream the blob to the file and verify its digest."""
+        checksum = hashlib.sha256()
+        written = 0
+
+        response = self._downloader(self._blob_url(digest), stream=True)
+        response.raise_for_status()
+
+        try:
+            with response, open(path, "wb") as f:
+                # Read the raw data, the digest is calculated from the encoded blob.
+                while chunk := response.raw.read(FETCH_CHUNK_SIZE):
+                    f.write(chunk)
+                    checksum.update(chunk)
+                    written += len(chunk)
+                    self._update_progress(len(chunk))
+        except BaseException:
+            self._update_progress(-written)
+            raise
+
+        if self._get_digest(checksum) != digest:
+            self._update_progress(-written)
+            raise SourceSetupError(
+                "The digest of the downloaded blob {} doesn't match.".format(digest)
+            )
+
+    @staticmethod
+    def _get_digest(checksum):
+        """Get a digest from the calculated checksum."""
+        return "sha256:" + checksum.hexdigest()
+
+    @staticmethod
+    def _discard(path):
+        """Remove the file if any."""
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+
+    def _update_progress(self, size):
+        """Update the number of fetched bytes."""
+        with self._lock:
+            self._fetched_size += size
+            self._report_progress()
+
+    def _report_progress(self):
+        """Report the aggregated progress of all downloads."""
+        if not self._total_size:
+            pct = 100
+        else:
+            pct = min(max(int(100 * self._fetched_size / self._total_size), 0), 100)
+
+        if pct == self._last_pct:
+            return
+
+        self._last_pct = pct
+        log.debug("Fetched %s (%s%%)", Size(self._fetched_size), pct)
+
+        if self._progress:
+            self._progress.report_progress(_("Downloading Flatpaks ({}%)").format(pct))
@@ -18,6 +18,7 @@
 # Red Hat, Inc.
 #
 
+import hashlib
 import json
 import os
 from abc import ABC, abstractmethod
@@ -29,9 +30,9 @@ from typing import Dict, List, Optional, Tuple
 from urllib.parse import urljoin, urlparse
 
 import requests
+from requests.adapters import HTTPAdapter
 
 from pyanaconda.anaconda_loggers import get_module_logger
-from pyanaconda.core.i18n import _
 from pyanaconda.core.util import requests_session
 from pyanaconda.modules.common.errors.payload import SourceSetupError
 from pyanaconda.modules.common.structures.payload import RepoConfigurationData
@@ -43,6 +44,7 @@ from pyanaconda.modules.payloads.payload.flatpak.constants import (
     FLATPAK_REGISTRY_URL_PATTERN,
     FLATPAK_SCHEMA_V2,
 )
+from pyanaconda.modules.payloads.payload.flatpak.fetcher import FETCH_WORKERS, BlobFetcher
 from pyanaconda.modules.payloads.payload.flatpak.utils import (
     canonicalize_flatpak_ref,
     get_container_arch,
@@ -206,12 +208,18 @@ class FlatpakStaticSource(FlatpakSource):
         self._cached_blobs = {}
 
     @contextmanager
-    def _downloader(self):
+    def _downloader(self, pool_size=None):
         """Prepare a requests.Session.get method appropriately for the repository.
 
+        :param pool_size: a number of connections that can be used at once or None
         :returns: a function that acts like requests.Session.get()
         """
         with requests_session() as session:
+            if pool_size:
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+
             downloader = get_downloader_for_repo_configuration(session, self.repository_config)
             yield downloader
 
@@ -245,7 +253,6 @@ class FlatpakStaticSource(FlatpakSource):
         log.debug("Total: download %d, installed %d", download_size, installed_size)
         return download_size, installed_size
 
-    # TODO: To cover this code with unit tests we need to refactor the downloader out of the code
     def download(self, refs, download_location, progress=None):
         if self._is_local:
             return "oci:" + self._url.removeprefix("file://")
@@ -258,27 +265,40 @@ class FlatpakStaticSource(FlatpakSource):
             "manifests": []
         }
 
-        with self._downloader() as downloader:
-            for image in self._images:
-                if image.ref in expanded_refs:
-                    # Expanded refs have all the refs we need for the installation (including runtimes)
-                    log.debug("Downloading %s, %s bytes", image.ref, image.download_size)
-                    if progress:
-                        progress.report_progress(_("Downloading {}").format(image.ref))
-
-                    manifest_len = self._download_blob(downloader, collection_location, image.digest)
-                    self._download_blob(downloader,
-                                        collection_location, image.manifest_json["config"]["digest"])
-                    index_json["manifests"].append({
-                        "mediaType": FLATPAK_MEDIA_TYPE,
-                        "digest": image.digest,
-                        "size": manifest_len
-                    })
-
-                    for layer in image.manifest_json["layers"]:
-                        self._download_blob(downloader,
-                                            collection_location, layer["digest"],
-                                            stream=True)
+        # Blobs shared by the images are downloaded only once.
+        blobs = {}
+
+        for image in self._images:
+            if image.ref not in expanded_refs:
+                continue
+
+            # Expanded refs have all the refs we need for the installation (including runtimes)
+            log.debug("Downloading %s, %s bytes", image.ref, image.download_size)
+            manifest_len = len(self._cached_blobs[image.digest])
+            config = image.manifest_json["config"]
+
+            blobs[image.digest] = manifest_len
+            blobs[config["digest"]] = len(self._cached_blobs[config["digest"]])
+
+            for layer in image.manifest_json["layers"]:
+                blobs[layer["digest"]] = int(layer["size"])
+
+            index_json["manifests"].append({
+                "mediaType": FLATPAK_MEDIA_TYPE,
+                "digest": image.digest,
+                "size": manifest_len
+            })
+
+        with self._downloader(pool_size=FETCH_WORKERS) as downloader:
+            fetcher = BlobFetcher(
+                downloader=downloader,
+                blob_url=self._blob_url,
+                download_location=collection_location,
+                progress=progress,
+                cached_blobs=self._cached_blobs,
+                workers=FETCH_WORKERS,
+            )
+            fetcher.fetch(blobs)
 
         os.makedirs(collection_location, exist_ok=True)
         with open(os.path.join(collection_location, "index.json"), "w") as f:
@@ -324,34 +344,13 @@ class FlatpakStaticSource(FlatpakSource):
 
         response = downloader(self._blob_url(digest))
         response.raise_for_status()
+        result = response.content
 
-        self._cached_blobs[digest] = result = response.content
-        return result
-
-    def _download_blob(self, downloader, download_location, digest, stream=False):
-        if not digest.startswith("sha256:"):
-            raise RuntimeError("Only SHA-256 digests are supported")
+        if "sha256:" + hashlib.sha256(result).hexdigest() != digest:
+            raise SourceSetupError("The digest of the blob {} doesn't match.".format(digest))
 
-        blobs_dir = os.path.join(download_location, "blobs/sha256/")
-        os.makedirs(blobs_dir, exist_ok=True)
-
-        path = os.path.join(blobs_dir, digest[7:])
-        with open(path, "wb") as f:
-            if stream:
-                response = downloader(self._blob_url(digest), stream=True)
-                response.raise_for_status()
-                size = 0
-                while True:
-                    chunk = response.raw.read(64*1024)
-                    if not chunk:
-                        break
-                    size += len(chunk)
-                    f.write(chunk)
-                return size
-            else:
-                blob = self._get_blob(downloader, digest)
-                f.write(blob)
-                return len(blob)
+        self._cached_blobs[digest] = result
+        return result
 
     def _get_json(self, session, digest):
         return json.loads(self._get_blob(session, digest))
@@ -0,0 +1,436 @@
+#
+# Copyright (C) 2026  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 31 Milk Street #960789 Boston, MA
+# 02196 USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+import errno
+import fcntl
+import os
+import re
+import stat
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from blivet.size import Size
+
+from pyanaconda.anaconda_loggers import get_module_logger
+from pyanaconda.core.path import join_paths
+from pyanaconda.modules.payloads.payload.live_image.installation_progress import (
+    InstallationProgress,
+)
+
+log = get_module_logger(__name__)
+
+__all__ = ["FileTreeCopier"]
+
+# The number of files that are copied at once.
+COPY_WORKERS = min(8, os.cpu_count() or 1)
+
+# The maximal size of data copied by one system call.
+COPY_CHUNK_SIZE = 8 * 1024 * 1024
+
+# The ioctl request for cloning a file on file systems with reflinks.
+FICLONE = 0x40049409
+
+# Errors that mean that the fast copy is not supported.
+UNSUPPORTED_COPY_ERRORS = (
+    errno.EXDEV,
+    errno.ENOSYS,
+    errno.EINVAL,
+    errno.EOPNOTSUPP,
+    errno.ENOTTY,
+    errno.EBADF,
+)
+
+
+class FileTreeCopier:
+    """Copy a file tree to another location.
+
+    The source tree is scanned first to calculate the total size of the
+    copied data. Then the regular files are copied at once by a pool of
+    workers, with reflinks or copy_file_range if the file systems allow
+    it. The copy doesn't cross file system boundaries of the source.
+
+    In the archive mode, permissions, owners, groups, ACLs, xattrs,
+    times, symlinks, hardlinks, devices and special files are preserved
+    like with `rsync -pogAXtlHrDx`. Otherwise, only directories and the
+    content of regular files are copied like with `rsync -rx`.
+    """
+
+    def __init__(self, source, target, callback, *, excludes=(), archive=True,
+                 workers=COPY_WORKERS):
+        """Create a new copier.
+
+        The exclude patterns follow the rules of rsync. A pattern that
+        starts with a slash is matched against the path relative to the
+        source, otherwise it is matched against the end of the path.
+        A pattern that ends with a slash matches only directories and
+        the wildcards don't match slashes.
+
+        :param str source: a path to the source directory
+        :param str target: a path to the target directory
+        :param callback: a function for the progress reporting
+        :param excludes: a list of exclude patterns
+        :param bool archive: should we preserve the metadata and special files?
+        :param int workers: a number of files copied at once
+        """
+        self._source = os.path.normpath(source)
+        self._target = os.path.normpath(target)
+        self._callback = callback
+        self._excludes = [self._compile_pattern(p) for p in excludes]
+        self._archive = archive
+        self._workers = workers
+        self._lock = threading.Lock()
+        self._failed = threading.Event()
+        self._clone_supported = True
+        self._copy_range_supported = True
+        self._progress = InstallationProgress(callback)
+
+    @staticmethod
+    def _compile_pattern(pattern):
+        """Compile an exclude pattern.
+
+        :return: a tuple of a compiled regex and a flag for directories
+        """
+        directory_only = pattern.endswith("/")
+        pattern = pattern.rstrip("/")
+
+        regex = re.escape(pattern).replace(r"\*", "[^/]*").replace(r"\?", "[^/]")
+
+        if not pattern.startswith("/"):
+            regex = "(?:.*/)?" + regex
+
+        return re.compile(regex), directory_only
+
+    def _is_excluded(self, path, is_directory):
+        """Is the path excluded from the copy?
+
+        :param str path: a path relative to the source with a leading slash
+        :param bool is_directory: is the path a directory?
+        """
+        for regex, directory_only in self._excludes:
+            if directory_only and not is_directory:
+                continue
+
+            if regex.fullmatch(path):
+                return True
+
+        return False
+
+    @property
+    def copied_files(self):
+        """The number of copied regular files."""
+        return self._progress.processed_entries
+
+    def copy(self):
+        """Copy the file tree.
+
+        :raise OSError: if the copy fails
+        """
+        directories, files, links, others = self._scan()
+        total_size = sum(st.st_size for _path, st in files)
+
+        log.debug(
+            "Copying %s in %s files, %s hardlinks, %s directories and %s other entries.",
+            Size(total_size), len(files), len(links), len(directories), len(others)
+        )
+
+        self._progress = InstallationProgress(self._callback, total_size)
+        self._progress.start()
+
+        for path, st in directories:
+            self._create_directory(path, st)
+
+        for path, st in others:
+            self._create_special_file(path, st)
+
+        self._copy_files(files)
+
+        for path, original_path in links:
+            self._create_hardlink(path, original_path)
+
+        # Set up the directories in the reverse order, because the
+        # times of a directory change when its content is created.
+        for path, st in reversed(directories):
+            self._set_directory_metadata(path, st)
+
+        self._progress.finish()
+        log.debug("Copied %s files.", self._progress.processed_entries)
+
+    def _scan(self):
+        """Scan the source tree.
+
+        :return: lists of directories, regular files, hardlinks and other entries
+        """
+        directories = []
+        files = []
+        links = []
+        others = []
+        inodes = {}
+
+        root_stat = os.lstat(self._source)
+        directories.append(("", root_stat))
+        stack = [""]
+
+        while stack:
+            path = stack.pop()
+
+            with os.scandir(join_paths(self._source, path)) as entries:
+                for entry in entries:
+                    entry_path = join_paths(path, entry.name).lstrip("/")
+                    st = entry.stat(follow_symlinks=False)
+                    is_directory = stat.S_ISDIR(st.st_mode)
+
+                    if self._is_excluded("/" + entry_path, is_directory):
+                        continue
+
+                    if is_directory:
+                        directories.append((entry_path, st))
+
+                        # Create the mount point, but don't cross it.
+                        if st.st_dev == root_stat.st_dev:
+                            stack.append(entry_path)
+
+                    elif stat.S_ISREG(st.st_mode):
+                        if self._archive and st.st_nlink > 1:
+                            inode = (st.st_dev, st.st_ino)
+
+                            if inode in inodes:
+                                links.append((entry_path, inodes[inode]))
+                                continue
+
+                            inodes[inode] = entry_path
+
+                        files.append((entry_path, st))
+
+                    elif self._archive:
+                        others.append((entry_path, st))
+
+                    else:
+                        log.debug("Skipping the non-regular file %s.", entry_path)
+
+        return directories, files, links, others
+
+    def _get_source_path(self, path):
+        """Get a path in the source tree."""
+        return join_paths(self._source, path)
+
+    def _get_target_path(self, path):
+        """Get a path in the target tree."""
+        return join_paths(self._target, path)
+
+    def _create_directory(self, path, st):
+        """Create a directory in the target tree."""
+        target_path = self._get_target_path(path)
+
+        try:
+            os.mkdir(target_path, 0o700 if self._archive else stat.S_IMODE(st.st_mode))
+        except FileExistsError:
+            if not os.path.isdir(target_path):
+                raise
+
+    def _set_directory_metadata(self, path, st):
+        """Set the metadata of a directory in the target tree."""
+        if not self._archive:
+            return
+
+        self._copy_metadata(self._get_source_path(path), self._get_target_path(path), st)
+
+    def _create_special_file(self, path, st):
+        """Create a symlink, a device or a special file in the target tree."""
+        source_path = self._get_source_path(path)
+        target_path = self._get_target_path(path)
+        self._remove_existing(target_path)
+
+        if stat.S_ISLNK(st.st_mode):
+            os.symlink(os.readlink(source_path), target_path)
+        else:
+            os.mknod(target_path, st.st_mode, st.st_rdev)
+
+        self._copy_metadata(source_path, target_path, st)
+
+    def _create_hardlink(self, path, original_path):
+        """Create a hardlink in the target tree."""
+        target_path = self._get_target_path(path)
+        self._remove_existing(target_path)
+        os.link(self._get_target_path(original_path), target_path)
+
+    @staticmethod
+    def _remove_existing(target_path):
+        """Remove an existing file that would be replaced."""
+        try:
+            os.unlink(target_path)
+        except FileNotFoundError:
+            pass
+
+    def _copy_files(self, files):
+        """Copy the regular files by a pool of workers."""
+        self._failed.clear()
+        iterator = iter(files)
+
+        with ThreadPoolExecutor(max_workers=self._workers) as executor:
+            futures = [
+                executor.submit(self._run_worker, iterator)
+                for _ in range(self._workers)
+            ]
+
+            for future in futures:
+                future.result()
+
+    def _run_worker(self, iterator):
+        """Copy the files until there are none left."""
+        try:
+            while not self._failed.is_set():
+                with self._lock:
+                    item = next(iterator, None)
+
+                if item is None:
+                    break
+
+                self._copy_file(*item)
+        except BaseException:
+            # Stop the other workers.
+            self._failed.set()
+            raise
+
+    def _copy_file(self, path, st):
+        """Copy a regular file to the target tree."""
+        source_path = self._get_source_path(path)
+        target_path = self._get_target_path(path)
+        mode = 0o600 if self._archive else stat.S_IMODE(st.st_mode)
+        flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | os.O_NOFOLLOW
+
+        source_fd = os.open(source_path, os.O_RDONLY | os.O_NOFOLLOW)
+
+        try:
+            try:
+                target_fd = os.open(target_path, flags, mode)
+            except FileExistsError:
+                self._remove_existing(target_path)
+                target_fd = os.open(target_path, flags, mode)
+
+            try:
+                self._copy_data(source_fd, target_fd, st.st_size)
+
+                if self._archive:
+                    self._copy_metadata(source_fd, target_fd, st)
+            finally:
+                os.close(target_fd)
+        finally:
+            os.close(source_fd)
+
+        self._progress.update(entries=1)
+
+    def _copy_data(self, source_fd, target_fd, size):
+        """Copy the data of a regular file."""
+        if not size:
+            return
+
+        if self._clone_supported and self._clone_file(source_fd, target_fd):
+            self._progress.update(size=size)
+            return
+
+        copied = 0
+
+        if self._copy_range_supported:
+            copied = self._copy_file_range(source_fd, target_fd, size)
+
+        while copied < size:
+            data = os.read(source_fd, min(COPY_CHUNK_SIZE, size - copied))
+
+            if not data:
+                break
+
+            copied += len(data)
+            self._progress.update(size=len(data))
+
+            while data:
+                data = data[os.write(target_fd, data):]
+
+    def _clone_file(self, source_fd, target_fd):
+        """Clone the data of a file with a reflink.
+
+        :return: True if the file was cloned, otherwise False
+        """
+        try:
+            fcntl.ioctl(target_fd, FICLONE, source_fd)
+            return True
+        except OSError as e:
+            if e.errno not in UNSUPPORTED_COPY_ERRORS:
+                raise
+
+            log.debug("Reflinks are not supported: %s", e)
+            self._clone_supported = False
+            return False
+
+    def _copy_file_range(self, source_fd, target_fd, size):
+        """Copy the data of a file in the kernel.
+
+        :return: a number of copied bytes
+        """
+        copied = 0
+
+        while copied < size:
+            try:
+                count = os.copy_file_range(
+                    source_fd, target_fd, min(COPY_CHUNK_SIZE, size - copied)
+                )
+            except OSError as e:
+                if copied or e.errno not in UNSUPPORTED_COPY_ERRORS:
+                    raise
+
+                log.debug("The copy_file_range call is not supported: %s", e)
+                self._copy_range_supported = False
+                break
+
+            if not count:
+                break
+
+            copied += count
+            self._progress.update(size=count)
+
+        return copied
+
+    @staticmethod
+    def _copy_metadata(source, target, st):
+        """Copy owners, permissions, xattrs, ACLs and times.
+
+        The owner has to be set before the permissions and xattrs,
+        because it clears the setuid bits and file capabilities.
+
+        :param source: a path or a file descriptor of the source
+        :param target: a path or a file descriptor of the target
+        :param st: a stat result of the source
+        """
+        # File descriptors don't support the follow_symlinks argument.
+        kwargs = {} if isinstance(target, int) else {"follow_symlinks": False}
+        os.chown(target, st.st_uid, st.st_gid, **kwargs)
+
+        if not stat.S_ISLNK(st.st_mode):
+            os.chmod(target, stat.S_IMODE(st.st_mode))
+
+        # The ACLs are stored in the system.posix_acl_* attributes.
+        for name in os.listxattr(source, **kwargs):
+            value = os.getxattr(source, name, **kwargs)
+
+            try:
+                os.setxattr(target, name, value, **kwargs)
+            except OSError as e:
+                if e.errno not in (errno.EOPNOTSUPP, errno.EPERM):
+                    raise
+
+                log.warning("Failed to set the xattr %s of %s: %s", name, target, e)
+
+        os.utime(target, ns=(st.st_atime_ns, st.st_mtime_ns), **kwargs)
@@ -0,0 +1,434 @@
+#
+# Copyright (C) 2026  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 31 Milk Street #960789 Boston, MA
+# 02196 USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import requests
+from blivet.size import Size
+from requests.adapters import HTTPAdapter
+
+from pyanaconda.anaconda_loggers import get_module_logger
+from pyanaconda.core.constants import NETWORK_CONNECTION_TIMEOUT
+from pyanaconda.core.i18n import _
+from pyanaconda.modules.payloads.payload.live_image.download_progress import (
+    DownloadProgress,
+)
+from pyanaconda.modules.payloads.payload.live_image.utils import create_hash
+
+log = get_module_logger(__name__)
+
+__all__ = ["ImageDownloader"]
+
+# The size of a chunk that is read from a response at once.
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+# The size of a segment that is downloaded by one Range request.
+DOWNLOAD_SEGMENT_SIZE = 64 * 1024 * 1024
+
+# The number of segments that are downloaded at once.
+DOWNLOAD_WORKERS = 4
+
+# The number of attempts to download one segment.
+DOWNLOAD_SEGMENT_ATTEMPTS = 3
+
+
+class SegmentError(Exception):
+    """The segment cannot be downloaded with a Range request."""
+
+
+class ImageDownloader:
+    """Download an image to a file.
+
+    If the server supports Range requests and reports the size of the
+    image, the image is split into segments that are downloaded at once
+    over a pool of connections. The completed segments are recorded in
+    a state file next to the image, so an interrupted download can be
+    resumed. Otherwise, the image is streamed to the file.
+
+    Only one chunk per connection is held in memory.
+
+    If a hash algorithm is specified, the checksum of the image is
+    calculated during the download, so the image doesn't have to be
+    read again to verify it. The segments are hashed in order as soon
+    as they are available, so they are usually read from the page cache.
+    """
+
+    def __init__(self, session, url, download_path, callback, *, proxies=None, verify=True,
+                 workers=DOWNLOAD_WORKERS, segment_size=DOWNLOAD_SEGMENT_SIZE,
+                 hash_algorithm=None):
+        """Create a new downloader.
+
+        :param session: a requests session
+        :param str url: an URL of the image
+        :param str download_path: a path to the downloaded image
+        :param callback: a function for the progress reporting
+        :param dict proxies: a dictionary of proxies
+        :param bool verify: should we verify the SSL certificates?
+        :param int workers: a number of segments downloaded at once
+        :param int segment_size: a size of one segment in bytes
+        :param str hash_algorithm: a name of the hash algorithm or None
+        """
+        self._session = session
+        self._url = url
+        self._download_path = download_path
+        self._callback = callback
+        self._proxies = proxies or {}
+        self._verify = verify
+        self._workers = workers
+        self._segment_size = segment_size
+        self._lock = threading.Lock()
+        self._progress = None
+        self._downloaded_size = 0
+        self._hash_algorithm = hash_algorithm
+        self._hash = None
+        self._hash_lock = threading.Lock()
+        self._hashed_size = 0
+        self._checksum = None
+        self._mount_connection_pool()
+
+    def _mount_connection_pool(self):
+        """Mount HTTP adapters with a pool big enough for all workers."""
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self._workers + 1)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+
+    @property
+    def state_path(self):
+        """A path to the file with the state of the download."""
+        return self._download_path + ".state"
+
+    @property
+    def checksum(self):
+        """The checksum of the downloaded image.
+
+        :return: a hexadecimal digest or None
+        """
+        return self._checksum
+
+    def _start_hashing(self):
+        """Start to calculate the checksum of the image."""
+        self._checksum = None
+        self._hashed_size = 0
+
+        if self._hash_algorithm:
+            self._hash = create_hash(self._hash_algorithm)
+
+    def _finish_hashing(self):
+        """Finish the calculation of the checksum of the image."""
+        if self._hash:
+            self._checksum = self._hash.hexdigest()
+            self._hash = None
+
+    def download(self, response):
+        """Download the image.
+
+        :param response: a streamed response to a GET request
+        :raise RequestException: if the download fails
+        """
+        total_size = self._get_content_length(response)
+
+        if total_size and self._accepts_ranges(response):
+            # Don't read the response, the segments will be requested separately.
+            response.close()
+            validator = response.headers.get("etag") or response.headers.get("last-modified")
+
+            try:
+                self._download_segments(total_size, validator)
+                return
+            except SegmentError as e:
+                log.warning("Failed to download the image in segments: %s", e)
+
+            # Request the image again and stream it.
+            response = self._send_request()
+
+        self._discard_state()
+        self._download_stream(response, total_size)
+
+    @staticmethod
+    def _get_content_length(response):
+        """Get the content length value."""
+        return int(response.headers.get("content-length") or 0)
+
+    @staticmethod
+    def _accepts_ranges(response):
+        """Does the server support Range requests?"""
+        return response.headers.get("accept-ranges", "").strip().lower() == "bytes"
+
+    def _send_request(self, headers=None):
+        """Send a GET request to the image URL."""
+        response = self._session.get(
+            url=self._url,
+            headers=headers,
+            proxies=self._proxies,
+            verify=self._verify,
+            stream=True,
+            timeout=NETWORK_CONNECTION_TIMEOUT,
+        )
+        response.raise_for_status()
+        return response
+
+    def _start_progress(self, total_size, downloaded_size=0):
+        """Start to report the download progress."""
+        self._progress = DownloadProgress(
+            url=self._url,
+            callback=self._callback,
+            total_size=total_size,
+        )
+        self._progress.start()
+        self._downloaded_size = downloaded_size
+        self._progress.update(downloaded_size)
+
+    def _update_progress(self, size):
+        """Update the download progress."""
+        with self._lock:
+            self._downloaded_size += size
+            self._progress.update(self._downloaded_size)
+
+    def _download_stream(self, response, total_size):
+        """Stream the image to the file."""
+        if total_size:
+            self._start_progress(total_size)
+        else:
+            log.warning(
+                "content-length header is missing for the installation "
+                "image, download progress reporting will not be available"
+            )
+            self._callback(_("Downloading {}").format(self._url))
+
+        self._start_hashing()
+
+        with open(self._download_path, "wb") as image_file:
+            for chunk in response.iter_content(DOWNLOAD_CHUNK_SIZE):
+                if not chunk:
+                    continue
+
+                image_file.write(chunk)
+
+                if self._hash:
+                    self._hash.update(chunk)
+
+                if self._progress:
+                    self._update_progress(len(chunk))
+
+        if self._progress:
+            self._progress.end()
+
+        self._finish_hashing()
+        log.debug("Downloaded %s.", self._url)
+
+    def _download_segments(self, total_size, validator):
+        """Download the image in segments at once."""
+        state = self._load_state(total_size, validator)
+        segments = self._get_segments(total_size)
+        missing = [s for s in segments if s[0] not in state["completed"]]
+
+        log.debug(
+            "Downloading %s in %d segments, %d of them are missing.",
+            Size(total_size), len(segments), len(missing)
+        )
+
+        flags = os.O_RDWR | os.O_CREAT
+
+        if not state["completed"]:
+            flags |= os.O_TRUNC
+
+        fd = os.open(self._download_path, flags, 0o644)
+
+        try:
+            os.ftruncate(fd, total_size)
+            self._start_progress(total_size, total_size - sum(e - s + 1 for s, e in missing))
+            self._start_hashing()
+
+            stopped = threading.Event()
+            executor = ThreadPoolExecutor(max_workers=self._workers)
+
+            try:
+                futures = [
+                    executor.submit(
+                        self._download_segment, fd, start, end, validator, state,
+                        stopped=stopped
+                    )
+                    for start, end in missing
+                ]
+
+                # Hash the resumed segments while the missing ones are downloaded.
+                self._hash_segments(fd, state)
+
+                for future in as_completed(futures):
+                    future.result()
+            except BaseException:
+                # Stop the running segments and cancel the pending ones.
+                stopped.set()
+                raise
+            finally:
+                executor.shutdown(cancel_futures=True)
+
+            self._hash_segments(fd, state)
+        finally:
+            os.close(fd)
+
+        self._progress.end()
+        self._finish_hashing()
+        self._discard_state()
+        log.debug("Downloaded %s.", self._url)
+
+    def _get_segments(self, total_size):
+        """Get a list of segments as tuples of the first and last byte."""
+        return [
+            (start, min(start + self._segment_size, total_size) - 1)
+            for start in range(0, total_size, self._segment_size)
+        ]
+
+    def _download_segment(self, fd, start, end, validator, state, *, stopped):
+        """Download one segment of the image.
+
+        The download of the segment is stopped if the stopped event is set.
+        """
+        headers = {"Range": "bytes={}-{}".format(start, end)}
+
+        if validator:
+            headers["If-Range"] = validator
+
+        for attempt in range(1, DOWNLOAD_SEGMENT_ATTEMPTS + 1):
+            written = 0
+
+            if stopped.is_set():
+                return
+
+            try:
+                response = self._send_request(headers)
+
+                if response.status_code != 206:
+                    response.close()
+                    raise SegmentError("Unexpected status code {}".format(response.status_code))
+
+                with response:
+                    for chunk in response.iter_content(DOWNLOAD_CHUNK_SIZE):
+                        if stopped.is_set():
+                            return
+
+                        chunk = chunk[:end - start + 1 - written]
+                        os.pwrite(fd, chunk, start + written)
+                        written += len(chunk)
+                        self._update_progress(len(chunk))
+
+                if written != end - start + 1:
+                    raise requests.exceptions.RequestException(
+                        "Incomplete segment {}-{}".format(start, end)
+                    )
+
+                break
+            except requests.exceptions.RequestException as e:
+                self._update_progress(-written)
+
+                if attempt == DOWNLOAD_SEGMENT_ATTEMPTS:
+                    raise
+
+                log.debug("Failed to download the segment %s-%s: %s", start, end, e)
+
+        # Make sure that the segment is stored before it is recorded.
+        os.fdatasync(fd)
+        self._save_state(state, start)
+        self._hash_segments(fd, state, blocking=False)
+
+    def _hash_segments(self, fd, state, blocking=True):
+        """Hash the completed segments that follow the hashed data.
+
+        The segments have to be hashed in order. If the hashing is not
+        blocking, the segments are left for the thread that is hashing
+        at the moment or for the final call of this method.
+        """
+        if not self._hash:
+            return
+
+        if not self._hash_lock.acquire(blocking=blocking):  # pylint: disable=consider-using-with
+            return
+
+        try:
+            while True:
+                with self._lock:
+                    completed = self._hashed_size in state["completed"]
+
+                if not completed:
+                    break
+
+                end = min(self._hashed_size + self._segment_size, state["size"])
+                self._hash_range(fd, self._hashed_size, end)
+        finally:
+            self._hash_lock.release()
+
+    def _hash_range(self, fd, start, end):
+        """Hash the data of the image between the given offsets."""
+        offset = start
+
+        while offset < end:
+            data = os.pread(fd, min(DOWNLOAD_CHUNK_SIZE, end - offset), offset)
+            self._hash.update(data)
+            offset += len(data)
+
+        self._hashed_size = end
+
+    def _load_state(self, total_size, validator):
+        """Load the state of an interrupted download.
+
+        Start from scratch if the state doesn't match the image.
+        """
+        state = {
+            "url": self._url,
+            "size": total_size,
+            "validator": validator,
+            "segment_size": self._segment_size,
+            "completed": [],
+        }
+
+        try:
+            with open(self.state_path) as f:
+                saved_state = json.load(f)
+        except (OSError, ValueError):
+            return state
+
+        if not validator or not os.path.exists(self._download_path):
+            return state
+
+        if any(saved_state.get(key) != state[key] for key in state if key != "completed"):
+            log.debug("The saved download state doesn't match the image.")
+            return state
+
+        state["completed"] = saved_state.get("completed", [])
+        log.info("Resuming the download of %s.", self._url)
+        return state
+
+    def _save_state(self, state, start):
+        """Record a completed segment in the state file."""
+        with self._lock:
+            state["completed"].append(start)
+            temporary_path = self.state_path + ".tmp"
+
+            with open(temporary_path, "w") as f:
+                json.dump(state, f)
+
+            os.replace(temporary_path, self.state_path)
+
+    def _discard_state(self):
+        """Remove the state file if any."""
+        try:
+            os.unlink(self.state_path)
+        except FileNotFoundError:
+            pass
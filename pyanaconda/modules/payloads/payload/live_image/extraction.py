@@ -0,0 +1,345 @@
+#
+# Copyright (C) 2026  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 31 Milk Street #960789 Boston, MA
+# 02196 USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+import itertools
+import os
+import subprocess
+
+from blivet.size import Size
+
+from pyanaconda.anaconda_loggers import get_module_logger
+from pyanaconda.core.constants import THREAD_LIVE_TAR_OUTPUT
+from pyanaconda.core.path import join_paths
+from pyanaconda.core.threads import thread_manager
+from pyanaconda.core.util import startProgram
+from pyanaconda.modules.payloads.payload.live_image.installation_progress import (
+    InstallationProgress,
+)
+from pyanaconda.modules.payloads.payload.live_image.utils import create_hash
+
+log = get_module_logger(__name__)
+
+__all__ = ["TarExtractor"]
+
+# The size of a chunk that is read from a tarball at once.
+TAR_CHUNK_SIZE = 1024 * 1024
+
+# Paths that are not extracted from a tarball.
+TAR_EXCLUDES = [
+    "./dev/*",
+    "./proc/*",
+    "./tmp/*",
+    "./sys/*",
+    "./run/*",
+    "./boot/*rescue*",
+    "./boot/loader",
+    "./boot/efi/loader",
+    "./etc/machine-id",
+    "./etc/machine-info",
+]
+
+# Formats of tarballs identified by the bytes at the given offset.
+# Tar cannot detect the compression of the standard input, so all
+# formats supported by tar are described here.
+TAR_FORMATS = [
+    (0, b"\x1f\x8b", ["--gzip"]),
+    (0, b"\x1f\x9d", ["--uncompress"]),
+    (0, b"BZh", ["--bzip2"]),
+    (0, b"\xfd7zXZ\x00", ["--xz"]),
+    (0, b"\x5d\x00\x00", ["--lzma"]),
+    (0, b"LZIP", ["--lzip"]),
+    (0, b"\x89LZO\x00\r\n\x1a\n", ["--lzop"]),
+    (0, b"\x28\xb5\x2f\xfd", ["--zstd"]),
+    (0, b"\x04\x22\x4d\x18", ["--use-compress-program", "lz4"]),
+    (257, b"ustar", []),
+]
+
+# The number of leading bytes that identify the format.
+TAR_HEADER_SIZE = 512
+
+
+class TarExtractor:
+    """Extract a tarball to the system root.
+
+    A tarball can be streamed to the standard input of tar, so it can be
+    extracted from any source of data, for example from a response to
+    an HTTP request. A tarball stored in a file is read by tar itself.
+    The extraction is always done by tar to preserve ACLs, xattrs and
+    SELinux contexts.
+
+    The progress is calculated from the number of processed bytes or,
+    if the size of the tarball is unknown, from the number of extracted
+    entries.
+
+    Tar failures are errors only if the exit code is checked. Otherwise,
+    they are only logged, as they always were for local tarballs.
+    """
+
+    def __init__(self, sysroot, callback, hash_algorithm=None, check_exit_code=True):
+        """Create a new extractor.
+
+        :param str sysroot: a path to the system root
+        :param callback: a function for the progress reporting
+        :param str hash_algorithm: a name of the hash algorithm or None
+        :param bool check_exit_code: should a failure of tar raise an error?
+        """
+        self._sysroot = sysroot
+        self._callback = callback
+        self._hash_algorithm = hash_algorithm
+        self._check_exit_code = check_exit_code
+        self._progress = InstallationProgress(callback)
+        self._messages = []
+        self._entries = []
+        self._checksum = None
+
+    @property
+    def checksum(self):
+        """The checksum of the extracted tarball.
+
+        :return: a hexadecimal digest or None
+        """
+        return self._checksum
+
+    @property
+    def extracted_entries(self):
+        """The number of extracted entries."""
+        return self._progress.processed_entries
+
+    def extract(self, chunks, total_size=0):
+        """Extract the tarball from a stream of data.
+
+        :param chunks: an iterable of binary chunks of the tarball
+        :param int total_size: a size of the tarball in bytes or 0
+        :raise OSError: if tar cannot be started
+        :raise RuntimeError: if the format is unknown or tar fails and
+            the exit code is checked
+        """
+        self._checksum = None
+        file_hash = create_hash(self._hash_algorithm) if self._hash_algorithm else None
+        chunks = iter(chunks)
+        header = self._read_header(chunks)
+
+        self._run_tar(
+            [*self._get_format_args(header), "--verbose", "-xf", "-"],
+            total_size,
+            lambda stream: self._write_chunks(
+                stream, itertools.chain([header], chunks), file_hash
+            )
+        )
+
+        if file_hash:
+            self._checksum = file_hash.hexdigest()
+
+    def extract_file(self, path):
+        """Extract the tarball from a file.
+
+        Tar reads the file itself, so it detects the compression of
+        the tarball. The progress is calculated from the number of
+        extracted entries.
+
+        :param str path: a path to the tarball
+        :raise OSError: if tar cannot be started
+        :raise RuntimeError: if tar fails and the exit code is checked
+        """
+        self._checksum = None
+        self._run_tar(["--verbose", "-xaf", path])
+
+    def remove_extracted(self):
+        """Remove the extracted entries from the system root.
+
+        The entries are removed in the reverse order, so directories
+        are removed after their content. Parent directories created by
+        tar are not listed, so empty parents of the entries are removed
+        as well. Directories that are not empty, for example mount points
+        or directories with other content, are kept.
+        """
+        log.info("Removing %d extracted entries.", len(self._entries))
+        sysroot = os.path.normpath(self._sysroot)
+
+        for name in reversed(self._entries):
+            path = os.path.normpath(join_paths(sysroot, name))
+
+            if path == sysroot:
+                continue
+
+            try:
+                if os.path.isdir(path) and not os.path.islink(path):
+                    os.rmdir(path)
+                else:
+                    os.unlink(path)
+            except OSError as e:
+                log.debug("Failed to remove %s: %s", path, e)
+                continue
+
+            self._remove_empty_parents(sysroot, path)
+
+        self._entries = []
+
+    @staticmethod
+    def _remove_empty_parents(sysroot, path):
+        """Remove empty parent directories of the path in the system root."""
+        path = os.path.dirname(path)
+
+        while path.startswith(sysroot + os.path.sep):
+            try:
+                os.rmdir(path)
+            except OSError:
+                return
+
+            path = os.path.dirname(path)
+
+    def _run_tar(self, args, total_size=0, write_input=None):
+        """Run tar and process its output.
+
+        :param args: arguments that specify the tarball
+        :param int total_size: a size of the tarball in bytes or 0
+        :param write_input: a function that writes the tarball to a stream or None
+        """
+        self._progress = InstallationProgress(self._callback, total_size)
+        self._progress.start()
+        self._messages = []
+        self._entries = []
+
+        process = startProgram(
+            ["tar", *self._get_tar_args(args)],
+            stdin=subprocess.PIPE if write_input else subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+        )
+
+        thread_manager.add_thread(
+            name=THREAD_LIVE_TAR_OUTPUT,
+            target=self._read_output,
+            args=(process.stdout, )
+        )
+
+        try:
+            if write_input:
+                write_input(process.stdin)
+        finally:
+            if write_input:
+                self._close_input(process.stdin)
+
+            return_code = process.wait()
+            thread_manager.wait(THREAD_LIVE_TAR_OUTPUT)
+
+        log.debug(
+            "Extracted %s entries from %s of data.",
+            self._progress.processed_entries, Size(self._progress.processed_size)
+        )
+
+        # Exit code 1 means that some files differ, which is not an error.
+        if return_code > 1:
+            message = self._messages[-1] if self._messages else \
+                "tar exited with the code {}".format(return_code)
+
+            if self._check_exit_code:
+                raise RuntimeError(message)
+
+            log.error("The failure of tar is ignored: %s", message)
+
+        self._progress.finish()
+
+    @staticmethod
+    def _read_header(chunks):
+        """Read enough data to identify the format."""
+        header = b""
+
+        for chunk in chunks:
+            header += chunk
+
+            if len(header) >= TAR_HEADER_SIZE:
+                break
+
+        return header
+
+    @staticmethod
+    def _get_format_args(header):
+        """Get arguments for the format of the tarball.
+
+        :raise RuntimeError: if the format is unknown
+        """
+        for offset, magic, args in TAR_FORMATS:
+            if header[offset:offset + len(magic)] == magic:
+                return args
+
+        raise RuntimeError("Unknown format of the tarball.")
+
+    def _get_tar_args(self, args):
+        """Get arguments for tar.
+
+        Preserve ACL's, xattrs, and SELinux context.
+        """
+        tar_args = [
+            "--numeric-owner",
+            "--selinux",
+            "--acls",
+            "--xattrs",
+            "--xattrs-include", "*",
+        ]
+
+        for pattern in TAR_EXCLUDES:
+            tar_args.extend(["--exclude", pattern])
+
+        tar_args.extend(args)
+        tar_args.extend(["-C", self._sysroot])
+        return tar_args
+
+    def _write_chunks(self, stream, chunks, file_hash):
+        """Write the chunks of the tarball to the input of tar."""
+        for chunk in chunks:
+            if not chunk:
+                continue
+
+            if file_hash:
+                file_hash.update(chunk)
+
+            try:
+                stream.write(chunk)
+            except BrokenPipeError:
+                # Tar has failed. The error will be reported.
+                log.debug("Tar stopped reading the tarball.")
+                return
+
+            self._progress.update(size=len(chunk))
+
+    @staticmethod
+    def _close_input(stream):
+        """Close the input of tar."""
+        try:
+            stream.close()
+        except BrokenPipeError:
+            pass
+
+    def _read_output(self, stream):
+        """Read the output of tar.
+
+        Tar prints a name of every extracted entry to the standard
+        output and its messages prefixed with 'tar:' to the standard
+        error output, which is redirected to the standard output.
+        """
+        with stream:
+            for line in stream:
+                line = line.decode("utf-8", "replace").rstrip("\n")
+
+                if line.startswith("tar: "):
+                    log.warning("%s", line)
+                    self._messages.append(line)
+                    continue
+
+                self._entries.append(line)
+                self._progress.update(entries=1)
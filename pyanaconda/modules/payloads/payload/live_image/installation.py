@@ -16,32 +16,65 @@
 # Red Hat, Inc.
 #
 import glob
-import hashlib
 import os
-import stat
 
 import blivet.util
 import requests
 
 from pyanaconda.anaconda_loggers import get_module_logger
+from pyanaconda.core.configuration.anaconda import conf
 from pyanaconda.core.constants import NETWORK_CONNECTION_TIMEOUT
 from pyanaconda.core.i18n import _
 from pyanaconda.core.path import join_paths
-from pyanaconda.core.string import lower_ascii
 from pyanaconda.core.util import execReadlines, execWithRedirect, requests_session
 from pyanaconda.modules.common.errors.installation import PayloadInstallationError
 from pyanaconda.modules.common.structures.live_image import LiveImageConfigurationData
 from pyanaconda.modules.common.task import Task
-from pyanaconda.modules.payloads.payload.live_image.download_progress import (
-    DownloadProgress,
+from pyanaconda.modules.payloads.payload.live_image.copier import FileTreeCopier
+from pyanaconda.modules.payloads.payload.live_image.downloader import ImageDownloader
+from pyanaconda.modules.payloads.payload.live_image.extraction import (
+    TAR_CHUNK_SIZE,
+    TarExtractor,
 )
-from pyanaconda.modules.payloads.payload.live_image.installation_progress import (
-    InstallationProgress,
+from pyanaconda.modules.payloads.payload.live_image.utils import (
+    create_hash,
+    get_hash_algorithm,
+    get_proxies_from_option,
+    parse_checksum,
 )
-from pyanaconda.modules.payloads.payload.live_image.utils import get_proxies_from_option
 
 log = get_module_logger(__name__)
 
+# Paths that are not installed from an image.
+IMAGE_EXCLUDES = [
+    "/dev/",
+    "/proc/",
+    "/tmp/*",
+    "/sys/",
+    "/run/",
+    "/boot/*rescue*",
+    "/boot/loader/",
+    "/boot/efi/",
+    # Fixup: exclude paths that fail with lremovexattr(security.selinux) on KIWI-built
+    # images. Remove after https://github.com/OSInside/kiwi-boxed-plugin/issues/99
+    "/boot/grub2/",
+    "/etc/sysconfig/",
+    "/usr/lib/grub/",
+    "/etc/machine-id",
+    "/etc/machine-info",
+]
+
+# Paths of /boot/efi that are not installed from an image. The same
+# patterns are used by rsync and by the copier, so both install the
+# same files. The patterns are anchored at the copied /boot/efi.
+EFI_IMAGE_EXCLUDES = [
+    "/boot/efi/loader/",
+]
+
+# Paths that are installed without xattrs on KIWI-built images.
+# Remove after https://github.com/OSInside/kiwi-boxed-plugin/issues/99 is fixed.
+KIWI_FIXUP_PATHS = ("boot/grub2", "etc/sysconfig", "usr/lib/grub")
+
 
 class DownloadImageTask(Task):
     """Task to download an image."""
@@ -58,12 +91,22 @@ class DownloadImageTask(Task):
         self._proxy = configuration.proxy
         self._ssl_verify = configuration.ssl_verification_enabled
         self._download_path = download_path
+        self._hash_algorithm = get_hash_algorithm(configuration.checksum)
+        self._checksum = None
 
     @property
     def name(self):
         """Name of the task."""
         return "Download an image"
 
+    @property
+    def checksum(self):
+        """The checksum calculated during the download.
+
+        :return: a hexadecimal digest or None
+        """
+        return self._checksum
+
     def run(self):
         """Run the task.
 
@@ -85,7 +128,7 @@ class DownloadImageTask(Task):
                 response = self._send_request(session)
 
                 # Download the image to a file.
-                self._download_image(response)
+                self._download_image(session, response)
 
             except requests.exceptions.RequestException as e:
                 raise PayloadInstallationError(
@@ -109,72 +152,40 @@ class DownloadImageTask(Task):
         response.raise_for_status()
         return response
 
-    def _download_image(self, response):
+    def _download_image(self, session, response):
         """Download the image to a file."""
-        # Handle no content length header.
-        if not self._get_content_length(response):
-            download = self._direct_download
-        else:
-            download = self._stream_download
-
-        # Download the image to a file.
-        with open(self._download_path, "wb") as image_file:
-            download(response, image_file)
-
-    def _get_content_length(self, response):
-        """Get the content length value."""
-        return response.headers.get('content-length')
-
-    def _direct_download(self, response, image_file):
-        """Download the image at once."""
-        log.warning(
-            "content-length header is missing for the installation "
-            "image, download progress reporting will not be available"
-        )
-
-        self.report_progress(_("Downloading {}").format(self._url))
-        image_file.write(response.content)
-        log.debug("Downloaded %s.", self._url)
-
-    def _stream_download(self, response, image_file):
-        """Download the image in 1 MB chunks."""
-        total_size = int(self._get_content_length(response))
-
-        progress = DownloadProgress(
+        downloader = ImageDownloader(
+            session=session,
             url=self._url,
+            download_path=self._download_path,
             callback=self.report_progress,
-            total_size=total_size,
+            proxies=get_proxies_from_option(self._proxy),
+            verify=self._ssl_verify,
+            hash_algorithm=self._hash_algorithm,
         )
-
-        progress.start()
-        downloaded_size = 0
-
-        for chunks in response.iter_content(1024 * 1024):
-            if not chunks:
-                continue
-
-            image_file.write(chunks)
-            image_file.flush()
-
-            downloaded_size += len(chunks)
-            progress.update(downloaded_size)
-
-        progress.end()
+        downloader.download(response)
+        self._checksum = downloader.checksum
 
 
 class VerifyImageChecksumTask(Task):
     """Task to verify the checksum of the downloaded image."""
 
-    def __init__(self, configuration: LiveImageConfigurationData, image_path):
+    def __init__(self, configuration: LiveImageConfigurationData, image_path,
+                 image_checksum=None):
         """Create a new task.
 
+        If the checksum of the image was calculated during the download,
+        the image doesn't have to be read again.
+
         :param configuration: a configuration of a remote image
         :type configuration: an instance of LiveImageConfigurationData
         :param image_path: a path to the image
+        :param image_checksum: a checksum calculated during the download or None
         """
         super().__init__()
         self._image_path = image_path
         self._checksum = configuration.checksum
+        self._image_checksum = image_checksum
 
     @property
     def name(self):
@@ -187,8 +198,17 @@ class VerifyImageChecksumTask(Task):
             return
 
         self.report_progress(_("Checking image checksum"))
-        expected_checksum = self._normalize_checksum(self._checksum)
-        calculated_checksum = self._calculate_checksum(self._image_path)
+
+        try:
+            algorithm, expected_checksum = parse_checksum(self._checksum)
+        except ValueError as e:
+            raise PayloadInstallationError(str(e)) from e
+
+        if self._image_checksum:
+            log.debug("Using the checksum calculated during the download.")
+            calculated_checksum = self._image_checksum
+        else:
+            calculated_checksum = self._calculate_checksum(self._image_path, algorithm)
 
         if expected_checksum != calculated_checksum:
             log.error("'%s' does not match '%s'", calculated_checksum, expected_checksum)
@@ -197,24 +217,19 @@ class VerifyImageChecksumTask(Task):
         log.debug("Checksum of the image does match.")
 
     @staticmethod
-    def _normalize_checksum(checksum):
-        """Normalize the given checksum."""
-        return lower_ascii(checksum)
-
-    @staticmethod
-    def _calculate_checksum(file_path):
+    def _calculate_checksum(file_path, algorithm):
         """Calculate the file checksum."""
-        sha256 = hashlib.sha256()
+        file_hash = create_hash(algorithm)
 
         with open(file_path, "rb") as f:
             while True:
                 data = f.read(1024 * 1024)
                 if not data:
                     break
-                sha256.update(data)
+                file_hash.update(data)
 
-        checksum = sha256.hexdigest()
-        log.debug("sha256 of %s: %s", file_path, checksum)
+        checksum = file_hash.hexdigest()
+        log.debug("%s of %s: %s", algorithm, file_path, checksum)
         return checksum
 
 
@@ -324,61 +339,134 @@ class InstallFromTarTask(Task):
         """The name of the task."""
         return "Install the payload from a tarball"
 
+    def run(self):
+        """Run installation of the payload from a tarball.
+
+        Failures of tar are only logged, because the exit code of tar
+        has never been checked for local tarballs.
+        """
+        extractor = TarExtractor(
+            sysroot=self._sysroot,
+            callback=self.report_progress,
+            check_exit_code=False,
+        )
+
+        try:
+            extractor.extract_file(self._tarfile)
+        except (OSError, RuntimeError) as e:
+            msg = "Failed to install tar: {}".format(e)
+            raise PayloadInstallationError(msg) from None
+
+
+class InstallFromRemoteTarTask(Task):
+    """Task to install the payload from a remote tarball.
+
+    The tarball is extracted while it is being downloaded, so it
+    is never stored on a disk. The checksum of the tarball is
+    calculated during the extraction and checked after the tarball
+    is extracted. If the checksum doesn't match, the extracted
+    entries are removed from the system root.
+
+    A failure of tar is an error. A truncated or corrupted download
+    is usually found by tar first, so it shouldn't be ignored.
+    """
+
+    def __init__(self, sysroot, configuration: LiveImageConfigurationData):
+        """Create a new task.
+
+        :param sysroot: a path to the system root
+        :param configuration: a configuration of a remote tarball
+        :type configuration: an instance of LiveImageConfigurationData
+        """
+        super().__init__()
+        self._sysroot = sysroot
+        self._url = configuration.url
+        self._proxy = configuration.proxy
+        self._ssl_verify = configuration.ssl_verification_enabled
+        self._configuration = configuration
+        self._hash_algorithm = get_hash_algorithm(configuration.checksum)
+        self._checksum = None
+
     @property
-    def _installation_size(self):
-        """The installation size of the archive.
+    def name(self):
+        """The name of the task."""
+        return "Install the payload from a remote tarball"
 
-        Use 2x the archive's size to estimate the size of the install.
+    @property
+    def checksum(self):
+        """The checksum calculated during the installation.
 
-        :return: a size in bytes
+        :return: a hexadecimal digest or None
         """
-        return os.stat(self._tarfile)[stat.ST_SIZE] * 2
+        return self._checksum
 
     def run(self):
-        """Run the task."""
-        with self._monitor_progress():
-            self._install_tar()
+        """Run installation of the payload from a remote tarball."""
+        log.info("Installing the tarball from %s.", self._url)
 
-    def _monitor_progress(self):
-        """Get a progress monitor."""
-        return InstallationProgress(
-            sysroot=self._sysroot,
-            callback=self.report_progress,
-            installation_size=self._installation_size,
-        )
+        with requests_session() as session:
+            try:
+                response = session.get(
+                    url=self._url,
+                    proxies=get_proxies_from_option(self._proxy),
+                    verify=self._ssl_verify,
+                    stream=True,
+                    timeout=NETWORK_CONNECTION_TIMEOUT,
+                )
+                response.raise_for_status()
+
+                with response:
+                    self._install_tar(response)
 
-    def _install_tar(self):
-        """Run installation of the payload from a tarball.
+            except requests.exceptions.RequestException as e:
+                raise PayloadInstallationError(
+                    "Error while downloading the image: {}".format(e)
+                ) from e
+
+    def _install_tar(self, response):
+        """Extract the tarball from the response and verify it.
 
-        Preserve ACL's, xattrs, and SELinux context.
+        The unverified content is not kept in the system root. The
+        extracted entries are removed if the installation fails.
         """
-        cmd = "tar"
-        args = [
-            "--numeric-owner",
-            "--selinux",
-            "--acls",
-            "--xattrs",
-            "--xattrs-include", "*",
-            "--exclude", "./dev/*",
-            "--exclude", "./proc/*",
-            "--exclude", "./tmp/*",
-            "--exclude", "./sys/*",
-            "--exclude", "./run/*",
-            "--exclude", "./boot/*rescue*",
-            "--exclude", "./boot/loader",
-            "--exclude", "./boot/efi/loader",
-            "--exclude", "./etc/machine-id",
-            "--exclude", "./etc/machine-info",
-            "-xaf", self._tarfile,
-            "-C", self._sysroot
-        ]
+        extractor = TarExtractor(
+            sysroot=self._sysroot,
+            callback=self.report_progress,
+            hash_algorithm=self._hash_algorithm,
+        )
 
         try:
-            execWithRedirect(cmd, args)
+            self._extract_tar(extractor, response)
+            self._verify_checksum()
+        except Exception:
+            extractor.remove_extracted()
+            raise
+
+    def _extract_tar(self, extractor, response):
+        """Extract the tarball from the response."""
+        try:
+            extractor.extract(
+                response.iter_content(TAR_CHUNK_SIZE),
+                int(response.headers.get("content-length") or 0)
+            )
         except (OSError, RuntimeError) as e:
             msg = "Failed to install tar: {}".format(e)
             raise PayloadInstallationError(msg) from None
 
+        self._checksum = extractor.checksum
+
+    def _verify_checksum(self):
+        """Verify the checksum calculated during the extraction."""
+        task = VerifyImageChecksumTask(
+            configuration=self._configuration,
+            image_path=None,
+            image_checksum=self._checksum
+        )
+        task.progress_changed_signal.connect(
+            lambda step, message: self.report_progress(message)
+        )
+        task.run()
+
 
 class InstallFromImageTask(Task):
     """Task to install the payload from image."""
@@ -406,36 +494,83 @@ class InstallFromImageTask(Task):
         Preserve permissions, owners, groups, ACL's, xattrs, times,
         symlinks and hardlinks. Go recursively, include devices and
         special files. Don't cross file system boundaries.
-
-        Use a trailing slash on the source directory to copy the content
-        instead of the directory itself. See `man rsync`.
         """
         # Force write everything to disk.
         self.report_progress(_("Synchronizing writes to disk"))
         os.sync()
 
-        # Copy the mounted image to storage
+        if conf.payload.parallel_image_copy:
+            self._copy_image()
+        else:
+            self._rsync_image()
+
+    def _copy_image(self):
+        """Copy the mounted image with a pool of workers."""
+        mount_point = os.path.normpath(self._mount_point)
+        self.report_progress(_("Installing software..."))
+
+        try:
+            FileTreeCopier(
+                source=mount_point,
+                target=self._sysroot,
+                callback=self.report_progress,
+                excludes=IMAGE_EXCLUDES,
+            ).copy()
+        except OSError as e:
+            msg = "Failed to install image: {}".format(e)
+            raise PayloadInstallationError(msg) from None
+
+        if os.path.exists(os.path.join(mount_point, "boot/efi")):
+            # Handle /boot/efi separately due to FAT filesystem limitations.
+            try:
+                FileTreeCopier(
+                    source=os.path.join(mount_point, "boot/efi"),
+                    target=os.path.join(self._sysroot, "boot/efi"),
+                    callback=self.report_progress,
+                    excludes=EFI_IMAGE_EXCLUDES,
+                    archive=False,
+                ).copy()
+            except OSError as e:
+                msg = "Failed to install /boot/efi from image: {}".format(e)
+                raise PayloadInstallationError(msg) from None
+
+        # Fixup: re-copy without xattrs paths excluded on KIWI-built images.
+        for rel_src in KIWI_FIXUP_PATHS:
+            src_dir = os.path.join(mount_point, rel_src)
+            if not os.path.exists(src_dir):
+                continue
+            dest_dir = os.path.join(self._sysroot, rel_src)
+            os.makedirs(dest_dir, exist_ok=True)
+            try:
+                FileTreeCopier(
+                    source=src_dir,
+                    target=dest_dir,
+                    callback=self.report_progress,
+                    archive=False,
+                ).copy()
+            except OSError as e:
+                raise PayloadInstallationError(
+                    "Failed to install {} from image: {}".format(rel_src, e)
+                ) from None
+
+    def _rsync_image(self):
+        """Copy the mounted image with rsync.
+
+        Use a trailing slash on the source directory to copy the content
+        instead of the directory itself. See `man rsync`.
+        """
         cmd = "rsync"
         args = [
             "-pogAXtlHrDx",
             "--stats",  # show statistics at end of process
             "--info=flist2,name,progress2",  # show progress after each file
             "--no-inc-recursive",  # force calculating total work in advance
-            "--exclude", "/dev/",
-            "--exclude", "/proc/",
-            "--exclude", "/tmp/*",
-            "--exclude", "/sys/",
-            "--exclude", "/run/",
-            "--exclude", "/boot/*rescue*",
-            "--exclude", "/boot/loader/",
-            "--exclude", "/boot/efi/",
-            # Fixup: exclude paths that fail with lremovexattr(security.selinux) on KIWI-built
-            # images. Remove after https://github.com/OSInside/kiwi-boxed-plugin/issues/99
-            "--exclude", "/boot/grub2/",
-            "--exclude", "/etc/sysconfig/",
-            "--exclude", "/usr/lib/grub/",
-            "--exclude", "/etc/machine-id",
-            "--exclude", "/etc/machine-info",
+        ]
+
+        for pattern in IMAGE_EXCLUDES:
+            args.extend(["--exclude", pattern])
+
+        args += [
             os.path.normpath(self._mount_point) + "/",
             self._sysroot
         ]
@@ -458,7 +593,12 @@ class InstallFromImageTask(Task):
                 "--stats",  # show statistics at end of process
                 "--info=flist2,name,progress2",  # show progress after each file
                 "--no-inc-recursive",  # force calculating total work in advance
-                "--exclude", "/boot/efi/loader/",
+            ]
+
+            for pattern in EFI_IMAGE_EXCLUDES:
+                args.extend(["--exclude", pattern])
+
+            args += [
                 os.path.normpath(self._mount_point) + "/boot/efi/",
                 os.path.join(self._sysroot, "boot/efi")
             ]
@@ -471,7 +611,7 @@ class InstallFromImageTask(Task):
 
         # Fixup: re-copy with -rx (no xattrs) paths that fail above on KIWI-built images.
         # Remove after https://github.com/OSInside/kiwi-boxed-plugin/issues/99 is fixed.
-        for rel_src in ("boot/grub2", "etc/sysconfig", "usr/lib/grub"):
+        for rel_src in KIWI_FIXUP_PATHS:
             src_dir = os.path.join(self._mount_point, rel_src)
             if not os.path.exists(src_dir):
                 continue
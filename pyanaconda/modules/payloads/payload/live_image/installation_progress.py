@@ -15,130 +15,117 @@
 # License and may only be used or replicated with the express permission of
 # Red Hat, Inc.
 #
-import os
+import threading
 import time
 
 from blivet.size import Size
 
 from pyanaconda.anaconda_loggers import get_module_logger
-from pyanaconda.core.constants import THREAD_LIVE_PROGRESS
 from pyanaconda.core.i18n import _
-from pyanaconda.core.path import join_paths
-from pyanaconda.core.threads import thread_manager
-from pyanaconda.modules.common.constants.objects import DEVICE_TREE
-from pyanaconda.modules.common.constants.services import STORAGE
-from pyanaconda.modules.common.structures.storage import DeviceData
-from pyanaconda.modules.common.task.cancellable import Cancellable
 
 log = get_module_logger(__name__)
 
 __all__ = ["InstallationProgress"]
 
+# The minimal time between two progress reports in seconds.
+PROGRESS_REPORT_INTERVAL = 0.5
 
-class InstallationProgress(Cancellable):
-    """Progress monitor of the image installation."""
 
-    def __init__(self, sysroot, installation_size, callback):
-        """Create a new installation progress.
-
-        :param sysroot: a path to the system root
-        :param installation_size: a size of the installed payload
-        :param callback: a function for the progress reporting
-        """
-        super().__init__()
-        self._sysroot = sysroot
-        self._installation_size = installation_size
-        self._callback = callback
-        self._thread_name = THREAD_LIVE_PROGRESS
-
-    def __enter__(self):
-        """Start to monitor the progress."""
-        # Start the thread.
-        thread_manager.add_thread(
-            name=self._thread_name,
-            target=self._monitor_progress
-        )
-
-    def __exit__(self, _exc_type, _exc_val, _exc_tb):
-        """Stop to monitor the progress."""
-        # Cancel the progress reporting.
-        self.cancel()
-
-        # Wait for the thread to finish.
-        thread_manager.wait(self._thread_name)
-
-    def _monitor_progress(self):
-        """Monitor the amount of disk space used on the target and source."""
-        log.debug("Installing %s.", Size(self._installation_size))
-
-        # Force write everything to disk.
-        self._callback(_("Synchronizing writes to disk"))
-        os.sync()
+class InstallationProgress:
+    """Progress of the image installation.
 
-        # Calculate the starting size used by the system.
-        mount_points = self._get_mount_points_to_count()
-        starting_size = self._calculate_used_size(mount_points)
-        log.debug("Used %s by %s.", Size(starting_size), ", ".join(mount_points))
+    The progress is updated with counters of the installation process
+    itself, for example with the number of written bytes or extracted
+    entries, so nothing has to be polled. If the total size is known,
+    the percentage of the processed bytes is reported. Otherwise, the
+    number of processed entries is reported.
 
-        pct = 0
-        last_pct = -1
+    The reporting rate adapts to the speed of the installation. A fast
+    installation reports at most once per the report interval, a slow
+    one reports only when the reported value changes.
+    """
 
-        while pct < 100 and not self.check_cancel():
-            # Calculate the installed size used by the system.
-            current_size = self._calculate_used_size(mount_points)
-            installed_size = current_size - starting_size
-
-            # Report the progress message.
-            pct = min(int(100 * installed_size / self._installation_size), 100)
-
-            if pct != last_pct:
-                log.debug("Installed %s (%s%%)", Size(installed_size), pct)
-                self._callback(_("Installing software {}%").format(pct))
-
-            last_pct = pct
-            time.sleep(0.777)
-
-    def _get_mount_points_to_count(self):
-        """Get mount points in the device tree, which should be queried for capacity.
+    def __init__(self, callback, total_size=0):
+        """Create a new installation progress.
 
-        :return: a list of mount points
+        :param callback: a function for the progress reporting
+        :param int total_size: a total size of the installed payload or 0
         """
-        device_tree = STORAGE.get_proxy(DEVICE_TREE)
-        mount_points = device_tree.GetMountPoints()
-
-        result = []
-        counted_btrfs_volumes = []
-
-        for path, device_id in mount_points.items():
-            dev_data = DeviceData.from_structure(device_tree.GetDeviceData(device_id))
-
-            if dev_data.type != "btrfs subvolume":
-                # not btrfs subvolume, so just take it as is
-                result.append(join_paths(self._sysroot, path))
-            else:
-                # For BTRFS, add only one mount-pointed subvolume per volume.
-                # That's because statvfs reports free/used as aggregate across the whole volume.
-                ancestors = device_tree.GetAncestors([device_id])
-                for ancestor in ancestors:
-                    anc_data = DeviceData.from_structure(device_tree.GetDeviceData(ancestor))
-                    if anc_data.type == "btrfs volume" and ancestor not in counted_btrfs_volumes:
-                        result.append(join_paths(self._sysroot, path))
-                        counted_btrfs_volumes.append(ancestor)
-
-        return result
-
-    def _calculate_used_size(self, mount_points):
-        """Calculate the total used size of the mount points.
-
-        :return: a size in bytes
+        self._callback = callback
+        self._total_size = total_size
+        self._interval = PROGRESS_REPORT_INTERVAL
+        self._lock = threading.Lock()
+        self._processed_size = 0
+        self._processed_entries = 0
+        self._last_value = None if total_size else 0
+        self._last_time = 0
+
+    @property
+    def processed_size(self):
+        """The number of processed bytes."""
+        return self._processed_size
+
+    @property
+    def processed_entries(self):
+        """The number of processed entries."""
+        return self._processed_entries
+
+    def start(self):
+        """Start to report the progress."""
+        with self._lock:
+            self._processed_size = 0
+            self._processed_entries = 0
+            self._last_value = None
+
+            if not self._total_size:
+                # Don't report zero entries.
+                self._last_value = 0
+                return
+
+            self._report_progress(force=True)
+
+    def update(self, size=0, entries=0):
+        """Update the progress.
+
+        This method can be called from multiple threads.
+
+        :param int size: a number of newly processed bytes
+        :param int entries: a number of newly processed entries
         """
-        total = 0
-
-        for path in mount_points:
-            if not os.path.exists(path):
-                continue
-
-            stat = os.statvfs(path)
-            total += stat.f_frsize * (stat.f_blocks - stat.f_bfree)
-
-        return total
+        with self._lock:
+            self._processed_size += size
+            self._processed_entries += entries
+            self._report_progress()
+
+    def finish(self):
+        """Report the final progress."""
+        with self._lock:
+            if self._total_size:
+                self._processed_size = max(self._processed_size, self._total_size)
+
+            self._report_progress(force=True)
+
+    def _report_progress(self, force=False):
+        """Report the progress if it is the time."""
+        now = time.monotonic()
+
+        if not force and now - self._last_time < self._interval:
+            return
+
+        if self._total_size:
+            value = min(int(100 * self._processed_size / self._total_size), 100)
+        else:
+            value = self._processed_entries
+
+        if value == self._last_value:
+            return
+
+        self._last_value = value
+        self._last_time = now
+
+        if self._total_size:
+            log.debug("Installed %s (%s%%)", Size(self._processed_size), value)
+            self._callback(_("Installing software {}%").format(value))
+        else:
+            log.debug("Installed %s entries", value)
+            self._callback(_("Installing software ({} files)").format(value))
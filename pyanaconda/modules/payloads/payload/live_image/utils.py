@@ -15,14 +15,19 @@
 # License and may only be used or replicated with the express permission of
 # Red Hat, Inc.
 #
+import hashlib
 import tarfile
 
 from pyanaconda.anaconda_loggers import get_module_logger
 from pyanaconda.core.payload import ProxyString, ProxyStringError
+from pyanaconda.core.string import lower_ascii
 from pyanaconda.modules.payloads.base.utils import sort_kernel_version_list
 
 log = get_module_logger(__name__)
 
+# Supported algorithms of image checksums.
+CHECKSUM_ALGORITHMS = ("sha256", "sha512", "blake2b")
+
 
 def get_kernel_version_list_from_tar(tarfile_path):
     with tarfile.open(tarfile_path) as archive:
@@ -55,3 +60,56 @@ def get_proxies_from_option(proxy_option):
         except ProxyStringError as e:
             log.info("Failed to parse proxy \"%s\": %s", proxy_option, e)
     return proxies
+
+
+def parse_checksum(checksum):
+    """Parse the checksum of an image.
+
+    The checksum can be prefixed with a name of the algorithm, for
+    example sha512:<digest>. Otherwise, the algorithm is sha512 for
+    digests with 128 characters and sha256 for everything else.
+
+    :param str checksum: a checksum of the image
+    :return: a tuple with the name of the algorithm and the digest
+    :raise ValueError: if the algorithm is not supported
+    """
+    checksum = lower_ascii(checksum.strip())
+
+    if ":" in checksum:
+        algorithm, digest = checksum.split(":", 1)
+    elif len(checksum) == 128:
+        algorithm, digest = "sha512", checksum
+    else:
+        algorithm, digest = "sha256", checksum
+
+    if algorithm not in CHECKSUM_ALGORITHMS:
+        raise ValueError("Unsupported checksum algorithm: {}".format(algorithm))
+
+    return algorithm, digest
+
+
+def get_hash_algorithm(checksum):
+    """Get a hash algorithm for the expected checksum of an image.
+
+    :param str checksum: a checksum of the image or an empty string
+    :return: a name of the algorithm or None
+    """
+    if not checksum:
+        return None
+
+    try:
+        algorithm, _digest = parse_checksum(checksum)
+        return algorithm
+    except ValueError as e:
+        # The checksum will be rejected by the verification.
+        log.debug("Won't calculate the checksum of the image: %s", e)
+        return None
+
+
+def create_hash(algorithm):
+    """Create a hash object for the specified algorithm.
+
+    :param str algorithm: a name of the algorithm
+    :return: a hash object
+    """
+    return hashlib.new(algorithm)
@@ -80,7 +80,8 @@ class InstallLiveImageTask(Task):
 
         task = VerifyImageChecksumTask(
             configuration=self._configuration,
-            image_path=image_path
+            image_path=image_path,
+            image_checksum=task.checksum
         )
         self._run_task(task)
 
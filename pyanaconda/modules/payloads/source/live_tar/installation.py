@@ -15,10 +15,12 @@
 # License and may only be used or replicated with the express permission of
 # Red Hat, Inc.
 #
+from pyanaconda.core.configuration.anaconda import conf
 from pyanaconda.modules.common.structures.live_image import LiveImageConfigurationData
 from pyanaconda.modules.common.task import Task
 from pyanaconda.modules.payloads.payload.live_image.installation import (
     DownloadImageTask,
+    InstallFromRemoteTarTask,
     InstallFromTarTask,
     RemoveImageTask,
     VerifyImageChecksumTask,
@@ -26,6 +28,7 @@ from pyanaconda.modules.payloads.payload.live_image.installation import (
 from pyanaconda.modules.payloads.payload.live_image.utils import (
     get_kernel_version_list_from_tar,
 )
+from pyanaconda.modules.payloads.payload.live_os.utils import get_kernel_version_list
 
 __all__ = ["InstallLiveTarTask"]
 
@@ -57,6 +60,11 @@ class InstallLiveTarTask(Task):
 
         :return: a list of kernel versions
         """
+        if self._is_streamed:
+            self._install_remote_tarball()
+            self._collect_installed_kernels()
+            return self._kernel_version_list
+
         self._set_up_tarball()
         self._collect_kernels()
         self._install_tarball()
@@ -64,6 +72,23 @@ class InstallLiveTarTask(Task):
 
         return self._kernel_version_list
 
+    @property
+    def _is_streamed(self):
+        """Should the tarball be extracted while it is being downloaded?"""
+        return conf.payload.stream_live_tarball \
+            and not self._configuration.url.startswith("file://")
+
+    def _install_remote_tarball(self):
+        """Install the remote tarball without storing it.
+
+        The checksum is checked after the tarball is extracted.
+        """
+        task = InstallFromRemoteTarTask(
+            sysroot=self._sysroot,
+            configuration=self._configuration
+        )
+        self._run_task(task)
+
     def _set_up_tarball(self):
         """Set up the tarball for the installation.
 
@@ -77,7 +102,8 @@ class InstallLiveTarTask(Task):
 
         task = VerifyImageChecksumTask(
             configuration=self._configuration,
-            image_path=self._tarball_path
+            image_path=self._tarball_path,
+            image_checksum=task.checksum
         )
         self._run_task(task)
 
@@ -95,6 +121,12 @@ class InstallLiveTarTask(Task):
             self._tarball_path
         )
 
+    def _collect_installed_kernels(self):
+        """Collect the kernel version list from the installed system."""
+        self._kernel_version_list = get_kernel_version_list(
+            self._sysroot
+        )
+
     def _tear_down_tarball(self):
         """Tear down the tarball after the installation."""
         task = RemoveImageTask(self._download_path)
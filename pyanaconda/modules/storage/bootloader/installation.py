@@ -76,7 +76,8 @@ class CreateRescueImagesTask(Task):
 
         create_rescue_images(
             sysroot=self._sysroot,
-            kernel_versions=self._versions
+            kernel_versions=self._versions,
+            callback=self.report_progress
         )
 
 
@@ -270,7 +271,8 @@ class RecreateInitrdsTask(Task):
 
         recreate_initrds(
             sysroot=self._sysroot,
-            kernel_versions=self._versions
+            kernel_versions=self._versions,
+            callback=self.report_progress
         )
 
 
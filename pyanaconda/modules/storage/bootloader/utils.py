@@ -16,10 +16,16 @@
 # Red Hat, Inc.
 #
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from glob import glob
 
+from blivet.size import Size
+from blivet.util import total_memory
+
 from pyanaconda.anaconda_loggers import get_module_logger
 from pyanaconda.core.configuration.anaconda import conf
+from pyanaconda.core.i18n import _
 from pyanaconda.core.product import get_product_name
 from pyanaconda.core.util import execWithRedirect
 from pyanaconda.modules.common.errors.installation import BootloaderInstallationError
@@ -29,9 +35,20 @@ log = get_module_logger(__name__)
 
 __all__ = ["configure_boot_loader", "create_rescue_images", "recreate_initrds"]
 
+# The memory needed to create one initramfs image.
+INITRAMFS_JOB_MEMORY = Size("512 MiB")
+
+
+def create_rescue_images(sysroot, kernel_versions, callback=None):
+    """Create the rescue initrd images for each installed kernel.
+
+    The images are created one by one, because the scripts share
+    the rescue image and the boot loader configuration.
 
-def create_rescue_images(sysroot, kernel_versions):
-    """Create the rescue initrd images for each installed kernel."""
+    :param sysroot: a path to the root of the installed system
+    :param kernel_versions: a list of kernel versions
+    :param callback: a function for the progress reporting or None
+    """
     # Always make sure the new system has a new machine-id, it
     # won't boot without it and some of the subsequent commands
     # like grub2-mkconfig and kernel-install will not work as well.
@@ -52,7 +69,7 @@ def create_rescue_images(sysroot, kernel_versions):
         log.debug("new-kernel-pkg does not exist, calling scripts directly.")
         use_nkp = False
 
-    for kernel in kernel_versions:
+    def create_rescue_image(kernel):
         log.info("Generating rescue image for %s.", kernel)
 
         if use_nkp:
@@ -76,6 +93,59 @@ def create_rescue_images(sysroot, kernel_versions):
                     root=sysroot
                 )
 
+    _run_kernel_jobs(
+        kernel_versions,
+        create_rescue_image,
+        message=_("Generated rescue image for {kernel} in {seconds:.1f} s"),
+        callback=callback,
+    )
+
+
+def _get_initramfs_workers(jobs):
+    """Get a number of initramfs images that can be created at once.
+
+    Every image needs one CPU and INITRAMFS_JOB_MEMORY of memory.
+    Only a half of the memory is used, the rest is left for the
+    installation environment.
+
+    :param jobs: a number of images to create
+    :return: a number of workers
+    """
+    cpus = len(os.sched_getaffinity(0))
+    memory = total_memory().get_bytes() // 2 // INITRAMFS_JOB_MEMORY.get_bytes()
+    return max(1, min(jobs, cpus, memory))
+
+
+def _run_kernel_jobs(kernel_versions, job, message, workers=1, callback=None):
+    """Run the job for each kernel.
+
+    The jobs are started in the order of the kernel versions. Every
+    finished job is reported with its duration.
+
+    :param kernel_versions: a list of kernel versions
+    :param job: a function that takes a kernel version
+    :param message: a message with the kernel and seconds placeholders
+    :param workers: a number of jobs that can run at once
+    :param callback: a function for the progress reporting or None
+    """
+    def run_job(kernel):
+        start = time.monotonic()
+        job(kernel)
+        return time.monotonic() - start
+
+    log.debug("Running jobs for %d kernels with %d workers.", len(kernel_versions), workers)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(run_job, k): k for k in kernel_versions}
+
+        # Report the progress from this thread.
+        for future in as_completed(futures):
+            text = message.format(kernel=futures[future], seconds=future.result())
+            log.info(text)
+
+            if callback:
+                callback(text)
+
 
 def configure_boot_loader(sysroot, storage, kernel_versions):
     """Configure the boot loader.
@@ -237,14 +307,19 @@ def create_bls_entries(sysroot, storage, kernel_versions):
         )
 
 
-def recreate_initrds(sysroot, kernel_versions):
+def recreate_initrds(sysroot, kernel_versions, callback=None):
     """Recreate the initrds by calling new-kernel-pkg or dracut.
 
     This needs to be done after all configuration files have been
     written, since dracut depends on some of them.
 
+    The initrds of different kernels are created by dracut at once.
+    The new-kernel-pkg tool updates the boot loader configuration,
+    so it runs for one kernel at a time.
+
     :param sysroot: a path to the root of the installed system
     :param kernel_versions: a list of kernel versions
+    :param callback: a function for the progress reporting or None
     """
     if os.path.exists(sysroot + "/usr/sbin/new-kernel-pkg"):
         use_dracut = False
@@ -252,7 +327,7 @@ def recreate_initrds(sysroot, kernel_versions):
         log.debug("new-kernel-pkg does not exist, using dracut instead")
         use_dracut = True
 
-    for kernel in kernel_versions:
+    def recreate_initrd(kernel):
         log.info("Recreating initrd for %s", kernel)
 
         if conf.target.is_image:
@@ -283,3 +358,16 @@ def recreate_initrds(sysroot, kernel_versions):
                     ["--mkinitrd", "--dracut", "--depmod", "--update", kernel],
                     root=sysroot
                 )
+
+    if conf.target.is_image or use_dracut:
+        workers = _get_initramfs_workers(len(kernel_versions))
+    else:
+        workers = 1
+
+    _run_kernel_jobs(
+        kernel_versions,
+        recreate_initrd,
+        message=_("Recreated initrd for {kernel} in {seconds:.1f} s"),
+        workers=workers,
+        callback=callback,
+    )
@@ -110,7 +110,11 @@ class DeviceTreeHandler(ABC):
         :return: True if success, otherwise False
         """
         device = self._get_device(device_id)
-        return unlock_device(self.storage, device, passphrase)
+
+        try:
+            return unlock_device(self.storage, device, passphrase)
+        finally:
+            self.storage.update_generation()
 
     def find_unconfigured_luks(self):
         """Find all unconfigured LUKS devices.
@@ -132,6 +136,7 @@ class DeviceTreeHandler(ABC):
         device = self._get_device(device_id)
         device.format.passphrase = passphrase
         self.storage.save_passphrase(device)
+        self.storage.update_generation()
 
     def get_device_mount_options(self, device_id):
         """Get mount options of the specified device.
@@ -154,6 +159,7 @@ class DeviceTreeHandler(ABC):
         """
         device = self._get_device(device_id)
         device.format.options = mount_options or None
+        self.storage.update_generation()
         log.debug("Mount options of %s are set to '%s'.", device.name, mount_options)
 
     def find_devices_with_task(self):
@@ -163,7 +169,9 @@ class DeviceTreeHandler(ABC):
 
         :return: a task
         """
-        return FindDevicesTask(self.storage.devicetree)
+        task = FindDevicesTask(self.storage.devicetree)
+        task.stopped_signal.connect(self.storage.update_generation)
+        return task
 
     def find_optical_media(self):
         """Find all devices with mountable optical media.
@@ -17,6 +17,8 @@
 #
 # Red Hat Author(s): David Lehman <dlehman@redhat.com>
 #
+import copy
+import itertools
 import logging
 
 from blivet.blivet import Blivet
@@ -43,6 +45,9 @@ from pyanaconda.modules.storage.devicetree.utils import (
 
 log = logging.getLogger("anaconda.storage")
 
+# The generations are unique across all storage models.
+_generations = itertools.count(1)
+
 __all__ = ["create_storage"]
 
 
@@ -66,6 +71,7 @@ class InstallerStorage(Blivet):
         self.fsset = FSSet(self.devicetree)
         self._short_product_name = get_product_short_name()
         self._default_luks_version = DEFAULT_LUKS_VERSION
+        self._generation = next(_generations)
 
         # Set the default filesystem type.
         self.set_default_fstype(conf.storage.file_system_type or self.default_fstype)
@@ -76,6 +82,21 @@ class InstallerStorage(Blivet):
         # Enable GPT discoverable partitions
         blivet_flags.gpt_discoverable_partitions = conf.storage.gpt_discoverable_partitions
 
+    @property
+    def generation(self):
+        """The generation of the storage model.
+
+        The generation is unique across all storage models. It changes
+        when the model is copied, reset or changed by the storage module.
+
+        :return: a number
+        """
+        return self._generation
+
+    def update_generation(self):
+        """Mark the storage model as changed."""
+        self._generation = next(_generations)
+
     @property
     def bootloader(self):
         if self._bootloader is None:
@@ -217,14 +238,29 @@ class InstallerStorage(Blivet):
         if disks is None:
             disks = self.disks
 
-        # Get a list of disks with supported disk labels.
-        disks = self._skip_unsupported_disk_labels(disks)
+        # Calculate the total free space.
+        return sum(self.get_disks_free_space(disks).values(), Size(0))
 
-        # Get the dictionary of free spaces for each disk.
-        snapshot = self.get_free_space(disks)
+    def get_disks_free_space(self, disks=None):
+        """Get free space on each of the given disks.
 
-        # Calculate the total free space.
-        return sum((disk_free for disk_free, fs_free in snapshot.values()), Size(0))
+        Calculates free space available for use.
+
+        :param disks: a list of disks or None
+        :return: a dictionary of disks and their free spaces
+        """
+        # Use all disks in the device tree by default.
+        if disks is None:
+            disks = self.disks
+
+        # Get the dictionary of free spaces for each disk name.
+        snapshot = self.get_free_space(self._skip_unsupported_disk_labels(disks))
+
+        # Disks with unsupported disk labels have no free space.
+        return {
+            disk: snapshot[disk.name][0] if disk.name in snapshot else Size(0)
+            for disk in disks
+        }
 
     def get_disk_reclaimable_space(self, disks=None):
         """Get total reclaimable space on the given disks.
@@ -303,6 +339,7 @@ class InstallerStorage(Blivet):
         self.roots = []
         self.roots = find_existing_installations(self.devicetree)
         self.dump_state("initial")
+        self.update_generation()
 
     def _mark_protected_devices(self):
         """Mark protected devices.
@@ -384,6 +421,7 @@ class InstallerStorage(Blivet):
 
         # Update the list.
         self.protected_devices = protected_names
+        self.update_generation()
 
     def _mark_protected_device(self, device, include_subtree=False):
         """Mark a device as protected.
@@ -469,6 +507,8 @@ class InstallerStorage(Blivet):
                 if disk not in self.devices:
                     self.devicetree.unhide(disk)
 
+        self.update_generation()
+
     def _get_hostname(self):
         """Return a hostname."""
         ignored_hostnames = {None, "", 'localhost', 'localhost.localdomain', 'localhost-live'}
@@ -556,6 +596,39 @@ class InstallerStorage(Blivet):
 
         # Create proper copies of the collected installation roots.
         new.roots = [root.copy(storage=new) for root in new.roots]
+        new.update_generation()
 
         log.debug("Finished a copy of the storage model.")
         return new
+
+    def shallow_copy(self):
+        """Create a copy of the storage model that shares the devices.
+
+        Only the configuration of the storage model is copied. The devices,
+        their formats and the scheduled actions are shared with this model,
+        so the copy has to be reset before it is used. It is much cheaper
+        than a full copy of the storage model with many devices.
+
+        :return InstallerStorage: a copy of the storage model
+        """
+        log.debug("Creating a shallow copy of the storage model.")
+
+        # Don't copy objects that will be dropped by the reset.
+        memo = {}
+
+        for device in itertools.chain(self.devicetree._devices, self.devicetree._hidden):
+            memo[id(device)] = device
+            memo[id(device.format)] = device.format
+            memo[id(device.original_format)] = device.original_format
+
+        for action in self.devicetree.actions:
+            memo[id(action)] = action
+
+        new = copy.deepcopy(self, memo)
+
+        # The installation roots will be found by the reset.
+        new.roots = []
+        new.update_generation()
+
+        log.debug("Finished a shallow copy of the storage model.")
+        return new
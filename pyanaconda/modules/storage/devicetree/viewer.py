@@ -32,6 +32,7 @@ from pyanaconda.modules.common.structures.storage import (
     DeviceActionData,
     DeviceData,
     DeviceFormatData,
+    DeviceTreeSnapshotData,
     MountPointConstraintsData,
     OSData,
 )
@@ -118,9 +119,15 @@ class DeviceTreeViewer(ABC):
         :return: an instance of DeviceData
         :raise: UnknownDeviceError if the device is not found
         """
-        # Find the device.
         device = self._get_device(device_id)
+        return self._get_device_data(device)
 
+    def _get_device_data(self, device):
+        """Get the device data.
+
+        :param device: an instance of the Blivet's device
+        :return: an instance of DeviceData
+        """
         # Collect the device data.
         data = DeviceData()
         self._set_device_data(device, data)
@@ -247,6 +254,43 @@ class DeviceTreeViewer(ABC):
         data.attrs = self._prune_attributes(data.attrs)
         return data
 
+    def get_generation(self):
+        """Get the generation of the device tree.
+
+        The generation changes with every change of the device tree.
+
+        :return: a number
+        """
+        return self.storage.generation
+
+    def get_snapshot(self):
+        """Get a snapshot of the device tree.
+
+        Collect data of all devices in the device tree at once.
+
+        :return: an instance of DeviceTreeSnapshotData
+        """
+        devices = self.storage.devices
+
+        data = DeviceTreeSnapshotData()
+        data.generation = self.storage.generation
+        data.devices = [self._get_device_data(d) for d in devices]
+        data.formats = [self._get_format_data(d.format) for d in devices]
+        data.size_limits = self._get_size_limits(devices)
+        data.free_space = {
+            disk.device_id: free_space.get_bytes()
+            for disk, free_space in self.storage.get_disks_free_space().items()
+        }
+        return data
+
+    def _get_size_limits(self, devices):
+        """Get size limits of the given devices.
+
+        :param devices: a list of instances of the Blivet's device
+        :return: a dictionary of device IDs and tuples of min and max sizes
+        """
+        return {}
+
     def get_format_type_data(self, format_name):
         """Get the format type data.
 
@@ -26,6 +26,7 @@ from pyanaconda.modules.common.structures.storage import (
     DeviceActionData,
     DeviceData,
     DeviceFormatData,
+    DeviceTreeSnapshotData,
     MountPointConstraintsData,
     OSData,
 )
@@ -95,6 +96,28 @@ class DeviceTreeViewerInterface(InterfaceTemplate):
         """
         return DeviceFormatData.to_structure(self.implementation.get_format_data(device_id))
 
+    def GetDeviceTreeGeneration(self) -> UInt64:
+        """Get the generation of the device tree.
+
+        The generation changes with every change of the device tree.
+        Use it to find out if the data of the device tree should be
+        requested again.
+
+        :return: a number
+        """
+        return self.implementation.get_generation()
+
+    def GetDeviceTreeSnapshot(self) -> Structure:
+        """Get a snapshot of the device tree.
+
+        Return data of all devices, their formats, size limits
+        and free space on disks with the generation of the device
+        tree at once.
+
+        :return: a structure with device tree data
+        """
+        return DeviceTreeSnapshotData.to_structure(self.implementation.get_snapshot())
+
     def GetFormatTypeData(self, name: Str) -> Structure:
         """Get the format type data.
 
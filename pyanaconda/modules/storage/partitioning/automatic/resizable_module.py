@@ -92,8 +92,21 @@ class ResizableDeviceTreeModule(DeviceTreeModule):
         :return: a tuple of min and max sizes in bytes
         """
         device = self._get_device(device_id)
+        return self._get_device_size_limits(device)
+
+    @staticmethod
+    def _get_device_size_limits(device):
+        """Get size limits of the given device."""
         return device.min_size.get_bytes(), device.max_size.get_bytes()
 
+    def _get_size_limits(self, devices):
+        """Get size limits of the given devices.
+
+        :param devices: a list of instances of the Blivet's device
+        :return: a dictionary of device IDs and tuples of min and max sizes
+        """
+        return {d.device_id: self._get_device_size_limits(d) for d in devices}
+
     def shrink_device(self, device_id, size):
         """Shrink the size of the device.
 
@@ -103,6 +116,7 @@ class ResizableDeviceTreeModule(DeviceTreeModule):
         size = Size(size)
         device = self._get_device(device_id)
         shrink_device(self.storage, device, size)
+        self.storage.update_generation()
 
     def remove_device(self, device_id):
         """Remove a device after removing its dependent devices.
@@ -114,3 +128,4 @@ class ResizableDeviceTreeModule(DeviceTreeModule):
         """
         device = self._get_device(device_id)
         remove_device(self.storage, device)
+        self.storage.update_generation()
@@ -64,6 +64,8 @@ class PartitioningTask(Task, metaclass=ABCMeta):
             self._handle_storage_error(e, str(e))
         except BootLoaderError as e:
             self._handle_bootloader_error(e, str(e))
+        finally:
+            self._storage.update_generation()
 
     @abstractmethod
     def _run(self, storage):
@@ -321,7 +321,11 @@ class DeviceTreeSchedulerModule(DeviceTreeModule):
         :raise: StorageConfigurationError if the device cannot be created
         """
         task = AddDeviceTask(self.storage, request)
-        task.run()
+
+        try:
+            task.run()
+        finally:
+            self.storage.update_generation()
 
     def change_device(self, request, original_request):
         """Change a device in the storage model.
@@ -334,7 +338,11 @@ class DeviceTreeSchedulerModule(DeviceTreeModule):
         """
         device = self._get_device(request.device_spec)
         task = ChangeDeviceTask(self.storage, device, request, original_request)
-        task.run()
+
+        try:
+            task.run()
+        finally:
+            self.storage.update_generation()
 
     def reset_device(self, device_id):
         """Reset the specified device in the storage model.
@@ -345,7 +353,11 @@ class DeviceTreeSchedulerModule(DeviceTreeModule):
         :raise: StorageConfigurationError in case of failure
         """
         device = self._get_device(device_id)
-        utils.reset_device(self.storage, device)
+
+        try:
+            utils.reset_device(self.storage, device)
+        finally:
+            self.storage.update_generation()
 
     def destroy_device(self, device_id):
         """Destroy the specified device in the storage model.
@@ -354,7 +366,11 @@ class DeviceTreeSchedulerModule(DeviceTreeModule):
         :raise: StorageConfigurationError in case of failure
         """
         device = self._get_device(device_id)
-        utils.destroy_device(self.storage, device)
+
+        try:
+            utils.destroy_device(self.storage, device)
+        finally:
+            self.storage.update_generation()
 
     def schedule_partitions_with_task(self, request):
         """Schedule the partitioning actions.
@@ -244,8 +244,9 @@ class StorageService(KickstartService):
 
         :return: a task
         """
-        # Copy the storage.
-        storage = self.storage.copy()
+        # Copy the storage. The devices will be scanned again,
+        # so there is no need to copy them.
+        storage = self.storage.shallow_copy()
 
         # Set up the storage.
         storage.ignored_disks = self._disk_selection_module.ignored_disks
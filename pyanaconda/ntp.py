@@ -25,13 +25,21 @@ import os
 import re
 import shutil
 import tempfile
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
 
 from pyanaconda.anaconda_loggers import get_module_logger
 from pyanaconda.core.async_utils import async_action_nowait
 from pyanaconda.core.constants import (
+    NTP_SERVER_CHECK_WORKERS,
     NTP_SERVER_NOK,
     NTP_SERVER_OK,
     NTP_SERVER_QUERY,
+    NTP_SERVER_RETRY_BACKOFF,
+    NTP_SERVER_RETRY_BACKOFF_MAX,
+    NTP_SERVER_STATUS_TTL,
     NTP_SERVER_TIMEOUT,
     THREAD_NTP_SERVER_CHECK,
 )
@@ -56,6 +64,9 @@ NTP_SERVER_STATUS_DESCRIPTIONS = {
     NTP_SERVER_QUERY: N_("checking status")
 }
 
+# A result of the NTP server check.
+_NTPServerResult = namedtuple("_NTPServerResult", ["working", "expires", "failures"])
+
 log = get_module_logger(__name__)
 
 
@@ -233,12 +244,166 @@ def save_servers_to_config(servers, conf_file_path=NTP_CONFIG_FILE, out_file_pat
             raise NTPconfigError(msg.format(oserr.strerror)) from oserr
 
 
+class NTPServerProber:
+    """Check NTP servers in batches and remember the results.
+
+    Requested servers are checked in batches by a pool of workers in one
+    thread.  Requests that arrive during a batch are checked in the next
+    one.  A working server is not checked again until its status expires.
+    A server that doesn't work is checked again after a delay, which
+    doubles with every failed check.  Forced checks ignore the known
+    results, so the user can check a server again at any time.
+
+    The results are shared by all caches of NTP server states, so the
+    spokes don't check the same servers again.
+    """
+
+    def __init__(self, workers=NTP_SERVER_CHECK_WORKERS, ttl=NTP_SERVER_STATUS_TTL,
+                 backoff=NTP_SERVER_RETRY_BACKOFF, max_backoff=NTP_SERVER_RETRY_BACKOFF_MAX):
+        """Create a new prober.
+
+        :param int workers: a maximal number of servers checked at once
+        :param int ttl: seconds for which a working server is not checked again
+        :param int backoff: seconds before a failed server is checked again
+        :param int max_backoff: a maximal number of seconds before the next check
+        """
+        self._workers = workers
+        self._ttl = ttl
+        self._backoff = backoff
+        self._max_backoff = max_backoff
+        self._lock = threading.Lock()
+        self._results = {}
+        self._pending = {}
+        self._running = False
+
+    def check(self, servers, callback, force=False):
+        """Check the given NTP servers.
+
+        Return known results right away. The callback is called with
+        results of the other servers once per batch, in the checking thread.
+
+        :param servers: a list of hostnames and NTS options
+        :type servers: a list of (str, bool)
+        :param callback: a function that accepts a dictionary of results
+        :param bool force: check the servers even if their results are known
+        :return: a dictionary of known results
+        :rtype: {(str, bool): bool}
+        """
+        known = {}
+        now = time.monotonic()
+
+        with self._lock:
+            for server in servers:
+                result = self._results.get(server)
+
+                if result and result.expires > now and not force:
+                    known[server] = result.working
+                    continue
+
+                self._pending.setdefault(server, []).append(callback)
+
+            start = bool(self._pending) and not self._running
+            self._running = self._running or start
+
+        if start:
+            thread_manager.add_thread(
+                prefix=THREAD_NTP_SERVER_CHECK,
+                target=self._run
+            )
+
+        return known
+
+    def _run(self):
+        """Check the requested servers until there are no requests."""
+        while True:
+            with self._lock:
+                batch = self._pending
+                self._pending = {}
+
+                if not batch:
+                    self._running = False
+                    return
+
+            try:
+                self._check_batch(batch)
+            except BaseException:
+                with self._lock:
+                    self._running = False
+                raise
+
+    def _check_batch(self, batch):
+        """Check a batch of servers and report the results.
+
+        :param batch: callbacks of requested servers
+        :type batch: {(str, bool): [callback]}
+        """
+        log.debug("Checking %d NTP servers.", len(batch))
+
+        with ThreadPoolExecutor(max_workers=self._workers) as executor:
+            results = dict(zip(batch, executor.map(
+                lambda server: self._check_server(*server), batch
+            )))
+
+        # Call every callback only once.
+        callbacks = {}
+
+        with self._lock:
+            now = time.monotonic()
+
+            for server, working in results.items():
+                self._results[server] = self._get_result(server, working, now)
+
+                for callback in batch[server]:
+                    callbacks.setdefault(callback, {})[server] = working
+
+        for callback, callback_results in callbacks.items():
+            callback(callback_results)
+
+    def _get_result(self, server, working, now):
+        """Get a new result of the server check."""
+        if working:
+            return _NTPServerResult(True, now + self._ttl, 0)
+
+        previous = self._results.get(server)
+        failures = previous.failures + 1 if previous else 1
+        delay = min(self._backoff * 2 ** (failures - 1), self._max_backoff)
+        return _NTPServerResult(False, now + delay, failures)
+
+    @staticmethod
+    def _check_server(hostname, nts_enabled):
+        """Check if an NTP server appears to be working.
+
+        :param str hostname: a hostname of an NTP server
+        :param bool nts_enabled: is NTS enabled?
+        :return bool: True if the server works, otherwise False
+        """
+        log.debug("Checking NTP server %s", hostname)
+
+        try:
+            result = ntp_server_working(hostname, nts_enabled)
+        except Exception as e:  # pylint: disable=broad-except
+            log.error("Failed to check NTP server %s: %s", hostname, e)
+            result = False
+
+        if result:
+            log.debug("NTP server %s appears to be working.", hostname)
+        else:
+            log.debug("NTP server %s appears not to be working.", hostname)
+
+        return result
+
+
+# The prober of NTP servers shared by all caches.
+ntp_server_prober = NTPServerProber()
+
+
 class NTPServerStatusCache:
     """The cache of NTP server states."""
 
-    def __init__(self):
+    def __init__(self, prober=None):
         self._cache = {}
         self._changed = Signal()
+        self._prober = prober or ntp_server_prober
 
     @property
     def changed(self):
@@ -268,21 +433,34 @@ class NTPServerStatusCache:
     def check_status(self, server):
         """Asynchronously check if given NTP servers appear to be working.
 
+        The server is checked again even if its status is known,
+        because the check was requested by the user.
+
         :param TimeSourceData server: an NTP server
         """
-        # Get a hostname and NTS option.
-        hostname = server.hostname
-        nts_enabled = "nts" in server.options
+        self.check_statuses([server], force=True)
 
-        # Reset the current status.
-        self._set_status(hostname, NTP_SERVER_QUERY)
+    def check_statuses(self, servers, force=False):
+        """Asynchronously check if the given NTP servers appear to be working.
+
+        The servers are checked in one batch.
+
+        :param servers: a list of NTP servers
+        :type servers: a list of TimeSourceData
+        :param bool force: check the servers even if their states are known
+        """
+        # Get hostnames and NTS options.
+        requests = [(server.hostname, "nts" in server.options) for server in servers]
+
+        # Reset the current states.
+        for hostname, _nts_enabled in requests:
+            self._set_status(hostname, NTP_SERVER_QUERY)
 
         # Start the check.
-        thread_manager.add_thread(
-            prefix=THREAD_NTP_SERVER_CHECK,
-            target=self._check_status,
-            args=(hostname, nts_enabled)
-        )
+        known = self._prober.check(requests, self._set_results, force=force)
+
+        if known:
+            self._set_results(known)
 
     def _set_status(self, hostname, status):
         """Set the status of the given NTP server.
@@ -292,6 +470,17 @@ class NTPServerStatusCache:
         """
         self._cache[hostname] = status
 
+    def _set_results(self, results):
+        """Set the states of checked NTP servers.
+
+        :param results: a dictionary of results
+        :type results: {(str, bool): bool}
+        """
+        for (hostname, _nts_enabled), working in results.items():
+            self._set_status(hostname, NTP_SERVER_OK if working else NTP_SERVER_NOK)
+
+        self._report_status_changed()
+
     @async_action_nowait
     def _report_status_changed(self):
         """Emit the status changed signal.
@@ -300,20 +489,3 @@ class NTPServerStatusCache:
         so they will not affect the running thread.
         """
         self._changed.emit()
-
-    def _check_status(self, hostname, nts_enabled):
-        """Check if an NTP server appears to be working.
-
-        :param str hostname: a hostname of an NTP server
-        """
-        log.debug("Checking NTP server %s", hostname)
-        result = ntp_server_working(hostname, nts_enabled)
-
-        if result:
-            log.debug("NTP server %s appears to be working.", hostname)
-            self._set_status(hostname, NTP_SERVER_OK)
-        else:
-            log.debug("NTP server %s appears not to be working.", hostname)
-            self._set_status(hostname, NTP_SERVER_NOK)
-
-        self._report_status_changed()
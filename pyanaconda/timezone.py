@@ -113,11 +113,11 @@ def all_timezones():
     return zoneinfo.available_timezones() | etc_zones
 
 
-def get_all_regions_and_timezones():
-    """
-    Get a dictionary mapping the regions to the list of their timezones.
+@cache
+def _get_regions_and_timezones():
+    """Get sorted regions and their timezones. Cached.
 
-    :rtype: dict
+    :rtype: tuple of (str, frozenset)
     """
     result = OrderedDict()
 
@@ -128,7 +128,20 @@ def get_all_regions_and_timezones():
             result.setdefault(region, set())
             result[region].add(city)
 
-    return result
+    return tuple((region, frozenset(cities)) for region, cities in result.items())
+
+
+def get_all_regions_and_timezones():
+    """
+    Get a dictionary mapping the regions to the list of their timezones.
+
+    The timezones are parsed only once. Every call returns a new dictionary.
+
+    :rtype: dict
+    """
+    return OrderedDict(
+        (region, set(cities)) for region, cities in _get_regions_and_timezones()
+    )
 
 
 def parse_timezone(timezone):
@@ -22,6 +22,7 @@ __all__ = ["UserInterface"]
 import copy
 
 from pyanaconda.core.util import collect
+from pyanaconda.ui.lib.manifest import find_modules
 
 
 class PathDict(dict):
@@ -157,11 +158,15 @@ class UserInterface:
             return ((issubclass(obj, standalone_class) and getattr(obj, "preForHub", False))
                     or getattr(obj, "postForHub", False))
 
+        def is_standalone_spoke(manifest):
+            return manifest.pre_for_hub or manifest.post_for_hub
+
         for module_pattern, path in module_pattern_w_path:
             standalones.extend(
                 collect(module_pattern,
                         path,
-                        check_standalone_spokes)
+                        check_standalone_spokes,
+                        find_modules(path, is_standalone_spoke))
             )
 
         return standalones
@@ -25,6 +25,7 @@ from pyanaconda.core.constants import ANACONDA_ENVIRON, FIRSTBOOT_ENVIRON
 from pyanaconda.core.signal import Signal
 from pyanaconda.core.util import collect
 from pyanaconda.ui.categories import SpokeCategory
+from pyanaconda.ui.lib.manifest import find_modules, get_manifest
 from pyanaconda.ui.lib.services import is_reconfiguration_mode
 
 log = get_module_logger(__name__)
@@ -635,24 +636,48 @@ def collect_spokes(mask_paths, category):
 
     """
     spokes = []
+    hidden_spokes = conf.ui.hidden_spokes
+
     for mask, path in mask_paths:
+        # import only modules with spokes of the category that are not hidden
+        modules = find_modules(path, lambda c: _is_visible_spoke(c, category, hidden_spokes))
         candidate_spokes = (collect(mask, path,
-                            lambda obj: hasattr(obj, "category") and obj.category is not None and obj.category.__name__ == category))
+                            lambda obj: hasattr(obj, "category") and obj.category is not None and obj.category.__name__ == category,
+                            modules))
         # filter out any spokes from the candidates that have already been visited by the user before
-        # (eq. before Anaconda or Initial Setup started) and should not be visible again
-        visible_spokes = []
-        hidden_spokes = conf.ui.hidden_spokes
-        for candidate in candidate_spokes:
-            if candidate.__name__ in hidden_spokes:
-                log.info("Spoke %s will not be displayed because it is hidden by "
-                         "the Anaconda configuration file.", candidate.__name__)
-            else:
-                visible_spokes.append(candidate)
+        # (eq. before Anaconda or Initial Setup started) and should not be visible again;
+        # hidden spokes are skipped by find_modules, but their modules can still be
+        # imported because of other spokes
+        visible_spokes = [c for c in candidate_spokes if c.__name__ not in hidden_spokes]
         spokes.extend(visible_spokes)
 
+        # the modules of hidden spokes are usually not imported, so look them up
+        # in the manifest as well
+        hidden = {m.name for m in get_manifest(path)[0]
+                  if m.category == category and m.name in hidden_spokes}
+        hidden.update(c.__name__ for c in candidate_spokes if c.__name__ in hidden_spokes)
+
+        for name in sorted(hidden):
+            log.info("Spoke %s will not be displayed because it is hidden by "
+                     "the Anaconda configuration file.", name)
+
     return spokes
 
 
+def _is_visible_spoke(manifest, category, hidden_spokes):
+    """Is the described class a visible spoke of the category?
+
+    :param ClassManifest manifest: a description of the class
+    :param str category: a name of the category
+    :param hidden_spokes: names of hidden spokes
+    :return bool: True if the module of the class should be imported
+    """
+    if manifest.category != category:
+        return False
+
+    return manifest.name not in hidden_spokes
+
+
 def collect_categories(mask_paths):
     """Return a list of all category subclasses. Look for them in modules
        imported as module_mask % basename(f) where f is name of all files in path.
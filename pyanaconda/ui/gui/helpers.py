@@ -343,6 +343,9 @@ class GUISpokeInputCheckHandler(GUIInputCheckHandler, metaclass=ABCMeta):
            Classes implementing this class should run GUISpokeInputCheckHandler.try_to_go_back,
            and if it succeeded, run NormalSpoke.on_back_clicked.
         """
+        # run the scheduled checks, so that we don't use outdated results
+        self.checker.finish_checks()
+
         # check if we can go back
         if self.can_go_back:
             if self.needs_waiver:
@@ -114,6 +114,7 @@ from pyanaconda.ui.gui.utils import (
 )
 from pyanaconda.ui.helpers import StorageCheckHandler
 from pyanaconda.ui.lib.storage import (
+    DeviceTreeCache,
     apply_partitioning,
     create_partitioning,
     filter_disks_by_names,
@@ -173,6 +174,7 @@ class CustomPartitioningSpoke(NormalSpoke, StorageCheckHandler):
 
         self._partitioning = None
         self._device_tree = None
+        self._device_tree_cache = None
         self._request = DeviceFactoryRequest()
         self._original_request = DeviceFactoryRequest()
         self._permissions = DeviceFactoryPermissions()
@@ -342,6 +344,7 @@ class CustomPartitioningSpoke(NormalSpoke, StorageCheckHandler):
             # the storage spoke would use it as a default partitioning.
             self._partitioning = create_partitioning(PARTITIONING_METHOD_INTERACTIVE)
             self._device_tree = STORAGE.get_proxy(self._partitioning.GetDeviceTree())
+            self._device_tree_cache = DeviceTreeCache(self._device_tree)
 
         # Get the name of the new installation.
         self._os_name = self._device_tree.GenerateSystemName()
@@ -429,6 +432,7 @@ class CustomPartitioningSpoke(NormalSpoke, StorageCheckHandler):
     def _populate_accordion(self):
         # Make sure we start with a clean state.
         self._accordion.remove_all_pages()
+        self._device_tree_cache.refresh()
 
         new_devices = self._get_new_devices()
         all_devices = self._get_all_devices()
@@ -526,13 +530,8 @@ class CustomPartitioningSpoke(NormalSpoke, StorageCheckHandler):
         if not root_name:
             root_name = selector.root_name
 
-        device_data = DeviceData.from_structure(
-            self._device_tree.GetDeviceData(device_id)
-        )
-
-        format_data = DeviceFormatData.from_structure(
-            self._device_tree.GetFormatData(device_id)
-        )
+        device_data = self._device_tree_cache.get_device_data(device_id)
+        format_data = self._device_tree_cache.get_format_data(device_id)
 
         mount_point = self._get_mount_point_description(
             mount_point, format_data
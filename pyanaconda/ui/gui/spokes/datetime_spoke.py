@@ -398,8 +398,7 @@ class DatetimeSpoke(FirstbootSpokeMixIn, NormalSpoke):
         self._ntp_servers_states.changed.connect(self._update_ntp_server_warning)
 
         if self._network_module.Connected:
-            for server in self._ntp_servers:
-                self._ntp_servers_states.check_status(server)
+            self._ntp_servers_states.check_statuses(self._ntp_servers)
 
         # Set up the NTP widgets.
         self._set_ntp_enabled(self._timezone_module.NTPEnabled)
@@ -65,7 +65,8 @@ class PassphraseDialog(GUIObject):
         self._checker = input_checking.PasswordChecker(
             initial_password_content=self._passphrase_entry.get_text(),
             initial_password_confirmation_content=self._confirm_entry.get_text(),
-            policy_name=PASSWORD_POLICY_LUKS
+            policy_name=PASSWORD_POLICY_LUKS,
+            delay=constants.PASSWORD_CHECK_DELAY
         )
 
         # configure the checker for passphrase checking
@@ -200,6 +201,9 @@ class PassphraseDialog(GUIObject):
         self._checker.password_confirmation.content = entry.get_text()
 
     def on_entry_activated(self, entry):
+        # make sure the save button reflects the current input
+        self._checker.finish_checks()
+
         if self._save_button.get_sensitive() and \
            entry.get_text() == self._passphrase_entry.get_text():
             self._save_button.emit("clicked")
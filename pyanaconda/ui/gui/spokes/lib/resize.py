@@ -24,13 +24,10 @@ from blivet.size import Size
 from pyanaconda.anaconda_loggers import get_module_logger
 from pyanaconda.core.i18n import C_, N_, P_, _
 from pyanaconda.modules.common.constants.services import STORAGE
-from pyanaconda.modules.common.structures.storage import (
-    DeviceData,
-    DeviceFormatData,
-    OSData,
-)
+from pyanaconda.modules.common.structures.storage import OSData
 from pyanaconda.ui.gui import GUIObject
 from pyanaconda.ui.gui.utils import blockedHandler, escape_markup, timed_action
+from pyanaconda.ui.lib.storage import DeviceTreeCache
 
 gi.require_version("Gdk", "3.0")
 gi.require_version("Gtk", "3.0")
@@ -78,6 +75,7 @@ class ResizeDialog(GUIObject):
         self._device_tree = STORAGE.get_proxy(
             partitioning.GetDeviceTree()
         )
+        self._device_tree_cache = DeviceTreeCache(self._device_tree)
 
         # Get roots of existing systems.
         self._roots = OSData.from_structure_list(
@@ -124,9 +122,7 @@ class ResizeDialog(GUIObject):
 
         # Otherwise, fall back on increasingly vague information.
         if device_data.children:
-            child_data = DeviceData.from_structure(
-                self._device_tree.GetDeviceData(device_data.children[0])
-            )
+            child_data = self._device_tree_cache.get_device_data(device_data.children[0])
             return child_data.name
 
         if "label" in format_data.attrs:
@@ -141,6 +137,7 @@ class ResizeDialog(GUIObject):
             return None
 
     def populate(self, disks):
+        self._device_tree_cache.refresh()
         self._selected_reclaimable_space = Size(0)
         self._can_shrink_something = False
 
@@ -172,12 +169,8 @@ class ResizeDialog(GUIObject):
 
     def _add_disk(self, device_id):
         # Get the device data.
-        device_data = DeviceData.from_structure(
-            self._device_tree.GetDeviceData(device_id)
-        )
-        format_data = DeviceFormatData.from_structure(
-            self._device_tree.GetFormatData(device_id)
-        )
+        device_data = self._device_tree_cache.get_device_data(device_id)
+        format_data = self._device_tree_cache.get_format_data(device_id)
 
         # First add the disk itself.
         is_partitioned = self._device_tree.IsDevicePartitioned(device_id)
@@ -227,17 +220,13 @@ class ResizeDialog(GUIObject):
 
     def _add_partition(self, itr, device_id):
         # Get the device data.
-        device_data = DeviceData.from_structure(
-            self._device_tree.GetDeviceData(device_id)
-        )
-        format_data = DeviceFormatData.from_structure(
-            self._device_tree.GetFormatData(device_id)
-        )
+        device_data = self._device_tree_cache.get_device_data(device_id)
+        format_data = self._device_tree_cache.get_format_data(device_id)
 
         # Calculate the free size.
         # Devices that are not resizable are still deletable.
         is_shrinkable = self._device_tree.IsDeviceShrinkable(device_id)
-        size_limits = self._device_tree.GetDeviceSizeLimits(device_id)
+        size_limits = self._device_tree_cache.get_device_size_limits(device_id)
 
         min_size = Size(size_limits[0])
         device_size = Size(device_data.size)
@@ -283,7 +272,7 @@ class ResizeDialog(GUIObject):
 
     def _add_free_space(self, itr, device_id):
         # Calculate the free space.
-        disk_free = Size(self._device_tree.GetDiskFreeSpace([device_id]))
+        disk_free = Size(self._device_tree_cache.get_disk_free_space(device_id))
 
         if disk_free < Size("1MiB"):
             return
@@ -402,9 +391,7 @@ class ResizeDialog(GUIObject):
             return
 
         device_id = obj.device_id
-        device_data = DeviceData.from_structure(
-            self._device_tree.GetDeviceData(device_id)
-        )
+        device_data = self._device_tree_cache.get_device_data(device_id)
 
         # If the selected filesystem does not support shrinking, make that
         # button insensitive.
@@ -412,7 +399,7 @@ class ResizeDialog(GUIObject):
         self._shrink_button.set_sensitive(is_shrinkable)
 
         if is_shrinkable:
-            min_size = self._device_tree.GetDeviceSizeLimits(device_id)[0]
+            min_size = self._device_tree_cache.get_device_size_limits(device_id)[0]
             self._setup_slider(min_size, device_data.size, Size(obj.target))
 
         # Then, disable the button for whatever action is currently selected.
@@ -465,9 +452,7 @@ class ResizeDialog(GUIObject):
         if is_partitioned:
             return False
 
-        device_data = DeviceData.from_structure(
-            self._device_tree.GetDeviceData(device_id)
-        )
+        device_data = self._device_tree_cache.get_device_data(device_id)
 
         if obj.action == _(PRESERVE):
             return False
@@ -523,9 +508,7 @@ class ResizeDialog(GUIObject):
                     self._disk_store[part_itr][EDITABLE_COL] = False
                 elif new_action == PRESERVE:
                     part_id = self._disk_store[part_itr][DEVICE_ID_COL]
-                    part_data = DeviceData.from_structure(
-                        self._device_tree.GetDeviceData(part_id)
-                    )
+                    part_data = self._device_tree_cache.get_device_data(part_id)
                     self._disk_store[part_itr][EDITABLE_COL] = not part_data.protected
 
                 part_itr = self._disk_store.iter_next(part_itr)
@@ -591,9 +574,7 @@ class ResizeDialog(GUIObject):
                 continue
 
             device_id = obj.device_id
-            device_data = DeviceData.from_structure(
-                self._device_tree.GetDeviceData(device_id)
-            )
+            device_data = self._device_tree_cache.get_device_data(device_id)
 
             if device_data.is_disk:
                 self._on_action_changed(itr, action)
@@ -95,7 +95,8 @@ class PasswordSpoke(FirstbootSpokeMixIn, NormalSpoke, GUISpokeInputCheckHandler)
         self._checker = input_checking.PasswordChecker(
                 initial_password_content=self.password,
                 initial_password_confirmation_content=self.password_confirmation,
-                policy_name=PASSWORD_POLICY_ROOT
+                policy_name=PASSWORD_POLICY_ROOT,
+                delay=constants.PASSWORD_CHECK_DELAY
         )
         # configure root username for checking
         self.checker.username = "root"
@@ -47,7 +47,6 @@ from pyanaconda.modules.common.constants.objects import (
 )
 from pyanaconda.modules.common.constants.services import STORAGE
 from pyanaconda.modules.common.structures.partitioning import PartitioningRequest
-from pyanaconda.modules.common.structures.storage import DeviceData
 from pyanaconda.modules.common.structures.validation import ValidationReport
 from pyanaconda.ui.categories.system import SystemCategory
 from pyanaconda.ui.communication import hubQ
@@ -74,6 +73,7 @@ from pyanaconda.ui.gui.utils import ignoreEscape
 from pyanaconda.ui.helpers import StorageCheckHandler
 from pyanaconda.ui.lib.format_dasd import DasdFormatting
 from pyanaconda.ui.lib.storage import (
+    DeviceTreeCache,
     apply_disk_selection,
     apply_partitioning,
     create_partitioning,
@@ -134,6 +134,7 @@ class StorageSpoke(NormalSpoke, StorageCheckHandler):
 
         self._storage_module = STORAGE.get_proxy()
         self._device_tree = STORAGE.get_proxy(DEVICE_TREE)
+        self._device_tree_cache = DeviceTreeCache(self._device_tree)
         self._bootloader_module = STORAGE.get_proxy(BOOTLOADER)
         self._disk_init_module = STORAGE.get_proxy(DISK_INITIALIZATION)
         self._disk_select_module = STORAGE.get_proxy(DISK_SELECTION)
@@ -423,12 +424,12 @@ class StorageSpoke(NormalSpoke, StorageCheckHandler):
         # of them, we do not display them in the box by default.  Instead, only
         # those selected in the filter UI are displayed.  This means refresh
         # needs to know to create and destroy overviews as appropriate.
+        self._device_tree_cache.refresh()
+
         for disk_id in self._available_disks:
 
             # Get the device data.
-            device_data = DeviceData.from_structure(
-                self._device_tree.GetDeviceData(disk_id)
-            )
+            device_data = self._device_tree_cache.get_device_data(disk_id)
 
             if is_local_disk(device_data.type):
                 # Add all available local disks.
@@ -497,7 +498,7 @@ class StorageSpoke(NormalSpoke, StorageCheckHandler):
             description = device_data.description
 
         kind = "drive-removable-media" if device_data.removable else "drive-harddisk"
-        free_space = self._device_tree.GetDiskFreeSpace([device_data.device_id])
+        free_space = self._device_tree_cache.get_disk_free_space(device_data.device_id)
         serial_number = device_data.attrs.get("serial") or None
 
         overview = AnacondaWidgets.DiskOverview(
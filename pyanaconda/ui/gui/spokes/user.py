@@ -310,7 +310,8 @@ class UserSpoke(FirstbootSpokeMixIn, NormalSpoke, GUISpokeInputCheckHandler):
         self._checker = input_checking.PasswordChecker(
                 initial_password_content=self.password,
                 initial_password_confirmation_content=self.password_confirmation,
-                policy_name=PASSWORD_POLICY_USER
+                policy_name=PASSWORD_POLICY_USER,
+                delay=constants.PASSWORD_CHECK_DELAY
         )
         # configure the checker for password checking
         self.checker.username = self.username
@@ -569,7 +570,7 @@ class UserSpoke(FirstbootSpokeMixIn, NormalSpoke, GUISpokeInputCheckHandler):
         self._empty_check.skip = not new_username or not self._password_is_required
         self._validity_check.skip = not new_username or not self._password_is_required
         # Re-run the password checks against the new username
-        self.checker.run_checks()
+        self.checker.schedule_checks()
 
     def on_full_name_changed(self, editable, data=None):
         """Called by Gtk callback when the full name field changes."""
@@ -583,7 +584,7 @@ class UserSpoke(FirstbootSpokeMixIn, NormalSpoke, GUISpokeInputCheckHandler):
         self.checker.fullname = fullname
 
         # rerun the checks
-        self.checker.run_checks()
+        self.checker.schedule_checks()
 
     def on_admin_toggled(self, togglebutton, data=None):
         # Add or remove user admin status based on changes to the admin checkbox
@@ -0,0 +1,165 @@
+#
+# Copyright (C) 2026  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 31 Milk Street #960789 Boston, MA
+# 02196 USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+import ast
+import functools
+import os
+from collections import namedtuple
+
+from pyanaconda.anaconda_loggers import get_module_logger
+
+__all__ = ["ClassManifest", "find_modules", "get_manifest"]
+
+log = get_module_logger(__name__)
+
+# A description of a class found in the source code of a module.
+# The class is resolved if all its base classes are described.
+ClassManifest = namedtuple(
+    "ClassManifest",
+    ["module", "name", "bases", "category", "pre_for_hub", "post_for_hub", "resolved"],
+    defaults=[True]
+)
+
+# Class attributes described by the manifest.
+_ATTRIBUTES = {
+    "category": "category",
+    "preForHub": "pre_for_hub",
+    "postForHub": "post_for_hub",
+}
+
+
+@functools.cache
+def get_manifest(path):
+    """Describe classes of UI modules in the directory without importing them.
+
+    The spokes are found by names of their categories and hubs that are
+    assigned in the class body.  A class that doesn't assign them inherits
+    them from a base class defined in the same directory.  A class with
+    other base classes is not resolved, because it can inherit them from
+    a base class that is not described.
+
+    Modules that can't be described, for example compiled modules or
+    modules with invalid sources, have to be imported to find their classes.
+
+    :param str path: a path to the directory
+    :return: a list of class manifests and a set of modules to import
+    :rtype: (list of ClassManifest, set of str)
+    """
+    classes = []
+    unknown = set()
+
+    try:
+        contents = sorted(os.listdir(path))
+    except OSError:
+        return classes, unknown
+
+    for module_file in contents:
+        mod_name, ext = os.path.splitext(module_file)
+
+        if mod_name == "__init__" or ext not in (".py", ".so"):
+            continue
+
+        if ext == ".so":
+            unknown.add(mod_name)
+            continue
+
+        try:
+            with open(os.path.join(path, module_file), "rb") as f:
+                tree = ast.parse(f.read(), module_file)
+        except (OSError, SyntaxError, ValueError) as e:
+            log.debug("Failed to describe module %s: %s", mod_name, e)
+            unknown.add(mod_name)
+            continue
+
+        classes.extend(_describe_classes(mod_name, tree))
+
+    return _inherit_attributes(classes), unknown
+
+
+def _describe_classes(mod_name, tree):
+    """Describe top-level classes of the module."""
+    for node in tree.body:
+        if not isinstance(node, ast.ClassDef):
+            continue
+
+        attributes = dict.fromkeys(_ATTRIBUTES.values())
+
+        for statement in node.body:
+            if not isinstance(statement, ast.Assign):
+                continue
+
+            for target in statement.targets:
+                if isinstance(target, ast.Name) and target.id in _ATTRIBUTES:
+                    attributes[_ATTRIBUTES[target.id]] = _get_name(statement.value)
+
+        names = tuple(map(_get_name, node.bases))
+        bases = tuple(filter(None, names))
+        resolved = None not in names
+        yield ClassManifest(mod_name, node.name, bases, **attributes, resolved=resolved)
+
+
+def _get_name(node):
+    """Get a name referenced by the node or None."""
+    if isinstance(node, ast.Name):
+        return node.id
+
+    if isinstance(node, ast.Attribute):
+        return node.attr
+
+    return None
+
+
+def _inherit_attributes(classes):
+    """Inherit missing attributes from base classes of the same directory."""
+    by_name = {c.name: c for c in classes}
+
+    def resolve(cls, seen):
+        for base_name in cls.bases:
+            base = by_name.get(base_name)
+
+            if base_name == "object" or base_name in seen:
+                continue
+
+            if base is None:
+                cls = cls._replace(resolved=False)
+                continue
+
+            base = resolve(base, seen | {base_name})
+            cls = cls._replace(resolved=cls.resolved and base.resolved, **{
+                attr: getattr(cls, attr) or getattr(base, attr)
+                for attr in _ATTRIBUTES.values()
+            })
+
+        return cls
+
+    return [resolve(c, {c.name}) for c in classes]
+
+
+def find_modules(path, pred):
+    """Find modules of the directory that have to be imported.
+
+    A module is skipped only if all its classes are provably irrelevant.
+    The module is imported if a class is not resolved and doesn't have
+    a known category, because its attributes might be inherited from
+    a class that is not described.
+
+    :param str path: a path to the directory
+    :param pred: a function which marks class manifests of wanted classes
+    :return: a set of module names
+    """
+    classes, unknown = get_manifest(path)
+    return unknown | {c.module for c in classes if pred(c) or not (c.resolved or c.category)}
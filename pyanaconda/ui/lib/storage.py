@@ -44,6 +44,11 @@ from pyanaconda.modules.common.errors.configuration import (
     BootloaderConfigurationError,
     StorageConfigurationError,
 )
+from pyanaconda.modules.common.structures.storage import (
+    DeviceData,
+    DeviceFormatData,
+    DeviceTreeSnapshotData,
+)
 from pyanaconda.modules.common.structures.validation import ValidationReport
 from pyanaconda.modules.common.task import sync_run_task
 
@@ -351,3 +356,94 @@ def filter_disks_by_names(disks, disk_ids):
     :return: a list of filtered disk IDs
     """
     return list(filter(lambda disk_id: disk_id in disks, disk_ids))
+
+
+class DeviceTreeCache:
+    """The cache of the device tree data.
+
+    Use the device tree cache to get data of many devices without
+    a D-Bus call for every device. Data of all devices are requested
+    at once and requested again only if the generation of the device
+    tree has changed.
+
+    Call the refresh method every time the device tree might have
+    been changed. Data of devices that are not in the snapshot of
+    the device tree, for example hidden devices, are requested from
+    the device tree directly.
+    """
+
+    def __init__(self, device_tree):
+        """Create a new cache.
+
+        :param device_tree: a proxy of a device tree
+        """
+        self._device_tree = device_tree
+        self._generation = None
+        self._devices = {}
+        self._formats = {}
+        self._size_limits = {}
+        self._free_space = {}
+
+    def refresh(self):
+        """Update the cache if the device tree has changed."""
+        if self._generation == self._device_tree.GetDeviceTreeGeneration():
+            return
+
+        snapshot = DeviceTreeSnapshotData.from_structure(
+            self._device_tree.GetDeviceTreeSnapshot()
+        )
+
+        log.debug("Updating the device tree cache to the generation %s.", snapshot.generation)
+        self._generation = snapshot.generation
+        self._devices = {d.device_id: d for d in snapshot.devices}
+        self._formats = {
+            d.device_id: f for d, f in zip(snapshot.devices, snapshot.formats)
+        }
+        self._size_limits = snapshot.size_limits
+        self._free_space = snapshot.free_space
+
+    def get_device_data(self, device_id):
+        """Get the device data.
+
+        :param str device_id: a device ID
+        :return DeviceData: the device data
+        """
+        if device_id not in self._devices:
+            return DeviceData.from_structure(self._device_tree.GetDeviceData(device_id))
+
+        return self._devices[device_id]
+
+    def get_format_data(self, device_id):
+        """Get the format data of the device.
+
+        :param str device_id: a device ID
+        :return DeviceFormatData: the format data
+        """
+        if device_id not in self._formats:
+            return DeviceFormatData.from_structure(self._device_tree.GetFormatData(device_id))
+
+        return self._formats[device_id]
+
+    def get_device_size_limits(self, device_id):
+        """Get size limits of the device.
+
+        The device tree has to support resizing of devices.
+
+        :param str device_id: a device ID
+        :return: a tuple of min and max sizes in bytes
+        """
+        if device_id not in self._size_limits:
+            return self._device_tree.GetDeviceSizeLimits(device_id)
+
+        return self._size_limits[device_id]
+
+    def get_disk_free_space(self, disk_id):
+        """Get free space on the disk.
+
+        :param str disk_id: a disk ID
+        :return: a size in bytes
+        """
+        if disk_id not in self._free_space:
+            return self._device_tree.GetDiskFreeSpace([disk_id])
+
+        return self._free_space[disk_id]
@@ -0,0 +1,112 @@
+#!/usr/bin/python3
+#
+# Copyright (C) 2026  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 31 Milk Street #960789 Boston, MA
+# 02196 USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+"""Measure the cost of the DNF download progress callbacks.
+
+Simulate the callbacks of a large transaction and print the time spent
+in the DownloadProgress class. The progress is reported on every tick,
+which is the worst case. For comparison, the same callbacks are sent to
+a copy of the previous implementation, which summed the downloaded
+sizes of all packages on every report:
+
+    PYTHONPATH=. ./tests/performance_tests/dnf_download_progress_benchmark.py \\
+        --packages 3000 --ticks 20
+"""
+import argparse
+import time
+
+import libdnf5
+
+from pyanaconda.modules.payloads.payload.dnf.download_progress import DownloadProgress
+
+
+def parse_args():
+    """Parse the command line arguments."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--packages", type=int, default=3000, help="number of packages")
+    parser.add_argument("--ticks", type=int, default=20, help="progress ticks per package")
+    parser.add_argument("--parallel", type=int, default=3, help="packages downloaded at once")
+    parser.add_argument("--rounds", type=int, default=3, help="number of rounds")
+    return parser.parse_args()
+
+
+class PreviousDownloadProgress(DownloadProgress):
+    """The accounting of the previous implementation."""
+
+    def __init__(self, callback):
+        super().__init__(callback)
+        self.downloads_by_name = {}
+
+    def progress(self, user_cb_data, total_to_download, downloaded):
+        nevra = self.user_cb_data_container[user_cb_data]
+        self.downloads_by_name[nevra] = downloaded
+
+        if total_to_download > 0:
+            self._report_progress()
+
+        return 0
+
+    def _update_rate(self):
+        self.downloaded_size = sum(self.downloads_by_name.values())
+
+
+def simulate(progress_class, args):
+    """Simulate a transaction and return the time spent in the callbacks."""
+    progress = progress_class(lambda msg: None)
+    size = 1024 * 1024
+    start = time.perf_counter()
+
+    for first in range(0, args.packages, args.parallel):
+        batch = range(first, min(first + args.parallel, args.packages))
+
+        for i in batch:
+            progress.last_time = 0
+            progress.add_new_download(None, "package-{}".format(i), size)
+
+        for tick in range(1, args.ticks + 1):
+            for i in batch:
+                progress.last_time = 0
+                progress.progress(i, size, size * tick // args.ticks)
+
+        for i in batch:
+            progress.last_time = 0
+            progress.end(i, libdnf5.repo.DownloadCallbacks.TransferStatus_SUCCESSFUL, "")
+
+    return time.perf_counter() - start
+
+
+def main():
+    """Run the benchmark."""
+    args = parse_args()
+    ticks = args.packages * args.ticks
+    results = {"previous": [], "current": []}
+
+    for _ in range(args.rounds):
+        results["previous"].append(simulate(PreviousDownloadProgress, args))
+        results["current"].append(simulate(DownloadProgress, args))
+
+    for name, times in results.items():
+        print("{:<8} best {:8.3f} s, {:8.2f} us per tick".format(
+            name, min(times), 1000000 * min(times) / ticks
+        ))
+
+    print("Speedup: {:.2f}x".format(min(results["previous"]) / min(results["current"])))
+
+
+if __name__ == "__main__":
+    main()
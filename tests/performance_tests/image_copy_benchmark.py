@@ -0,0 +1,158 @@
+#!/usr/bin/python3
+#
+# Copyright (C) 2026  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 31 Milk Street #960789 Boston, MA
+# 02196 USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+"""Compare rsync and the parallel copy of a live image.
+
+Copy the same file tree with rsync and with the FileTreeCopier class
+and print the copy times. By default, a synthetic tree that resembles
+an installed system is generated, but any directory, for example a
+mounted live image, can be used instead:
+
+    PYTHONPATH=. ./tests/performance_tests/image_copy_benchmark.py \\
+        --source /run/install/source --target /mnt/benchmark
+
+The target directory should be on the storage you want to measure.
+Its content is removed before every round.
+"""
+import argparse
+import os
+import random
+import shutil
+import subprocess
+import tempfile
+import time
+
+from pyanaconda.modules.payloads.payload.live_image.copier import (
+    COPY_WORKERS,
+    FileTreeCopier,
+)
+from pyanaconda.modules.payloads.payload.live_image.installation import IMAGE_EXCLUDES
+
+
+def parse_args():
+    """Parse the command line arguments."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--source", help="a directory to copy")
+    parser.add_argument("--target", help="a directory to copy to")
+    parser.add_argument("--files", type=int, default=20000, help="number of generated files")
+    parser.add_argument("--workers", type=int, default=COPY_WORKERS, help="number of workers")
+    parser.add_argument("--rounds", type=int, default=3, help="number of rounds")
+    return parser.parse_args()
+
+
+def generate_tree(path, files):
+    """Generate a file tree with mostly small files and a few big ones."""
+    rand = random.Random(42)
+
+    for i in range(files):
+        directory = os.path.join(path, "usr", "d{}".format(i % 97), "s{}".format(i % 13))
+        os.makedirs(directory, exist_ok=True)
+        file_path = os.path.join(directory, "f{}".format(i))
+
+        size = rand.choice([0, 100, 1000, 4000, 16000, 64000]) if i % 500 else 8 * 1024 * 1024
+
+        with open(file_path, "wb") as f:
+            f.write(rand.randbytes(size))
+
+        if i % 50 == 0:
+            os.symlink("f{}".format(i), file_path + ".link")
+
+        if i % 200 == 0:
+            os.link(file_path, file_path + ".hardlink")
+
+
+def clean_directory(path):
+    """Remove the content of a directory."""
+    for name in os.listdir(path):
+        entry = os.path.join(path, name)
+
+        if os.path.isdir(entry) and not os.path.islink(entry):
+            shutil.rmtree(entry)
+        else:
+            os.unlink(entry)
+
+
+def run_rsync(source, target, _workers):
+    """Copy the tree with rsync like the image installation does."""
+    args = ["rsync", "-pogAXtlHrDx", "--no-inc-recursive"]
+
+    for pattern in IMAGE_EXCLUDES:
+        args.extend(["--exclude", pattern])
+
+    args.extend([source + "/", target])
+    subprocess.run(args, check=True)
+
+
+def run_copier(source, target, workers):
+    """Copy the tree with the FileTreeCopier class."""
+    FileTreeCopier(
+        source=source,
+        target=target,
+        callback=lambda msg: None,
+        excludes=IMAGE_EXCLUDES,
+        workers=workers,
+    ).copy()
+
+
+def measure(run, args, source, target):
+    """Measure the copy time."""
+    clean_directory(target)
+    os.sync()
+
+    start = time.monotonic()
+    run(source, target, args.workers)
+    os.sync()
+    return time.monotonic() - start
+
+
+def main():
+    """Run the benchmark."""
+    args = parse_args()
+    temporary = tempfile.mkdtemp(prefix="image-copy-benchmark-")
+
+    try:
+        source = args.source
+
+        if not source:
+            source = os.path.join(temporary, "source")
+            generate_tree(source, args.files)
+
+        target = args.target or os.path.join(temporary, "target")
+        os.makedirs(target, exist_ok=True)
+
+        results = {"rsync": [], "copier": []}
+
+        for _ in range(args.rounds):
+            results["rsync"].append(measure(run_rsync, args, source, target))
+            results["copier"].append(measure(run_copier, args, source, target))
+
+        for name, times in results.items():
+            print("{:<7} best {:8.2f} s, mean {:8.2f} s".format(
+                name, min(times), sum(times) / len(times)
+            ))
+
+        speedup = min(results["rsync"]) / min(results["copier"])
+        print("Speedup of the parallel copy with {} workers: {:.2f}x".format(
+            args.workers, speedup
+        ))
+    finally:
+        shutil.rmtree(temporary, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+#!/usr/bin/python3
+#
+# Copyright (C) 2026  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 31 Milk Street #960789 Boston, MA
+# 02196 USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+"""Measure how the network device configurations scale with connections.
+
+Populate the DeviceConfigurations class from a fake NetworkManager client
+with physical devices and VLAN connections on top of them, then remove all
+devices and connections with the NetworkManager signal callbacks. Half of
+the VLANs are active. For comparison, the same is done with a copy of the
+previous implementation, which scanned all configurations on every lookup.
+Run it with several sizes to see the scaling:
+
+    PYTHONPATH=. ./tests/performance_tests/network_device_configurations_benchmark.py \\
+        --devices 50 --connections 250 500 1000 2000
+"""
+import argparse
+import time
+
+import gi
+
+from pyanaconda.modules.network.constants import (
+    NM_CONNECTION_TYPE_ETHERNET,
+    NM_CONNECTION_TYPE_VLAN,
+)
+from pyanaconda.modules.network.device_configuration import DeviceConfigurations
+
+gi.require_version("NM", "1.0")
+from gi.repository import NM
+
+
+def parse_args():
+    """Parse the command line arguments."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--devices", type=int, default=50, help="number of physical devices")
+    parser.add_argument("--connections", type=int, nargs="+", default=[1000],
+                        help="numbers of VLAN connections")
+    parser.add_argument("--rounds", type=int, default=3, help="number of rounds")
+    return parser.parse_args()
+
+
+class PreviousDeviceConfigurations(DeviceConfigurations):
+    """The lookups of the previous implementation."""
+
+    def get_for_device(self, device_name):
+        return [cfg for cfg in self._device_configurations.values()
+                if cfg.device_name == device_name]
+
+    def get_for_uuid(self, connection_uuid):
+        return [cfg for cfg in self._device_configurations.values()
+                if cfg.connection_uuid == connection_uuid]
+
+
+class FakeSetting:
+    """A fake connection setting."""
+
+    def __init__(self, iface):
+        self._iface = iface
+
+    def get_interface_name(self):
+        return self._iface
+
+    def get_read_only(self):
+        return False
+
+    def get_controller(self):
+        return None
+
+    def get_port_type(self):
+        return None
+
+
+class FakeConnection:
+    """A fake NetworkManager connection."""
+
+    def __init__(self, uuid, iface, connection_type):
+        self._uuid = uuid
+        self._type = connection_type
+        self._setting = FakeSetting(iface)
+
+    def get_uuid(self):
+        return self._uuid
+
+    def get_id(self):
+        return self._uuid
+
+    def get_connection_type(self):
+        return self._type
+
+    def get_setting_connection(self):
+        return self._setting
+
+    def get_connection(self):
+        return self
+
+
+class FakeDevice:
+    """A fake NetworkManager device."""
+
+    def __init__(self, iface, device_type, connection):
+        self._iface = iface
+        self._type = device_type
+        self._connection = connection
+
+    def get_iface(self):
+        return self._iface
+
+    def get_device_type(self):
+        return self._type
+
+    def get_hw_address(self):
+        return None
+
+    def get_permanent_hw_address(self):
+        return None
+
+    def get_available_connections(self):
+        return [self._connection]
+
+    def get_active_connection(self):
+        if self._type == NM.DeviceType.VLAN:
+            return self._connection
+        return None
+
+
+class FakeClient:
+    """A fake NetworkManager client."""
+
+    def __init__(self, devices, connections):
+        self._devices = devices
+        self._connections = connections
+        self._connections_by_uuid = {c.get_uuid(): c for c in connections}
+
+    def get_devices(self):
+        return self._devices
+
+    def get_connections(self):
+        return self._connections
+
+    def get_connection_by_uuid(self, uuid):
+        return self._connections_by_uuid.get(uuid)
+
+
+def create_client(devices, connections):
+    """Create a fake client with physical devices and VLANs."""
+    device_objects = []
+    connection_objects = []
+
+    for i in range(devices):
+        iface = "ens{}".format(i)
+        connection = FakeConnection("eth-{}".format(i), iface, NM_CONNECTION_TYPE_ETHERNET)
+        connection_objects.append(connection)
+        device_objects.append(FakeDevice(iface, NM.DeviceType.ETHERNET, connection))
+
+    for i in range(connections):
+        iface = "ens{}.{}".format(i % devices, i + 1)
+        connection = FakeConnection("vlan-{}".format(i), iface, NM_CONNECTION_TYPE_VLAN)
+        connection_objects.append(connection)
+
+        if i % 2:
+            device_objects.append(FakeDevice(iface, NM.DeviceType.VLAN, connection))
+
+    return FakeClient(device_objects, connection_objects)
+
+
+def simulate(configurations_class, client):
+    """Populate and tear down the configurations and return the time."""
+    configurations = configurations_class(client)
+    start = time.perf_counter()
+
+    configurations.reload()
+    assert len(configurations.get_all()) == len(client.get_connections())
+
+    for device in client.get_devices():
+        configurations._device_removed_cb(client, device)
+
+    for connection in client.get_connections():
+        configurations._connection_removed_cb(client, connection)
+
+    assert not configurations.get_all()
+    return time.perf_counter() - start
+
+
+def main():
+    """Run the benchmark."""
+    args = parse_args()
+
+    for connections in args.connections:
+        client = create_client(args.devices, connections)
+        results = {"previous": [], "current": []}
+
+        for _ in range(args.rounds):
+            results["previous"].append(simulate(PreviousDeviceConfigurations, client))
+            results["current"].append(simulate(DeviceConfigurations, client))
+
+        print("{} connections:".format(len(client.get_connections())))
+
+        for name, times in results.items():
+            print("  {:<8} best {:8.3f} s".format(name, min(times)))
+
+        print("  Speedup: {:.2f}x".format(min(results["previous"]) / min(results["current"])))
+
+
+if __name__ == "__main__":
+    main()
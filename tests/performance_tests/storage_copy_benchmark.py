@@ -0,0 +1,122 @@
+#!/usr/bin/python3
+#
+# Copyright (C) 2026  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 31 Milk Street #960789 Boston, MA
+# 02196 USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+"""Compare the full and the shallow copy of the storage model.
+
+Create a storage model with a synthetic device tree of disks, LVM volume
+groups and logical volumes with file systems, and print the time and the
+memory needed to create a full copy of the model and a shallow copy that
+shares the devices. The storage module used the full copy to scan devices.
+No real devices are created or modified, but blivet and libblockdev have
+to be installed:
+
+    PYTHONPATH=. ./tests/performance_tests/storage_copy_benchmark.py --devices 500
+"""
+import argparse
+import time
+import tracemalloc
+
+from blivet.devices import DiskDevice, LVMLogicalVolumeDevice, LVMVolumeGroupDevice
+from blivet.formats import get_format
+from blivet.size import Size
+
+from pyanaconda.modules.storage.devicetree import create_storage
+
+# Every volume group has this number of disks and logical volumes.
+DISKS_PER_GROUP = 4
+VOLUMES_PER_GROUP = 5
+
+
+def parse_args():
+    """Parse the command line arguments."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--devices", type=int, default=500, help="number of devices")
+    parser.add_argument("--rounds", type=int, default=3, help="number of rounds")
+    return parser.parse_args()
+
+
+def create_device_tree(devices):
+    """Create a storage model with the given number of devices."""
+    storage = create_storage()
+    groups = max(1, devices // (DISKS_PER_GROUP + VOLUMES_PER_GROUP + 1))
+
+    for i in range(groups):
+        disks = []
+
+        for j in range(DISKS_PER_GROUP):
+            disk = DiskDevice(
+                "disk{}x{}".format(i, j),
+                size=Size("100 GiB"),
+                fmt=get_format("lvmpv")
+            )
+            storage.devicetree._add_device(disk)
+            disks.append(disk)
+
+        vg = LVMVolumeGroupDevice("vg{}".format(i), parents=disks)
+        storage.devicetree._add_device(vg)
+
+        for j in range(VOLUMES_PER_GROUP):
+            lv = LVMLogicalVolumeDevice(
+                "lv{}".format(j),
+                parents=[vg],
+                size=Size("10 GiB"),
+                fmt=get_format("xfs", mountpoint="/data/{}/{}".format(i, j))
+            )
+            storage.devicetree._add_device(lv)
+
+    return storage
+
+
+def measure(copy_method):
+    """Return the time and the peak memory of the copy."""
+    start = time.perf_counter()
+    copy_method()
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    copy_method()
+    _current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return elapsed, peak
+
+
+def main():
+    """Run the benchmark."""
+    args = parse_args()
+    storage = create_device_tree(args.devices)
+    results = {"full": [], "shallow": []}
+
+    for _ in range(args.rounds):
+        results["full"].append(measure(storage.copy))
+        results["shallow"].append(measure(storage.shallow_copy))
+
+    print("{} devices:".format(len(storage.devices)))
+
+    for name, runs in results.items():
+        print("  {:<8} best {:8.3f} s, {:8.1f} MiB".format(
+            name, min(t for t, _ in runs), min(m for _, m in runs) / 2**20
+        ))
+
+    print("  Speedup: {:.2f}x".format(
+        min(t for t, _ in results["full"]) / min(t for t, _ in results["shallow"])
+    ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+#!/usr/bin/python3
+#
+# Copyright (C) 2026  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 31 Milk Street #960789 Boston, MA
+# 02196 USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+"""Measure how long it takes to collect the spokes of the user interface.
+
+Collect the standalone spokes and the categories and spokes of the summary
+hub in a fresh Python process, the same way the graphical or the text user
+interface does it. Print the time and the number of imported modules. The
+spokes are not instantiated, so the time to show the hub is not measured. For comparison, the same is done without the manifest of
+the spoke modules, which imported every module of the spoke directories.
+Spokes hidden by the configuration file can be simulated:
+
+    PYTHONPATH=. ./tests/performance_tests/ui_spokes_import_benchmark.py \\
+        --ui gui --hidden-spokes UserSpoke PasswordSpoke
+
+The graphical interface needs the GTK libraries, but not a display.
+"""
+import argparse
+import json
+import subprocess
+import sys
+
+COLLECT_SCRIPT = """
+import json
+import sys
+import time
+from unittest.mock import patch
+
+from pyanaconda.core.configuration.anaconda import conf
+from pyanaconda.ui.common import collectCategoriesAndSpokes
+
+if "{ui}" == "gui":
+    from pyanaconda.ui.gui import GraphicalUserInterface as Interface
+    from pyanaconda.ui.gui.hubs.summary import SummaryHub
+    from pyanaconda.ui.gui.spokes import StandaloneSpoke
+else:
+    from pyanaconda.ui.tui import TextUserInterface as Interface
+    from pyanaconda.ui.tui.hubs.summary import SummaryHub
+    from pyanaconda.ui.tui.spokes import StandaloneSpoke
+
+conf.ui._set_option("hidden_spokes", " ".join({hidden_spokes!r}))
+modules = set(sys.modules)
+
+with patch("pyanaconda.ui.find_modules", {find_modules}), \\
+        patch("pyanaconda.ui.common.find_modules", {find_modules}):
+    start = time.perf_counter()
+    Interface._collectActionClasses(Interface.paths["spokes"], StandaloneSpoke)
+    collectCategoriesAndSpokes(Interface.paths, SummaryHub)
+    elapsed = time.perf_counter() - start
+
+print(json.dumps([elapsed, len(set(sys.modules) - modules)]))
+"""
+
+
+def parse_args():
+    """Parse the command line arguments."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ui", choices=["gui", "tui"], default="tui", help="user interface")
+    parser.add_argument("--hidden-spokes", nargs="*", default=[], help="names of hidden spokes")
+    parser.add_argument("--rounds", type=int, default=5, help="number of rounds")
+    return parser.parse_args()
+
+
+def collect(ui, hidden_spokes, previous):
+    """Collect the spokes in a new process and return the time and modules."""
+    script = COLLECT_SCRIPT.format(
+        ui=ui,
+        hidden_spokes=hidden_spokes,
+        find_modules="lambda path, pred: None" if previous else "find_modules",
+    )
+
+    if not previous:
+        script = "from pyanaconda.ui.lib.manifest import find_modules\n" + script
+
+    output = subprocess.check_output([sys.executable, "-c", script], text=True)
+    return json.loads(output.splitlines()[-1])
+
+
+def main():
+    """Run the benchmark."""
+    args = parse_args()
+    results = {"previous": [], "current": []}
+
+    for _ in range(args.rounds):
+        results["previous"].append(collect(args.ui, args.hidden_spokes, True))
+        results["current"].append(collect(args.ui, args.hidden_spokes, False))
+
+    for name, runs in results.items():
+        print("{:<8} best {:8.3f} s, {} imported modules".format(
+            name, min(t for t, _ in runs), runs[-1][1]
+        ))
+
+    print("Speedup: {:.2f}x".format(
+        min(t for t, _ in results["previous"]) / min(t for t, _ in results["current"])
+    ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+#
+# Copyright (C) 2026  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 31 Milk Street #960789 Boston, MA
+# 02196 USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+import json
+import os
+import threading
+import unittest
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+from pyanaconda.core.timeline import Timeline
+from pyanaconda.installation_tasks import Task, TaskQueue
+
+
+class TimelineTestCase(unittest.TestCase):
+    """Test the timeline of the installation."""
+
+    def setUp(self):
+        self._temporary = TemporaryDirectory()
+        self.timeline_dir = os.path.join(self._temporary.name, "timeline")
+        self.timeline = Timeline(self.timeline_dir)
+
+    def tearDown(self):
+        self._temporary.cleanup()
+
+    def _get_events(self, phase):
+        """Get recorded events of the given phase."""
+        return [e for e in self.timeline.collect() if e["ph"] == phase]
+
+    @patch("pyanaconda.core.timeline.conf")
+    def test_disabled(self, conf):
+        """Nothing is recorded if the timeline is disabled."""
+        conf.anaconda.profile_installation = False
+
+        with self.timeline.span("a", "test") as args:
+            args["x"] = 1
+
+        assert not os.path.exists(self.timeline_dir)
+        assert self.timeline.collect() == []
+        assert self.timeline.write_trace(os.path.join(self._temporary.name, "t.json")) is False
+
+    @patch("pyanaconda.core.timeline.conf")
+    def test_span(self, conf):
+        """Test the span method."""
+        conf.anaconda.profile_installation = True
+
+        with self.timeline.span("a", "test", x=1) as args:
+            args["y"] = 2
+
+        with self.timeline.span("b", "test"):
+            pass
+
+        events = self._get_events("X")
+        assert [e["name"] for e in events] == ["a", "b"]
+        assert events[0]["cat"] == "test"
+        assert events[0]["args"] == {"x": "1", "y": "2"}
+        assert events[0]["pid"] == os.getpid()
+        assert events[0]["tid"] == threading.get_native_id()
+        assert events[0]["dur"] >= 0
+        assert events[0]["ts"] <= events[1]["ts"]
+
+        # The process and the thread are named only once.
+        metadata = self._get_events("M")
+        assert [e["name"] for e in metadata] == ["process_name", "thread_name"]
+        assert metadata[1]["args"] == {"name": threading.current_thread().name}
+
+    @patch("pyanaconda.core.timeline.conf")
+    def test_span_error(self, conf):
+        """An event is recorded even if the block fails."""
+        conf.anaconda.profile_installation = True
+
+        with self.assertRaises(ValueError):
+            with self.timeline.span("a", "test"):
+                raise ValueError()
+
+        assert [e["name"] for e in self._get_events("X")] == ["a"]
+
+    @patch("pyanaconda.core.timeline.conf")
+    def test_write_trace(self, conf):
+        """Test the write_trace method."""
+        conf.anaconda.profile_installation = True
+        self.timeline.record("a", "test", 2, 3)
+
+        # Add events of another process.
+        with open(os.path.join(self.timeline_dir, "1.json"), "w") as f:
+            f.write(json.dumps({"name": "b", "ph": "X", "ts": 1000000, "pid": 1}) + "\n")
+
+        trace_path = os.path.join(self._temporary.name, "trace.json")
+        assert self.timeline.write_trace(trace_path) is True
+
+        with open(trace_path) as f:
+            trace = json.load(f)
+
+        events = [e for e in trace["traceEvents"] if e["ph"] == "X"]
+        assert [(e["name"], e["ts"]) for e in events] == [("b", 1000000), ("a", 2000000)]
+        assert events[1]["dur"] == 1000000
+
+    @patch("pyanaconda.core.timeline.conf")
+    def test_installation_tasks(self, conf):
+        """Installation tasks are recorded."""
+        conf.anaconda.profile_installation = True
+
+        queue = TaskQueue("queue")
+        queue.append(Task("task", lambda: None))
+
+        with patch("pyanaconda.installation_tasks.timeline", self.timeline):
+            queue.start()
+
+        events = self._get_events("X")
+        assert [(e["name"], e["cat"]) for e in events] == [
+            ("queue", "TaskQueue"), ("task", "Task")
+        ]
+
+    def test_process_name(self):
+        """Test the names of processes."""
+        with patch("sys.argv", ["/usr/lib/python3/pyanaconda/modules/storage/__main__.py"]):
+            assert Timeline._get_process_name() == "storage"
+
+        with patch("sys.argv", ["/usr/bin/anaconda", "--text"]):
+            assert Timeline._get_process_name() == "anaconda"
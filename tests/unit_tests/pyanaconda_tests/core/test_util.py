@@ -16,6 +16,7 @@
 # License and may only be used or replicated with the express permission of
 # Red Hat, Inc.
 
+import logging
 import os
 import signal
 import sys
@@ -23,8 +24,8 @@ import tempfile
 import unittest
 from io import StringIO
 from textwrap import dedent
-from threading import Lock
-from unittest.mock import Mock, patch
+from threading import Lock, Thread
+from unittest.mock import Mock, call, patch
 
 import pytest
 from timer import timer
@@ -75,6 +76,89 @@ class RunProgramTests(unittest.TestCase):
         # incorrect calling should return rc!=0
         assert util.execWithRedirect('ls', ['--asdasd']) != 0
 
+    def test_run_program_streaming(self):
+        """Test _run_program with a lot of output."""
+        script = "for i in $(seq 1 1000); do echo line $i; done; echo -n end"
+
+        # the whole output is returned and written to the file
+        stdout = StringIO()
+        retcode, output = util._run_program(["/bin/sh", "-c", script], stdout=stdout)
+        assert retcode == 0
+        assert output.count("\n") == 1001
+        assert output.endswith("line 1000\nend\n")
+        assert stdout.getvalue() == output
+
+        # only the last lines of the output are kept
+        retcode, output = util._run_program(["/bin/sh", "-c", script], max_output_lines=2)
+        assert retcode == 0
+        assert output == "line 1000\nend\n"
+
+    @patch("pyanaconda.core.util.program_log")
+    def test_run_program_logging(self, program_log):
+        """Test the logging of _run_program."""
+        with patch.object(util.program_output_log, "_logger", program_log):
+            util._run_program(["/bin/sh", "-c", "echo one; echo two >&2; exit 3"],
+                              filter_stderr=True)
+
+        messages = [c.args[1] % c.args[2:] for c in program_log.log.call_args_list]
+        assert messages[0] == "Running... /bin/sh -c echo one; echo two >&2; exit 3"
+        assert sorted(messages[1:3]) == ["one", "two"]
+        assert messages[3] == "Return code of /bin/sh: 3"
+
+    def test_program_output_log(self):
+        """Test the non-blocking log of the program output."""
+        logger = Mock()
+        lock = Lock()
+        output_log = util.ProgramOutputLog(logger, lock)
+
+        # the messages are logged immediately if possible
+        output_log.log(logging.INFO, "%s", "one")
+        logger.log.assert_called_once_with(logging.INFO, "%s", "one")
+        logger.log.reset_mock()
+
+        # the messages are queued if the lock is held by someone else
+        with lock:
+            output_log.log(logging.INFO, "%s", "two")
+            output_log.log(logging.DEBUG, "%s", "three")
+            logger.log.assert_not_called()
+
+        # the messages are logged in the original order
+        output_log.flush()
+        assert logger.log.call_args_list == [
+            call(logging.INFO, "%s", "two"),
+            call(logging.DEBUG, "%s", "three"),
+        ]
+
+    def test_program_output_log_race(self):
+        """Test a message queued before the lock is released."""
+        logger = Mock()
+        lock = Lock()
+        output_log = util.ProgramOutputLog(logger, lock)
+        callbacks = []
+
+        def release():
+            # Another thread queues a message after the queue is drained,
+            # but before the lock is released.
+            while callbacks:
+                callbacks.pop()()
+
+            lock.release()
+
+        def log_from_thread():
+            thread = Thread(target=output_log.log, args=(logging.INFO, "%s", "two"))
+            thread.start()
+            thread.join()
+
+        output_log._lock = Mock(acquire=lock.acquire, release=release)
+        callbacks.append(log_from_thread)
+        output_log.log(logging.INFO, "%s", "one")
+
+        # the message is not stranded in the queue
+        assert logger.log.call_args_list == [
+            call(logging.INFO, "%s", "one"),
+            call(logging.INFO, "%s", "two"),
+        ]
+
     def test_exec_with_capture(self):
         """Test execWithCapture."""
 
@@ -116,7 +200,7 @@ echo "error" >&2
                                                env_add={"TEST": "test"},
                                                env_prune=("TEST_PRUNE",)
                                                )
-        mock_start_program.return_value.communicate.return_value = (b"", b"")
+        mock_start_program.return_value.stdout.readline.return_value = b""
 
         util.execWithCaptureAsLiveUser('ls', [])
 
@@ -140,6 +224,14 @@ echo "error" >&2
         with pytest.raises(UnicodeDecodeError):
             util.execWithCapture('echo', ['-en', r'\xa0\xa1\xa2'])
 
+        # The output is written to stdout before the exception is raised.
+        stdout = StringIO()
+
+        with pytest.raises(UnicodeDecodeError):
+            util._run_program(['echo', '-en', r'Hello\n\xa0\nworld!'], stdout=stdout)
+
+        assert stdout.getvalue() == 'Hello\n\ufffd\nworld!\n'
+
     def test_exec_readlines(self):
         """Test execReadlines."""
 
@@ -421,6 +513,23 @@ exit 0
         finally:
             signal.signal(signal.SIGHUP, old_HUP_handler)
 
+    @patch("pyanaconda.core.util.program_log")
+    def test_exec_readlines_logging(self, program_log):
+        """Test the logging of execReadlines."""
+        with patch.object(util.program_output_log, "_logger", program_log):
+            rl_iterator = util.execReadlines("/bin/sh", ["-c", "echo one; echo two; exit 1"],
+                                             raise_on_nozero=False)
+            assert list(rl_iterator) == ["one", "two"]
+
+        # the last lines of the failed command are logged
+        messages = [c.args[1] % c.args[2:] for c in program_log.log.call_args_list]
+        assert messages == [
+            "Running... /bin/sh -c echo one; echo two; exit 1",
+            "one",
+            "two",
+            "Return code of /bin/sh: 1",
+        ]
+
     def test_exec_readlines_filter_stderr(self):
         """Test execReadlines and filter_stderr."""
 
@@ -583,7 +692,7 @@ done
     @patch("pyanaconda.core.util.startProgram")
     def test_do_preexec(self, mock_start_program):
         """Test the do_preexec option of exec*** functions."""
-        mock_start_program.return_value.communicate.return_value = (b"", b"")
+        mock_start_program.return_value.stdout.readline.return_value = b""
 
         util.execWithRedirect("ls", [])
         mock_start_program.assert_called_once()
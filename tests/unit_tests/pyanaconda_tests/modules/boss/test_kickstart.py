@@ -17,6 +17,7 @@
 #
 
 import os
+import threading
 import unittest
 from contextlib import contextmanager
 from unittest.mock import Mock, patch
@@ -273,6 +274,72 @@ class KickstartManagerTestCase(unittest.TestCase):
 
         assert manager.generate_kickstart() == self._m123_kickstart
 
+    def test_distribute_concurrently(self):
+        """Test that modules are called at once."""
+        manager = KickstartManager()
+        barrier = threading.Barrier(2, timeout=5)
+
+        module1 = ConcurrentTestModule(barrier, commands=["network", "firewall"])
+        module2 = ConcurrentTestModule(barrier, addons=["pony"])
+
+        manager.on_module_observers_changed([
+            self._get_module_observer("1", module1),
+            self._get_module_observer("2", module2),
+        ])
+
+        # Both modules have to be called at once to pass the barrier.
+        with self._create_ks_files(self._kickstart_include) as filename:
+            report = manager.read_kickstart_file(filename)
+
+        assert module1.kickstart == self._m1_kickstart
+        assert module2.kickstart == self._m2_kickstart
+        assert len(report.get_messages()) == 1
+        assert report.get_messages()[0].module_name == "1"
+
+        assert manager.generate_kickstart() == "\n\n".join([
+            self._m1_kickstart.strip(),
+            self._m2_kickstart.strip(),
+        ])
+
+    def test_create_proxies_in_calling_thread(self):
+        """Test that the module proxies are not created in the workers."""
+        manager = KickstartManager()
+        modules = [TestModule(), TestModule()]
+        threads = []
+
+        def get_proxy(*args, **kwargs):
+            threads.append(threading.current_thread())
+            return modules[len(threads) - 1]
+
+        observers = [
+            self._get_module_observer("1", None),
+            self._get_module_observer("2", None),
+        ]
+
+        for observer in observers:
+            observer._message_bus.get_proxy.side_effect = get_proxy
+
+        manager.on_module_observers_changed(observers)
+        modules[0].kickstart = "network --device ens3"
+        modules[1].kickstart = "%addon pony\n%end"
+
+        assert manager.generate_kickstart() == "network --device ens3\n\n%addon pony\n%end"
+        assert threads == [threading.current_thread()] * 2
+
+    def test_kickstart_ownership_cached(self):
+        """Test that the kickstart ownership is read only once."""
+        manager = KickstartManager()
+        module = TestModule(commands=["network"])
+        manager.on_module_observers_changed([self._get_module_observer("1", module)])
+
+        with self._create_ks_files(self._kickstart_include) as filename:
+            manager.read_kickstart_file(filename)
+            module.kickstart = ""
+            manager.read_kickstart_file(filename)
+
+        assert module.property_reads == 3
+        assert "network --device ens3" in module.kickstart
+
     def test_nothing_to_parse(self):
         ks_content = ""
         manager = KickstartManager()
@@ -481,17 +548,21 @@ class TestModule:
         self.kickstart_sections = sections or []
         self.kickstart_addons = addons or []
         self.kickstart = ""
+        self.property_reads = 0
 
     @property
     def KickstartSections(self):
+        self.property_reads += 1
         return self.kickstart_sections
 
     @property
     def KickstartAddons(self):
+        self.property_reads += 1
         return self.kickstart_addons
 
     @property
     def KickstartCommands(self):
+        self.property_reads += 1
         return self.kickstart_commands
 
     def ReadKickstart(self, kickstart):
@@ -514,3 +585,19 @@ class TestModule:
     def GenerateKickstart(self):
         """Mock generating a kickstart."""
         return self.kickstart
+
+
+class ConcurrentTestModule(TestModule):
+    """Test module that waits for other modules in every call."""
+
+    def __init__(self, barrier, **kwargs):
+        super().__init__(**kwargs)
+        self._barrier = barrier
+
+    def ReadKickstart(self, kickstart):
+        self._barrier.wait()
+        return super().ReadKickstart(kickstart)
+
+    def GenerateKickstart(self):
+        self._barrier.wait()
+        return super().GenerateKickstart()
@@ -0,0 +1,163 @@
+#
+# Copyright (C) 2026  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 31 Milk Street #960789 Boston, MA
+# 02196 USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+import gzip
+import os
+import subprocess
+import time
+import unittest
+from tempfile import TemporaryDirectory
+from unittest.mock import Mock, patch
+
+from pyanaconda.modules.boss.log_collector import TRUNCATION_MARKER, LogCollector
+
+
+class LogCollectorTestCase(unittest.TestCase):
+    """Test the collector of installation logs."""
+
+    def setUp(self):
+        self._temporary = TemporaryDirectory()
+        self.src = os.path.join(self._temporary.name, "src")
+        self.dest = os.path.join(self._temporary.name, "dest")
+        os.makedirs(os.path.join(self.src, "tree", "subdir"))
+        os.makedirs(self.dest)
+
+    def tearDown(self):
+        self._temporary.cleanup()
+
+    def _write(self, path, data):
+        path = os.path.join(self.src, path)
+
+        with open(path, "wb") as f:
+            f.write(data)
+
+        return path
+
+    def _read(self, path):
+        with open(os.path.join(self.dest, path), "rb") as f:
+            return f.read()
+
+    def test_collect_files(self):
+        """Collect files and trees."""
+        first = self._write("first.log", b"first\n")
+        self._write("tree/second.log", b"second\n")
+        self._write("tree/subdir/third.log", b"third\n")
+
+        collector = LogCollector(self.dest)
+        collector.add_file(first, "first.log")
+        collector.add_file(os.path.join(self.src, "missing.log"), "missing.log")
+        collector.add_tree(os.path.join(self.src, "tree"), "tree/")
+        collector.add_tree(os.path.join(self.src, "missing"), "missing/")
+
+        assert collector.collect() == 19
+        assert self._read("first.log") == b"first\n"
+        assert self._read("tree/second.log") == b"second\n"
+        assert self._read("tree/subdir/third.log") == b"third\n"
+        assert os.stat(os.path.join(self.dest, "first.log")).st_mode & 0o777 == 0o600
+        assert sorted(os.listdir(self.dest)) == ["first.log", "tree"]
+
+    @patch("pyanaconda.modules.boss.log_collector.startProgram")
+    def test_collect_output(self, start_program):
+        """Stream the output of a command."""
+        start_program.side_effect = lambda argv: subprocess.Popen(argv, stdout=subprocess.PIPE)
+
+        collector = LogCollector(self.dest)
+        collector.add_command(["echo", "journal"], "journal.log")
+
+        assert collector.collect() == 8
+        start_program.assert_called_once_with(["echo", "journal"])
+        assert self._read("journal.log") == b"journal\n"
+
+    @patch("pyanaconda.modules.boss.log_collector.startProgram")
+    def test_size_budget(self, start_program):
+        """Truncate logs that don't fit into the size budget."""
+        process = start_program.return_value.__enter__.return_value
+        process.stdout.read.side_effect = [b"x" * 10, b""]
+        marker = TRUNCATION_MARKER.format(15).encode()
+
+        first = self._write("first.log", b"a" * 12)
+        second = self._write("second.log", b"b" * 5)
+
+        collector = LogCollector(self.dest, budget=15, tail=15, workers=1)
+        collector.add_command(["journalctl", "-b"], "journal.log")
+        collector.add_file(first, "first.log")
+        collector.add_file(second, "second.log")
+
+        # The files are collected first and the ends of logs are kept.
+        assert collector.collect() == 15
+        assert self._read("first.log") == b"a" * 12
+        assert self._read("second.log") == marker + b"b" * 3
+        assert self._read("journal.log") == marker
+
+    def test_size_budget_tail(self):
+        """Keep the beginning and the end of a truncated log."""
+        log = self._write("first.log", b"0123456789")
+        marker = TRUNCATION_MARKER.format(6).encode()
+
+        with patch("pyanaconda.modules.boss.log_collector.LOG_CHUNK_SIZE", 3):
+            collector = LogCollector(self.dest, budget=6, tail=4)
+            collector.add_file(log, "first.log")
+            assert collector.collect() == 6
+
+        assert self._read("first.log") == b"01" + marker + b"6789"
+
+    @patch("pyanaconda.modules.boss.log_collector.startProgram")
+    def test_files_first(self, start_program):
+        """Collect all files before the outputs of commands."""
+        collected = []
+        first = self._write("first.log", b"first\n")
+        second = self._write("second.log", b"second\n")
+
+        def _start_program(argv):
+            collected.append("journal.log")
+            return subprocess.Popen(argv, stdout=subprocess.PIPE)
+
+        def _copy_file(src, dest):
+            time.sleep(0.1)
+            collected.append(dest)
+
+        start_program.side_effect = _start_program
+
+        collector = LogCollector(self.dest, workers=4)
+        collector._copy_file = _copy_file
+        collector.add_command(["echo", "journal"], "journal.log")
+        collector.add_file(first, "first.log")
+        collector.add_file(second, "second.log")
+        collector.collect()
+
+        assert collected[-1] == "journal.log"
+
+    def test_compression(self):
+        """Compress the collected logs."""
+        first = self._write("first.log", b"first\n")
+        zstd = Mock()
+        zstd.ZstdFile.side_effect = lambda f, mode: gzip.GzipFile(fileobj=f, mode=mode)
+
+        with patch("pyanaconda.modules.boss.log_collector.zstd", zstd):
+            collector = LogCollector(self.dest, compress=True)
+            collector.add_file(first, "first.log")
+            assert collector.collect() == 6
+
+        assert gzip.decompress(self._read("first.log.zst")) == b"first\n"
+
+        # The compression is not supported.
+        with patch("pyanaconda.modules.boss.log_collector.zstd", None):
+            collector = LogCollector(self.dest, compress=True)
+            collector.add_file(first, "other.log")
+            assert collector.collect() == 6
+
+        assert self._read("other.log") == b"first\n"
@@ -222,3 +222,80 @@ class ModuleManagerTestCase(unittest.TestCase):
 
         self._manager.set_module_observers(observers)
         assert self._manager.get_service_names() == service_names
+
+    @patch("dasbus.client.observer.Gio")
+    def test_start_lazy_modules(self, gio):
+        """Start modules with lazy modules."""
+        service_names = [
+            "org.fedoraproject.Anaconda.Addons.A",
+            "org.fedoraproject.Anaconda.Addons.B",
+            "org.fedoraproject.Anaconda.Modules.A",
+        ]
+
+        task = StartModulesTask(
+            message_bus=self._message_bus,
+            activatable=service_names,
+            forbidden=[],
+            optional=["org.fedoraproject.Anaconda.Addons.*"],
+            lazy=[
+                "org.fedoraproject.Anaconda.Addons.A",
+                "org.fedoraproject.Anaconda.Modules.A",
+            ]
+        )
+
+        def call():
+            return DBUS_START_REPLY_SUCCESS
+
+        def fake_callbacks(fake_observer):
+            for observer in task._module_observers:
+                if observer.is_lazy:
+                    continue
+
+                observer._is_service_available = True
+                task._start_service_by_name_callback(call, observer)
+                task._service_available_callback(observer)
+
+        task._callbacks.put((None, fake_callbacks))
+        observers = task.run()
+
+        # Only optional modules can be lazy.
+        assert [(o.service_name, o.is_lazy) for o in observers] == [
+            ("org.fedoraproject.Anaconda.Addons.A", True),
+            ("org.fedoraproject.Anaconda.Addons.B", False),
+            ("org.fedoraproject.Anaconda.Modules.A", False),
+        ]
+
+        # The lazy module is not started.
+        started = [c.args[0] for c in self._message_bus.proxy.StartServiceByName.call_args_list]
+        assert started == [
+            "org.fedoraproject.Anaconda.Addons.B",
+            "org.fedoraproject.Anaconda.Modules.A",
+        ]
+
+        # The startup latencies are recorded.
+        assert set(task._latencies) == set(observers[1:])
+
+        # The lazy module is reported as running.
+        self._manager.set_module_observers(observers)
+        assert self._manager.get_service_names() == service_names
+
+    @patch("dasbus.client.observer.Gio")
+    def test_set_lazy_modules_locale(self, gio):
+        """Set locale of lazy modules."""
+        task = StartModulesTask(
+            message_bus=self._message_bus,
+            activatable=["org.fedoraproject.Anaconda.Addons.A"],
+            forbidden=[],
+            optional=["org.fedoraproject.Anaconda.Addons.*"],
+            lazy=["org.fedoraproject.Anaconda.Addons.*"]
+        )
+        (observer, ) = task.run()  # pylint: disable=unbalanced-tuple-unpacking
+        self._manager.set_module_observers([observer])
+
+        # The lazy module is not running.
+        self._manager.set_modules_locale("cs_CZ.UTF-8")
+        self._message_bus.get_proxy.return_value.SetLocale.assert_not_called()
+
+        # The lazy module is started.
+        observer._service_name_appeared_callback()
+        self._message_bus.get_proxy.return_value.SetLocale.assert_called_once_with("cs_CZ.UTF-8")
@@ -18,12 +18,17 @@
 # Red Hat Author(s): Vendula Poncova <vponcova@redhat.com>
 #
 import unittest
-from unittest.mock import Mock
+from unittest.mock import ANY, Mock, patch
 
 import pytest
 from dasbus.client.observer import DBusObserverError
+from dasbus.constants import DBUS_FLAG_NONE, DBUS_START_REPLY_SUCCESS
+from dasbus.error import DBusError
 
-from pyanaconda.modules.boss.module_manager.module_observer import ModuleObserver
+from pyanaconda.modules.boss.module_manager.module_observer import (
+    ModuleObserver,
+    activate_modules,
+)
 
 
 class ModuleObserverTestCase(unittest.TestCase):
@@ -93,3 +98,126 @@ class ModuleObserverTestCase(unittest.TestCase):
 
         with pytest.raises(DBusObserverError):
             observer.proxy.DoSomething()
+
+    def test_activate(self):
+        """Test the activation of a module."""
+        dbus = Mock()
+        observer = ModuleObserver(dbus, "my.test.module")
+        self._setup_observer(observer)
+        assert observer.is_lazy is False
+
+        # Modules that are not lazy are not activated.
+        observer.activate()
+        dbus.proxy.StartServiceByName.assert_not_called()
+        assert not observer.is_service_available
+
+    def _finish_activation(self, dbus, error=None):
+        """Finish the asynchronous start of the module."""
+        def call():
+            if error:
+                raise error
+
+            return DBUS_START_REPLY_SUCCESS
+
+        callback = dbus.proxy.StartServiceByName.call_args.kwargs["callback"]
+        callback(call)
+
+    def test_activate_lazy(self):
+        """Test the activation of a lazy module."""
+        dbus = Mock()
+        callback = Mock()
+        observer = ModuleObserver(dbus, "my.test.module", is_lazy=True)
+        self._setup_observer(observer)
+        assert observer.is_lazy is True
+
+        # Start the module on the first use.
+        assert observer.activate(callback) is True
+        dbus.proxy.StartServiceByName.assert_called_once_with(
+            "my.test.module", DBUS_FLAG_NONE, callback=ANY
+        )
+
+        # The module is already starting.
+        assert observer.activate() is True
+        dbus.proxy.StartServiceByName.assert_called_once()
+
+        # The module is started.
+        assert not observer.is_service_available
+        callback.assert_not_called()
+
+        self._finish_activation(dbus)
+        self._test_if_service_available(observer)
+        callback.assert_called_once_with(observer)
+
+        observer.proxy.DoSomething()
+        dbus.get_proxy.assert_called_once_with("my.test.module", "/my/test/module")
+
+        # The observer is notified about the service later.
+        observer._service_name_appeared_callback()
+        observer._service_available.emit.assert_not_called()
+
+        # The module is already available.
+        dbus.proxy.StartServiceByName.reset_mock()
+        assert observer.activate() is False
+        dbus.proxy.StartServiceByName.assert_not_called()
+
+        # The module has stopped.
+        self._make_service_unavailable(observer)
+
+    def test_activate_lazy_failed(self):
+        """Test a failed activation of a lazy module."""
+        dbus = Mock()
+        callback = Mock()
+        observer = ModuleObserver(dbus, "my.test.module", is_lazy=True)
+        self._setup_observer(observer)
+
+        observer.activate(callback)
+        self._finish_activation(dbus, DBusError("Fake error!"))
+        callback.assert_called_once_with(observer)
+
+        assert not observer.is_service_available
+        observer._service_available.emit.assert_not_called()
+
+        # The module is not started again.
+        assert observer.is_lazy is False
+        assert observer.activate() is False
+        dbus.proxy.StartServiceByName.assert_called_once()
+
+    @patch("pyanaconda.modules.boss.module_manager.module_observer.create_main_loop")
+    @patch("pyanaconda.modules.boss.module_manager.module_observer.create_new_context")
+    def test_activate_modules(self, create_context, create_loop):
+        """Test the activation of lazy modules at once."""
+        dbus = Mock()
+        observers = [
+            ModuleObserver(dbus, "my.test.module.A", is_lazy=True),
+            ModuleObserver(dbus, "my.test.module.B"),
+            ModuleObserver(dbus, "my.test.module.C", is_lazy=True),
+        ]
+
+        for observer in observers:
+            self._setup_observer(observer)
+
+        context = create_context.return_value
+        loop = create_loop.return_value
+
+        def run():
+            # Both modules are started before the loop runs.
+            calls = dbus.proxy.StartServiceByName.call_args_list
+            assert [c.args[0] for c in calls] == ["my.test.module.A", "my.test.module.C"]
+
+            for c in calls:
+                c.kwargs["callback"](lambda: DBUS_START_REPLY_SUCCESS)
+
+            loop.quit.assert_called_once_with()
+
+        loop.run.side_effect = run
+        activate_modules(observers)
+
+        loop.run.assert_called_once_with()
+        context.push_thread_default.assert_called_once_with()
+        context.pop_thread_default.assert_called_once_with()
+        assert [o.is_service_available for o in observers] == [True, False, True]
+
+        # There is nothing to start.
+        create_context.reset_mock()
+        activate_modules(observers)
+        create_context.assert_not_called()
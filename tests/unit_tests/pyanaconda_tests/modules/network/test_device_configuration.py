@@ -0,0 +1,140 @@
+#
+# Copyright (C) 2026  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 31 Milk Street #960789 Boston, MA
+# 02196 USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+import unittest
+from unittest.mock import Mock
+
+import gi
+
+from pyanaconda.modules.network.device_configuration import DeviceConfigurations
+
+gi.require_version("NM", "1.0")
+from gi.repository import NM
+
+
+class DeviceConfigurationsTestCase(unittest.TestCase):
+    """Test the indexes of device configurations."""
+
+    def setUp(self):
+        self.nm_client = Mock()
+        self.nm_client.get_devices.return_value = []
+        self.nm_client.get_connections.return_value = []
+        self.configurations = DeviceConfigurations(self.nm_client)
+        self.configurations.reload()
+
+    def _check_indexes(self):
+        """Check that the indexes match a scan of all configurations."""
+        cfgs = self.configurations.get_all()
+
+        for cfg in cfgs:
+            assert self.configurations.get_for_device(cfg.device_name) == \
+                [c for c in cfgs if c.device_name == cfg.device_name]
+            assert self.configurations.get_for_uuid(cfg.connection_uuid) == \
+                [c for c in cfgs if c.connection_uuid == cfg.connection_uuid]
+
+    @staticmethod
+    def _get_device(iface):
+        device = Mock()
+        device.get_iface.return_value = iface
+        device.get_device_type.return_value = NM.DeviceType.ETHERNET
+        return device
+
+    def test_add_and_attach(self):
+        """Test the indexes after adding and attaching configurations."""
+        self.configurations.add(connection_uuid="uuid-2", device_type=NM.DeviceType.VLAN)
+        self.configurations.add(device_name="ens3", device_type=NM.DeviceType.ETHERNET)
+        self.configurations.add(connection_uuid="uuid-3", device_type=NM.DeviceType.VLAN)
+
+        vlan_2, ens3, vlan_3 = self.configurations.get_all()
+        assert self.configurations.get_for_device("ens3") == [ens3]
+        assert self.configurations.get_for_uuid("uuid-2") == [vlan_2]
+        assert self.configurations.get_for_device("") == [vlan_2, vlan_3]
+        assert self.configurations.get_for_device("ens4") == []
+        assert self.configurations.get_for_uuid(None) == []
+        self._check_indexes()
+
+        # The configurations are returned in the order they were added.
+        self.configurations.attach(vlan_3, device_name="vlan2")
+        self.configurations.attach(vlan_2, device_name="vlan2")
+        assert self.configurations.get_for_device("vlan2") == [vlan_2, vlan_3]
+        assert self.configurations.get_for_device("") == []
+
+        self.configurations.attach(ens3, connection_uuid="uuid-1")
+        assert self.configurations.get_for_uuid("uuid-1") == [ens3]
+        assert self.configurations.get_for_uuid("") == []
+        self._check_indexes()
+
+        # The returned lists don't change the indexes.
+        self.configurations.get_for_device("vlan2").clear()
+        assert self.configurations.get_for_device("vlan2") == [vlan_2, vlan_3]
+
+    def test_removed_callbacks(self):
+        """Test the indexes after NetworkManager removes devices and connections."""
+        self.configurations.add(device_name="ens3", connection_uuid="uuid-1",
+                                device_type=NM.DeviceType.ETHERNET)
+        self.configurations.add(device_name="vlan2", connection_uuid="uuid-2",
+                                device_type=NM.DeviceType.VLAN)
+        self.configurations.add(device_name="ens4", device_type=NM.DeviceType.ETHERNET)
+        ens3, vlan_2, ens4 = self.configurations.get_all()
+
+        # The configuration of a virtual device is kept without the device.
+        self.configurations._device_removed_cb(None, self._get_device("vlan2"))
+        assert vlan_2.device_name == ""
+        assert self.configurations.get_for_device("vlan2") == []
+        assert self.configurations.get_for_uuid("uuid-2") == [vlan_2]
+
+        # The configuration of a physical device is removed.
+        assert self.configurations.get_for_device("ens4") == [ens4]
+        self.configurations._device_removed_cb(None, self._get_device("ens4"))
+        assert self.configurations.get_all() == [ens3, vlan_2]
+        assert self.configurations.get_for_device("ens4") == []
+
+        # The configuration of an existing device is kept without the connection.
+        connection = Mock()
+        connection.get_uuid.return_value = "uuid-1"
+        self.configurations._connection_removed_cb(None, connection)
+        assert ens3.connection_uuid == ""
+        assert self.configurations.get_for_uuid("uuid-1") == []
+        assert self.configurations.get_for_device("ens3") == [ens3]
+
+        # The configuration without a device is removed.
+        connection.get_uuid.return_value = "uuid-2"
+        self.configurations._connection_removed_cb(None, connection)
+        assert self.configurations.get_all() == [ens3]
+        assert self.configurations.get_for_uuid("uuid-2") == []
+        self._check_indexes()
+
+        # The configurations can be added again.
+        self.configurations.add(connection_uuid="uuid-2", device_type=NM.DeviceType.VLAN)
+        assert len(self.configurations.get_for_uuid("uuid-2")) == 1
+        self._check_indexes()
+
+    def test_equal_configurations(self):
+        """Test the indexes with configurations of the same values."""
+        for _i in range(3):
+            self.configurations.add(device_type=NM.DeviceType.VLAN)
+
+        vlan_1, vlan_2, vlan_3 = self.configurations.get_all()
+        assert vlan_1 == vlan_2 == vlan_3
+
+        # The attached configuration is identified by the object.
+        self.configurations.attach(vlan_2, device_name="vlan2", connection_uuid="uuid-2")
+        assert self.configurations.get_for_device("vlan2")[0] is vlan_2
+        assert self.configurations.get_for_uuid("uuid-2")[0] is vlan_2
+        assert self.configurations.get_for_device("") == [vlan_1, vlan_3]
+        assert self.configurations.get_for_device("")[1] is vlan_3
+        self._check_indexes()
@@ -42,6 +42,8 @@ from pyanaconda.modules.network.nm_client import (
     GError,
     get_config_file_connection_of_device,
     get_dracut_arguments_from_connection,
+    get_iface_from_hwaddr,
+    get_ifaces_by_hwaddr,
     get_kickstart_network_data,
     get_new_nm_client,
     get_ports_from_connections,
@@ -419,9 +421,9 @@ class NMClientTestCase(unittest.TestCase):
 
     @patch("pyanaconda.modules.network.nm_client.get_vlan_interface_name_from_connection")
     @patch("pyanaconda.modules.network.nm_client.is_config_file_for_system")
-    @patch("pyanaconda.modules.network.nm_client.get_iface_from_hwaddr")
+    @patch("pyanaconda.modules.network.nm_client.get_ifaces_by_hwaddr")
     @patch("pyanaconda.modules.network.nm_client.is_s390")
-    def test_get_config_file_connection_of_device(self, is_s390, get_iface_from_hwaddr,
+    def test_get_config_file_connection_of_device(self, is_s390, get_ifaces_by_hwaddr,
                                                   is_config_file_for_system,
                                                   get_vlan_interface_name_from_connection):
         nm_client = Mock()
@@ -579,12 +581,11 @@ class NMClientTestCase(unittest.TestCase):
         assert get_config_file_connection_of_device(nm_client, "ens8", device_hwaddr=HWADDR_ENS8) == \
             ENS8_UUID
         # config bound to hwaddr, no hint
-        hwaddr_to_iface = {
-            HWADDR_ENS3: "ens3",
-            HWADDR_ENS8: "ens8",
-            HWADDR_ENS11: "ens11",
+        get_ifaces_by_hwaddr.return_value = {
+            HWADDR_ENS3.upper(): "ens3",
+            HWADDR_ENS8.upper(): "ens8",
+            HWADDR_ENS11.upper(): "ens11",
         }
-        get_iface_from_hwaddr.side_effect = lambda nm_client, hwaddr: hwaddr_to_iface[hwaddr]
         assert get_config_file_connection_of_device(nm_client, "ens11") == ENS11_UUID
         # config not bound
         assert get_config_file_connection_of_device(nm_client, "ens12") == ""
@@ -605,6 +606,43 @@ class NMClientTestCase(unittest.TestCase):
         # infiniband, first wins
         assert get_config_file_connection_of_device(nm_client, "ens33") == ENS33_UUID
 
+    def test_get_ifaces_by_hwaddr(self):
+        """Test get_ifaces_by_hwaddr."""
+        nm_client = Mock()
+        devices_specs = [
+            {
+                "get_iface.return_value": "ens3",
+                "get_device_type.return_value": NM.DeviceType.ETHERNET,
+                "get_permanent_hw_address.return_value": "52:54:00:0c:77:e3",
+                "get_hw_address.return_value": "52:54:00:0c:77:e4",
+            },
+            {
+                "get_iface.return_value": "ens4",
+                "get_device_type.return_value": NM.DeviceType.ETHERNET,
+                "get_permanent_hw_address.return_value": "",
+                "get_hw_address.return_value": "52:54:00:0c:77:e5",
+            },
+            {
+                "get_iface.return_value": "bond0",
+                "get_device_type.return_value": NM.DeviceType.BOND,
+                "get_hw_address.return_value": "52:54:00:0c:77:e5",
+            },
+            {
+                "get_iface.return_value": "lo",
+                "get_device_type.return_value": NM.DeviceType.GENERIC,
+                "get_hw_address.return_value": None,
+            },
+        ]
+        nm_client.get_devices.return_value = self._get_mock_objects_from_attrs(devices_specs)
+
+        # The permanent address is preferred and the first device wins.
+        assert get_ifaces_by_hwaddr(nm_client) == {
+            "52:54:00:0C:77:E3": "ens3",
+            "52:54:00:0C:77:E5": "ens4",
+        }
+        for hwaddr, iface in get_ifaces_by_hwaddr(nm_client).items():
+            assert get_iface_from_hwaddr(nm_client, hwaddr.lower()) == iface
+
     @patch("pyanaconda.modules.network.nm_client.get_team_port_config_from_connection")
     @patch("pyanaconda.modules.network.nm_client.get_ports_from_connections")
     @patch("pyanaconda.modules.network.nm_client.get_iface_from_connection")
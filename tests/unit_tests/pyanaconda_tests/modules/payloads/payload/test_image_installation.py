@@ -15,143 +15,100 @@
 # License and may only be used or replicated with the express permission of
 # Red Hat, Inc.
 #
-import os
-import tempfile
-import time
+import threading
 import unittest
 from unittest.mock import Mock, call, patch
 
-from pyanaconda.core.path import join_paths
-from pyanaconda.modules.common.constants.objects import DEVICE_TREE
-from pyanaconda.modules.common.constants.services import STORAGE
-from pyanaconda.modules.common.structures.storage import DeviceData
 from pyanaconda.modules.payloads.payload.live_image.installation_progress import (
     InstallationProgress,
 )
-from tests.unit_tests.pyanaconda_tests import patch_dbus_get_proxy_with_cache
 
 
 class InstallationProgressTestCase(unittest.TestCase):
     """Test the installation progress of the image installation."""
 
-    @patch("os.statvfs")
-    @patch_dbus_get_proxy_with_cache
-    def test_canceled_progress(self, proxy_getter, statvfs_mock):
-        """Test the canceled installation progress."""
-        callback = Mock()
-
-        with tempfile.TemporaryDirectory() as sysroot:
-            os.mkdir(join_paths(sysroot, "/boot"))
-            os.mkdir(join_paths(sysroot, "/home"))
-
-            device_tree = STORAGE.get_proxy(DEVICE_TREE)
-            device_tree.GetMountPoints.return_value = {
-                "/": "dev1",
-                "/boot": "dev2",
-                "/home": "dev3",
-            }
-            device_tree.GetDeviceData.return_value = DeviceData.to_structure(DeviceData())
-
-            statvfs_mock.return_value = \
-                Mock(f_frsize=1024, f_blocks=150, f_bfree=100)
-
-            progress = InstallationProgress(
-                sysroot=sysroot,
-                callback=callback,
-                installation_size=1024 * 100
-            )
-
-            with progress:
-                time.sleep(2)
-
-        expected = [
-            call("Synchronizing writes to disk"),
-            call("Installing software 0%")
-        ]
-        assert callback.call_args_list == expected
-
-    @patch("time.sleep")
-    @patch("os.statvfs")
-    @patch_dbus_get_proxy_with_cache
-    def test_finished_progress(self, proxy_getter, statvfs_mock, sleep_mock):
-        """Test the finished installation progress."""
-        callback = Mock()
-
-        with tempfile.TemporaryDirectory() as sysroot:
-            device_tree = STORAGE.get_proxy(DEVICE_TREE)
-            device_tree.GetMountPoints.return_value = {
-                "/": "dev1",
-                "/boot": "dev2",
-                "/home": "dev3",
-            }
-            device_tree.GetDeviceData.return_value = DeviceData.to_structure(DeviceData())
-
-            statvfs_mock.side_effect = [
-                Mock(f_frsize=1024, f_blocks=150, f_bfree=125),
-                Mock(f_frsize=1024, f_blocks=150, f_bfree=100),
-                Mock(f_frsize=1024, f_blocks=150, f_bfree=75),
-                Mock(f_frsize=1024, f_blocks=150, f_bfree=45),
-                Mock(f_frsize=1024, f_blocks=150, f_bfree=25),
-                Mock(f_frsize=1024, f_blocks=150, f_bfree=0),
-            ]
-
-            progress = InstallationProgress(
-                sysroot=sysroot,
-                callback=callback,
-                installation_size=1024 * 100
-            )
-
-            progress._monitor_progress()
-
-        expected = [
-            call("Synchronizing writes to disk"),
+    def setUp(self):
+        """Set up the test."""
+        self.callback = Mock()
+
+    @patch("time.monotonic")
+    def test_size_progress(self, monotonic):
+        """Test the progress of processed bytes."""
+        monotonic.return_value = 100
+        progress = InstallationProgress(self.callback, total_size=1000)
+
+        progress.start()
+        progress.update(size=100)
+        assert progress.processed_size == 100
+
+        monotonic.return_value = 101
+        progress.update(size=150)
+        progress.update(size=500)
+
+        monotonic.return_value = 102
+        progress.update(size=200)
+        progress.finish()
+
+        assert self.callback.mock_calls == [
+            call("Installing software 0%"),
             call("Installing software 25%"),
-            call("Installing software 50%"),
-            call("Installing software 80%"),
+            call("Installing software 95%"),
             call("Installing software 100%"),
         ]
-        assert callback.call_args_list == expected
-
-    @patch_dbus_get_proxy_with_cache
-    def test_btrfs_mountpoint_selection(self, proxy_getter):
-        """Test installation progress calculation with btrfs."""
-
-        def get_device_data(device):
-            data = DeviceData()
-            if device in ("root-btrfs-one", "home-btrfs-one"):
-                data.type = "btrfs subvolume"
-            elif device == "btrfs-one":
-                data.type = "btrfs volume"
-            return DeviceData.to_structure(data)
-
-        def get_device_ancestors(devices):
-            ancestors = {
-                "root-btrfs-one": ["btrfs-one", "dev1-disk", "dev2-disk"],
-                "dev2": ["dev2-disk"],
-                "home-btrfs-one": ["dev1-disk", "dev2-disk", "btrfs-one"],
-            }
-            return ancestors[devices[0]]
-
-        callback = Mock()
-
-        device_tree = STORAGE.get_proxy(DEVICE_TREE)
-        device_tree.GetMountPoints.return_value = {
-            "/": "root-btrfs-one",
-            "/boot": "dev2",
-            "/home": "home-btrfs-one",
-        }
-        device_tree.GetDeviceData = Mock(wraps=get_device_data)
-        device_tree.GetAncestors = Mock(wraps=get_device_ancestors)
-
-        progress = InstallationProgress(
-            sysroot="/somewhere",
-            callback=callback,
-            installation_size=1024 * 100
-        )
-
-        mount_points = progress._get_mount_points_to_count()
-
-        assert mount_points == [
-            "/somewhere/",
-            "/somewhere/boot",
+
+    @patch("time.monotonic")
+    def test_entries_progress(self, monotonic):
+        """Test the progress of processed entries."""
+        monotonic.return_value = 100
+        progress = InstallationProgress(self.callback)
+
+        progress.start()
+        progress.update(entries=1)
+        progress.update(entries=1)
+        assert progress.processed_entries == 2
+
+        monotonic.return_value = 101
+        progress.update(entries=1)
+        progress.update(entries=1)
+        progress.finish()
+
+        assert self.callback.mock_calls == [
+            call("Installing software (1 files)"),
+            call("Installing software (3 files)"),
+            call("Installing software (4 files)"),
+        ]
+
+    def test_unchanged_progress(self):
+        """Test that the unchanged progress is not reported."""
+        progress = InstallationProgress(self.callback, total_size=10 ** 9)
+
+        progress.start()
+        progress.update(size=1)
+        progress.update(size=1)
+
+        assert self.callback.mock_calls == [
+            call("Installing software 0%"),
         ]
+
+    def test_concurrent_progress(self):
+        """Test the progress updated from multiple threads."""
+        progress = InstallationProgress(self.callback, total_size=40000)
+        progress.start()
+
+        def update():
+            for _i in range(10000):
+                progress.update(size=1, entries=1)
+
+        threads = [threading.Thread(target=update) for _i in range(4)]
+
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+        progress.finish()
+
+        assert progress.processed_size == 40000
+        assert progress.processed_entries == 40000
+        assert self.callback.mock_calls[-1] == call("Installing software 100%")
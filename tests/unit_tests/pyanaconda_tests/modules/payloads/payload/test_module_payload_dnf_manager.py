@@ -46,6 +46,11 @@ from pyanaconda.modules.payloads.payload.dnf.dnf_manager import (
     DNFManager,
     MetadataError,
 )
+from pyanaconda.modules.payloads.payload.dnf.download_progress import (
+    DownloadProgress,
+    format_time,
+)
+from pyanaconda.modules.payloads.payload.dnf.metadata_cache import MetadataCache
 
 
 class DNF5TestCase(unittest.TestCase):
@@ -371,6 +376,120 @@ class DNFManagerTestCase(unittest.TestCase):
         assert g is not self.dnf_manager._goal
         assert t is not self.dnf_manager._transaction
 
+    def test_resolve_selection_remembered(self):
+        """Test the resolve_selection method with a resolved selection."""
+        self.dnf_manager.setup_base()
+
+        self.dnf_manager.apply_specs(include_list=["p1"], exclude_list=["p2"])
+        report = self.dnf_manager.resolve_selection()
+        transaction = self.dnf_manager._transaction
+
+        # Resolve the same selection again.
+        self.dnf_manager.clear_selection()
+
+        with patch("libdnf5.base.Goal.add_install") as add_install, \
+             patch("libdnf5.base.Goal.resolve") as resolve:
+            self.dnf_manager.apply_specs(include_list=["p1"], exclude_list=["p2"])
+            other_report = self.dnf_manager.resolve_selection()
+
+        add_install.assert_not_called()
+        resolve.assert_not_called()
+        assert self.dnf_manager._transaction is transaction
+        assert other_report is not report
+        assert other_report.warning_messages == report.warning_messages
+        assert other_report.error_messages == report.error_messages
+
+        # Resolve a different selection.
+        self.dnf_manager.clear_selection()
+        self.dnf_manager.apply_specs(include_list=["p1", "p3"], exclude_list=["p2"])
+        report = self.dnf_manager.resolve_selection()
+
+        assert self.dnf_manager._transaction is not transaction
+        assert report.warning_messages == [
+            'No match for argument: p1',
+            'No match for argument: p3',
+        ]
+
+    def test_resolve_selection_extended(self):
+        """Test the resolve_selection method with an extended selection."""
+        self.dnf_manager.setup_base()
+
+        self.dnf_manager.apply_specs(include_list=["p1"], exclude_list=[])
+        self.dnf_manager.resolve_selection()
+
+        # The remembered part of the selection is applied later.
+        self.dnf_manager.clear_selection()
+        self.dnf_manager.apply_specs(include_list=["p1"], exclude_list=[])
+        self.dnf_manager.apply_specs(include_list=["p3"], exclude_list=[])
+        report = self.dnf_manager.resolve_selection()
+
+        assert report.warning_messages == [
+            'No match for argument: p1',
+            'No match for argument: p3',
+        ]
+
+    def test_resolve_selection_excludes(self):
+        """Test the resolve_selection method with applied excludes."""
+        self.dnf_manager.setup_base()
+
+        self.dnf_manager.apply_specs(include_list=["p1"], exclude_list=[])
+        self.dnf_manager.resolve_selection()
+
+        # The excludes stay applied after the selection is cleared.
+        self.dnf_manager.clear_selection()
+        self.dnf_manager.apply_specs(include_list=["p2"], exclude_list=["p1"])
+        self.dnf_manager.resolve_selection()
+
+        # The first selection is resolved again with the applied excludes.
+        self.dnf_manager.clear_selection()
+
+        with patch("libdnf5.base.Goal.add_install") as add_install:
+            self.dnf_manager.apply_specs(include_list=["p1"], exclude_list=[])
+
+        add_install.assert_called()
+
+    def test_resolve_selection_copies(self):
+        """Test that the remembered report is not modified."""
+        self.dnf_manager.setup_base()
+
+        self.dnf_manager.apply_specs(include_list=["p1"], exclude_list=[])
+        report = self.dnf_manager.resolve_selection()
+        report.error_messages.append("Unexpected error.")
+        report.warning_messages.clear()
+
+        self.dnf_manager.clear_selection()
+        self.dnf_manager.apply_specs(include_list=["p1"], exclude_list=[])
+        report = self.dnf_manager.resolve_selection()
+
+        assert report.error_messages == []
+        assert report.warning_messages == [
+            'No match for argument: p1',
+        ]
+
+    @patch("pyanaconda.modules.payloads.payload.dnf.dnf_manager.DNF_RESOLVED_SELECTIONS", 2)
+    def test_resolve_selection_forgotten(self):
+        """Test that only the last resolved selections are remembered."""
+        self.dnf_manager.setup_base()
+
+        for spec in ["p1", "p2", "p3"]:
+            self.dnf_manager.clear_selection()
+            self.dnf_manager.apply_specs(include_list=[spec], exclude_list=[])
+            self.dnf_manager.resolve_selection()
+
+        assert len(self.dnf_manager._resolved_selections) == 2
+
+        # The oldest selection is resolved again.
+        self.dnf_manager.clear_selection()
+
+        with patch("libdnf5.base.Goal.add_install") as add_install:
+            self.dnf_manager.apply_specs(include_list=["p1"], exclude_list=[])
+
+        add_install.assert_called()
+
+        # The resolved selections are forgotten with the base.
+        self.dnf_manager.reset_base()
+        assert len(self.dnf_manager._resolved_selections) == 0
+
     def test_substitute(self):
         """Test the substitute method."""
         self.dnf_manager.setup_base()
@@ -450,11 +569,8 @@ class DNFManagerTestCase(unittest.TestCase):
             self.download_progress.progress(i, download_size, 100)
             self.download_progress.end(i, libdnf5.repo.DownloadCallbacks.TransferStatus_SUCCESSFUL, "Message!")
 
-        assert self.download_progress.downloads == {
-            "p1": 100,
-            "p2": 100,
-            "p3": 100
-        }
+        assert self.download_progress.downloads == [100, 100, 100]
+        assert self.download_progress.downloaded_size == 300
 
     def _set_download_callbacks(self, callbacks):
         """Mock the DNFManager._set_download_callbacks, so that we can store the
@@ -492,8 +608,11 @@ class DNFManagerTestCase(unittest.TestCase):
             call('Downloading 2 RPMs, 0 B / 200 B (0%) done.'),
             call('Downloading 3 RPMs, 0 B / 300 B (0%) done.'),
             call('Downloading 3 RPMs, 25 B / 300 B (8%) done.'),
-            call('Downloading 3 RPMs, 50 B / 300 B (16%) done.'),
-            call('Downloading 3 RPMs, 75 B / 300 B (25%) done.'),
+            call('Downloading 3 RPMs, 25 B / 300 B (8%) done. Failed to download 1 RPMs.'),
+            call('Downloading 3 RPMs, 50 B / 300 B (16%) done. Failed to download 1 RPMs.'),
+            call('Downloading 3 RPMs, 50 B / 300 B (16%) done. Failed to download 2 RPMs.'),
+            call('Downloading 3 RPMs, 75 B / 300 B (25%) done. Failed to download 2 RPMs.'),
+            call('Downloading 3 RPMs, 75 B / 300 B (25%) done. Failed to download 3 RPMs.'),
         ])
 
     def _download_packages_failed(self):
@@ -510,11 +629,9 @@ class DNFManagerTestCase(unittest.TestCase):
             self.download_progress.last_time = 0
             self.download_progress.end(i, libdnf5.repo.DownloadCallbacks.TransferStatus_ERROR, "Message!")
 
-        assert self.download_progress.downloads == {
-            "p1": 25,
-            "p2": 25,
-            "p3": 25
-        }
+        assert self.download_progress.downloads == [25, 25, 25]
+        assert self.download_progress.downloaded_size == 75
+        assert self.download_progress.failed_files == 3
 
     @patch.object(DNFManager, '_run_transaction')
     def test_install_packages(self, run_transaction):
@@ -824,6 +941,60 @@ class DNFManagerTestCase(unittest.TestCase):
         ]
 
 
+class DownloadProgressTestCase(unittest.TestCase):
+    """Test the DownloadProgress class."""
+
+    def test_accounting(self):
+        """Test the accounting of downloaded bytes."""
+        progress = DownloadProgress(Mock())
+
+        assert progress.add_new_download(None, "p1", 100) == 0
+        assert progress.add_new_download(None, "p2", 200) == 1
+        assert progress.total_files == 2
+        assert progress.total_size == 300
+
+        progress.progress(0, 100, 50)
+        progress.progress(1, 200, 20)
+        progress.progress(0, 100, 100)
+        assert progress.downloads == [100, 20]
+        assert progress.downloaded_size == 120
+
+        # The download of p2 is restarted.
+        progress.progress(1, 200, 0)
+        assert progress.downloads == [100, 0]
+        assert progress.downloaded_size == 100
+
+    @patch("pyanaconda.modules.payloads.payload.dnf.download_progress.time")
+    def test_rate(self, mocked_time):
+        """Test the reporting of the download rate."""
+        mocked_time.time.return_value = 10000
+        mocked_time.monotonic.side_effect = [0, 2, 4]
+
+        callback = Mock()
+        progress = DownloadProgress(callback)
+        progress.add_new_download(None, "p1", 4000)
+        assert progress.rate is None
+        assert progress.time_left is None
+
+        progress.last_time = 0
+        progress.progress(0, 4000, 1000)
+        assert progress.rate == 500
+        assert progress.time_left == 6
+        callback.assert_called_once_with(
+            "Downloading 1 RPMs, 1000 B / 3.91 KiB (25%) done, 500 B/s, 00:06 left."
+        )
+
+        progress.last_time = 0
+        progress.progress(0, 4000, 3000)
+        assert progress.rate == 650
+
+    def test_format_time(self):
+        """Test the format_time function."""
+        assert format_time(0) == "00:00"
+        assert format_time(61.5) == "01:01"
+        assert format_time(3600 * 25 + 62) == "25:01:02"
+
+
 class DNFManagerCompsTestCase(unittest.TestCase):
     """Test the comps abstraction of the DNF base."""
 
@@ -1065,6 +1236,11 @@ class DNFManagerReposTestCase(unittest.TestCase):
         self.dnf_manager = DNFManager()
         self.dnf_manager.setup_base()
 
+        # Don't share the cached metadata with other tests.
+        metadata_dir = TemporaryDirectory()
+        self.addCleanup(metadata_dir.cleanup)
+        self.dnf_manager._metadata_cache = MetadataCache(path=metadata_dir.name)
+
     def _add_repository(self, repo_id, repo_dir=None, **kwargs):
         """Add the DNF repository with the specified id."""
         data = RepoConfigurationData()
@@ -1510,6 +1686,34 @@ class DNFManagerReposTestCase(unittest.TestCase):
         repo = self._get_repository("r1")
         assert repo.is_enabled() is True
 
+    def test_load_repositories_cached(self):
+        """Test the load_repositories method with cached metadata."""
+        fetcher = self.dnf_manager._repomd_fetcher
+
+        with TemporaryDirectory() as d, \
+                patch.object(fetcher, "get_hashes", wraps=fetcher.get_hashes) as get_hashes:
+            # The metadata cache is empty, so nothing is fetched to restore it.
+            self._add_repository("r1", repo_dir=d)
+            self.dnf_manager.load_repositories()
+            get_hashes.assert_not_called()
+
+            self.dnf_manager.load_repomd_hashes()
+            get_hashes.assert_called_once()
+            md_hashes = self.dnf_manager._md_hashes
+            assert md_hashes["r1"]
+
+            # The hashes fetched to restore the metadata are reused.
+            get_hashes.reset_mock()
+            self.dnf_manager.reset_base()
+            self.dnf_manager.setup_base()
+            self._add_repository("r1", baseurl=["file://" + d])
+            self.dnf_manager.load_repositories()
+            get_hashes.assert_called_once()
+
+            self.dnf_manager.load_repomd_hashes()
+            get_hashes.assert_called_once()
+            assert self.dnf_manager._md_hashes == md_hashes
+
     def test_load_no_repomd_hashes(self):
         """Test the load_repomd_hashes method with no repositories."""
         self.dnf_manager.load_repomd_hashes()
@@ -0,0 +1,157 @@
+#
+# Copyright (C) 2026  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 31 Milk Street #960789 Boston, MA
+# 02196 USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+import os
+import unittest
+from tempfile import TemporaryDirectory
+
+from pyanaconda.modules.payloads.payload.dnf.metadata_cache import MetadataCache
+from pyanaconda.modules.payloads.payload.dnf.utils import calculate_hash
+
+
+class MetadataCacheTestCase(unittest.TestCase):
+    """Test the MetadataCache class."""
+
+    def setUp(self):
+        self._temporary = TemporaryDirectory()
+        self.tmp = self._temporary.name
+        self.cache_path = os.path.join(self.tmp, "cache")
+        os.makedirs(self.cache_path)
+        self.cache = MetadataCache(path=self.cache_path, max_size=1024 * 1024)
+
+    def tearDown(self):
+        self._temporary.cleanup()
+
+    def _write_file(self, path, content):
+        """Write a file."""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        with open(path, "w") as f:
+            f.write(content)
+
+    def _read_file(self, path):
+        """Read a file."""
+        with open(path) as f:
+            return f.read()
+
+    def _create_repo_cache(self, name, repomd, size=0):
+        """Create a repo cache directory."""
+        cache_dir = os.path.join(self.tmp, name)
+        self._write_file(os.path.join(cache_dir, "repodata", "repomd.xml"), repomd)
+        self._write_file(os.path.join(cache_dir, "repodata", "primary.xml"), "x" * size)
+        self._write_file(os.path.join(cache_dir, "solv", name + ".solv"), "solv")
+        self._write_file(os.path.join(cache_dir, "packages", "a.rpm"), "rpm")
+        return cache_dir
+
+    def test_get_repomd_hash(self):
+        """Test the get_repomd_hash method."""
+        cache_dir = self._create_repo_cache("r1", "Metadata for r1.")
+        assert self.cache.get_repomd_hash(cache_dir) == calculate_hash("Metadata for r1.")
+        assert self.cache.get_repomd_hash(os.path.join(self.tmp, "nonexistent")) is None
+
+    def test_store_and_restore(self):
+        """Test the store and restore methods."""
+        cache_dir = self._create_repo_cache("r1", "Metadata for r1.")
+        md_hash = calculate_hash("Metadata for r1.")
+        assert self.cache.store(cache_dir) is True
+        assert os.listdir(self.cache_path) == [md_hash.hex()]
+
+        # Restore the metadata to a different repo cache directory.
+        restored_dir = os.path.join(self.tmp, "r2")
+        assert self.cache.restore(md_hash, restored_dir) is True
+
+        assert self._read_file(os.path.join(restored_dir, "repodata", "repomd.xml")) \
+            == "Metadata for r1."
+        assert self._read_file(os.path.join(restored_dir, "solv", "r1.solv")) == "solv"
+        assert not os.path.exists(os.path.join(restored_dir, "packages"))
+
+        # Storing the same metadata again is fine.
+        assert self.cache.store(restored_dir) is True
+        assert os.listdir(self.cache_path) == [md_hash.hex()]
+
+    def test_is_empty(self):
+        """Test the is_empty method."""
+        assert self.cache.is_empty() is True
+        assert MetadataCache(path=os.path.join(self.tmp, "nonexistent")).is_empty() is True
+
+        self.cache.store(self._create_repo_cache("r1", "Metadata for r1."))
+        assert self.cache.is_empty() is False
+
+    def test_copies(self):
+        """Test that the cached files are not shared with the repo cache."""
+        cache_dir = self._create_repo_cache("r1", "Metadata for r1.")
+        md_hash = calculate_hash("Metadata for r1.")
+        assert self.cache.store(cache_dir) is True
+
+        restored_dir = os.path.join(self.tmp, "r2")
+        assert self.cache.restore(md_hash, restored_dir) is True
+
+        # Rewrite the files in place.
+        solv_path = os.path.join("solv", "r1.solv")
+        self._write_file(os.path.join(cache_dir, solv_path), "modified")
+        self._write_file(os.path.join(restored_dir, solv_path), "modified")
+
+        entry_path = os.path.join(self.cache_path, md_hash.hex())
+        assert self._read_file(os.path.join(entry_path, solv_path)) == "solv"
+
+    def test_restore_unknown(self):
+        """Test the restore method with unknown metadata."""
+        cache_dir = os.path.join(self.tmp, "r1")
+        assert self.cache.restore(None, cache_dir) is False
+        assert self.cache.restore(calculate_hash("Unknown."), cache_dir) is False
+        assert not os.path.exists(cache_dir)
+
+    def test_restore_existing(self):
+        """Test that the existing repo cache directory is not replaced."""
+        self.cache.store(self._create_repo_cache("r1", "Metadata for r1."))
+        cache_dir = self._create_repo_cache("r2", "Metadata for r2.")
+
+        assert self.cache.restore(calculate_hash("Metadata for r1."), cache_dir) is False
+        assert self._read_file(os.path.join(cache_dir, "repodata", "repomd.xml")) \
+            == "Metadata for r2."
+
+    def test_store_invalid(self):
+        """Test the store method without metadata."""
+        cache_dir = os.path.join(self.tmp, "r1")
+        os.makedirs(cache_dir)
+
+        assert self.cache.store(cache_dir) is False
+        assert os.listdir(self.cache_path) == []
+
+    def test_eviction(self):
+        """Test the eviction of the least recently used entries."""
+        size = 400 * 1024
+        h1 = calculate_hash("r1")
+        h2 = calculate_hash("r2")
+        h3 = calculate_hash("r3")
+
+        self.cache.store(self._create_repo_cache("r1", "r1", size))
+        self.cache.store(self._create_repo_cache("r2", "r2", size))
+        os.utime(os.path.join(self.cache_path, h1.hex()), (1, 1))
+        os.utime(os.path.join(self.cache_path, h2.hex()), (2, 2))
+
+        # Use the first entry.
+        assert self.cache.restore(h1, os.path.join(self.tmp, "restored")) is True
+
+        # The second entry is the least recently used one.
+        self.cache.store(self._create_repo_cache("r3", "r3", size))
+        assert sorted(os.listdir(self.cache_path)) == sorted([h1.hex(), h3.hex()])
+
+    def test_eviction_newest(self):
+        """Test that the newest entry is always kept."""
+        self.cache.store(self._create_repo_cache("r1", "r1", 2 * 1024 * 1024))
+        assert os.listdir(self.cache_path) == [calculate_hash("r1").hex()]
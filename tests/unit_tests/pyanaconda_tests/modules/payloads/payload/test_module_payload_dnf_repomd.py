@@ -0,0 +1,241 @@
+#
+# Copyright (C) 2026  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 31 Milk Street #960789 Boston, MA
+# 02196 USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+import os
+import threading
+import time
+import unittest
+from tempfile import TemporaryDirectory
+from unittest.mock import MagicMock, Mock, patch
+
+import requests
+
+from pyanaconda.core.constants import USER_AGENT
+from pyanaconda.modules.common.structures.payload import RepoConfigurationData
+from pyanaconda.modules.payloads.payload.dnf.repomd import RepomdFetcher, RepomdSource
+from pyanaconda.modules.payloads.payload.dnf.utils import calculate_hash
+
+
+class RepomdFetcherTestCase(unittest.TestCase):
+    """Test the RepomdFetcher class."""
+
+    def setUp(self):
+        self.fetcher = RepomdFetcher(workers=4, timeout=5)
+        self.released = threading.Event()
+
+    def tearDown(self):
+        self.released.set()
+
+    def _create_repository(self, path, content):
+        """Create a repository with the given repomd.xml file."""
+        os.makedirs(os.path.join(path, "repodata"))
+
+        with open(os.path.join(path, "repodata", "repomd.xml"), "w") as f:
+            f.write(content)
+
+        return "file://" + path
+
+    def _create_response(self, status_code=200, content=b"", headers=None):
+        """Create a mock of a response."""
+        response = MagicMock(status_code=status_code, content=content, headers=headers or {})
+        response.__enter__.return_value = response
+
+        if status_code >= 400:
+            response.raise_for_status.side_effect = requests.exceptions.HTTPError(status_code)
+
+        return response
+
+    def _wait_for(self, condition, timeout=5):
+        """Wait until the condition is true."""
+        deadline = time.monotonic() + timeout
+
+        while not condition():
+            assert time.monotonic() < deadline, "Timed out waiting for a condition."
+            time.sleep(0.01)
+
+    @patch("pyanaconda.modules.payloads.payload.dnf.repomd.requests_session")
+    def _get_hashes(self, sources, responses, session_getter):
+        """Get the hashes with mocked responses for URLs."""
+        session = Mock()
+        session_getter.return_value = session
+
+        def get(url, **kwargs):
+            response = responses[url]
+            return response if isinstance(response, Mock) else response(**kwargs)
+
+        session.get.side_effect = get
+        return self.fetcher.get_hashes(sources), session
+
+    def test_no_sources(self):
+        """Test the fetcher with no sources."""
+        assert self.fetcher.get_hashes([]) == {}
+        assert self.fetcher.get_hashes([RepomdSource("r1", [])]) == {"r1": None}
+
+    def test_file_sources(self):
+        """Test the fetcher with local repositories."""
+        with TemporaryDirectory() as d:
+            r1 = self._create_repository(os.path.join(d, "r1"), "Metadata for r1.")
+            r2 = self._create_repository(os.path.join(d, "r2"), "Metadata for r2.")
+
+            sources = [
+                RepomdSource("r1", ["file://nonexistent/1", r1, "file:///nonexistent/2"]),
+                RepomdSource("r2", [r2]),
+                RepomdSource("r3", ["file://nonexistent/1", "file:///nonexistent/2"]),
+            ]
+
+            assert self.fetcher.get_hashes(sources) == {
+                "r1": calculate_hash("Metadata for r1."),
+                "r2": calculate_hash("Metadata for r2."),
+                "r3": None,
+            }
+
+    def test_mirror_order(self):
+        """Test that the mirrors are tried in the configured order."""
+        def slow_response(**kwargs):
+            time.sleep(0.1)
+            return self._create_response(content=b"First metadata.")
+
+        sources = [RepomdSource("r1", ["http://first", "http://second"])]
+        responses = {
+            "http://first/repodata/repomd.xml": slow_response,
+            "http://second/repodata/repomd.xml": self._create_response(content=b"Other metadata.")
+        }
+
+        # The hash doesn't depend on the fastest mirror.
+        md_hashes, session = self._get_hashes(sources, responses)
+        assert md_hashes == {"r1": calculate_hash("First metadata.")}
+        assert session.get.call_count == 1
+
+    def test_failed_mirror(self):
+        """Test that a failed mirror is skipped."""
+        sources = [RepomdSource("r1", ["http://broken", "http://working"])]
+        responses = {
+            "http://broken/repodata/repomd.xml": self._create_response(status_code=404),
+            "http://working/repodata/repomd.xml": self._create_response(content=b"Metadata.")
+        }
+
+        md_hashes, session = self._get_hashes(sources, responses)
+        assert md_hashes == {"r1": calculate_hash("Metadata.")}
+        assert [c.kwargs["url"] for c in session.get.call_args_list] == [
+            "http://broken/repodata/repomd.xml",
+            "http://working/repodata/repomd.xml",
+        ]
+        self._wait_for(lambda: session.close.called)
+        session.close.assert_called_once_with()
+
+    def test_timeout(self):
+        """Test that unreachable repositories time out."""
+        def hanging_response(**kwargs):
+            self.released.wait(10)
+            return self._create_response(content=b"Late metadata.")
+
+        self.fetcher = RepomdFetcher(workers=4, timeout=0.1)
+        sources = [
+            RepomdSource("r1", ["http://hanging"]),
+            RepomdSource("r2", ["http://working"]),
+        ]
+        responses = {
+            "http://hanging/repodata/repomd.xml": hanging_response,
+            "http://working/repodata/repomd.xml": self._create_response(content=b"Metadata.")
+        }
+
+        md_hashes, session = self._get_hashes(sources, responses)
+        assert md_hashes == {"r1": None, "r2": calculate_hash("Metadata.")}
+
+        # The session is closed after the hanging request finishes.
+        session.close.assert_not_called()
+        self.released.set()
+        self._wait_for(lambda: session.close.called)
+        session.close.assert_called_once_with()
+
+    def test_network_settings(self):
+        """Test that the network settings are used."""
+        data = RepoConfigurationData()
+        data.proxy = "http://proxy:3128"
+        data.ssl_configuration.ca_cert_path = "/ca-cert"
+        data.ssl_configuration.client_cert_path = "/client-cert"
+        data.ssl_configuration.client_key_path = "/client-key"
+
+        sources = [RepomdSource("r1", ["https://example.com"], data)]
+        responses = {
+            "https://example.com/repodata/repomd.xml": self._create_response(content=b"Metadata.")
+        }
+
+        _md_hashes, session = self._get_hashes(sources, responses)
+        session.get.assert_called_once_with(
+            url="https://example.com/repodata/repomd.xml",
+            headers={"user-agent": USER_AGENT},
+            proxies={
+                "http": "http://proxy:3128",
+                "https": "http://proxy:3128",
+                "ftp": "http://proxy:3128",
+            },
+            verify="/ca-cert",
+            cert=("/client-cert", "/client-key"),
+            timeout=5,
+        )
+
+    def test_conditional_requests(self):
+        """Test the conditional requests for cached responses."""
+        url = "http://example.com/repodata/repomd.xml"
+        sources = [RepomdSource("r1", ["http://example.com"])]
+        expected_hash = calculate_hash("Metadata.")
+
+        # The first request is not conditional.
+        responses = {url: self._create_response(content=b"Metadata.", headers={
+            "etag": '"123"',
+            "last-modified": "Wed, 21 Oct 2015 07:28:00 GMT",
+        })}
+
+        md_hashes, session = self._get_hashes(sources, responses)
+        assert md_hashes == {"r1": expected_hash}
+        assert session.get.call_args.kwargs["headers"] == {"user-agent": USER_AGENT}
+
+        # The unchanged file is not downloaded again.
+        responses = {url: self._create_response(status_code=304)}
+
+        md_hashes, session = self._get_hashes(sources, responses)
+        assert md_hashes == {"r1": expected_hash}
+        assert session.get.call_args.kwargs["headers"] == {
+            "user-agent": USER_AGENT,
+            "If-None-Match": '"123"',
+            "If-Modified-Since": "Wed, 21 Oct 2015 07:28:00 GMT",
+        }
+
+        # The changed file is downloaded again.
+        responses = {url: self._create_response(content=b"New metadata.", headers={
+            "etag": '"456"',
+        })}
+
+        md_hashes, session = self._get_hashes(sources, responses)
+        assert md_hashes == {"r1": calculate_hash("New metadata.")}
+
+        # Different network settings are not conditional.
+        data = RepoConfigurationData()
+        data.proxy = "http://proxy"
+        sources = [RepomdSource("r1", ["http://example.com"], data)]
+        responses = {url: self._create_response(content=b"Metadata.")}
+
+        _md_hashes, session = self._get_hashes(sources, responses)
+        assert session.get.call_args.kwargs["headers"] == {"user-agent": USER_AGENT}
+
+        # The cache can be cleared.
+        self.fetcher.clear_cache()
+        sources = [RepomdSource("r1", ["http://example.com"])]
+
+        _md_hashes, session = self._get_hashes(sources, responses)
+        assert session.get.call_args.kwargs["headers"] == {"user-agent": USER_AGENT}
@@ -17,16 +17,25 @@
 #
 # Red Hat Author(s): Jiri Konecny <jkonecny@redhat.com>
 #
+import hashlib
+import io
+import json
+import os
 import ssl
 import unittest
+from contextlib import contextmanager
 from pathlib import Path
-from unittest.mock import MagicMock, PropertyMock, patch
+from tempfile import TemporaryDirectory
+from unittest.mock import MagicMock, Mock, PropertyMock, patch
 from urllib.parse import urlparse
 
 import pytest
 import requests
 
+from pyanaconda.modules.common.errors.payload import SourceSetupError
 from pyanaconda.modules.common.structures.payload import RepoConfigurationData
+from pyanaconda.modules.payloads.payload.flatpak.constants import FLATPAK_MEDIA_TYPE
+from pyanaconda.modules.payloads.payload.flatpak.fetcher import BlobFetcher
 from pyanaconda.modules.payloads.payload.flatpak.source import (
     FlatpakRegistrySource,
     FlatpakStaticSource,
@@ -77,6 +86,65 @@ class FlatpakStaticSourceTestCase(unittest.TestCase):
 
         assert ret == "oci:/local/source/test-flatpak"
 
+    def test_remote_download(self):
+        """Test FlatpakStaticSource download for remote source."""
+        runtime = json.dumps({"config": {"Labels": {
+            "org.flatpak.ref": "runtime/org.example.Platform/amd64/stable",
+        }}}).encode()
+        app = json.dumps({"config": {"Labels": {
+            "org.flatpak.ref": "app/org.example.App/amd64/stable",
+            "org.flatpak.metadata": "[Application]\nruntime=org.example.Platform/amd64/stable\n",
+        }}}).encode()
+
+        # The layer is shared by both images.
+        manifests = [
+            json.dumps({
+                "config": {"digest": get_digest(config)},
+                "layers": [{"digest": get_digest(b"layer"), "size": "5"}],
+            }).encode() for config in (app, runtime)
+        ]
+        index = {"manifests": [
+            {"mediaType": FLATPAK_MEDIA_TYPE, "digest": get_digest(m)} for m in manifests
+        ]}
+
+        server = FakeBlobServer(
+            [runtime, app, b"layer", *manifests],
+            url="http://example.com/flatpak/test-flatpak"
+        )
+        server.blobs[server.url + "/index.json"] = json.dumps(index).encode()
+
+        def download(url, stream=False):
+            response = server(url, stream)
+            response.json.return_value = index
+            response.status_code = 200
+            return response
+
+        @contextmanager
+        def downloader(pool_size=None):
+            yield download
+
+        data = self._prepare_repo_data("http://example.com/flatpak")
+        source = FlatpakStaticSource(data, "test-flatpak")
+
+        with TemporaryDirectory() as location, \
+                patch.object(source, "_downloader", side_effect=downloader):
+            ret = source.download(["app/org.example.App/amd64/stable"], location)
+            assert ret == "oci:" + location + "/Flatpaks"
+
+            with open(os.path.join(location, "Flatpaks", "index.json")) as f:
+                assert json.load(f)["manifests"] == [
+                    {"mediaType": FLATPAK_MEDIA_TYPE, "digest": get_digest(m), "size": len(m)}
+                    for m in manifests
+                ]
+
+            blobs_dir = os.path.join(location, "Flatpaks", "blobs", "sha256")
+            assert len(os.listdir(blobs_dir)) == 5
+
+        # Only the layer is downloaded again, once.
+        layer_url = server.blob_url(get_digest(b"layer"))
+        assert server.requested.count(layer_url) == 1
+        assert len(server.requested) == 6
+
     @patch.object(FlatpakStaticSource, "_images", new_callable=PropertyMock)
     def test_calculate_size_source(self, mocked_images):
         """Test FlatpakStaticSource calculate_size method with one source."""
@@ -206,6 +274,114 @@ class FlatpakStaticSourceTestCase(unittest.TestCase):
         assert installed_size == 40
 
 
+def get_digest(content):
+    """Get a digest of the blob content."""
+    return "sha256:" + hashlib.sha256(content).hexdigest()
+
+
+class FakeBlobServer:
+    """Serve blobs to a fake downloader."""
+
+    def __init__(self, blobs, url="http://example.com/flatpak"):
+        self.url = url
+        self.blobs = {self.blob_url(get_digest(b)): b for b in blobs}
+        self.requested = []
+
+    def blob_url(self, digest):
+        return self.url + "/blobs/sha256/" + digest.removeprefix("sha256:")
+
+    def __call__(self, url, stream=False):
+        self.requested.append(url)
+        content = self.blobs[url]
+
+        response = MagicMock()
+        response.content = content
+        response.raw = io.BytesIO(content)
+        return response
+
+
+class BlobFetcherTestCase(unittest.TestCase):
+    """Test the fetcher of OCI blobs."""
+
+    def setUp(self):
+        self._temporary = TemporaryDirectory()
+        self.location = self._temporary.name
+        self.addCleanup(self._temporary.cleanup)
+
+        self.blobs = [b"layer1", b"layer2", b"layer3"]
+        self.server = FakeBlobServer(self.blobs)
+        self.progress = Mock()
+
+    def _fetch(self, blobs, **kwargs):
+        fetcher = BlobFetcher(
+            downloader=self.server,
+            blob_url=self.server.blob_url,
+            download_location=self.location,
+            progress=self.progress,
+            workers=2,
+            **kwargs
+        )
+        fetcher.fetch({get_digest(b): len(b) for b in blobs})
+        return fetcher
+
+    def _read_blob(self, fetcher, blob):
+        with open(fetcher.get_blob_path(get_digest(blob)), "rb") as f:
+            return f.read()
+
+    def test_fetch(self):
+        """Download blobs."""
+        fetcher = self._fetch(self.blobs)
+
+        assert sorted(self.server.requested) == \
+            sorted(self.server.blob_url(get_digest(b)) for b in self.blobs)
+
+        for blob in self.blobs:
+            assert self._read_blob(fetcher, blob) == blob
+
+        # The progress is reported for all blobs together.
+        self.progress.report_progress.assert_called_with("Downloading Flatpaks (100%)")
+        assert self.progress.report_progress.call_count <= 101
+
+    def test_fetch_present(self):
+        """Don't download blobs present in the layout."""
+        fetcher = self._fetch(self.blobs[:1])
+
+        # Break the second blob.
+        with open(fetcher.get_blob_path(get_digest(self.blobs[1])), "wb") as f:
+            f.write(b"broken")
+
+        self.server.requested.clear()
+        self._fetch(self.blobs)
+
+        assert sorted(self.server.requested) == \
+            sorted(self.server.blob_url(get_digest(b)) for b in self.blobs[1:])
+        assert self._read_blob(fetcher, self.blobs[1]) == self.blobs[1]
+
+    def test_fetch_cached(self):
+        """Write cached blobs without a download."""
+        fetcher = self._fetch(self.blobs, cached_blobs={get_digest(b"layer1"): b"layer1"})
+
+        assert self.server.blob_url(get_digest(b"layer1")) not in self.server.requested
+        assert self._read_blob(fetcher, b"layer1") == b"layer1"
+
+    def test_fetch_wrong_digest(self):
+        """Don't keep blobs with a wrong digest."""
+        digest = get_digest(b"layer1")
+        self.server.blobs[self.server.blob_url(digest)] = b"corrupted"
+
+        with pytest.raises(SourceSetupError):
+            self._fetch([b"layer1"])
+
+        assert os.listdir(os.path.join(self.location, "blobs", "sha256")) == []
+
+    def test_unsupported_digest(self):
+        """Support only SHA-256 digests."""
+        fetcher = BlobFetcher(Mock(), Mock(), self.location)
+
+        with pytest.raises(RuntimeError):
+            fetcher.get_blob_path("md5:1234")
+
+
 class FlatpakRegistrySourceTestCase(unittest.TestCase):
     """Test FlatpakRegistrySource of the Flatpak module."""
 
@@ -17,10 +17,19 @@
 #
 # Red Hat Author(s): Jiri Konecny <jkonecny@redhat.com>
 #
+import errno
+import hashlib
+import io
 import os
+import stat
+import subprocess
+import tarfile
 import tempfile
+import threading
+import time
 import unittest
 from contextlib import contextmanager
+from functools import partial
 from unittest.mock import MagicMock, Mock, call, patch
 
 import pytest
@@ -28,15 +37,19 @@ import requests
 from requests_file import FileAdapter
 
 from pyanaconda.core.configuration.anaconda import conf
-from pyanaconda.core.path import join_paths, touch
+from pyanaconda.core.path import join_paths, make_directories, touch
 from pyanaconda.modules.common.errors.installation import PayloadInstallationError
 from pyanaconda.modules.common.structures.live_image import LiveImageConfigurationData
+from pyanaconda.modules.payloads.payload.live_image.copier import FileTreeCopier
 from pyanaconda.modules.payloads.payload.live_image.download_progress import (
     DownloadProgress,
 )
+from pyanaconda.modules.payloads.payload.live_image.downloader import ImageDownloader
+from pyanaconda.modules.payloads.payload.live_image.extraction import TarExtractor
 from pyanaconda.modules.payloads.payload.live_image.installation import (
     DownloadImageTask,
     InstallFromImageTask,
+    InstallFromRemoteTarTask,
     InstallFromTarTask,
     MountImageTask,
     RemoveImageTask,
@@ -170,24 +183,259 @@ class InstallFromImageTaskTestCase(unittest.TestCase):
         msg = "Failed to install image: Fake!"
         assert str(cm.value) == msg
 
+    @patch("pyanaconda.modules.payloads.payload.live_image.installation.os.sync")
+    @patch("pyanaconda.modules.payloads.payload.live_image.installation.conf")
+    def test_install_image_task_copier(self, mocked_conf, os_sync):
+        """Test installation from an image with a pool of workers."""
+        mocked_conf.payload.parallel_image_copy = True
+        callback = Mock()
 
-class InstallFromTarTaskTestCase(unittest.TestCase):
-    """Test the InstallFromTarTask class."""
+        with tempfile.TemporaryDirectory() as d:
+            mount_point = join_paths(d, "image")
+            sysroot = join_paths(d, "sysroot")
+            os.mkdir(sysroot)
+
+            for path in ["usr/bin/f1", "tmp/f2", "boot/efi/EFI/f3", "boot/efi/loader/f4",
+                         "boot/vmlinuz-0-rescue-1", "etc/sysconfig/f5", "etc/machine-id"]:
+                make_directories(os.path.dirname(join_paths(mount_point, path)))
+                touch(join_paths(mount_point, path))
+
+            task = InstallFromImageTask(
+                sysroot=sysroot,
+                mount_point=mount_point
+            )
+            task.progress_changed_signal.connect(callback)
+            task.run()
+
+            assert sorted(
+                os.path.relpath(join_paths(root, name), sysroot)
+                for root, dirs, files in os.walk(sysroot) for name in dirs + files
+            ) == [
+                "boot", "boot/efi", "boot/efi/EFI", "boot/efi/EFI/f3",
+                "boot/efi/loader", "boot/efi/loader/f4",
+                "etc", "etc/sysconfig", "etc/sysconfig/f5",
+                "tmp", "usr", "usr/bin", "usr/bin/f1",
+            ]
+
+        callback.assert_any_call(0, "Installing software...")
 
     @patch("pyanaconda.modules.payloads.payload.live_image.installation.os.sync")
-    @patch("pyanaconda.modules.payloads.payload.live_image.installation.execWithRedirect")
-    def test_install_tar_task(self, exec_with_redirect, os_sync):
-        """Test installation from a tarball."""
-        exec_with_redirect.return_value = 0
+    @patch("pyanaconda.modules.payloads.payload.live_image.installation.conf")
+    @patch("pyanaconda.modules.payloads.payload.live_image.copier.FileTreeCopier.copy")
+    def test_install_image_task_copier_failed(self, copy, mocked_conf, os_sync):
+        """Test a failed installation from an image with a pool of workers."""
+        mocked_conf.payload.parallel_image_copy = True
+        copy.side_effect = OSError("Fake!")
 
-        with tempfile.NamedTemporaryFile("w") as f:
-            task = InstallFromTarTask(
+        with tempfile.TemporaryDirectory() as mount_point:
+            task = InstallFromImageTask(
                 sysroot="/mnt/root",
-                tarfile=f.name
+                mount_point=mount_point
             )
-            task.run()
 
-        exec_with_redirect.assert_called_once_with("tar", [
+            with pytest.raises(PayloadInstallationError) as cm:
+                task.run()
+
+        msg = "Failed to install image: Fake!"
+        assert str(cm.value) == msg
+
+
+class FileTreeCopierTestCase(unittest.TestCase):
+    """Test the FileTreeCopier class."""
+
+    def setUp(self):
+        """Set up the test."""
+        self.callback = Mock()
+
+    @contextmanager
+    def _create_directories(self):
+        """Create the source and the target directories."""
+        with tempfile.TemporaryDirectory() as d:
+            source = join_paths(d, "source")
+            target = join_paths(d, "target")
+            os.mkdir(source)
+            os.mkdir(target)
+            yield source, target
+
+    def _create_file(self, path, content=b"", mode=0o644):
+        """Create a file."""
+        make_directories(os.path.dirname(path))
+
+        with open(path, "wb") as f:
+            f.write(content)
+
+        os.chmod(path, mode)
+
+    def _copy(self, source, target, workers=3, **kwargs):
+        """Copy the source tree."""
+        copier = FileTreeCopier(
+            source=source,
+            target=target,
+            callback=self.callback,
+            workers=workers,
+            **kwargs
+        )
+        copier.copy()
+        return copier
+
+    def test_copy_files(self):
+        """Copy files with the metadata."""
+        with self._create_directories() as (source, target):
+            for i in range(20):
+                self._create_file(
+                    join_paths(source, "dir{}/file{}".format(i % 3, i)),
+                    content=os.urandom(i * 1000),
+                    mode=0o640 + i % 8
+                )
+
+            os.utime(join_paths(source, "dir1/file1"), ns=(1000000000, 2000000000))
+            os.utime(join_paths(source, "dir1"), ns=(3000000000, 4000000000))
+            os.chmod(join_paths(source, "dir2"), 0o750)
+
+            copier = self._copy(source, target)
+            assert copier.copied_files == 20
+
+            for i in range(20):
+                path = "dir{}/file{}".format(i % 3, i)
+
+                with open(join_paths(source, path), "rb") as f1:
+                    with open(join_paths(target, path), "rb") as f2:
+                        assert f1.read() == f2.read()
+
+                assert os.stat(join_paths(target, path)).st_mode & 0o777 == 0o640 + i % 8
+
+            assert os.stat(join_paths(target, "dir1/file1")).st_mtime_ns == 2000000000
+            assert os.stat(join_paths(target, "dir1")).st_mtime_ns == 4000000000
+            assert os.stat(join_paths(target, "dir2")).st_mode & 0o777 == 0o750
+
+        assert self.callback.mock_calls[0] == call("Installing software 0%")
+        assert self.callback.mock_calls[-1] == call("Installing software 100%")
+
+    @patch(
+        "pyanaconda.modules.payloads.payload.live_image.installation_progress."
+        "PROGRESS_REPORT_INTERVAL", 0
+    )
+    def test_copy_progress(self):
+        """Report the progress of workers in order."""
+        with self._create_directories() as (source, target):
+            for i in range(100):
+                self._create_file(join_paths(source, "file{}".format(i)), os.urandom(1000))
+
+            self._copy(source, target, workers=4)
+
+        values = [int(c.args[0].split()[-1].rstrip("%")) for c in self.callback.mock_calls]
+        assert values == sorted(set(values))
+        assert values[-1] == 100
+
+    def test_copy_special_files(self):
+        """Copy symlinks, hardlinks and special files."""
+        with self._create_directories() as (source, target):
+            self._create_file(join_paths(source, "a/file"), b"CONTENT")
+            os.link(join_paths(source, "a/file"), join_paths(source, "b"))
+            os.symlink("a/file", join_paths(source, "link"))
+            os.mkfifo(join_paths(source, "fifo"))
+
+            self._copy(source, target)
+
+            assert os.path.samefile(join_paths(target, "a/file"), join_paths(target, "b"))
+            assert os.readlink(join_paths(target, "link")) == "a/file"
+            assert stat.S_ISFIFO(os.lstat(join_paths(target, "fifo")).st_mode)
+
+    def test_copy_xattrs(self):
+        """Copy xattrs."""
+        with self._create_directories() as (source, target):
+            self._create_file(join_paths(source, "file"))
+
+            try:
+                os.setxattr(join_paths(source, "file"), "user.test", b"VALUE")
+            except OSError:
+                self.skipTest("Xattrs are not supported.")
+
+            self._copy(source, target)
+            assert os.getxattr(join_paths(target, "file"), "user.test") == b"VALUE"
+
+    def test_copy_excludes(self):
+        """Copy files with excludes."""
+        with self._create_directories() as (source, target):
+            for path in ["dev/null", "tmp/f1", "boot/x-rescue-y", "boot/a/x-rescue-y",
+                         "etc/machine-id", "etc/f2", "f3.log", "a/f4.log", "run"]:
+                self._create_file(join_paths(source, path))
+
+            self._copy(source, target, excludes=[
+                "/dev/", "/tmp/*", "/boot/*rescue*", "/etc/machine-id", "*.log", "/run/"
+            ])
+
+            assert sorted(
+                os.path.relpath(join_paths(root, name), target)
+                for root, dirs, files in os.walk(target) for name in dirs + files
+            ) == ["a", "boot", "boot/a", "boot/a/x-rescue-y", "etc", "etc/f2", "run", "tmp"]
+
+    def test_copy_without_archive(self):
+        """Copy only directories and regular files."""
+        with self._create_directories() as (source, target):
+            self._create_file(join_paths(source, "a/file"), b"CONTENT")
+            os.link(join_paths(source, "a/file"), join_paths(source, "b"))
+            os.symlink("a/file", join_paths(source, "link"))
+            os.utime(join_paths(source, "b"), ns=(1000000000, 2000000000))
+
+            self._copy(source, target, archive=False)
+
+            assert not os.path.samefile(join_paths(target, "a/file"), join_paths(target, "b"))
+            assert not os.path.lexists(join_paths(target, "link"))
+            assert os.stat(join_paths(target, "b")).st_mtime_ns != 2000000000
+
+    @patch("pyanaconda.modules.payloads.payload.live_image.copier.fcntl.ioctl")
+    @patch("pyanaconda.modules.payloads.payload.live_image.copier.os.copy_file_range")
+    def test_copy_fallback(self, copy_file_range, ioctl):
+        """Copy files without the fast copy."""
+        ioctl.side_effect = OSError(errno.EOPNOTSUPP, "Fake!")
+        copy_file_range.side_effect = OSError(errno.EXDEV, "Fake!")
+
+        with self._create_directories() as (source, target):
+            content = os.urandom(100000)
+            self._create_file(join_paths(source, "f1"), content)
+            self._create_file(join_paths(source, "f2"), content)
+
+            self._copy(source, target, workers=1)
+
+            for name in ("f1", "f2"):
+                with open(join_paths(target, name), "rb") as f:
+                    assert f.read() == content
+
+        ioctl.assert_called_once()
+        copy_file_range.assert_called_once()
+
+    @patch("pyanaconda.modules.payloads.payload.live_image.copier.os.copy_file_range")
+    def test_copy_failed(self, copy_file_range):
+        """Fail to copy files."""
+        copy_file_range.side_effect = OSError(errno.EIO, "Fake!")
+
+        with self._create_directories() as (source, target):
+            for i in range(10):
+                self._create_file(join_paths(source, "f{}".format(i)), b"CONTENT")
+
+            with pytest.raises(OSError):
+                self._copy(source, target)
+
+
+class InstallFromTarTaskTestCase(unittest.TestCase):
+    """Test the InstallFromTarTask class."""
+
+    @patch("pyanaconda.modules.payloads.payload.live_image.extraction.startProgram")
+    def test_install_tar_task(self, start_program):
+        """Test installation from a tarball."""
+        process = start_program.return_value
+        process.stdout = io.BytesIO(b"./\n./f1\n")
+        process.wait.return_value = 0
+
+        task = InstallFromTarTask(
+            sysroot="/mnt/root",
+            tarfile="/path/to/image.tar.lz4"
+        )
+        task.run()
+
+        start_program.assert_called_once_with([
+            "tar",
             "--numeric-owner",
             "--selinux",
             "--acls",
@@ -203,28 +451,302 @@ class InstallFromTarTaskTestCase(unittest.TestCase):
             "--exclude", "./boot/efi/loader",
             "--exclude", "./etc/machine-id",
             "--exclude", "./etc/machine-info",
-            "-xaf", f.name,
+            "--verbose",
+            "-xaf", "/path/to/image.tar.lz4",
             "-C", "/mnt/root"
-        ])
+        ], stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
 
-    @patch("pyanaconda.modules.payloads.payload.live_image.installation.os.sync")
-    @patch("pyanaconda.modules.payloads.payload.live_image.installation.execWithRedirect")
-    def test_install_tar_task_failed_exception(self, exec_with_redirect, os_sync):
+        # Tar reads the tarball itself.
+        process.stdin.write.assert_not_called()
+
+    @patch("pyanaconda.modules.payloads.payload.live_image.extraction.startProgram")
+    def test_install_tar_task_failed_exception(self, start_program):
         """Test installation from a tarball with an exception."""
-        exec_with_redirect.side_effect = OSError("Fake!")
+        start_program.side_effect = OSError("Fake!")
 
-        with tempfile.NamedTemporaryFile("w") as f:
-            task = InstallFromTarTask(
-                sysroot="/mnt/root",
-                tarfile=f.name
-            )
+        task = InstallFromTarTask(
+            sysroot="/mnt/root",
+            tarfile="/path/to/image.tar"
+        )
 
-            with pytest.raises(PayloadInstallationError) as cm:
-                task.run()
+        with pytest.raises(PayloadInstallationError) as cm:
+            task.run()
 
         msg = "Failed to install tar: Fake!"
         assert str(cm.value) == msg
 
+    @patch("pyanaconda.modules.payloads.payload.live_image.extraction.log")
+    @patch("pyanaconda.modules.payloads.payload.live_image.extraction.startProgram")
+    def test_install_tar_task_failed_tar(self, start_program, mocked_log):
+        """Test installation from a tarball with a failed tar."""
+        process = start_program.return_value
+        process.stdout = io.BytesIO(b"./\ntar: Fake error!\n")
+        process.wait.return_value = 2
+
+        task = InstallFromTarTask(
+            sysroot="/mnt/root",
+            tarfile="/path/to/image.tar"
+        )
+
+        # The exit code of tar is not checked.
+        task.run()
+
+        mocked_log.error.assert_called_once_with(
+            "The failure of tar is ignored: %s", "tar: Fake error!"
+        )
+
+
+class TarExtractorTestCase(unittest.TestCase):
+    """Test the TarExtractor class."""
+
+    def setUp(self):
+        """Set up the test."""
+        self.callback = Mock()
+
+    def _create_tarball(self, path, mode, files):
+        """Create a tarball with the given files."""
+        with tarfile.open(path, mode) as tar:
+            for name in files:
+                info = tarfile.TarInfo(name)
+                info.size = len(name)
+                tar.addfile(info, io.BytesIO(name.encode()))
+
+    def _extract(self, mode, files, total_size=True, hash_algorithm=None):
+        """Create and extract a tarball."""
+        with tempfile.TemporaryDirectory() as d:
+            tarball = join_paths(d, "image.tar")
+            sysroot = join_paths(d, "sysroot")
+            os.mkdir(sysroot)
+
+            self._create_tarball(tarball, mode, files)
+
+            with open(tarball, "rb") as f:
+                content = f.read()
+
+            extractor = TarExtractor(
+                sysroot=sysroot,
+                callback=self.callback,
+                hash_algorithm=hash_algorithm
+            )
+            extractor.extract(
+                [content[i:i + 100] for i in range(0, len(content), 100)],
+                len(content) if total_size else 0
+            )
+
+            for name in files:
+                path = join_paths(sysroot, name)
+
+                if name.startswith("./tmp/") or name.startswith("./dev/"):
+                    assert not os.path.exists(path)
+                    continue
+
+                with open(path) as f:
+                    assert f.read() == name
+
+        return extractor, content
+
+    def test_extract(self):
+        """Extract tarballs with different compressions."""
+        files = ["./f1", "./etc/f2", "./tmp/f3", "./dev/f4"]
+
+        for mode in ("w", "w:gz", "w:bz2", "w:xz"):
+            self.callback.reset_mock()
+            extractor, _content = self._extract(mode, files)
+
+            assert extractor.extracted_entries == 2
+            assert extractor.checksum is None
+            assert self.callback.mock_calls[-1] == call("Installing software 100%")
+
+    @patch(
+        "pyanaconda.modules.payloads.payload.live_image.installation_progress."
+        "PROGRESS_REPORT_INTERVAL", 0
+    )
+    def test_extract_unknown_size(self):
+        """Extract a tarball of an unknown size."""
+        files = ["./f1", "./f2", "./f3"]
+        extractor, _content = self._extract("w:gz", files, total_size=False)
+
+        assert extractor.extracted_entries == 3
+        assert self.callback.mock_calls == [
+            call("Installing software (1 files)"),
+            call("Installing software (2 files)"),
+            call("Installing software (3 files)"),
+        ]
+
+    def test_extract_checksum(self):
+        """Calculate the checksum of a tarball."""
+        extractor, content = self._extract("w:gz", ["./f1"], hash_algorithm="sha512")
+        assert extractor.checksum == hashlib.sha512(content).hexdigest()
+
+    def test_extract_file(self):
+        """Extract tarballs from files."""
+        files = ["./f1", "./etc/f2", "./tmp/f3"]
+
+        for mode in ("w", "w:gz", "w:bz2", "w:xz"):
+            with tempfile.TemporaryDirectory() as d:
+                tarball = join_paths(d, "image.tar")
+                sysroot = join_paths(d, "sysroot")
+                os.mkdir(sysroot)
+
+                self._create_tarball(tarball, mode, files)
+                extractor = TarExtractor(sysroot=sysroot, callback=self.callback)
+                extractor.extract_file(tarball)
+
+                assert extractor.extracted_entries == 2
+                assert os.path.exists(join_paths(sysroot, "etc/f2"))
+                assert not os.path.exists(join_paths(sysroot, "tmp/f3"))
+
+    def test_get_format_args(self):
+        """Identify formats of streamed tarballs."""
+        headers = {
+            b"\x1f\x8b\x08": ["--gzip"],
+            b"\x1f\x9d\x90": ["--uncompress"],
+            b"BZh91AY": ["--bzip2"],
+            b"\xfd7zXZ\x00\x00": ["--xz"],
+            b"\x5d\x00\x00\x80\x00": ["--lzma"],
+            b"LZIP\x01": ["--lzip"],
+            b"\x89LZO\x00\r\n\x1a\n\x10": ["--lzop"],
+            b"\x28\xb5\x2f\xfd\x04": ["--zstd"],
+            b"\x04\x22\x4d\x18\x64": ["--use-compress-program", "lz4"],
+            b"./f1".ljust(257, b"\x00") + b"ustar\x0000": [],
+        }
+
+        for header, args in headers.items():
+            assert TarExtractor._get_format_args(header) == args
+
+        for header in (b"", b"INVALID", b"x" * 512):
+            with pytest.raises(RuntimeError) as cm:
+                TarExtractor._get_format_args(header)
+
+            assert str(cm.value) == "Unknown format of the tarball."
+
+    @patch("pyanaconda.modules.payloads.payload.live_image.extraction.startProgram")
+    def test_extract_unknown_format(self, start_program):
+        """Don't run tar for a stream of an unknown format."""
+        extractor = TarExtractor(sysroot="/mnt/root", callback=self.callback)
+
+        with pytest.raises(RuntimeError):
+            extractor.extract([b"INVALID" * 100], 700)
+
+        start_program.assert_not_called()
+
+    def test_remove_extracted(self):
+        """Remove the extracted entries."""
+        with tempfile.TemporaryDirectory() as d:
+            tarball = join_paths(d, "image.tar")
+            sysroot = join_paths(d, "sysroot")
+            os.makedirs(join_paths(sysroot, "etc"))
+
+            with open(join_paths(sysroot, "etc", "existing"), "w") as f:
+                f.write("EXISTING")
+
+            self._create_tarball(tarball, "w:gz", ["./f1", "./etc/f2", "./usr/bin/f3"])
+            extractor = TarExtractor(sysroot=sysroot, callback=self.callback)
+            extractor.extract_file(tarball)
+            extractor.remove_extracted()
+
+            # Directories that are not empty are kept.
+            assert os.listdir(sysroot) == ["etc"]
+            assert os.listdir(join_paths(sysroot, "etc")) == ["existing"]
+
+    def test_extract_failed(self):
+        """Fail to extract an invalid tarball."""
+        with tempfile.TemporaryDirectory() as d:
+            extractor = TarExtractor(
+                sysroot=d,
+                callback=self.callback,
+                hash_algorithm="sha256"
+            )
+
+            with pytest.raises(RuntimeError):
+                extractor.extract([b"\x1f\x8b", b"INVALID" * 1000], 7002)
+
+            assert extractor.checksum is None
+
+
+class InstallFromRemoteTarTaskTestCase(unittest.TestCase):
+    """Test the InstallFromRemoteTarTask class."""
+
+    def setUp(self):
+        """Set up the test."""
+        self.data = LiveImageConfigurationData()
+
+    @staticmethod
+    def patch_requests():
+        """Patch the requests session object."""
+        return patch(
+            "pyanaconda.modules.payloads.payload.live_image.installation.requests_session"
+        )
+
+    def _run_task(self, sysroot):
+        """Run the task."""
+        task = InstallFromRemoteTarTask(
+            sysroot=sysroot,
+            configuration=self.data
+        )
+
+        with self.patch_requests() as session_getter:
+            session = requests.Session()
+            session.mount("fake://", FileAdapter(set_content_length=True))
+            session_getter.return_value = session
+            task.run()
+
+        return task
+
+    def _create_tarball(self, tarball):
+        """Create a tarball and return its checksum."""
+        with tarfile.open(tarball, "w:gz") as tar:
+            info = tarfile.TarInfo("./usr/f1")
+            info.size = 7
+            tar.addfile(info, io.BytesIO(b"CONTENT"))
+
+        with open(tarball, "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()
+
+    def test_install_remote_tar(self):
+        """Install a remote tarball."""
+        with tempfile.TemporaryDirectory() as d:
+            tarball = join_paths(d, "image.tar.gz")
+            sysroot = join_paths(d, "sysroot")
+            os.mkdir(sysroot)
+
+            checksum = self._create_tarball(tarball)
+            self.data.url = "fake://" + tarball
+            self.data.checksum = "sha256:" + checksum
+            task = self._run_task(sysroot)
+
+            with open(join_paths(sysroot, "usr", "f1"), "rb") as f:
+                assert f.read() == b"CONTENT"
+
+            assert task.checksum == checksum
+
+    def test_install_remote_tar_wrong_checksum(self):
+        """Remove the content of a remote tarball with a wrong checksum."""
+        with tempfile.TemporaryDirectory() as d:
+            tarball = join_paths(d, "image.tar.gz")
+            sysroot = join_paths(d, "sysroot")
+            os.mkdir(sysroot)
+
+            self._create_tarball(tarball)
+            self.data.url = "fake://" + tarball
+            self.data.checksum = "sha256:" + "0" * 64
+
+            with pytest.raises(PayloadInstallationError) as cm:
+                self._run_task(sysroot)
+
+            assert str(cm.value) == "Checksum of the image does not match."
+            assert os.listdir(sysroot) == []
+
+    def test_install_remote_tar_failed(self):
+        """Fail to install a remote tarball."""
+        with tempfile.TemporaryDirectory() as d:
+            self.data.url = "fake://" + join_paths(d, "image.tar.gz")
+
+            with pytest.raises(PayloadInstallationError) as cm:
+                self._run_task(d)
+
+        assert str(cm.value).startswith("Error while downloading the image:")
+
 
 class VerifyImageChecksumTestCase(unittest.TestCase):
     """Test the VerifyImageChecksumTask class."""
@@ -291,6 +813,74 @@ class VerifyImageChecksumTestCase(unittest.TestCase):
         msg = "Checksum of the image does not match."
         assert str(cm.value) == msg
 
+    def test_verify_other_algorithms(self):
+        """Test the verification of checksums with other algorithms."""
+        checksums = [
+            "sha512:" + hashlib.sha512(b"IMAGE CONTENT").hexdigest(),
+            hashlib.sha512(b"IMAGE CONTENT").hexdigest().upper(),
+            "BLAKE2B:" + hashlib.blake2b(b"IMAGE CONTENT").hexdigest(),
+        ]
+
+        for checksum in checksums:
+            self.data.checksum = checksum
+
+            with tempfile.NamedTemporaryFile("w") as f:
+                self._create_image(f)
+
+                task = VerifyImageChecksumTask(
+                    configuration=self.data,
+                    image_path=f.name
+                )
+
+                with self.assertLogs(level="DEBUG") as cm:
+                    task.run()
+
+            msg = "Checksum of the image does match."
+            assert msg in "\n".join(cm.output)
+
+    def test_verify_unsupported_algorithm(self):
+        """Test the verification of a checksum with an unsupported algorithm."""
+        self.data.checksum = "md5:4a9d2f8d0ea2ca3e0b7cd9b4f1a8a1c1"
+
+        task = VerifyImageChecksumTask(
+            configuration=self.data,
+            image_path="/invalid/path"
+        )
+
+        with pytest.raises(PayloadInstallationError) as cm:
+            task.run()
+
+        msg = "Unsupported checksum algorithm: md5"
+        assert str(cm.value) == msg
+
+    @patch.object(VerifyImageChecksumTask, "_calculate_checksum")
+    def test_verify_calculated_checksum(self, calculate_checksum):
+        """Test the verification of a checksum calculated during the download."""
+        self.data.checksum = "SHA512:ABCD"
+
+        task = VerifyImageChecksumTask(
+            configuration=self.data,
+            image_path="/invalid/path",
+            image_checksum="abcd"
+        )
+
+        with self.assertLogs(level="DEBUG") as cm:
+            task.run()
+
+        calculate_checksum.assert_not_called()
+
+        msg = "Checksum of the image does match."
+        assert msg in "\n".join(cm.output)
+
+        task = VerifyImageChecksumTask(
+            configuration=self.data,
+            image_path="/invalid/path",
+            image_checksum="dcba"
+        )
+
+        with pytest.raises(PayloadInstallationError):
+            task.run()
+
 
 class DownloadProgressTestCase(unittest.TestCase):
     """Test the DownloadProgress class."""
@@ -416,7 +1006,7 @@ class DownloadImageTaskTestCase(unittest.TestCase):
         session = session_getter.return_value.__enter__.return_value
         response = session.get.return_value
         response.headers = {}
-        response.content = b"CONTENT"
+        response.iter_content.return_value = [b"CON", b"", b"TENT"]
 
         # Run the task.
         with self._create_directory():
@@ -444,6 +1034,40 @@ class DownloadImageTaskTestCase(unittest.TestCase):
             0, 'Downloading http://source'
         )
 
+    @patch_requests()
+    def test_remote_file_checksum(self, session_getter):
+        """Calculate the checksum of a remote file during the download."""
+        session = session_getter.return_value.__enter__.return_value
+        response = session.get.return_value
+        response.headers = {}
+        response.iter_content.return_value = [b"CON", b"TENT"]
+
+        with self._create_directory():
+            self.data.url = "http://source"
+            self.data.checksum = "sha512:invalid"
+
+            task = DownloadImageTask(
+                configuration=self.data,
+                download_path=self.download_path
+            )
+            task.run()
+
+        assert task.checksum == hashlib.sha512(b"CONTENT").hexdigest()
+
+    def test_local_file_checksum(self):
+        """Don't calculate the checksum of a local file."""
+        with self._create_directory():
+            self.data.url = "file://{}".format(self.image_path)
+            self.data.checksum = "sha256:invalid"
+
+            task = DownloadImageTask(
+                configuration=self.data,
+                download_path=self.download_path
+            )
+
+            assert task.run() == self.image_path
+            assert task.checksum is None
+
     @patch_requests()
     def test_remote_file_failed(self, session_getter):
         """Mock a failed download of a remote file."""
@@ -462,6 +1086,238 @@ class DownloadImageTaskTestCase(unittest.TestCase):
             assert str(cm.value) == "Error while downloading the image: Fake!"
 
 
+class FakeRangeResponse:
+    """A fake response of a server with the support for Range requests."""
+
+    def __init__(self, content, headers, status_code=200):
+        self.content = content
+        self.headers = headers
+        self.status_code = status_code
+        self.closed = False
+
+    def raise_for_status(self):
+        """Raise an error for a failed request."""
+
+    def iter_content(self, chunk_size):
+        """Iterate over the content."""
+        for i in range(0, len(self.content), chunk_size):
+            yield self.content[i:i + chunk_size]
+
+    def close(self):
+        """Close the response."""
+        self.closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+class FakeRangeSession:
+    """A fake session of a server with the support for Range requests."""
+
+    def __init__(self, content, accept_ranges=True, failures=0):
+        self.content = content
+        self.accept_ranges = accept_ranges
+        self.failures = failures
+        self.requested_ranges = []
+
+    def mount(self, prefix, adapter):
+        """Mount an adapter."""
+
+    def get(self, url, headers=None, **kwargs):
+        """Send a GET request."""
+        response_headers = {"content-length": str(len(self.content)), "etag": "1"}
+
+        if self.accept_ranges:
+            response_headers["accept-ranges"] = "bytes"
+
+        if not headers or not self.accept_ranges:
+            return FakeRangeResponse(self.content, response_headers)
+
+        assert headers["If-Range"] == "1"
+        start, end = map(int, headers["Range"].removeprefix("bytes=").split("-"))
+        self.requested_ranges.append((start, end))
+
+        if self.failures:
+            self.failures -= 1
+            raise requests.ConnectionError("Fake!")
+
+        return FakeRangeResponse(self.content[start:end + 1], response_headers, 206)
+
+
+class ImageDownloaderTestCase(unittest.TestCase):
+    """Test the ImageDownloader class."""
+
+    def setUp(self):
+        """Set up the test."""
+        self.content = bytes(range(256)) * 40
+        self.callback = Mock()
+
+    def _download(self, session, download_path, workers=2):
+        """Download the image."""
+        downloader = ImageDownloader(
+            session=session,
+            url="http://my/image",
+            download_path=download_path,
+            callback=self.callback,
+            workers=workers,
+            segment_size=1000,
+            hash_algorithm="sha256",
+        )
+        downloader.download(session.get("http://my/image"))
+
+        with open(download_path, "rb") as f:
+            assert f.read() == self.content
+
+        assert not os.path.exists(downloader.state_path)
+        assert downloader.checksum == hashlib.sha256(self.content).hexdigest()
+        return downloader
+
+    def test_segments(self):
+        """Download the image in segments."""
+        session = FakeRangeSession(self.content)
+
+        with tempfile.TemporaryDirectory() as d:
+            self._download(session, join_paths(d, "image.img"))
+
+        assert sorted(session.requested_ranges) == [
+            (i, min(i + 999, len(self.content) - 1))
+            for i in range(0, len(self.content), 1000)
+        ]
+        assert self.callback.mock_calls[0] == call("Downloading http://my/image (0%)")
+        assert self.callback.mock_calls[-1] == call("Downloading http://my/image (100%)")
+
+    def test_segments_retry(self):
+        """Download the image in segments with failed attempts."""
+        session = FakeRangeSession(self.content, failures=2)
+
+        with tempfile.TemporaryDirectory() as d:
+            self._download(session, join_paths(d, "image.img"), workers=1)
+
+        assert len(session.requested_ranges) == 11 + 2
+
+    def test_segments_resume(self):
+        """Resume an interrupted download of segments."""
+        session = FakeRangeSession(self.content)
+
+        with tempfile.TemporaryDirectory() as d:
+            download_path = join_paths(d, "image.img")
+
+            with open(download_path, "wb") as f:
+                f.write(self.content[:3000])
+
+            with open(download_path + ".state", "w") as f:
+                f.write(
+                    '{"url": "http://my/image", "size": 10240, "validator": "1", '
+                    '"segment_size": 1000, "completed": [0, 2000]}'
+                )
+
+            self._download(session, download_path)
+
+        assert (0, 999) not in session.requested_ranges
+        assert (1000, 1999) in session.requested_ranges
+        assert (2000, 2999) not in session.requested_ranges
+        assert len(session.requested_ranges) == 9
+
+    def test_segments_invalid_state(self):
+        """Ignore a state of a different image."""
+        session = FakeRangeSession(self.content)
+
+        with tempfile.TemporaryDirectory() as d:
+            download_path = join_paths(d, "image.img")
+            touch(download_path)
+
+            with open(download_path + ".state", "w") as f:
+                f.write(
+                    '{"url": "http://my/image", "size": 10240, "validator": "2", '
+                    '"segment_size": 1000, "completed": [0, 2000]}'
+                )
+
+            self._download(session, download_path)
+
+        assert len(session.requested_ranges) == 11
+
+    def test_segments_failed(self):
+        """Fail to download the image in segments."""
+        session = FakeRangeSession(self.content, failures=10)
+
+        with tempfile.TemporaryDirectory() as d:
+            downloader = ImageDownloader(
+                session=session,
+                url="http://my/image",
+                download_path=join_paths(d, "image.img"),
+                callback=self.callback,
+                workers=1,
+                segment_size=1000,
+            )
+
+            with pytest.raises(requests.ConnectionError):
+                downloader.download(session.get("http://my/image"))
+
+            assert downloader.checksum is None
+
+    def test_segments_failed_stop(self):
+        """Stop the running segments if a segment fails."""
+        session = FakeRangeSession(self.content)
+        failed = threading.Event()
+        read_pieces = []
+        get = session.get
+
+        def iter_slowly(content, chunk_size):
+            for i in range(0, len(content), 100):
+                read_pieces.append(i)
+                yield content[i:i + 100]
+                failed.wait(timeout=5)
+                time.sleep(0.1)
+
+        def get_segment(url, headers=None, **kwargs):
+            response = get(url, headers, **kwargs)
+
+            if headers and headers["Range"] == "bytes=0-999":
+                failed.set()
+                raise requests.ConnectionError("Fake!")
+
+            if headers:
+                response.iter_content = partial(iter_slowly, response.content)
+
+            return response
+
+        session.get = get_segment
+
+        with tempfile.TemporaryDirectory() as d:
+            downloader = ImageDownloader(
+                session=session,
+                url="http://my/image",
+                download_path=join_paths(d, "image.img"),
+                callback=self.callback,
+                workers=2,
+                segment_size=1000,
+            )
+
+            with pytest.raises(requests.ConnectionError):
+                downloader.download(session.get("http://my/image"))
+
+        # The running segment is stopped and the next segments are canceled.
+        assert (1000, 1999) in session.requested_ranges
+        assert len(read_pieces) < 10
+        assert len(session.requested_ranges) < 11
+
+    def test_stream(self):
+        """Stream the image if ranges are not supported."""
+        session = FakeRangeSession(self.content, accept_ranges=False)
+
+        with tempfile.TemporaryDirectory() as d:
+            self._download(session, join_paths(d, "image.img"))
+
+        assert session.requested_ranges == []
+        assert self.callback.mock_calls == [
+            call("Downloading http://my/image (0%)"),
+            call("Downloading http://my/image (100%)"),
+        ]
+
+
 class MountImageTaskTestCase(unittest.TestCase):
     """Test the MountImageTask class."""
 
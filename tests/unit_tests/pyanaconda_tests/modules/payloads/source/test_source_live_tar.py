@@ -22,7 +22,9 @@ import unittest
 from contextlib import contextmanager
 from unittest.mock import patch
 
+import requests
 from dasbus.typing import Bool, Str, get_variant
+from requests_file import FileAdapter
 
 from pyanaconda.core.constants import SOURCE_TYPE_LIVE_TAR
 from pyanaconda.core.path import join_paths, make_directories, touch
@@ -184,3 +186,26 @@ class LiveTarInstallationTestCase(unittest.TestCase):
             '5.8.16-200.fc32.x86_64',
             '5.8.18-200.fc32.x86_64',
         ]
+
+    @patch("pyanaconda.modules.payloads.source.live_tar.installation.conf")
+    def test_install_streamed_files(self, mocked_conf):
+        """Install a remote tarball without storing it."""
+        mocked_conf.payload.stream_live_tarball = True
+        files = ["f1", "f2", "f3"]
+
+        with self._create_directory():
+            self._create_tar(files)
+            self.data.url = "fake://" + self.tarball
+
+            with patch(
+                "pyanaconda.modules.payloads.payload.live_image.installation.requests_session"
+            ) as session_getter:
+                session = requests.Session()
+                session.mount("fake://", FileAdapter())
+                session_getter.return_value = session
+                result = self._run_task()
+
+            self._check_content(files)
+            assert not os.path.exists(join_paths(self.sysroot, "source.tar"))
+
+        assert result == []
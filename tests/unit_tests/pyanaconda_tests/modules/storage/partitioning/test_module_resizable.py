@@ -27,6 +27,7 @@ from blivet.formats.fs import FS
 from blivet.size import Size
 
 from pyanaconda.modules.common.errors.storage import ProtectedDeviceError
+from pyanaconda.modules.common.structures.storage import DeviceTreeSnapshotData
 from pyanaconda.modules.storage.devicetree import create_storage
 from pyanaconda.modules.storage.partitioning.automatic.resizable_interface import (
     ResizableDeviceTreeInterface,
@@ -131,6 +132,20 @@ class ResizableDeviceTreeTestCase(unittest.TestCase):
         assert min_size == 0
         assert max_size == 0
 
+    def test_get_device_tree_snapshot(self):
+        """Test GetDeviceTreeSnapshot with size limits."""
+        self.module.on_storage_changed(create_storage())
+        self._add_device(StorageDevice(
+            "dev1",
+            fmt=get_format("ext4"),
+            size=Size("10 MiB")
+        ))
+
+        snapshot = DeviceTreeSnapshotData.from_structure(
+            self.interface.GetDeviceTreeSnapshot()
+        )
+        assert snapshot.size_limits == {"dev1": (0, 0)}
+
     def test_shrink_device(self):
         """Test ShrinkDevice."""
         self.module.on_storage_changed(create_storage())
@@ -186,3 +186,36 @@ class InstallerStorageTestCase(unittest.TestCase):
         root2_copy = storage_copy.roots[1]
         assert root2_copy.name == "Linux 2"
         assert len(root2_copy.mountopts) == 1
+
+    def test_shallow_copy(self):
+        """Test the shallow_copy method."""
+        dev1 = StorageDevice("dev1")
+        self._add_device(dev1)
+
+        dev2 = StorageDevice("dev2", exists=True)
+        self._add_device(dev2)
+        self.storage.devicetree.hide(dev2)
+
+        self.storage.roots.append(Root(name="Linux 1", devices=[dev1]))
+        self.storage.protected_devices = ["dev1"]
+
+        storage_copy = self.storage.shallow_copy()
+        assert storage_copy is not self.storage
+        assert storage_copy.devicetree is not self.storage.devicetree
+        assert storage_copy.fsset is not self.storage.fsset
+        assert not storage_copy.roots
+
+        # The devices are shared.
+        assert storage_copy.devices[0] is dev1
+        assert storage_copy.devicetree._hidden[0] is dev2
+        assert storage_copy.devices[0].format is dev1.format
+
+        # The configuration is not shared.
+        storage_copy.protected_devices.append("dev2")
+        assert self.storage.protected_devices == ["dev1"]
+
+        # The reset doesn't change the original model.
+        storage_copy.devicetree.reset()
+        assert not storage_copy.devices
+        assert self.storage.devices == [dev1]
+        assert len(self.storage.roots) == 1
@@ -66,6 +66,7 @@ from pyanaconda.modules.storage.bootloader.installation import (
     InstallBootloaderTask,
     RecreateInitrdsTask,
 )
+from pyanaconda.modules.storage.bootloader.utils import _get_initramfs_workers
 from pyanaconda.modules.storage.bootloader.zipl import ZIPL
 from pyanaconda.modules.storage.constants import BootloaderMode
 from pyanaconda.modules.storage.devicetree import create_storage
@@ -651,6 +652,61 @@ class BootloaderTasksTestCase(unittest.TestCase):
                 root=root
             )
 
+    @patch('pyanaconda.modules.storage.bootloader.utils.execWithRedirect')
+    @patch('pyanaconda.modules.storage.bootloader.utils.conf')
+    @patch('pyanaconda.modules.storage.bootloader.utils._get_initramfs_workers')
+    def test_recreate_initrds_parallel(self, workers_mock, conf_mock, exec_mock):
+        """Test the installation task that recreates initrds of more kernels."""
+        storage = Mock(bootloader=EFIGRUB())
+        versions = ["6.1.0-1.x86_64", "6.1.0-1.x86_64+debug", "6.1.0-1.x86_64+rt"]
+        conf_mock.target.is_image = False
+        workers_mock.return_value = 3
+
+        with tempfile.TemporaryDirectory() as root:
+            task = RecreateInitrdsTask(
+                storage=storage,
+                sysroot=root,
+                payload_type=PAYLOAD_TYPE_LIVE_IMAGE,
+                kernel_versions=versions
+            )
+
+            with patch.object(task, "report_progress") as progress_mock:
+                task.run()
+
+        workers_mock.assert_called_once_with(3)
+        assert exec_mock.call_count == 6
+
+        # The depmod tool runs before dracut for every kernel.
+        calls = [(c.args[0], c.args[1][-1]) for c in exec_mock.call_args_list]
+
+        for version in versions:
+            assert calls.index(("depmod", version)) < calls.index(("dracut", version))
+
+        # Every kernel is reported with its duration.
+        messages = [c.args[0] for c in progress_mock.call_args_list]
+        assert len(messages) == 3
+
+        for version in versions:
+            assert any(m.startswith("Recreated initrd for {} in ".format(version))
+                       for m in messages)
+
+    @patch('pyanaconda.modules.storage.bootloader.utils.total_memory')
+    @patch('pyanaconda.modules.storage.bootloader.utils.os.sched_getaffinity')
+    def test_initramfs_workers(self, cpus_mock, memory_mock):
+        """Test the number of initramfs images created at once."""
+        cpus_mock.return_value = set(range(4))
+        memory_mock.return_value = Size("8 GiB")
+
+        assert _get_initramfs_workers(0) == 1
+        assert _get_initramfs_workers(2) == 2
+        assert _get_initramfs_workers(10) == 4
+
+        memory_mock.return_value = Size("2 GiB")
+        assert _get_initramfs_workers(10) == 2
+
+        memory_mock.return_value = Size("512 MiB")
+        assert _get_initramfs_workers(10) == 1
+
     @patch('pyanaconda.modules.storage.bootloader.installation.conf')
     @patch('pyanaconda.modules.storage.bootloader.installation.InstallBootloaderTask')
     @patch('pyanaconda.modules.storage.bootloader.installation.ConfigureBootloaderTask')
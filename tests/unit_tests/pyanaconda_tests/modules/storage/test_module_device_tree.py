@@ -50,7 +50,9 @@ from pyanaconda.modules.common.errors.storage import (
     UnknownDeviceError,
 )
 from pyanaconda.modules.common.structures.storage import (
+    DeviceData,
     DeviceFormatData,
+    DeviceTreeSnapshotData,
     MountPointConstraintsData,
 )
 from pyanaconda.modules.storage.devicetree import (
@@ -477,6 +479,49 @@ class DeviceTreeInterfaceTestCase(unittest.TestCase):
             'attrs': get_variant(Dict[Str, Str], {}),
         }
 
+    def test_get_device_tree_snapshot(self):
+        """Test GetDeviceTreeSnapshot."""
+        dev1 = DiskDevice(
+            "dev1",
+            size=Size("10 GiB")
+        )
+        self._add_device(dev1)
+
+        dev2 = StorageDevice(
+            "dev2",
+            parents=[dev1],
+            fmt=get_format("ext4", mountpoint="/home"),
+            size=Size("5 GiB")
+        )
+        self._add_device(dev2)
+
+        snapshot = DeviceTreeSnapshotData.from_structure(
+            self.interface.GetDeviceTreeSnapshot()
+        )
+
+        assert snapshot.generation == self.interface.GetDeviceTreeGeneration()
+        assert [d.device_id for d in snapshot.devices] == ["dev1", "dev2"]
+        assert [f.type for f in snapshot.formats] == ["", "ext4"]
+        assert DeviceData.to_structure(snapshot.devices[1]) == \
+            self.interface.GetDeviceData("dev2")
+        assert DeviceFormatData.to_structure(snapshot.formats[1]) == \
+            self.interface.GetFormatData("dev2")
+        assert snapshot.size_limits == {}
+        assert snapshot.free_space == {"dev1": Size("10 GiB").get_bytes()}
+
+    def test_get_device_tree_generation(self):
+        """Test GetDeviceTreeGeneration."""
+        generation = self.interface.GetDeviceTreeGeneration()
+        assert self.interface.GetDeviceTreeGeneration() == generation
+
+        self.storage.protect_devices([])
+        assert self.interface.GetDeviceTreeGeneration() > generation
+        generation = self.interface.GetDeviceTreeGeneration()
+
+        # A new storage model has a different generation.
+        self.module.on_storage_changed(self.storage.copy())
+        assert self.interface.GetDeviceTreeGeneration() > generation
+
     def test_get_format_type_data(self):
         """Test GetFormatTypeData."""
         assert self.interface.GetFormatTypeData("swap") == {
@@ -17,9 +17,14 @@
 # subject to the GNU General Public License and may only be used or replicated
 # with the express permission of Red Hat, Inc.
 #
+import threading
 import unittest
 from textwrap import dedent
+from unittest.mock import patch
 
+import pytest
+
+from pyanaconda.errors import ERROR_RAISE
 from pyanaconda.installation_tasks import Task, TaskQueue
 
 
@@ -264,3 +269,174 @@ class InstallTasksTestCase(unittest.TestCase):
         assert self._task_completed_count == 4
         assert self._queue_started_count == 3
         assert self._queue_completed_count == 3
+
+
+class ParallelTaskQueueTestCase(unittest.TestCase):
+    """Test the parallel processing of task queues."""
+
+    def _create_queue(self, events, max_workers=4):
+        """Create a parallel task queue that records its signals."""
+        queue = TaskQueue(name="queue", max_workers=max_workers)
+        queue.task_started.connect(lambda task: events.append(("started", task.name)))
+        queue.task_completed.connect(lambda task: events.append(("completed", task.name)))
+        return queue
+
+    def test_default_requirements(self):
+        """Items require the previous item by default."""
+        order = []
+        queue = self._create_queue([])
+
+        for name in ["a", "b", "c"]:
+            queue.append(Task(name, order.append, (name,)))
+
+        queue.start()
+        assert queue.max_workers == 4
+        assert order == ["a", "b", "c"]
+
+    def test_independent_items(self):
+        """Independent items run at the same time."""
+        events = []
+        barrier = threading.Barrier(3, timeout=5)
+        queue = self._create_queue(events)
+
+        for name in ["a", "b", "c"]:
+            queue.append(Task(name, barrier.wait), requires=[])
+
+        queue.start()
+
+        # The signals are emitted in the order of the queue.
+        assert events == [
+            ("started", "a"), ("completed", "a"),
+            ("started", "b"), ("completed", "b"),
+            ("started", "c"), ("completed", "c"),
+        ]
+
+    def test_deferred_signals(self):
+        """Signals of later items wait for the previous items."""
+        events = []
+        a_done = threading.Event()
+        queue = self._create_queue(events)
+
+        # The item b finishes before the item a.
+        task_a = Task("a", a_done.wait, (5,))
+        task_b = Task("b", a_done.set)
+        queue.append(task_a, requires=[])
+        queue.append(task_b, requires=[])
+        queue.start()
+
+        assert a_done.is_set()
+        assert events == [
+            ("started", "a"), ("completed", "a"),
+            ("started", "b"), ("completed", "b"),
+        ]
+
+    def test_requirements(self):
+        """Items wait for the required items."""
+        order = []
+        queue = self._create_queue([])
+
+        task_a = Task("a", order.append, ("a",))
+        task_b = Task("b", order.append, ("b",))
+        task_c = Task("c", order.append, ("c",))
+
+        queue.append(task_a, requires=[])
+        queue.append(task_b, requires=[task_a])
+        queue.append(task_c, requires=[task_a, task_b])
+        queue.start()
+
+        assert order == ["a", "b", "c"]
+
+        with pytest.raises(ValueError):
+            queue.append(Task("d", order.append), requires=[Task("e", order.append)])
+
+    def test_resources(self):
+        """Items with a shared resource don't run at the same time."""
+        running = []
+        overlaps = []
+
+        def run(name):
+            running.append(name)
+            overlaps.append(len(running) > 1)
+            threading.Event().wait(0.05)
+            running.remove(name)
+
+        queue = self._create_queue([])
+        queue.append(Task("a", run, ("a",)), requires=[], resources=["r"])
+        queue.append(Task("b", run, ("b",)), requires=[], resources=["r"])
+        queue.start()
+
+        assert overlaps == [False, False]
+
+    @patch("pyanaconda.installation_tasks.errorHandler")
+    def test_errors(self, error_handler):
+        """The error of the first failed item is raised."""
+        error_handler.cb.return_value = ERROR_RAISE
+        order = []
+
+        def fail(name):
+            order.append(name)
+            raise RuntimeError(name)
+
+        queue = self._create_queue([])
+        task_a = Task("a", fail, ("a",))
+        queue.append(task_a, requires=[])
+        queue.append(Task("b", fail, ("b",)), requires=[])
+        queue.append(Task("c", order.append, ("c",)), requires=[task_a])
+
+        with pytest.raises(RuntimeError, match=r"^a$"):
+            queue.start()
+
+        # The item c is never started.
+        assert sorted(order) == ["a", "b"]
+
+    @patch("pyanaconda.installation_tasks.errorHandler")
+    def test_error_handler_thread(self, error_handler):
+        """Errors of items are handled in the thread of the queue."""
+        threads = []
+
+        def handle(exception):
+            threads.append(threading.current_thread())
+            return ERROR_RAISE if str(exception) == "a" else None
+
+        def fail(name):
+            raise RuntimeError(name)
+
+        def wait_and_fail(name):
+            barrier.wait()
+            fail(name)
+
+        error_handler.cb.side_effect = handle
+        barrier = threading.Barrier(2, timeout=5)
+
+        queue = self._create_queue([])
+        group = TaskQueue(name="group")
+        group.append(Task("wait", barrier.wait))
+        group.append(Task("b", fail, ("b",)))
+        queue.append(Task("a", wait_and_fail, ("a",)), requires=[])
+        queue.append(group, requires=[])
+
+        with pytest.raises(RuntimeError, match=r"^a$"):
+            queue.start()
+
+        # The ignored error of b doesn't stop the group.
+        assert threads == [threading.current_thread()] * 2
+
+    def test_nested_queues(self):
+        """Nested queues are counted in the serial order."""
+        queue = TaskQueue(name="queue", max_workers=2)
+        queue_events = []
+        queue.queue_started.connect(lambda q: queue_events.append(("started", q.name)))
+        queue.queue_completed.connect(lambda q: queue_events.append(("completed", q.name)))
+        barrier = threading.Barrier(2, timeout=5)
+
+        for name in ["group1", "group2"]:
+            group = TaskQueue(name=name, status_message=name, task_category=name)
+            group.append(Task(name, barrier.wait))
+            queue.append(group, requires=[])
+
+        queue.start()
+
+        assert queue_events == [
+            ("started", "group1"), ("completed", "group1"),
+            ("started", "group2"), ("completed", "group2"),
+        ]
@@ -104,6 +104,38 @@ class LangcodeLocaleParsingTests(unittest.TestCase):
         with pytest.raises(localization.InvalidLocaleSpec):
             localization.get_xlated_timezone("America/New_York")
 
+    @patch.dict("pyanaconda.localization.os.environ", {})
+    @patch("pyanaconda.localization.langtable.timezone_name")
+    def test_xlated_tz_cache(self, timezone_name):
+        """Translated timezones are cached per locale."""
+        localization._get_xlated_timezone.cache_clear()
+        self.addCleanup(localization._get_xlated_timezone.cache_clear)
+        timezone_name.side_effect = lambda name, languageIdQuery: languageIdQuery + ":" + name
+
+        localization.os.environ["LANG"] = "cs_CZ"
+        assert localization.get_xlated_timezone("Europe") == "cs_CZ:Europe"
+        assert localization.get_xlated_timezone("Europe") == "cs_CZ:Europe"
+        assert timezone_name.call_count == 1
+
+        localization.os.environ["LANG"] = "de_DE"
+        assert localization.get_xlated_timezone("Europe") == "de_DE:Europe"
+        assert timezone_name.call_count == 2
+
+    @patch("pyanaconda.localization.langtable.language_name")
+    def test_language_names_cache(self, language_name):
+        """Names of languages are cached."""
+        localization._get_language_name.cache_clear()
+        self.addCleanup(localization._get_language_name.cache_clear)
+        language_name.return_value = "german"
+
+        assert localization.get_english_name("de") == "German"
+        assert localization.get_english_name("de") == "German"
+        assert localization.get_native_name("de") == "german"
+        assert language_name.call_args_list == [
+            call(languageId="de", languageIdQuery="en"),
+            call(languageId="de", languageIdQuery=None),
+        ]
+
 
 class SetupLocaleTest(unittest.TestCase):
 
@@ -0,0 +1,201 @@
+#
+# Copyright (C) 2026  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 31 Milk Street #960789 Boston, MA
+# 02196 USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock, patch
+
+from pyanaconda.core.constants import NTP_SERVER_NOK, NTP_SERVER_OK, NTP_SERVER_QUERY
+from pyanaconda.modules.common.structures.timezone import TimeSourceData
+from pyanaconda.ntp import NTPServerProber, NTPServerStatusCache
+
+
+class NTPServerProberTestCase(unittest.TestCase):
+    """Test the batched checks of NTP servers."""
+
+    def setUp(self):
+        self.prober = NTPServerProber(workers=2, ttl=300, backoff=15, max_backoff=60)
+        self.working = {"a.example.com", "b.example.com"}
+        self.checked = []
+        self.time = 1000
+
+        patchers = [
+            patch("pyanaconda.ntp.thread_manager"),
+            patch("pyanaconda.ntp.ntp_server_working", side_effect=self._check_server),
+            patch("pyanaconda.ntp.time.monotonic", side_effect=lambda: self.time),
+            patch.object(NTPServerStatusCache, "_report_status_changed"),
+        ]
+
+        mocks = [p.start() for p in patchers]
+
+        for p in patchers:
+            self.addCleanup(p.stop)
+
+        # Run the checking thread right away.
+        self.thread_manager = mocks[0]
+        self.thread_manager.add_thread.side_effect = lambda prefix, target: target()
+
+    def _check_server(self, hostname, nts_enabled):
+        self.checked.append((hostname, nts_enabled))
+        return hostname in self.working
+
+    @staticmethod
+    def _get_servers(*hostnames):
+        servers = []
+
+        for hostname in hostnames:
+            server = TimeSourceData()
+            server.hostname = hostname
+            server.options = ["iburst"]
+            servers.append(server)
+
+        return servers
+
+    def test_batch(self):
+        """Check servers in one batch."""
+        servers = self._get_servers("a.example.com", "b.example.com", "c.example.com")
+        states = NTPServerStatusCache(self.prober)
+
+        with patch("pyanaconda.ntp.ThreadPoolExecutor", wraps=ThreadPoolExecutor) as executor:
+            states.check_statuses(servers)
+
+        executor.assert_called_once_with(max_workers=2)
+        self.thread_manager.add_thread.assert_called_once()
+        assert sorted(self.checked) == [
+            ("a.example.com", False), ("b.example.com", False), ("c.example.com", False)
+        ]
+
+        # The change is reported once per batch.
+        states._report_status_changed.assert_called_once_with()
+        assert [states.get_status(s) for s in servers] == \
+            [NTP_SERVER_OK, NTP_SERVER_OK, NTP_SERVER_NOK]
+
+    def test_next_batch(self):
+        """Check servers requested during a batch in the next batch."""
+        callback = Mock()
+
+        def check_server(hostname, nts_enabled):
+            if hostname == "a.example.com":
+                self.prober.check([("b.example.com", True)], callback)
+
+            return self._check_server(hostname, nts_enabled)
+
+        with patch("pyanaconda.ntp.ntp_server_working", side_effect=check_server):
+            assert self.prober.check([("a.example.com", False)], callback) == {}
+
+        self.thread_manager.add_thread.assert_called_once()
+        assert self.checked == [("a.example.com", False), ("b.example.com", True)]
+        assert callback.call_args_list == [
+            (({("a.example.com", False): True},),),
+            (({("b.example.com", True): True},),),
+        ]
+
+    def test_cached_results(self):
+        """Reuse results of working servers across caches."""
+        servers = self._get_servers("a.example.com")
+        NTPServerStatusCache(self.prober).check_statuses(servers)
+        NTPServerStatusCache._report_status_changed.reset_mock()
+        assert len(self.checked) == 1
+
+        # The result is reused by another cache.
+        self.time += 299
+        states = NTPServerStatusCache(self.prober)
+        states.check_statuses(servers)
+
+        assert len(self.checked) == 1
+        assert states.get_status(servers[0]) == NTP_SERVER_OK
+        states._report_status_changed.assert_called_once_with()
+
+        # The result expired.
+        self.time += 1
+        self.thread_manager.add_thread.side_effect = None
+        states.check_statuses(servers)
+        assert states.get_status(servers[0]) == NTP_SERVER_QUERY
+        self.thread_manager.add_thread.assert_called()
+
+    def test_backoff(self):
+        """Check failed servers again after a growing delay."""
+        callback = Mock()
+        server = ("c.example.com", False)
+
+        for delay in (15, 30, 60, 60):
+            self.prober.check([server], callback)
+            assert len(self.checked) == 1
+
+            self.time += delay - 1
+            assert self.prober.check([server], callback) == {server: False}
+            assert len(self.checked) == 1
+
+            self.time += 1
+            self.checked.clear()
+
+        # A working server resets the delay.
+        self.working.add("c.example.com")
+        self.prober.check([server], callback)
+        self.working.remove("c.example.com")
+        self.time += 300
+        self.prober.check([server], callback)
+        self.time += 15
+        self.checked.clear()
+        self.prober.check([server], callback)
+        assert self.checked == [server]
+
+    def test_forced_check(self):
+        """Check servers requested by the user despite the known results."""
+        server = self._get_servers("c.example.com")[0]
+        states = NTPServerStatusCache(self.prober)
+        states.check_statuses([server])
+        assert states.get_status(server) == NTP_SERVER_NOK
+
+        # The failed server is not checked again during the backoff.
+        self.time += 1
+        states.check_statuses([server])
+        assert len(self.checked) == 1
+
+        # The user can check the server again.
+        self.working.add("c.example.com")
+        states.check_status(server)
+        assert len(self.checked) == 2
+        assert states.get_status(server) == NTP_SERVER_OK
+
+    def test_failed_check(self):
+        """Report every server of a batch if a check fails."""
+        def check_server(hostname, nts_enabled):
+            if hostname == "b.example.com":
+                raise OSError("Fake error!")
+
+            return self._check_server(hostname, nts_enabled)
+
+        servers = self._get_servers("a.example.com", "b.example.com", "c.example.com")
+        states = NTPServerStatusCache(self.prober)
+
+        with patch("pyanaconda.ntp.ntp_server_working", side_effect=check_server):
+            states.check_statuses(servers)
+
+        assert [states.get_status(s) for s in servers] == \
+            [NTP_SERVER_OK, NTP_SERVER_NOK, NTP_SERVER_NOK]
+
+    def test_nts(self):
+        """Check servers with and without NTS separately."""
+        server = self._get_servers("a.example.com")[0]
+        states = NTPServerStatusCache(self.prober)
+        states.check_status(server)
+
+        server.options.append("nts")
+        states.check_status(server)
+
+        assert self.checked == [("a.example.com", False), ("a.example.com", True)]
@@ -17,7 +17,12 @@
 #
 # Red Hat Author(s): Martin Kolman <mkolman@redhat.com>
 #
+import threading
 import unittest
+from concurrent.futures import Future, ThreadPoolExecutor
+from unittest.mock import Mock, patch
+
+import pwquality
 
 from pyanaconda import input_checking
 from pyanaconda.core import constants
@@ -242,3 +247,175 @@ class PasswordQuality(unittest.TestCase):
         assert check.result.password_quality == 0  # dependent on password length
         assert check.result.error_message == \
             _(constants.SECRET_TOO_SHORT[constants.SecretType.PASSWORD])
+
+
+class PwqualityResultCacheTestCase(unittest.TestCase):
+    """Test the cache of libpwquality results."""
+
+    def test_check(self):
+        """Check every password, username and minimum length once."""
+        settings = Mock(minlen=6)
+        settings.check.return_value = 50
+        cache = input_checking.PwqualityResultCache(max_size=2)
+
+        assert cache.check(settings, "password", "user") == (50, "")
+        assert cache.check(settings, "password", "user") == (50, "")
+        settings.check.assert_called_once_with("password", None, "user")
+
+        assert cache.check(settings, "password", "root") == (50, "")
+        settings.minlen = 10
+        settings.check.side_effect = pwquality.PWQError(1, "too short")
+        assert cache.check(settings, "password", "root") == (0, "too short")
+        assert settings.check.call_count == 3
+
+        # The oldest result is dropped.
+        settings.minlen = 6
+        settings.check.side_effect = None
+        cache.check(settings, "password", "user")
+        assert settings.check.call_count == 4
+
+    def test_serialized_checks(self):
+        """Run one libpwquality check at a time."""
+        running = threading.Semaphore(1)
+        started = threading.Event()
+        release = threading.Event()
+
+        def _check(password, old_password, username):
+            assert running.acquire(blocking=False), "parallel checks"
+            started.set()
+            release.wait(timeout=5)
+            running.release()
+            return len(password)
+
+        settings = Mock(minlen=6)
+        settings.check.side_effect = _check
+        cache = input_checking.PwqualityResultCache()
+
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            first = executor.submit(cache.check, settings, "password", "user")
+            assert started.wait(timeout=5)
+            same = executor.submit(cache.check, settings, "password", "user")
+            other = executor.submit(cache.check, settings, "other", "user")
+            release.set()
+
+            assert first.result() == (8, "")
+            assert same.result() == (8, "")
+            assert other.result() == (5, "")
+
+        # The waiting check of the same password reused the result.
+        assert settings.check.call_count == 2
+
+
+class DelayedPasswordCheckerTestCase(unittest.TestCase):
+    """Test the delayed checks of the password checker."""
+
+    def setUp(self):
+        self.timers = []
+        self.prepared = []
+
+        patchers = [
+            patch("pyanaconda.input_checking.get_policy", return_value=get_policy()),
+            patch("pyanaconda.input_checking.Timer", side_effect=self._create_timer),
+            patch("pyanaconda.input_checking.run_in_loop", side_effect=self._run_in_loop),
+            patch("pyanaconda.input_checking._get_check_executor"),
+        ]
+
+        mocks = [p.start() for p in patchers]
+
+        for p in patchers:
+            self.addCleanup(p.stop)
+
+        # Keep the submitted jobs until they are finished.
+        self.jobs = []
+        self.executor = mocks[3].return_value
+        self.executor.submit.side_effect = self._submit
+
+        self.checker = input_checking.PasswordChecker("", "", PASSWORD_POLICY_USER, delay=100)
+        self.check = Mock(skip=False, result=input_checking.CheckResult())
+        self.check.prepare.side_effect = lambda r: self.prepared.append(r.password)
+        self.check.run.side_effect = self._run_check
+        self.checker.add_check(self.check)
+
+        self.results = []
+        self.checker.checks_done.connect(self.results.append)
+
+    def _create_timer(self):
+        timer = Mock()
+        self.timers.append(timer)
+        return timer
+
+    def _run_in_loop(self, callback, *args):
+        callback(*args)
+
+    def _submit(self, func, *args):
+        future = Future()
+        self.jobs.append((future, func, args))
+        return future
+
+    def _finish_jobs(self):
+        for future, func, args in self.jobs:
+            if future.set_running_or_notify_cancel():
+                future.set_result(func(*args))
+
+        self.jobs.clear()
+
+    def _fire_timer(self):
+        timer = self.timers[0]
+        callback, *args = timer.timeout_msec.call_args.args[1:]
+        assert callback(*args) is False
+
+    def _run_check(self, request):
+        self.check.result.success = len(request.password) > 3
+        self.check.result.error_message = "" if self.check.result.success else "short"
+
+    def test_delayed_checks(self):
+        """Report only results of the latest checks."""
+        self.checker.password.content = "a"
+        self.checker.password.content = "ab"
+        self.check.run.assert_not_called()
+
+        # The first timer was cancelled.
+        timer = self.timers[0]
+        timer.cancel.assert_called_once_with()
+        self.check.run.assert_not_called()
+
+        self._fire_timer()
+        assert self.executor.submit.call_count == 1
+        self.check.run.assert_not_called()
+
+        self._finish_jobs()
+        assert self.prepared == ["ab"]
+        assert self.results == ["short"]
+        assert self.check.run.call_args.args[0].password == "ab"
+
+    def test_outdated_checks(self):
+        """Cancel checks of outdated input."""
+        self.checker.password.content = "a"
+        self._fire_timer()
+
+        # The input changed while the checks were prepared.
+        self.checker.password.content = "abcd"
+        assert self.jobs[0][0].cancelled()
+
+        self._fire_timer()
+        self._finish_jobs()
+
+        assert self.prepared == ["abcd"]
+        assert self.results == [""]
+        self.check.run.assert_called_once()
+
+    def test_finish_checks(self):
+        """Run the scheduled checks right away."""
+        self.checker.finish_checks()
+        assert self.results == []
+
+        self.checker.password.content = "abcd"
+        self.checker.finish_checks()
+        assert self.results == [""]
+        assert self.checker.success
+
+        # The scheduled checks were cancelled.
+        self._fire_timer()
+        self._finish_jobs()
+        assert self.results == [""]
+        self.executor.submit.assert_not_called()
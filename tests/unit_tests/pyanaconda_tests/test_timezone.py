@@ -53,6 +53,16 @@ class TimezonesListings(unittest.TestCase):
 
         assert result == timezone.get_all_regions_and_timezones()
 
+    def test_regions_and_timezones_copy(self):
+        """Test that get_all_regions_and_timezones returns a new dictionary."""
+        regions_and_timezones = timezone.get_all_regions_and_timezones()
+        regions_and_timezones["Europe"].add("Atlantis")
+        regions_and_timezones.pop("America")
+
+        result = timezone.get_all_regions_and_timezones()
+        assert "Atlantis" not in result["Europe"]
+        assert "America" in result
+
     def test_parse_timezone(self):
         """Test the parse_timezone function."""
         regions_and_timezones = timezone.get_all_regions_and_timezones()
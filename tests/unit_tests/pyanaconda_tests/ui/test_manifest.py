@@ -0,0 +1,218 @@
+#
+# Copyright (C) 2026  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 31 Milk Street #960789 Boston, MA
+# 02196 USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+import os
+import sys
+import unittest
+from tempfile import TemporaryDirectory
+from textwrap import dedent
+from unittest.mock import patch
+
+from pyanaconda.ui import UserInterface
+from pyanaconda.ui.common import collect_spokes
+from pyanaconda.ui.lib.manifest import ClassManifest, find_modules, get_manifest
+
+MODULES = {
+    "manifest_test_storage": """
+        class StorageCategory:
+            pass
+
+        class BaseSpoke:
+            category = StorageCategory
+
+        class StorageSpoke(BaseSpoke):
+            pass
+
+        class HiddenSpoke:
+            category = StorageCategory
+    """,
+    "manifest_test_hidden": """
+        from manifest_test_base import ExternalSpoke
+        from manifest_test_storage import StorageCategory
+
+        class OtherHiddenSpoke(ExternalSpoke):
+            category = StorageCategory
+    """,
+    "manifest_test_inherited": """
+        from manifest_test_base import ExternalSpoke
+
+        __all__ = ["InheritedSpoke"]
+
+        class InheritedSpoke(ExternalSpoke):
+            pass
+    """,
+    "manifest_test_welcome": """
+        import hubs
+
+        class WelcomeSpoke:
+            preForHub = hubs.SummaryHub
+            category = None
+    """,
+    "manifest_test_invalid": """
+        class InvalidSpoke(
+    """,
+}
+
+# A module with base classes outside of the described directory.
+BASE_MODULE = """
+    class StorageCategory:
+        pass
+
+    class ExternalSpoke:
+        category = StorageCategory
+"""
+
+
+class ManifestTestCase(unittest.TestCase):
+    """Test the manifest of UI modules."""
+
+    def setUp(self):
+        self._temporary = TemporaryDirectory()
+        self.path = self._temporary.name
+
+        for mod_name, source in MODULES.items():
+            with open(os.path.join(self.path, mod_name + ".py"), "w") as f:
+                f.write(dedent(source))
+
+        # Compiled modules can't be described.
+        open(os.path.join(self.path, "manifest_test_compiled.so"), "w").close()
+        open(os.path.join(self.path, "__init__.py"), "w").close()
+        open(os.path.join(self.path, "README"), "w").close()
+
+        # Base classes are imported from a directory that is not described.
+        base_path = os.path.join(self.path, "base")
+        os.mkdir(base_path)
+
+        with open(os.path.join(base_path, "manifest_test_base.py"), "w") as f:
+            f.write(dedent(BASE_MODULE))
+
+        sys.path.insert(0, base_path)
+        self.addCleanup(sys.path.remove, base_path)
+
+    def tearDown(self):
+        self._temporary.cleanup()
+
+        # The modules can be imported also with the name of the mask.
+        for name in list(sys.modules):
+            if name.startswith("manifest_test"):
+                sys.modules.pop(name)
+
+    @staticmethod
+    def _is_imported(mod_name):
+        """Is the module imported with any name of the mask?"""
+        return any(name.rpartition(".")[2] == mod_name for name in sys.modules)
+
+    def test_get_manifest(self):
+        """Test the get_manifest function."""
+        classes, unknown = get_manifest(self.path)
+
+        assert unknown == {"manifest_test_invalid", "manifest_test_compiled"}
+        assert sorted(classes) == sorted([
+            ClassManifest("manifest_test_hidden", "OtherHiddenSpoke", ("ExternalSpoke",),
+                          "StorageCategory", None, None, False),
+            ClassManifest("manifest_test_inherited", "InheritedSpoke", ("ExternalSpoke",),
+                          None, None, None, False),
+            ClassManifest("manifest_test_storage", "StorageCategory", (),
+                          None, None, None),
+            ClassManifest("manifest_test_storage", "BaseSpoke", (),
+                          "StorageCategory", None, None),
+            ClassManifest("manifest_test_storage", "StorageSpoke", ("BaseSpoke",),
+                          "StorageCategory", None, None),
+            ClassManifest("manifest_test_storage", "HiddenSpoke", (),
+                          "StorageCategory", None, None),
+            ClassManifest("manifest_test_welcome", "WelcomeSpoke", (),
+                          None, "SummaryHub", None),
+        ])
+
+        assert get_manifest("/nonexistent/path") == ([], set())
+
+    def test_find_modules(self):
+        """Test the find_modules function."""
+        assert find_modules(self.path, lambda c: c.pre_for_hub or c.post_for_hub) == {
+            "manifest_test_welcome", "manifest_test_invalid", "manifest_test_compiled",
+            "manifest_test_inherited"
+        }
+
+    def test_resolved(self):
+        """Test the resolution of base classes."""
+        with open(os.path.join(self.path, "manifest_test_resolved.py"), "w") as f:
+            f.write(dedent("""
+                from manifest_test_base import ExternalSpoke
+
+                class FirstSpoke(object):
+                    pass
+
+                class SecondSpoke(FirstSpoke):
+                    pass
+
+                class ThirdSpoke(SecondSpoke, ExternalSpoke):
+                    pass
+
+                class FourthSpoke(ThirdSpoke):
+                    pass
+
+                class FifthSpoke(type("Base", (), {})):
+                    pass
+            """))
+
+        classes, _unknown = get_manifest(self.path)
+        resolved = {c.name: c.resolved for c in classes if c.module == "manifest_test_resolved"}
+        assert resolved == {
+            "FirstSpoke": True,
+            "SecondSpoke": True,
+            "ThirdSpoke": False,
+            "FourthSpoke": False,
+            "FifthSpoke": False,
+        }
+
+    @patch("pyanaconda.ui.common.log")
+    @patch("pyanaconda.ui.common.conf")
+    def test_collect_spokes(self, conf, log):
+        """Modules with only hidden spokes are not imported."""
+        conf.ui.hidden_spokes = ["HiddenSpoke", "OtherHiddenSpoke"]
+
+        # Don't import modules that can't be described.
+        with patch("pyanaconda.ui.common.find_modules",
+                   lambda path, pred: find_modules(path, pred) - get_manifest(path)[1]):
+            spokes = collect_spokes([("manifest_test.spokes.%s", self.path)], "StorageCategory")
+
+        assert sorted(s.__name__ for s in spokes) == ["BaseSpoke", "InheritedSpoke", "StorageSpoke"]
+        assert self._is_imported("manifest_test_storage")
+        assert self._is_imported("manifest_test_inherited")
+        assert not self._is_imported("manifest_test_hidden")
+        assert not self._is_imported("manifest_test_welcome")
+
+        # The hidden spokes are logged once.
+        assert [c.args[1] for c in log.info.call_args_list] == ["HiddenSpoke", "OtherHiddenSpoke"]
+
+    def test_collect_standalone_spokes(self):
+        """Only modules with standalone spokes are imported."""
+        with open(os.path.join(self.path, "hubs.py"), "w") as f:
+            f.write("class SummaryHub:\n    pass\n")
+
+        sys.path.insert(0, self.path)
+        self.addCleanup(sys.path.remove, self.path)
+        self.addCleanup(sys.modules.pop, "hubs", None)
+
+        with patch("pyanaconda.ui.find_modules",
+                   lambda path, pred: find_modules(path, pred) - get_manifest(path)[1]):
+            spokes = UserInterface._collectActionClasses(
+                [("manifest_test.spokes.%s", self.path)], object
+            )
+
+        assert [s.__name__ for s in spokes] == ["WelcomeSpoke"]
+        assert not self._is_imported("manifest_test_storage")
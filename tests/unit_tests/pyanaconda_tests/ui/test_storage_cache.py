@@ -0,0 +1,96 @@
+#
+# Copyright (C) 2026  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 31 Milk Street #960789 Boston, MA
+# 02196 USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+import unittest
+from unittest.mock import Mock
+
+from pyanaconda.modules.common.structures.storage import (
+    DeviceData,
+    DeviceFormatData,
+    DeviceTreeSnapshotData,
+)
+from pyanaconda.ui.lib.storage import DeviceTreeCache
+
+
+class DeviceTreeCacheTestCase(unittest.TestCase):
+    """Test the cache of the device tree data."""
+
+    def setUp(self):
+        """Set up the test."""
+        self.device_tree = Mock()
+        self.device_tree.GetDeviceTreeGeneration.return_value = 1
+        self.device_tree.GetDeviceTreeSnapshot.side_effect = self._get_snapshot
+        self.cache = DeviceTreeCache(self.device_tree)
+
+    def _get_snapshot(self):
+        device = DeviceData()
+        device.device_id = "dev1"
+        device.name = "dev1"
+
+        fmt = DeviceFormatData()
+        fmt.type = "ext4"
+
+        snapshot = DeviceTreeSnapshotData()
+        snapshot.generation = self.device_tree.GetDeviceTreeGeneration()
+        snapshot.devices = [device]
+        snapshot.formats = [fmt]
+        snapshot.size_limits = {"dev1": (1, 10)}
+        snapshot.free_space = {"dev1": 5}
+        return DeviceTreeSnapshotData.to_structure(snapshot)
+
+    def test_refresh(self):
+        """Request the snapshot only if the device tree has changed."""
+        self.cache.refresh()
+        self.cache.refresh()
+        self.device_tree.GetDeviceTreeSnapshot.assert_called_once_with()
+
+        self.device_tree.GetDeviceTreeGeneration.return_value = 2
+        self.cache.refresh()
+        assert self.device_tree.GetDeviceTreeSnapshot.call_count == 2
+
+    def test_cached_data(self):
+        """Get cached data of devices."""
+        self.cache.refresh()
+
+        assert self.cache.get_device_data("dev1").name == "dev1"
+        assert self.cache.get_format_data("dev1").type == "ext4"
+        assert self.cache.get_device_size_limits("dev1") == (1, 10)
+        assert self.cache.get_disk_free_space("dev1") == 5
+
+        self.device_tree.GetDeviceData.assert_not_called()
+        self.device_tree.GetFormatData.assert_not_called()
+        self.device_tree.GetDeviceSizeLimits.assert_not_called()
+        self.device_tree.GetDiskFreeSpace.assert_not_called()
+
+    def test_uncached_data(self):
+        """Request data of unknown devices from the device tree."""
+        self.device_tree.GetDeviceData.return_value = \
+            DeviceData.to_structure(DeviceData())
+        self.device_tree.GetFormatData.return_value = \
+            DeviceFormatData.to_structure(DeviceFormatData())
+        self.device_tree.GetDeviceSizeLimits.return_value = (0, 0)
+        self.device_tree.GetDiskFreeSpace.return_value = 0
+
+        assert isinstance(self.cache.get_device_data("dev2"), DeviceData)
+        assert isinstance(self.cache.get_format_data("dev2"), DeviceFormatData)
+        assert self.cache.get_device_size_limits("dev2") == (0, 0)
+        assert self.cache.get_disk_free_space("dev2") == 0
+
+        self.device_tree.GetDeviceData.assert_called_once_with("dev2")
+        self.device_tree.GetFormatData.assert_called_once_with("dev2")
+        self.device_tree.GetDeviceSizeLimits.assert_called_once_with("dev2")
+        self.device_tree.GetDiskFreeSpace.assert_called_once_with(["dev2"])